@@ -1,5 +1,8 @@
+from . import backbone_analysis
+from . import backbone_joint
+from . import backbone_kinetics
 from . import bipopulations
 from . import canonicalag
 from . import puckering
 name = "backbone"
-__all__ = ["bipopulations", "canonicalag", "puckering"]
+__all__ = ["backbone_analysis", "backbone_joint", "backbone_kinetics", "bipopulations", "canonicalag", "puckering"]
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""Module containing the BackboneAnalysis class and the command line interface."""
+
+from typing import Optional
+
+import matplotlib.pyplot as plt
+import pandas as pd
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.backbone.common import (
+    bi_populations,
+    bi_states,
+    canonical_alpha_gamma,
+    canonical_alpha_gamma_states,
+    get_xlabels,
+    puckering_populations,
+    puckering_states,
+    read_backbone_series,
+    save_states,
+)
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import ArchiveMemberInputs
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.transform import inverse_complement
+
+
+class BackboneAnalysis(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
+    """
+    | biobb_dna BackboneAnalysis
+    | Calculate BI/BII, canonical alpha/gamma and puckering populations in a single run.
+    | Reads the ten backbone .ser files (alpha, gamma, epsil, zeta and phase for both strands) once, either from separate files or from the zip file generated by biobb_canal, and computes the BI/BII, canonical alpha/gamma and puckering populations tables.
+
+    Args:
+        input_zip_file (str) (Optional): Zip file with Canal output files. Backbone series are read from the canal_output_<parameter>.ser files inside it. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        input_alphaC_path (str) (Optional): Path to .ser file for helical parameter 'alphaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_alphaW_path (str) (Optional): Path to .ser file for helical parameter 'alphaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaC_path (str) (Optional): Path to .ser file for helical parameter 'gammaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaW_path (str) (Optional): Path to .ser file for helical parameter 'gammaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilC_path (str) (Optional): Path to .ser file for helical parameter 'epsilC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilW_path (str) (Optional): Path to .ser file for helical parameter 'epsilW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaC_path (str) (Optional): Path to .ser file for helical parameter 'zetaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaW_path (str) (Optional): Path to .ser file for helical parameter 'zetaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseC_path (str) (Optional): Path to .ser file for helical parameter 'phaseC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseW_path (str) (Optional): Path to .ser file for helical parameter 'phaseW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseW.ser>`_. Accepted formats: ser (edam:format_2330).
+        output_bipop_csv_path (str): Path to .csv file where BI/BII populations are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/backbone_bipop_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_canonag_csv_path (str): Path to .csv file where canonical alpha/gamma populations are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_puckering_csv_path (str): Path to .csv file where puckering populations are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_bipop_jpg_path (str) (Optional): Path to .jpg file where BI/BII populations plot is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/bipop_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_canonag_jpg_path (str) (Optional): Path to .jpg file where canonical alpha/gamma populations plot is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_puckering_jpg_path (str) (Optional): Path to .jpg file where puckering populations plot is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_bipop_states_path (str) (Optional): Path to .npy file where per-frame BI (0) / BII (1) states are saved (-1 for undefined values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/bipop_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
+        output_canonag_states_path (str) (Optional): Path to .npy file where per-frame canonical (1) / non-canonical (0) alpha/gamma states are saved (-1 for undefined values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
+        output_puckering_states_path (str) (Optional): Path to .npy file where per-frame North (0), East (1), South (2) and West (3) puckering states are saved (-1 for undefined or boundary values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
+        properties (dict):
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser files. Length of sequence is expected to be the same as the total number of columns in the .ser files, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
+            * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.backbone.backbone_analysis import backbone_analysis
+
+            prop = {
+                'sequence': 'GCAT',
+            }
+            backbone_analysis(
+                input_zip_file='/path/to/canal_output.zip',
+                output_bipop_csv_path='/path/to/table/bipop.csv',
+                output_canonag_csv_path='/path/to/table/canonag.csv',
+                output_puckering_csv_path='/path/to/table/puckering.csv',
+                properties=prop)
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        output_bipop_csv_path,
+        output_canonag_csv_path,
+        output_puckering_csv_path,
+        input_zip_file=None,
+        input_alphaC_path=None,
+        input_alphaW_path=None,
+        input_gammaC_path=None,
+        input_gammaW_path=None,
+        input_epsilC_path=None,
+        input_epsilW_path=None,
+        input_zetaC_path=None,
+        input_zetaW_path=None,
+        input_phaseC_path=None,
+        input_phaseW_path=None,
+        output_bipop_jpg_path=None,
+        output_canonag_jpg_path=None,
+        output_puckering_jpg_path=None,
+        output_bipop_states_path=None,
+        output_canonag_states_path=None,
+        output_puckering_states_path=None,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_zip_file": input_zip_file,
+                "input_alphaC_path": input_alphaC_path,
+                "input_alphaW_path": input_alphaW_path,
+                "input_gammaC_path": input_gammaC_path,
+                "input_gammaW_path": input_gammaW_path,
+                "input_epsilC_path": input_epsilC_path,
+                "input_epsilW_path": input_epsilW_path,
+                "input_zetaC_path": input_zetaC_path,
+                "input_zetaW_path": input_zetaW_path,
+                "input_phaseC_path": input_phaseC_path,
+                "input_phaseW_path": input_phaseW_path,
+            },
+            "out": {
+                "output_bipop_csv_path": output_bipop_csv_path,
+                "output_canonag_csv_path": output_canonag_csv_path,
+                "output_puckering_csv_path": output_puckering_csv_path,
+                "output_bipop_jpg_path": output_bipop_jpg_path,
+                "output_canonag_jpg_path": output_canonag_jpg_path,
+                "output_puckering_jpg_path": output_puckering_jpg_path,
+                "output_bipop_states_path": output_bipop_states_path,
+                "output_canonag_states_path": output_canonag_states_path,
+                "output_puckering_states_path": output_puckering_states_path,
+            },
+        }
+
+        self.properties = properties
+        self.sequence = properties.get("sequence")
+        self.seqpos = [
+            int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
+        ]
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`BackboneAnalysis <backbone.backbone_analysis.BackboneAnalysis>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check seqpos
+        if self.seqpos:
+            if (max(self.seqpos) > len(self.sequence) - 2) or (min(self.seqpos) < 1):
+                raise ValueError(
+                    f"seqpos values must be between 1 and {len(self.sequence) - 2}"
+                )
+            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
+                raise ValueError("seqpos must be a list of at least two integers")
+        else:
+            self.seqpos = None  # type: ignore
+
+        # read input files, each strand joined with its complementary one
+        self.start_phase("parse")
+        series = read_backbone_series(self.stage_io_dict["in"], seqpos=self.seqpos)
+
+        # classify all backbone parameters
+        self.start_phase("compute")
+        xlabels = get_xlabels(
+            self.sequence, inverse_complement(self.sequence), self.seqpos
+        )
+        separator = len(self.seqpos) if self.seqpos else len(self.sequence)
+        BI, BII = bi_populations(series["epsil"], series["zeta"])
+        canonical = canonical_alpha_gamma(series["alpha"], series["gamma"])
+        Npop, Epop, Wpop, Spop = puckering_populations(series["phase"])
+
+        # save tables
+        self.start_phase("archive")
+        pd.DataFrame(
+            {"Nucleotide": xlabels, "BI population": BI, "BII population": BII}
+        ).to_csv(self.stage_io_dict["out"]["output_bipop_csv_path"], index=False)
+        pd.DataFrame(
+            {"Nucleotide": xlabels, "Canonical alpha/gamma": canonical}
+        ).to_csv(self.stage_io_dict["out"]["output_canonag_csv_path"], index=False)
+        pd.DataFrame(
+            {
+                "Nucleotide": xlabels,
+                "North": Npop,
+                "East": Epop,
+                "West": Wpop,
+                "South": Spop,
+            }
+        ).to_csv(self.stage_io_dict["out"]["output_puckering_csv_path"], index=False)
+
+        # save plots
+        self.start_phase("render")
+        if self.stage_io_dict["out"].get("output_bipop_jpg_path"):
+            self.plot_populations(
+                xlabels,
+                separator,
+                {"BI": BI, "BII": BII},
+                "BI/BII Population (%)",
+                "Nucleotide parameter: BI/BII Population",
+                self.stage_io_dict["out"]["output_bipop_jpg_path"],
+            )
+        if self.stage_io_dict["out"].get("output_canonag_jpg_path"):
+            self.plot_populations(
+                xlabels,
+                separator,
+                {"canonical alpha/gamma": canonical, None: 100 - canonical},
+                "Canonical Alpha-Gamma (%)",
+                "Nucleotide parameter: Canonical Alpha-Gamma",
+                self.stage_io_dict["out"]["output_canonag_jpg_path"],
+            )
+        if self.stage_io_dict["out"].get("output_puckering_jpg_path"):
+            self.plot_populations(
+                xlabels,
+                separator,
+                {"North": Npop, "East": Epop, "South": Spop, "West": Wpop},
+                "Puckering (%)",
+                "Nucleotide parameter: Puckering",
+                self.stage_io_dict["out"]["output_puckering_jpg_path"],
+            )
+
+        # save per-frame states
+        self.start_phase("archive")
+        states_paths = {
+            "bipop": self.stage_io_dict["out"].get("output_bipop_states_path"),
+            "canonag": self.stage_io_dict["out"].get("output_canonag_states_path"),
+            "puckering": self.stage_io_dict["out"].get("output_puckering_states_path"),
+        }
+        if states_paths["bipop"]:
+            save_states(
+                states_paths["bipop"], bi_states(series["epsil"], series["zeta"])
+            )
+        if states_paths["canonag"]:
+            save_states(
+                states_paths["canonag"],
+                canonical_alpha_gamma_states(series["alpha"], series["gamma"]),
+            )
+        if states_paths["puckering"]:
+            save_states(states_paths["puckering"], puckering_states(series["phase"]))
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+    def plot_populations(self, xlabels, separator, populations, ylabel, title, jpg_path):
+        """Stacked bar plot of the populations of each nucleotide."""
+        fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
+        bottom = 0
+        for label, values in populations.items():
+            axs.bar(range(len(xlabels)), values, bottom=bottom, label=label)
+            bottom = bottom + values
+        # empty bar to divide both sequences
+        axs.bar([separator], [100], color="white", label=None)
+        axs.legend()
+        axs.set_xticks(range(len(xlabels)))
+        axs.set_xticklabels(xlabels, rotation=90)
+        axs.set_xlabel("Nucleotide Sequence")
+        axs.set_ylabel(ylabel)
+        axs.set_title(title)
+        fig.savefig(jpg_path, format="jpg")
+        plt.close()
+
+
+def backbone_analysis(
+    output_bipop_csv_path: str,
+    output_canonag_csv_path: str,
+    output_puckering_csv_path: str,
+    input_zip_file: Optional[str] = None,
+    input_alphaC_path: Optional[str] = None,
+    input_alphaW_path: Optional[str] = None,
+    input_gammaC_path: Optional[str] = None,
+    input_gammaW_path: Optional[str] = None,
+    input_epsilC_path: Optional[str] = None,
+    input_epsilW_path: Optional[str] = None,
+    input_zetaC_path: Optional[str] = None,
+    input_zetaW_path: Optional[str] = None,
+    input_phaseC_path: Optional[str] = None,
+    input_phaseW_path: Optional[str] = None,
+    output_bipop_jpg_path: Optional[str] = None,
+    output_canonag_jpg_path: Optional[str] = None,
+    output_puckering_jpg_path: Optional[str] = None,
+    output_bipop_states_path: Optional[str] = None,
+    output_canonag_states_path: Optional[str] = None,
+    output_puckering_states_path: Optional[str] = None,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`BackboneAnalysis <dna.backbone.backbone_analysis.BackboneAnalysis>` class and
+    execute the: meth: `launch() <dna.backbone.backbone_analysis.BackboneAnalysis.launch>` method."""
+    return BackboneAnalysis(**dict(locals())).launch()
+
+
+backbone_analysis.__doc__ = BackboneAnalysis.__doc__
+main = BackboneAnalysis.get_main(backbone_analysis, "Calculate BI/BII, canonical alpha/gamma and puckering populations in a single run.")
+
+if __name__ == "__main__":
+    main()
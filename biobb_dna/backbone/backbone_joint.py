@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+"""Module containing the BackboneJoint class and the command line interface."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.backbone.common import (
+    BI_STATES,
+    CANONICAL_STATES,
+    PUCKERING_STATES,
+    UNDEFINED,
+    bi_states,
+    canonical_alpha_gamma_states,
+    combine_states,
+    get_xlabels,
+    mutual_information,
+    puckering_states,
+    read_backbone_series,
+)
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import ArchiveMemberInputs
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.transform import inverse_complement
+
+
+class BackboneJoint(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
+    """
+    | biobb_dna BackboneJoint
+    | Calculate joint populations of BI/BII, canonical alpha/gamma and puckering states.
+    | Reads the ten backbone .ser files (alpha, gamma, epsil, zeta and phase for both strands) once, encodes the combined BI/BII, alpha/gamma and puckering state of every snapshot of each nucleotide and computes the joint populations, the joint states of neighbouring nucleotides and the mutual information between the three kinds of states.
+
+    Args:
+        input_zip_file (str) (Optional): Zip file with Canal output files. Backbone series are read from the canal_output_<parameter>.ser files inside it. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        input_alphaC_path (str) (Optional): Path to .ser file for helical parameter 'alphaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_alphaW_path (str) (Optional): Path to .ser file for helical parameter 'alphaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaC_path (str) (Optional): Path to .ser file for helical parameter 'gammaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaW_path (str) (Optional): Path to .ser file for helical parameter 'gammaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilC_path (str) (Optional): Path to .ser file for helical parameter 'epsilC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilW_path (str) (Optional): Path to .ser file for helical parameter 'epsilW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaC_path (str) (Optional): Path to .ser file for helical parameter 'zetaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaW_path (str) (Optional): Path to .ser file for helical parameter 'zetaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseC_path (str) (Optional): Path to .ser file for helical parameter 'phaseC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseW_path (str) (Optional): Path to .ser file for helical parameter 'phaseW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseW.ser>`_. Accepted formats: ser (edam:format_2330).
+        output_csv_path (str): Path to .csv file where joint populations of each nucleotide are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/joint_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_neighbours_csv_path (str) (Optional): Path to .csv file where joint state counts and conditional probabilities of neighbouring nucleotides are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/joint_neighbours_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_mi_csv_path (str) (Optional): Path to .csv file where mutual information between states of each nucleotide is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/joint_mi_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        properties (dict):
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser files. Length of sequence is expected to be the same as the total number of columns in the .ser files, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
+            * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.backbone.backbone_joint import backbone_joint
+
+            prop = {
+                'sequence': 'GCAT',
+            }
+            backbone_joint(
+                input_zip_file='/path/to/canal_output.zip',
+                output_csv_path='/path/to/table/joint.csv',
+                output_neighbours_csv_path='/path/to/table/neighbours.csv',
+                output_mi_csv_path='/path/to/table/mi.csv',
+                properties=prop)
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        output_csv_path,
+        input_zip_file=None,
+        input_alphaC_path=None,
+        input_alphaW_path=None,
+        input_gammaC_path=None,
+        input_gammaW_path=None,
+        input_epsilC_path=None,
+        input_epsilW_path=None,
+        input_zetaC_path=None,
+        input_zetaW_path=None,
+        input_phaseC_path=None,
+        input_phaseW_path=None,
+        output_neighbours_csv_path=None,
+        output_mi_csv_path=None,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_zip_file": input_zip_file,
+                "input_alphaC_path": input_alphaC_path,
+                "input_alphaW_path": input_alphaW_path,
+                "input_gammaC_path": input_gammaC_path,
+                "input_gammaW_path": input_gammaW_path,
+                "input_epsilC_path": input_epsilC_path,
+                "input_epsilW_path": input_epsilW_path,
+                "input_zetaC_path": input_zetaC_path,
+                "input_zetaW_path": input_zetaW_path,
+                "input_phaseC_path": input_phaseC_path,
+                "input_phaseW_path": input_phaseW_path,
+            },
+            "out": {
+                "output_csv_path": output_csv_path,
+                "output_neighbours_csv_path": output_neighbours_csv_path,
+                "output_mi_csv_path": output_mi_csv_path,
+            },
+        }
+
+        self.properties = properties
+        self.sequence = properties.get("sequence")
+        self.seqpos = [
+            int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
+        ]
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`BackboneJoint <backbone.backbone_joint.BackboneJoint>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check seqpos
+        if self.seqpos:
+            if (max(self.seqpos) > len(self.sequence) - 2) or (min(self.seqpos) < 1):
+                raise ValueError(
+                    f"seqpos values must be between 1 and {len(self.sequence) - 2}"
+                )
+            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
+                raise ValueError("seqpos must be a list of at least two integers")
+        else:
+            self.seqpos = None  # type: ignore
+
+        # read input files and encode combined states
+        self.start_phase("parse")
+        series = read_backbone_series(self.stage_io_dict["in"], seqpos=self.seqpos)
+        combined = combine_states(
+            bi_states(series["epsil"], series["zeta"]),
+            canonical_alpha_gamma_states(series["alpha"], series["gamma"]),
+            puckering_states(series["phase"]),
+        )
+        xlabels = np.asarray(
+            get_xlabels(self.sequence, inverse_complement(self.sequence), self.seqpos)
+        )
+        n_frames, n_columns = combined.shape
+        n_codes = len(BI_STATES) * len(CANONICAL_STATES) * len(PUCKERING_STATES)
+        codes = np.arange(n_codes)
+        bi_names = np.asarray(list(BI_STATES.values()))[codes // 8]
+        canonical_names = np.asarray(list(CANONICAL_STATES.values()))[codes // 4 % 2]
+        puckering_names = np.asarray(list(PUCKERING_STATES.values()))[codes % 4]
+        columns = np.broadcast_to(np.arange(n_columns), combined.shape)
+
+        # joint populations of each nucleotide
+        self.start_phase("compute")
+        defined = combined != UNDEFINED
+        joint = np.bincount(
+            columns[defined] * n_codes + combined[defined],
+            minlength=n_columns * n_codes,
+        ).reshape(n_columns, n_codes)
+        not_separator = xlabels != "-"
+        joint_df = pd.DataFrame(
+            {
+                "Nucleotide": np.repeat(xlabels, n_codes),
+                "BI/BII": np.tile(bi_names, n_columns),
+                "Alpha/gamma": np.tile(canonical_names, n_columns),
+                "Puckering": np.tile(puckering_names, n_columns),
+                "Count": joint.ravel(),
+                "Population": joint.ravel() * 100 / n_frames,
+            }
+        )
+        joint_df[np.repeat(not_separator, n_codes)].to_csv(
+            self.stage_io_dict["out"]["output_csv_path"], index=False
+        )
+
+        # joint states of neighbouring nucleotides on the same strand: adjacent
+        # columns whose sequence positions follow each other (5'->3')
+        if self.stage_io_dict["out"].get("output_neighbours_csv_path"):
+            positions = np.asarray(self.seqpos or range(len(self.sequence)), dtype=float)
+            column_positions = np.concatenate([positions, [np.nan], positions[::-1]])
+            step = np.where(np.arange(n_columns - 1) < len(positions), 1, -1)
+            pairs = np.flatnonzero(np.diff(column_positions) == step)
+            first, second = combined[:, pairs], combined[:, pairs + 1]
+            valid = (first != UNDEFINED) & (second != UNDEFINED)
+            pair_index = np.broadcast_to(np.arange(len(pairs)), first.shape)
+            counts = np.bincount(
+                (pair_index[valid] * n_codes + first[valid]) * n_codes + second[valid],
+                minlength=len(pairs) * n_codes * n_codes,
+            ).reshape(len(pairs), n_codes, n_codes)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                conditional = counts / counts.sum(axis=2, keepdims=True)
+            pair, state, neighbour_state = np.nonzero(counts)
+            pd.DataFrame(
+                {
+                    "Nucleotide": xlabels[pairs[pair]],
+                    "Neighbour": xlabels[pairs[pair] + 1],
+                    "State": self.code_names(state, bi_names, canonical_names, puckering_names),
+                    "Neighbour state": self.code_names(neighbour_state, bi_names, canonical_names, puckering_names),
+                    "Count": counts[pair, state, neighbour_state],
+                    "Conditional probability": conditional[pair, state, neighbour_state],
+                }
+            ).to_csv(
+                self.stage_io_dict["out"]["output_neighbours_csv_path"], index=False
+            )
+
+        # mutual information between the three kinds of states
+        if self.stage_io_dict["out"].get("output_mi_csv_path"):
+            joint_3d = joint.reshape(
+                n_columns, len(BI_STATES), len(CANONICAL_STATES), len(PUCKERING_STATES)
+            )
+            pd.DataFrame(
+                {
+                    "Nucleotide": xlabels,
+                    "BI/BII - Alpha/gamma": mutual_information(joint_3d.sum(axis=3)),
+                    "BI/BII - Puckering": mutual_information(joint_3d.sum(axis=2)),
+                    "Alpha/gamma - Puckering": mutual_information(joint_3d.sum(axis=1)),
+                }
+            )[not_separator].to_csv(
+                self.stage_io_dict["out"]["output_mi_csv_path"], index=False
+            )
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+    @staticmethod
+    def code_names(codes, bi_names, canonical_names, puckering_names):
+        """Names of combined state codes (ie 'BII/canonical/South')."""
+        return [
+            f"{bi_names[code]}/{canonical_names[code]}/{puckering_names[code]}"
+            for code in codes
+        ]
+
+
+def backbone_joint(
+    output_csv_path: str,
+    input_zip_file: Optional[str] = None,
+    input_alphaC_path: Optional[str] = None,
+    input_alphaW_path: Optional[str] = None,
+    input_gammaC_path: Optional[str] = None,
+    input_gammaW_path: Optional[str] = None,
+    input_epsilC_path: Optional[str] = None,
+    input_epsilW_path: Optional[str] = None,
+    input_zetaC_path: Optional[str] = None,
+    input_zetaW_path: Optional[str] = None,
+    input_phaseC_path: Optional[str] = None,
+    input_phaseW_path: Optional[str] = None,
+    output_neighbours_csv_path: Optional[str] = None,
+    output_mi_csv_path: Optional[str] = None,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`BackboneJoint <dna.backbone.backbone_joint.BackboneJoint>` class and
+    execute the: meth: `launch() <dna.backbone.backbone_joint.BackboneJoint.launch>` method."""
+    return BackboneJoint(**dict(locals())).launch()
+
+
+backbone_joint.__doc__ = BackboneJoint.__doc__
+main = BackboneJoint.get_main(backbone_joint, "Calculate joint populations of backbone states.")
+
+if __name__ == "__main__":
+    main()
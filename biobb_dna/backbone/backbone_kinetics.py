@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""Module containing the BackboneKinetics class and the command line interface."""
+
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.backbone.common import (
+    BI_STATES,
+    CANONICAL_STATES,
+    PUCKERING_STATES,
+    UNDEFINED,
+    bi_states,
+    canonical_alpha_gamma_states,
+    get_xlabels,
+    lifetime_counts,
+    load_states,
+    puckering_states,
+    read_backbone_series,
+    run_lengths,
+    transition_counts,
+)
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import ArchiveMemberInputs
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.transform import inverse_complement
+
+
+class BackboneKinetics(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
+    """
+    | biobb_dna BackboneKinetics
+    | Calculate lifetimes and transitions of BI/BII, canonical alpha/gamma or puckering states.
+    | Classifies every snapshot of each nucleotide in BI/BII, canonical alpha/gamma or puckering states (or reads the states saved by the backbone blocks) and computes, for each nucleotide, the transition counts between states, the mean lifetime of each state and the distribution of lifetimes.
+
+    Args:
+        input_states_path (str) (Optional): Path to .npy file with per-frame states, as generated by the BIPopulations, CanonicalAG, Puckering or BackboneAnalysis blocks. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
+        input_zip_file (str) (Optional): Zip file with Canal output files. Backbone series are read from the canal_output_<parameter>.ser files inside it. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        input_alphaC_path (str) (Optional): Path to .ser file for helical parameter 'alphaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_alphaW_path (str) (Optional): Path to .ser file for helical parameter 'alphaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_alphaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaC_path (str) (Optional): Path to .ser file for helical parameter 'gammaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_gammaW_path (str) (Optional): Path to .ser file for helical parameter 'gammaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilC_path (str) (Optional): Path to .ser file for helical parameter 'epsilC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_epsilW_path (str) (Optional): Path to .ser file for helical parameter 'epsilW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_epsilW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaC_path (str) (Optional): Path to .ser file for helical parameter 'zetaC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_zetaW_path (str) (Optional): Path to .ser file for helical parameter 'zetaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaW.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseC_path (str) (Optional): Path to .ser file for helical parameter 'phaseC'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseC.ser>`_. Accepted formats: ser (edam:format_2330).
+        input_phaseW_path (str) (Optional): Path to .ser file for helical parameter 'phaseW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseW.ser>`_. Accepted formats: ser (edam:format_2330).
+        output_csv_path (str): Path to .csv file where populations, mean lifetimes and transition rates of each state are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/kinetics_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_transitions_csv_path (str) (Optional): Path to .csv file where transition counts between states are saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/kinetics_transitions_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_lifetimes_csv_path (str) (Optional): Path to .csv file where the distribution of lifetimes of each state is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/kinetics_lifetimes_ref.csv>`_. Accepted formats: csv (edam:format_3752).
+        properties (dict):
+            * **type** (*str*) - ("bipop") Type of backbone states. Values: bipop (BI/BII states from epsilon and zeta parameters), canonag (canonical and non canonical alpha/gamma states), puckering (North/East/South/West sugar puckering states from phase parameter).
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser files. Length of sequence is expected to be the same as the total number of columns in the .ser files, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
+            * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence. Must match the one used to generate input_states_path.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.backbone.backbone_kinetics import backbone_kinetics
+
+            prop = {
+                'type': 'puckering',
+                'sequence': 'GCAT',
+            }
+            backbone_kinetics(
+                input_phaseC_path='/path/to/phaseC.ser',
+                input_phaseW_path='/path/to/phaseW.ser',
+                output_csv_path='/path/to/table/kinetics.csv',
+                output_transitions_csv_path='/path/to/table/transitions.csv',
+                output_lifetimes_csv_path='/path/to/table/lifetimes.csv',
+                properties=prop)
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        output_csv_path,
+        input_states_path=None,
+        input_zip_file=None,
+        input_alphaC_path=None,
+        input_alphaW_path=None,
+        input_gammaC_path=None,
+        input_gammaW_path=None,
+        input_epsilC_path=None,
+        input_epsilW_path=None,
+        input_zetaC_path=None,
+        input_zetaW_path=None,
+        input_phaseC_path=None,
+        input_phaseW_path=None,
+        output_transitions_csv_path=None,
+        output_lifetimes_csv_path=None,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_states_path": input_states_path,
+                "input_zip_file": input_zip_file,
+                "input_alphaC_path": input_alphaC_path,
+                "input_alphaW_path": input_alphaW_path,
+                "input_gammaC_path": input_gammaC_path,
+                "input_gammaW_path": input_gammaW_path,
+                "input_epsilC_path": input_epsilC_path,
+                "input_epsilW_path": input_epsilW_path,
+                "input_zetaC_path": input_zetaC_path,
+                "input_zetaW_path": input_zetaW_path,
+                "input_phaseC_path": input_phaseC_path,
+                "input_phaseW_path": input_phaseW_path,
+            },
+            "out": {
+                "output_csv_path": output_csv_path,
+                "output_transitions_csv_path": output_transitions_csv_path,
+                "output_lifetimes_csv_path": output_lifetimes_csv_path,
+            },
+        }
+
+        self.properties = properties
+        self.type = properties.get("type", "bipop")
+        self.sequence = properties.get("sequence")
+        self.seqpos = [
+            int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
+        ]
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`BackboneKinetics <backbone.backbone_kinetics.BackboneKinetics>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check type
+        state_names = {
+            "bipop": BI_STATES,
+            "canonag": CANONICAL_STATES,
+            "puckering": PUCKERING_STATES,
+        }
+        if self.type not in state_names:
+            raise ValueError(
+                f"type must be one of {list(state_names.keys())}, got {self.type}"
+            )
+        state_names = state_names[self.type]
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check seqpos
+        if self.seqpos:
+            if (max(self.seqpos) > len(self.sequence) - 2) or (min(self.seqpos) < 1):
+                raise ValueError(
+                    f"seqpos values must be between 1 and {len(self.sequence) - 2}"
+                )
+            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
+                raise ValueError("seqpos must be a list of at least two integers")
+        else:
+            self.seqpos = None  # type: ignore
+
+        xlabels = get_xlabels(
+            self.sequence, inverse_complement(self.sequence), self.seqpos
+        )
+
+        # read or compute per-frame states
+        self.start_phase("parse")
+        states = self.get_states()
+        if states.shape[1] != len(xlabels):
+            raise ValueError(
+                f"states have {states.shape[1]} columns but {len(xlabels)} "
+                "were expected from sequence and seqpos"
+            )
+        n_frames, n_columns = states.shape
+        n_states = len(state_names)
+
+        # run-length encoding of all nucleotides at once
+        self.start_phase("compute")
+        run_columns, run_states, run_lengths_ = run_lengths(states)
+        defined = run_states != UNDEFINED
+        index = run_columns[defined] * n_states + run_states[defined]
+        n_runs = np.bincount(index, minlength=n_columns * n_states)
+        frames = np.bincount(
+            index, weights=run_lengths_[defined], minlength=n_columns * n_states
+        )
+        transitions = transition_counts(run_columns, run_states, n_columns, n_states)
+        transitions_out = (
+            transitions.sum(axis=2) - np.diagonal(transitions, axis1=1, axis2=2)
+        ).ravel()
+
+        # summary table, one row for each nucleotide and state
+        nucleotides = np.repeat(xlabels, n_states)
+        not_separator = nucleotides != "-"
+        with np.errstate(divide="ignore", invalid="ignore"):
+            summary = pd.DataFrame(
+                {
+                    "Nucleotide": nucleotides,
+                    "State": np.tile(list(state_names.values()), n_columns),
+                    "Population": frames * 100 / n_frames,
+                    "Lifetimes": n_runs,
+                    "Mean lifetime": frames / n_runs,
+                    "Transitions": transitions_out,
+                    "Transition rate": transitions_out / frames,
+                }
+            )
+        summary[not_separator].to_csv(
+            self.stage_io_dict["out"]["output_csv_path"], index=False
+        )
+
+        # transition counts table
+        if self.stage_io_dict["out"].get("output_transitions_csv_path"):
+            column, source, target = np.indices(transitions.shape).reshape(3, -1)
+            changes = (source != target) & (np.asarray(xlabels)[column] != "-")
+            pd.DataFrame(
+                {
+                    "Nucleotide": np.asarray(xlabels)[column[changes]],
+                    "From": np.asarray(list(state_names.values()))[source[changes]],
+                    "To": np.asarray(list(state_names.values()))[target[changes]],
+                    "Count": transitions.ravel()[changes],
+                }
+            ).to_csv(
+                self.stage_io_dict["out"]["output_transitions_csv_path"], index=False
+            )
+
+        # lifetimes distribution table
+        if self.stage_io_dict["out"].get("output_lifetimes_csv_path"):
+            columns, states, lengths, counts = lifetime_counts(
+                run_columns, run_states, run_lengths_, n_states
+            )
+            pd.DataFrame(
+                {
+                    "Nucleotide": np.asarray(xlabels)[columns],
+                    "State": np.asarray(list(state_names.values()))[states],
+                    "Lifetime": lengths,
+                    "Count": counts,
+                }
+            ).to_csv(
+                self.stage_io_dict["out"]["output_lifetimes_csv_path"], index=False
+            )
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+    def get_states(self):
+        """Load the per-frame states or classify them from the backbone series."""
+        if self.stage_io_dict["in"].get("input_states_path"):
+            return load_states(self.stage_io_dict["in"]["input_states_path"])
+        if self.type == "bipop":
+            series = read_backbone_series(
+                self.stage_io_dict["in"], ["epsil", "zeta"], self.seqpos
+            )
+            return bi_states(series["epsil"], series["zeta"])
+        if self.type == "canonag":
+            series = read_backbone_series(
+                self.stage_io_dict["in"], ["alpha", "gamma"], self.seqpos
+            )
+            return canonical_alpha_gamma_states(series["alpha"], series["gamma"])
+        series = read_backbone_series(self.stage_io_dict["in"], ["phase"], self.seqpos)
+        return puckering_states(series["phase"])
+
+
+def backbone_kinetics(
+    output_csv_path: str,
+    input_states_path: Optional[str] = None,
+    input_zip_file: Optional[str] = None,
+    input_alphaC_path: Optional[str] = None,
+    input_alphaW_path: Optional[str] = None,
+    input_gammaC_path: Optional[str] = None,
+    input_gammaW_path: Optional[str] = None,
+    input_epsilC_path: Optional[str] = None,
+    input_epsilW_path: Optional[str] = None,
+    input_zetaC_path: Optional[str] = None,
+    input_zetaW_path: Optional[str] = None,
+    input_phaseC_path: Optional[str] = None,
+    input_phaseW_path: Optional[str] = None,
+    output_transitions_csv_path: Optional[str] = None,
+    output_lifetimes_csv_path: Optional[str] = None,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`BackboneKinetics <dna.backbone.backbone_kinetics.BackboneKinetics>` class and
+    execute the: meth: `launch() <dna.backbone.backbone_kinetics.BackboneKinetics.launch>` method."""
+    return BackboneKinetics(**dict(locals())).launch()
+
+
+backbone_kinetics.__doc__ = BackboneKinetics.__doc__
+main = BackboneKinetics.get_main(backbone_kinetics, "Calculate lifetimes and transitions of backbone states.")
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,21 @@
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
-from numpy import nan
 
+from biobb_dna.backbone.common import (
+    bi_populations, bi_states, get_xlabels, join_strands, save_states)
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
 from biobb_dna.utils.transform import inverse_complement
 
 
-class BIPopulations(BiobbObject):
+class BIPopulations(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna BIPopulations
     | Calculate BI/BII populations from epsilon and zeta parameters.
@@ -27,9 +31,11 @@ class BIPopulations(BiobbObject):
         input_zetaW_path (str): Path to .ser file for helical parameter 'zetaW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_zetaW.ser>`_. Accepted formats: ser (edam:format_2330).
         output_csv_path (str): Path to .csv file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/bipop_ref.csv>`_. Accepted formats: csv (edam:format_3752).
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/bipop_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_states_path (str) (Optional): Path to .npy file where per-frame BI (0) / BII (1) states are saved (-1 for undefined values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/bipop_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -49,6 +55,7 @@ class BIPopulations(BiobbObject):
                 input_zetaW_path='/path/to/zetaW.ser',
                 output_csv_path='/path/to/table/output.csv',
                 output_jpg_path='/path/to/table/output.jpg',
+                output_states_path='/path/to/table/states.npy',
                 properties=prop)
     Info:
         * wrapped_software:
@@ -68,6 +75,7 @@ class BIPopulations(BiobbObject):
         input_zetaW_path,
         output_csv_path,
         output_jpg_path,
+        output_states_path=None,
         properties=None,
         **kwargs,
     ) -> None:
@@ -88,6 +96,7 @@ class BIPopulations(BiobbObject):
             "out": {
                 "output_csv_path": output_csv_path,
                 "output_jpg_path": output_jpg_path,
+                "output_states_path": output_states_path,
             },
         }
 
@@ -128,36 +137,32 @@ class BIPopulations(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input files
-        epsilC = read_series(
-            self.stage_io_dict["in"]["input_epsilC_path"], usecols=self.seqpos
-        )
-        epsilW = read_series(
-            self.stage_io_dict["in"]["input_epsilW_path"], usecols=self.seqpos
-        )
-        zetaC = read_series(
-            self.stage_io_dict["in"]["input_zetaC_path"], usecols=self.seqpos
-        )
-        zetaW = read_series(
-            self.stage_io_dict["in"]["input_zetaW_path"], usecols=self.seqpos
-        )
-
-        # calculate difference between epsil and zeta parameters
-        xlabels = self.get_xlabels(self.sequence, inverse_complement(self.sequence))
-        diff_epsil_zeta = self.get_angles_difference(epsilC, zetaC, epsilW, zetaW)
+        self.start_phase("parse")
+        epsilC = read_series(self.stage_io_dict["in"]["input_epsilC_path"])
+        epsilW = read_series(self.stage_io_dict["in"]["input_epsilW_path"])
+        zetaC = read_series(self.stage_io_dict["in"]["input_zetaC_path"])
+        zetaW = read_series(self.stage_io_dict["in"]["input_zetaW_path"])
 
         # calculate BI population
-        BI = (diff_epsil_zeta < 0).sum(axis=0) * 100 / len(diff_epsil_zeta)
-        BII = 100 - BI
+        self.start_phase("compute")
+        # bipopulations has always divided by one snapshot more than the
+        # series have, keep it so the saved table does not change
+        Bpopulations_df = bi_populations_table(
+            epsilC, epsilW, zetaC, zetaW, self.sequence, self.seqpos,
+            snapshots=len(epsilC) + 1,
+        )
+        xlabels = Bpopulations_df["Nucleotide"].tolist()
+        BI = Bpopulations_df["BI population"].to_numpy()
+        BII = Bpopulations_df["BII population"].to_numpy()
 
         # save table
-        Bpopulations_df = pd.DataFrame(
-            {"Nucleotide": xlabels, "BI population": BI, "BII population": BII}
-        )
+        self.start_phase("archive")
         Bpopulations_df.to_csv(
             self.stage_io_dict["out"]["output_csv_path"], index=False
         )
 
         # save plot
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.bar(range(len(xlabels)), BI, label="BI")
         axs.bar(range(len(xlabels)), BII, bottom=BI, label="BII")
@@ -172,6 +177,17 @@ class BIPopulations(BiobbObject):
         fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
         plt.close()
 
+        # save per-frame states
+        self.start_phase("archive")
+        if self.stage_io_dict["out"].get("output_states_path"):
+            epsilW, epsilC, zetaW, zetaC = (
+                select_series(ser, self.seqpos) for ser in (epsilW, epsilC, zetaW, zetaC)
+            )
+            states = bi_states(
+                join_strands(epsilW, epsilC), join_strands(zetaW, zetaC)
+            )
+            save_states(self.stage_io_dict["out"]["output_states_path"], states)
+
         # Copy files to host
         self.copy_to_host()
 
@@ -182,32 +198,29 @@ class BIPopulations(BiobbObject):
 
         return 0
 
-    def get_xlabels(self, strand1, strand2):
-        # get list of tetramers, except first and last two bases
-        labelsW = list(strand1)
-        labelsW[0] = f"{labelsW[0]}5'"
-        labelsW[-1] = f"{labelsW[-1]}3'"
-        labelsW = [f"{i}-{j}" for i, j in zip(labelsW, range(1, len(labelsW) + 1))]
-        labelsC = list(strand2)[::-1]
-        labelsC[0] = f"{labelsC[0]}5'"
-        labelsC[-1] = f"{labelsC[-1]}3'"
-        labelsC = [f"{i}-{j}" for i, j in zip(labelsC, range(len(labelsC), 0, -1))]
-
-        if self.seqpos is not None:
-            labelsC = [labelsC[i] for i in self.seqpos]
-            labelsW = [labelsW[i] for i in self.seqpos]
-        xlabels = labelsW + ["-"] + labelsC
-        return xlabels
-
-    def get_angles_difference(self, epsilC, zetaC, epsilW, zetaW):
-        # concatenate zeta and epsil arrays
-        separator_df = pd.DataFrame({"-": nan}, index=range(len(zetaW)))
-        zeta = pd.concat([zetaW, separator_df, zetaC[zetaC.columns[::-1]]], axis=1)
-        epsil = pd.concat([epsilW, separator_df, epsilC[epsilC.columns[::-1]]], axis=1)
-
-        # difference between epsilon and zeta coordinates
-        diff_epsil_zeta = epsil - zeta
-        return diff_epsil_zeta
+
+def bi_populations_table(epsilC, epsilW, zetaC, zetaW, sequence, seqpos=None, snapshots=None):
+    """Table of the BI and BII populations of each nucleotide of both strands.
+
+    Each torsion is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. The Crick strand follows the Watson one,
+    5' to 3', after an empty separator nucleotide. The populations are
+    percentages of snapshots, by default the number of frames of the series."""
+    usecols = list(seqpos) if seqpos else None
+    epsilC, epsilW, zetaC, zetaW = (
+        select_series(series_frame(ser), usecols) for ser in (epsilC, epsilW, zetaC, zetaW)
+    )
+    xlabels = get_xlabels(sequence, inverse_complement(sequence), seqpos)
+    epsil = join_strands(epsilW, epsilC)
+    zeta = join_strands(zetaW, zetaC)
+    if snapshots is None:
+        BI, BII = bi_populations(epsil, zeta)
+    else:
+        BI = np.less(epsil - zeta, 0).sum(axis=0) * 100 / snapshots
+        BII = 100 - BI
+    return pd.DataFrame(
+        {"Nucleotide": xlabels, "BI population": BI, "BII population": BII}
+    )
 
 
 def bipopulations(
@@ -217,6 +230,7 @@ def bipopulations(
     input_zetaW_path: str,
     output_csv_path: str,
     output_jpg_path: str,
+    output_states_path: Optional[str] = None,
     properties: Optional[dict] = None,
     **kwargs,
 ) -> int:
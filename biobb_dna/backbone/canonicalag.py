@@ -4,17 +4,25 @@
 from typing import Optional
 
 import matplotlib.pyplot as plt
-import numpy as np
 import pandas as pd
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
 
+from biobb_dna.backbone.common import (
+    canonical_alpha_gamma,
+    canonical_alpha_gamma_states,
+    get_xlabels,
+    join_strands,
+    save_states,
+)
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
 from biobb_dna.utils.transform import inverse_complement
 
 
-class CanonicalAG(BiobbObject):
+class CanonicalAG(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna CanonicalAG
     | Calculate Canonical Alpha/Gamma populations from alpha and gamma parameters.
@@ -27,9 +35,11 @@ class CanonicalAG(BiobbObject):
         input_gammaW_path (str): Path to .ser file for helical parameter 'gammaW'. File type: input. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_gammaW.ser>`_. Accepted formats: ser (edam:format_2330).
         output_csv_path (str): Path to .csv file where output is saved. File type: output. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_ref.csv>`_. Accepted formats: csv (edam:format_3752).
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_states_path (str) (Optional): Path to .npy file where per-frame canonical (1) / non-canonical (0) alpha/gamma states are saved (-1 for undefined values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/canonag_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -50,6 +60,7 @@ class CanonicalAG(BiobbObject):
                 input_gammaW_path='/path/to/gammaW.ser',
                 output_csv_path='/path/to/table/output.csv',
                 output_jpg_path='/path/to/table/output.jpg',
+                output_states_path='/path/to/table/states.npy',
                 properties=prop)
     Info:
         * wrapped_software:
@@ -69,6 +80,7 @@ class CanonicalAG(BiobbObject):
         input_gammaW_path,
         output_csv_path,
         output_jpg_path,
+        output_states_path=None,
         properties=None,
         **kwargs,
     ) -> None:
@@ -89,6 +101,7 @@ class CanonicalAG(BiobbObject):
             "out": {
                 "output_csv_path": output_csv_path,
                 "output_jpg_path": output_jpg_path,
+                "output_states_path": output_states_path,
             },
         }
 
@@ -128,39 +141,28 @@ class CanonicalAG(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input files
-        alphaC = read_series(
-            self.stage_io_dict["in"]["input_alphaC_path"], usecols=self.seqpos
-        )
-        alphaW = read_series(
-            self.stage_io_dict["in"]["input_alphaW_path"], usecols=self.seqpos
-        )
-        gammaC = read_series(
-            self.stage_io_dict["in"]["input_gammaC_path"], usecols=self.seqpos
-        )
-        gammaW = read_series(
-            self.stage_io_dict["in"]["input_gammaW_path"], usecols=self.seqpos
+        self.start_phase("parse")
+        alphaC = read_series(self.stage_io_dict["in"]["input_alphaC_path"])
+        alphaW = read_series(self.stage_io_dict["in"]["input_alphaW_path"])
+        gammaC = read_series(self.stage_io_dict["in"]["input_gammaC_path"])
+        gammaW = read_series(self.stage_io_dict["in"]["input_gammaW_path"])
+
+        # calculate canonical alpha/gamma populations
+        self.start_phase("compute")
+        ag_populations_df = canonical_alpha_gamma_table(
+            alphaC, alphaW, gammaC, gammaW, self.sequence, self.seqpos
         )
-
-        # fix angle range so its not negative
-        alphaC = self.fix_angles(alphaC)
-        alphaW = self.fix_angles(alphaW)
-        gammaC = self.fix_angles(gammaC)
-        gammaW = self.fix_angles(gammaW)
-
-        # calculate difference between epsil and zeta parameters
-        xlabels = self.get_xlabels(self.sequence, inverse_complement(self.sequence))
-        canonical_populations = self.check_alpha_gamma(alphaC, gammaC, alphaW, gammaW)
+        xlabels = ag_populations_df["Nucleotide"].tolist()
+        canonical_populations = ag_populations_df["Canonical alpha/gamma"].to_numpy()
 
         # save table
-        canonical_populations.name = "Canonical alpha/gamma"
-        ag_populations_df = pd.DataFrame(
-            {"Nucleotide": xlabels, "Canonical alpha/gamma": canonical_populations}
-        )
+        self.start_phase("archive")
         ag_populations_df.to_csv(
             self.stage_io_dict["out"]["output_csv_path"], index=False
         )
 
         # save plot
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.bar(
             range(len(xlabels)), canonical_populations, label="canonical alpha/gamma"
@@ -172,7 +174,7 @@ class CanonicalAG(BiobbObject):
             label=None,
         )
         # empty bar to divide both sequences
-        axs.bar([len(alphaC.columns)], [100], color="white", label=None)
+        axs.bar([len(xlabels) // 2], [100], color="white", label=None)
         axs.legend()
         axs.set_xticks(range(len(xlabels)))
         axs.set_xticklabels(xlabels, rotation=90)
@@ -182,6 +184,17 @@ class CanonicalAG(BiobbObject):
         fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
         plt.close()
 
+        # save per-frame states
+        self.start_phase("archive")
+        if self.stage_io_dict["out"].get("output_states_path"):
+            alphaW, alphaC, gammaW, gammaC = (
+                select_series(ser, self.seqpos) for ser in (alphaW, alphaC, gammaW, gammaC)
+            )
+            states = canonical_alpha_gamma_states(
+                join_strands(alphaW, alphaC), join_strands(gammaW, gammaC)
+            )
+            save_states(self.stage_io_dict["out"]["output_states_path"], states)
+
         # Copy files to host
         self.copy_to_host()
 
@@ -190,39 +203,25 @@ class CanonicalAG(BiobbObject):
 
         return 0
 
-    def get_xlabels(self, strand1, strand2):
-        # get list of tetramers, except first and last two bases
-        labelsW = list(strand1)
-        labelsW[0] = f"{labelsW[0]}5'"
-        labelsW[-1] = f"{labelsW[-1]}3'"
-        labelsW = [f"{i}-{j}" for i, j in zip(labelsW, range(1, len(labelsW) + 1))]
-        labelsC = list(strand2)[::-1]
-        labelsC[0] = f"{labelsC[0]}5'"
-        labelsC[-1] = f"{labelsC[-1]}3'"
-        labelsC = [f"{i}-{j}" for i, j in zip(labelsC, range(len(labelsC), 0, -1))]
-
-        if self.seqpos:
-            labelsC = [labelsC[i] for i in self.seqpos]
-            labelsW = [labelsW[i] for i in self.seqpos]
-        xlabels = labelsW + ["-"] + labelsC
-        return xlabels
-
-    def check_alpha_gamma(self, alphaC, gammaC, alphaW, gammaW):
-        separator_df = pd.DataFrame({"-": np.nan}, index=range(len(gammaW)))
-        gamma = pd.concat([gammaW, separator_df, gammaC[gammaC.columns[::-1]]], axis=1)
-        alpha = pd.concat([alphaW, separator_df, alphaC[alphaC.columns[::-1]]], axis=1)
-
-        alpha_filter = np.logical_and(alpha > 240, alpha < 360)
-        gamma_filter = np.logical_and(gamma > 0, gamma < 120)
-        canonical_alpha_gamma = np.logical_and(alpha_filter, gamma_filter).mean() * 100
 
-        return canonical_alpha_gamma
+def canonical_alpha_gamma_table(alphaC, alphaW, gammaC, gammaW, sequence, seqpos=None):
+    """Table of the canonical alpha/gamma population of each nucleotide of both
+    strands, as saved by canonicalag.
 
-    def fix_angles(self, dataset):
-        values = np.where(dataset < 0, dataset + 360, dataset)
-        values = np.where(values > 360, values - 360, values)
-        dataset = pd.DataFrame(values)
-        return dataset
+    Each torsion is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. The Crick strand follows the Watson one,
+    5' to 3', after an empty separator nucleotide."""
+    usecols = list(seqpos) if seqpos else None
+    alphaC, alphaW, gammaC, gammaW = (
+        select_series(series_frame(ser), usecols) for ser in (alphaC, alphaW, gammaC, gammaW)
+    )
+    xlabels = get_xlabels(sequence, inverse_complement(sequence), seqpos)
+    canonical_populations = canonical_alpha_gamma(
+        join_strands(alphaW, alphaC), join_strands(gammaW, gammaC)
+    )
+    return pd.DataFrame(
+        {"Nucleotide": xlabels, "Canonical alpha/gamma": canonical_populations}
+    )
 
 
 def canonicalag(
@@ -232,6 +231,7 @@ def canonicalag(
     input_gammaW_path: str,
     output_csv_path: str,
     output_jpg_path: str,
+    output_states_path: Optional[str] = None,
     properties: Optional[dict] = None,
     **kwargs,
 ) -> int:
@@ -0,0 +1,218 @@
+"""Common functions for the backbone package."""
+
+import numpy as np
+
+from biobb_dna.utils.loader import open_archive, read_series_array
+
+BACKBONE_PARAMETERS = ["alpha", "gamma", "epsil", "zeta", "phase"]
+
+# per-frame state codes, UNDEFINED is used for missing values and for values
+# lying exactly on a state boundary
+UNDEFINED = -1
+BI_STATES = {0: "BI", 1: "BII"}
+CANONICAL_STATES = {0: "non-canonical", 1: "canonical"}
+PUCKERING_STATES = {0: "North", 1: "East", 2: "South", 3: "West"}
+PUCKERING_BOUNDARIES = [45, 135, 225, 315]
+
+
+def get_xlabels(strand1, strand2, seqpos=None):
+    """Nucleotide labels for the Watson strand, a separator and the Crick strand (5'->3')."""
+    labelsW = list(strand1)
+    labelsW[0] = f"{labelsW[0]}5'"
+    labelsW[-1] = f"{labelsW[-1]}3'"
+    labelsW = [f"{i}-{j}" for i, j in zip(labelsW, range(1, len(labelsW) + 1))]
+    labelsC = list(strand2)[::-1]
+    labelsC[0] = f"{labelsC[0]}5'"
+    labelsC[-1] = f"{labelsC[-1]}3'"
+    labelsC = [f"{i}-{j}" for i, j in zip(labelsC, range(len(labelsC), 0, -1))]
+
+    if seqpos:
+        labelsC = [labelsC[i] for i in seqpos]
+        labelsW = [labelsW[i] for i in seqpos]
+    return labelsW + ["-"] + labelsC
+
+
+def join_strands(strandW, strandC):
+    """Join Watson and Crick series in a single (frames, columns) array.
+
+    Crick columns are reversed and both strands are separated by a column of
+    NaN, so the column order matches the labels returned by get_xlabels."""
+    strandW = np.asarray(strandW, dtype=float)
+    strandC = np.asarray(strandC, dtype=float)
+    separator = np.full((len(strandW), 1), np.nan)
+    return np.hstack([strandW, separator, strandC[:, ::-1]])
+
+
+def read_backbone_series(input_paths, parameters=None, seqpos=None):
+    """Read backbone series and join the Watson and Crick strands of each parameter.
+
+    Each series is read from input_paths["input_<parameter><strand>_path"] or,
+    if that path is not given, from the canal_output_<parameter><strand>.ser
+    file inside input_paths["input_zip_file"]."""
+    zip_path = input_paths.get("input_zip_file")
+    series = {}
+    for parameter in parameters or BACKBONE_PARAMETERS:
+        strands = {}
+        for strand in ("W", "C"):
+            helpar = f"{parameter}{strand}"
+            usecols = list(seqpos) if seqpos else None
+            ser_path = input_paths.get(f"input_{helpar}_path")
+            if ser_path:
+                strands[strand] = read_series_array(ser_path, usecols=usecols)
+            elif zip_path:
+                member = f"canal_output_{helpar}.ser"
+                if member not in open_archive(zip_path).namelist():
+                    raise ValueError(
+                        f"{member} not found in {zip_path}, "
+                        f"provide input_{helpar}_path instead"
+                    )
+                strands[strand] = read_series_array(
+                    zip_path, usecols=usecols, inner_file=member)
+            else:
+                raise ValueError(
+                    f"input_{helpar}_path or input_zip_file must be provided"
+                )
+        series[parameter] = join_strands(strands["W"], strands["C"])
+    return series
+
+
+def fix_angles(values):
+    """Move angle values to the [0, 360] range."""
+    values = np.where(values < 0, values + 360, values)
+    values = np.where(values > 360, values - 360, values)
+    return values
+
+
+def bi_populations(epsil, zeta):
+    """Percentage of BI (epsilon - zeta < 0) and BII snapshots for each column."""
+    bi = np.less(epsil - zeta, 0).mean(axis=0) * 100
+    return bi, 100 - bi
+
+
+def canonical_alpha_gamma(alpha, gamma):
+    """Percentage of snapshots with canonical alpha/gamma values for each column."""
+    alpha = fix_angles(alpha)
+    gamma = fix_angles(gamma)
+    canonical = (alpha > 240) & (alpha < 360) & (gamma > 0) & (gamma < 120)
+    return canonical.mean(axis=0) * 100
+
+
+def puckering_populations(phase):
+    """Percentage of North, East, West and South snapshots for each column."""
+    phase = fix_angles(phase)
+    north = ((phase > 315) | (phase < 45)).mean(axis=0) * 100
+    east = ((phase > 45) & (phase < 135)).mean(axis=0) * 100
+    west = ((phase > 225) & (phase < 315)).mean(axis=0) * 100
+    south = ((phase > 135) & (phase < 225)).mean(axis=0) * 100
+    return north, east, west, south
+
+
+def bi_states(epsil, zeta):
+    """Per-frame BI (0) / BII (1) states."""
+    diff = np.asarray(epsil, dtype=float) - np.asarray(zeta, dtype=float)
+    states = np.where(diff < 0, 0, 1).astype(np.int8)
+    states[np.isnan(diff)] = UNDEFINED
+    return states
+
+
+def canonical_alpha_gamma_states(alpha, gamma):
+    """Per-frame canonical (1) / non-canonical (0) alpha/gamma states."""
+    alpha = fix_angles(np.asarray(alpha, dtype=float))
+    gamma = fix_angles(np.asarray(gamma, dtype=float))
+    canonical = (alpha > 240) & (alpha < 360) & (gamma > 0) & (gamma < 120)
+    states = canonical.astype(np.int8)
+    states[np.isnan(alpha) | np.isnan(gamma)] = UNDEFINED
+    return states
+
+
+def puckering_states(phase):
+    """Per-frame North (0), East (1), South (2) and West (3) puckering states."""
+    phase = fix_angles(np.asarray(phase, dtype=float))
+    # bins: <45 North, 45-135 East, 135-225 South, 225-315 West, >315 North
+    codes = np.array([0, 1, 2, 3, 0], dtype=np.int8)
+    states = codes[np.digitize(phase, PUCKERING_BOUNDARIES)]
+    states[np.isnan(phase) | np.isin(phase, PUCKERING_BOUNDARIES)] = UNDEFINED
+    return states
+
+
+def save_states(states_path, states):
+    """Save a (frames, columns) array of state codes as a .npy int8 file."""
+    states_map = np.lib.format.open_memmap(
+        states_path, mode="w+", dtype=np.int8, shape=states.shape
+    )
+    states_map[:] = states
+    states_map.flush()
+    del states_map
+
+
+def load_states(states_path, mmap_mode="r"):
+    """Load a .npy file of state codes, memory-mapped by default."""
+    return np.load(states_path, mmap_mode=mmap_mode)
+
+
+def run_lengths(states):
+    """Run-length encoding of a (frames, columns) array of state codes.
+
+    Returns the column, state and length of every run, ordered by column and
+    by frame within each column. The run starts are found along the frames of
+    the array as it is stored, without a transposed copy of the states."""
+    states = np.asarray(states)
+    n_frames = states.shape[0]
+    starts = np.empty(states.shape, dtype=bool)
+    starts[0] = True
+    np.not_equal(states[1:], states[:-1], out=starts[1:])
+    columns, frames = np.nonzero(starts.T)
+    flat_starts = columns.astype(np.int64) * n_frames + frames
+    lengths = np.diff(np.append(flat_starts, states.size))
+    return columns, states[frames, columns], lengths
+
+
+def lifetime_counts(run_columns, run_states, run_lengths_, n_states):
+    """Number of runs of each (column, state, length), for the defined states.
+
+    The three values are encoded in a single int64 key, so the runs are
+    counted with a one-dimensional numpy.unique. Returns the columns, states,
+    lengths and counts, ordered by column, state and length."""
+    defined = run_states != UNDEFINED
+    max_length = int(run_lengths_.max(initial=0)) + 1
+    keys = (
+        run_columns[defined].astype(np.int64) * n_states + run_states[defined]
+    ) * max_length + run_lengths_[defined]
+    keys, counts = np.unique(keys, return_counts=True)
+    column_states, lengths = np.divmod(keys, max_length)
+    columns, states = np.divmod(column_states, n_states)
+    return columns, states, lengths, counts
+
+
+def transition_counts(run_columns, run_states, n_columns, n_states):
+    """(columns, n_states, n_states) matrix of transitions between consecutive runs.
+
+    Transitions from or to an undefined state are not counted."""
+    same_column = run_columns[1:] == run_columns[:-1]
+    source, target = run_states[:-1], run_states[1:]
+    valid = same_column & (source != UNDEFINED) & (target != UNDEFINED)
+    index = (run_columns[1:][valid] * n_states + source[valid]) * n_states + target[valid]
+    counts = np.bincount(index, minlength=n_columns * n_states * n_states)
+    return counts.reshape(n_columns, n_states, n_states)
+
+
+def combine_states(bi, canonical, puckering):
+    """Combine BI/BII, alpha/gamma and puckering states in a single code.
+
+    The code is bi * 8 + canonical * 4 + puckering (0 to 15), or UNDEFINED
+    if any of the three states is undefined."""
+    combined = (bi * 8 + canonical * 4 + puckering).astype(np.int8)
+    combined[(bi == UNDEFINED) | (canonical == UNDEFINED) | (puckering == UNDEFINED)] = UNDEFINED
+    return combined
+
+
+def mutual_information(joint):
+    """Mutual information (bits) of the last two axes of an array of joint counts."""
+    joint = np.asarray(joint, dtype=float)
+    total = joint.sum(axis=(-2, -1), keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        p_xy = joint / total
+        p_x = p_xy.sum(axis=-1, keepdims=True)
+        p_y = p_xy.sum(axis=-2, keepdims=True)
+        terms = p_xy * np.log2(p_xy / (p_x * p_y))
+    return np.where(p_xy > 0, terms, 0).sum(axis=(-2, -1))
@@ -9,12 +9,15 @@ import pandas as pd
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
 
+from biobb_dna.backbone.common import get_xlabels, join_strands, puckering_states, save_states
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
 from biobb_dna.utils.transform import inverse_complement
 
 
-class Puckering(BiobbObject):
+class Puckering(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna Puckering
     | Calculate Puckering from phase parameters.
@@ -25,10 +28,12 @@ class Puckering(BiobbObject):
         input_phaseW_path (str): Path to .ser file for helical parameter 'phaseW'. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/backbone/canal_output_phaseW.ser>`_. Accepted formats: ser (edam:format_2330).
         output_csv_path (str): Path to .csv file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_ref.csv>`_. Accepted formats: csv (edam:format_3752).
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_states_path (str) (Optional): Path to .npy file where per-frame North (0), East (1), South (2) and West (3) puckering states are saved (-1 for undefined or boundary values). File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/backbone/puckering_states_ref.npy>`_. Accepted formats: npy (edam:format_4003).
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **stride** (*int*) - (1000) granularity of the number of snapshots for plotting time series.
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -46,6 +51,7 @@ class Puckering(BiobbObject):
                 input_phaseW_path='/path/to/phaseW.ser',
                 output_csv_path='/path/to/table/output.csv',
                 output_jpg_path='/path/to/table/output.jpg',
+                output_states_path='/path/to/table/states.npy',
                 properties=prop)
     Info:
         * wrapped_software:
@@ -63,6 +69,7 @@ class Puckering(BiobbObject):
         input_phaseW_path,
         output_csv_path,
         output_jpg_path,
+        output_states_path=None,
         properties=None,
         **kwargs,
     ) -> None:
@@ -81,6 +88,7 @@ class Puckering(BiobbObject):
             "out": {
                 "output_csv_path": output_csv_path,
                 "output_jpg_path": output_jpg_path,
+                "output_states_path": output_states_path,
             },
         }
 
@@ -120,29 +128,27 @@ class Puckering(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input files
-        phaseC = read_series(
-            self.stage_io_dict["in"]["input_phaseC_path"], usecols=self.seqpos
+        self.start_phase("parse")
+        phaseC = read_series(self.stage_io_dict["in"]["input_phaseC_path"])
+        phaseW = read_series(self.stage_io_dict["in"]["input_phaseW_path"])
+
+        # calculate puckering populations
+        self.start_phase("compute")
+        populations = puckering_table(phaseC, phaseW, self.sequence, self.seqpos)
+        xlabels = populations["Nucleotide"].tolist()
+        Npop, Epop, Wpop, Spop = (
+            populations[state].to_numpy() for state in ["North", "East", "West", "South"]
         )
-        phaseW = read_series(
-            self.stage_io_dict["in"]["input_phaseW_path"], usecols=self.seqpos
-        )
-
-        # fix angle range so its not negative
-        phaseC = self.fix_angles(phaseC)
-        phaseW = self.fix_angles(phaseW)
-
-        # calculate difference between epsil and zeta parameters
-        xlabels = self.get_xlabels(self.sequence, inverse_complement(self.sequence))
-        Npop, Epop, Wpop, Spop = self.check_puckering(phaseC, phaseW)
 
         # save plot
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.bar(range(len(xlabels)), Npop, label="North")
         axs.bar(range(len(xlabels)), Epop, bottom=Npop, label="East")
         axs.bar(range(len(xlabels)), Spop, bottom=Npop + Epop, label="South")
         axs.bar(range(len(xlabels)), Wpop, bottom=Npop + Epop + Spop, label="West")
         # empty bar to divide both sequences
-        axs.bar([len(phaseC.columns)], [100], color="white", label=None)
+        axs.bar([len(xlabels) // 2], [100], color="white", label=None)
         axs.legend()
         axs.set_xticks(range(len(xlabels)))
         axs.set_xticklabels(xlabels, rotation=90)
@@ -152,19 +158,17 @@ class Puckering(BiobbObject):
         fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
 
         # save table
-        populations = pd.DataFrame(
-            {
-                "Nucleotide": xlabels,
-                "North": Npop,
-                "East": Epop,
-                "West": Wpop,
-                "South": Spop,
-            }
-        )
+        self.start_phase("archive")
         populations.to_csv(self.stage_io_dict["out"]["output_csv_path"], index=False)
 
         plt.close()
 
+        # save per-frame states
+        if self.stage_io_dict["out"].get("output_states_path"):
+            phaseW, phaseC = (select_series(ser, self.seqpos) for ser in (phaseW, phaseC))
+            states = puckering_states(join_strands(phaseW, phaseC))
+            save_states(self.stage_io_dict["out"]["output_states_path"], states)
+
         # Copy files to host
         self.copy_to_host()
 
@@ -175,39 +179,31 @@ class Puckering(BiobbObject):
 
         return 0
 
-    def get_xlabels(self, strand1, strand2):
-        # get list of tetramers, except first and last two bases
-        labelsW = list(strand1)
-        labelsW[0] = f"{labelsW[0]}5'"
-        labelsW[-1] = f"{labelsW[-1]}3'"
-        labelsW = [f"{i}-{j}" for i, j in zip(labelsW, range(1, len(labelsW) + 1))]
-        labelsC = list(strand2)[::-1]
-        labelsC[0] = f"{labelsC[0]}5'"
-        labelsC[-1] = f"{labelsC[-1]}3'"
-        labelsC = [f"{i}-{j}" for i, j in zip(labelsC, range(len(labelsC), 0, -1))]
 
-        if self.seqpos:
-            labelsC = [labelsC[i] for i in self.seqpos]
-            labelsW = [labelsW[i] for i in self.seqpos]
-        xlabels = labelsW + ["-"] + labelsC
-        return xlabels
-
-    def check_puckering(self, phaseC, phaseW):
-        separator_df = pd.DataFrame({"-": np.nan}, index=range(1, len(phaseC)))
-        phase = pd.concat([phaseW, separator_df, phaseC[phaseC.columns[::-1]]], axis=1)
-        # phase.columns = columns
-
-        Npop = np.logical_or(phase > 315, phase < 45).mean() * 100
-        Epop = np.logical_and(phase > 45, phase < 135).mean() * 100
-        Wpop = np.logical_and(phase > 225, phase < 315).mean() * 100
-        Spop = np.logical_and(phase > 135, phase < 225).mean() * 100
-        return Npop, Epop, Wpop, Spop
-
-    def fix_angles(self, dataset):
-        values = np.where(dataset < 0, dataset + 360, dataset)
-        # values = np.where(values > 360, values - 360, values)
-        dataset = pd.DataFrame(values)
-        return dataset
+def puckering_table(phaseC, phaseW, sequence, seqpos=None):
+    """Table of the North, East, West and South puckering populations of each
+    nucleotide of both strands, as saved by puckering.
+
+    Each phase is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. The Crick strand follows the Watson one,
+    5' to 3', after an empty separator nucleotide."""
+    usecols = list(seqpos) if seqpos else None
+    phaseC, phaseW = (select_series(series_frame(ser), usecols) for ser in (phaseC, phaseW))
+    xlabels = get_xlabels(sequence, inverse_complement(sequence), seqpos)
+
+    # fix angle range so its not negative
+    phase = join_strands(phaseW, phaseC)
+    phase = np.where(phase < 0, phase + 360, phase)
+
+    return pd.DataFrame(
+        {
+            "Nucleotide": xlabels,
+            "North": np.logical_or(phase > 315, phase < 45).mean(axis=0) * 100,
+            "East": np.logical_and(phase > 45, phase < 135).mean(axis=0) * 100,
+            "West": np.logical_and(phase > 225, phase < 315).mean(axis=0) * 100,
+            "South": np.logical_and(phase > 135, phase < 225).mean(axis=0) * 100,
+        }
+    )
 
 
 def puckering(
@@ -215,6 +211,7 @@ def puckering(
     input_phaseW_path: str,
     output_csv_path: str,
     output_jpg_path: str,
+    output_states_path: Optional[str] = None,
     properties: Optional[dict] = None,
     **kwargs,
 ) -> int:
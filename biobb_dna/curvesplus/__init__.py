@@ -1,6 +1,7 @@
 from . import biobb_curves
 from . import biobb_canal
+from . import biobb_curves_canal
 from . import biobb_canion
 from . import canal_unzip
 name = "curves"
-__all__ = ["biobb_curves", "biobb_canal", "biobb_canion", "canal_unzip"]
+__all__ = ["biobb_curves", "biobb_canal", "biobb_curves_canal", "biobb_canion", "canal_unzip"]
@@ -2,6 +2,7 @@
 
 """Module containing the Canal class and the command line interface."""
 import os
+import shutil
 import zipfile
 from typing import Optional
 from pathlib import Path
@@ -9,9 +10,16 @@ from pathlib import Path
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
 from biobb_common.tools.file_utils import launchlogger
+from biobb_dna.utils.cache import (
+    load_results, result_cache_root, result_key, store_results)
+from biobb_dna.curvesplus.common import (
+    frame_chunks, link_chunk_inputs, merge_window_outputs,
+    parallel_instructions)
+from biobb_dna.curvesplus.lis_parser import read_sequence
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class Canal(BiobbObject):
+class Canal(LaunchProfiler, BiobbObject):
     """
     | biobb_dna Canal
     | Wrapper for the Canal executable that is part of the Curves+ software suite.
@@ -34,7 +42,12 @@ class Canal(BiobbObject):
             * **histo** (*bool*) - (False) if True then output histogram data.
             * **corr** (*bool*) - (False) if True than output linear correlation coefficients between all variables.
             * **sequence** (*str*) - (Optional) sequence of the first strand of the corresponding DNA fragment, for each .cda file. If not given it will be parsed from .lis file.
+            * **num_workers** (*int*) - (1) Number of Canal processes run concurrently, each one over a contiguous window of the itst to itnd snapshot range (itnd must be specified and corr is not available). Series are joined with global snapshot indices and histograms are recombined weighting each window by its number of snapshots (their bins must be the same in all windows). canal_output.lis is the one written by Canal for the first window: its number of snapshots, averages and standard deviations only describe that window.
+            * **result_cache** (*bool*) - (False) if True, results are reused from a local cache when the contents of the input files, the instructions passed to the program and the program binary (or container image) are the same as in a previous run.
+            * **result_cache_path** (*str*) - (None) Directory of the result cache. If not specified, $XDG_CACHE_HOME/biobb_dna/results is used.
+            * **result_cache_max_size** (*int*) - (10240) Maximum size (MB) of the result cache, the least recently used results are removed above it.
             * **binary_path** (*str*) - ('Canal') Path to Canal executable, otherwise the program wil look for Canal executable in the binaries folder.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -99,6 +112,10 @@ class Canal(BiobbObject):
         self.histo = ".t." if properties.get('histo', False) else ".f."
         self.corr = ".t." if properties.get('corr', False) else ".f."
         self.sequence = properties.get('sequence', None)
+        self.num_workers = int(properties.get('num_workers', 1))
+        self.result_cache = properties.get('result_cache', False)
+        self.result_cache_path = properties.get('result_cache_path', None)
+        self.result_cache_max_size = int(properties.get('result_cache_max_size', 10240))
         self.binary_path = properties.get('binary_path', 'Canal')
         self.properties = properties
 
@@ -106,6 +123,35 @@ class Canal(BiobbObject):
         self.check_properties(properties)
         self.check_arguments()
 
+    def create_instructions(self, cda_path, itst, itnd):
+        """Heredoc instructions for a Canal run over the itst-itnd snapshot range."""
+        instructions = [
+            f"{self.binary_path} <<! ",
+            "&inp",
+            "  lis=canal_output,"]
+        if self.bases is not None:
+            # add topology file if needed
+            fu.log('Appending sequence of bases to be searched to command',
+                   self.out_log, self.global_log)
+            instructions.append(f"  seq={self.bases},")
+        if self.nastr is not None:
+            # add topology file if needed
+            fu.log('Adding null values string specification to command',
+                   self.out_log, self.global_log)
+            instructions.append(f"  nastr={self.nastr},")
+
+        instructions = instructions + [
+            f"  cormin={self.cormin},",
+            f"  lev1={self.lev1},lev2={self.lev2},",
+            f"  itst={itst},itnd={itnd},itdel={self.itdel},",
+            f"  histo={self.histo},",
+            f"  series={self.series},",
+            f"  corr={self.corr},",
+            "&end",
+            f"{cda_path} {self.sequence}",
+            "!"]
+        return instructions
+
     @launchlogger
     def launch(self) -> int:
         """Execute the :class:`Canal <biobb_dna.curvesplus.biobb_canal.Canal>` object."""
@@ -116,20 +162,24 @@ class Canal(BiobbObject):
         self.stage_files()
 
         if self.sequence is None:
-            if self.stage_io_dict['in']['input_lis_file'] is None:
+            if self.stage_io_dict['in'].get('input_lis_file') is None:
                 raise RuntimeError(
                     "if no sequence is passed in the configuration, "
                     "you must at least specify `input_lis_file` "
                     "so sequence can be parsed from there")
-            lis_lines = Path(
-                self.stage_io_dict['in']['input_lis_file']).read_text().splitlines()
-            for line in lis_lines:
-                if line.strip().startswith("Strand  1"):
-                    self.sequence = line.split(" ")[-1]
-                    fu.log(
-                        f"using sequence {self.sequence} "
-                        f"from {self.stage_io_dict['in']['input_lis_file']}",
-                        self.out_log)
+            self.sequence = read_sequence(self.stage_io_dict['in']['input_lis_file'])
+            fu.log(
+                f"using sequence {self.sequence} "
+                f"from {self.stage_io_dict['in']['input_lis_file']}",
+                self.out_log)
+
+        # split snapshots range in windows for parallel runs
+        if self.num_workers > 1:
+            if self.corr == ".t.":
+                raise ValueError(
+                    "correlation coefficients (corr) can not be computed "
+                    "from independent windows, use num_workers=1")
+            chunks = frame_chunks(self.itst, self.itnd, self.itdel, self.num_workers)
 
         # define temporary file name
         if self.container_path:
@@ -137,6 +187,10 @@ class Canal(BiobbObject):
         else:
             tmp_cda_path = Path(self.stage_io_dict['in']['input_cda_file']).name
 
+        # inputs identifying the results in the result cache
+        cache_path = result_cache_root(self.result_cache_path).resolve()
+        cache_inputs = [Path(self.io_dict['in']['input_cda_file']).resolve()]
+
         # change directory to temporary folder
         original_directory = os.getcwd()
 
@@ -145,47 +199,68 @@ class Canal(BiobbObject):
         else:
             os.chdir(self.stage_io_dict.get("unique_dir", ""))
 
-        # create intructions
-        instructions = [
-            f"{self.binary_path} <<! ",
-            "&inp",
-            "  lis=canal_output,"]
-        if self.bases is not None:
-            # add topology file if needed
-            fu.log('Appending sequence of bases to be searched to command',
-                   self.out_log, self.global_log)
-            instructions.append(f"  seq={self.bases},")
-        if self.nastr is not None:
-            # add topology file if needed
-            fu.log('Adding null values string specification to command',
+        if self.num_workers > 1:
+            # one Canal process for each window of snapshots, each one in its
+            # own subdirectory of the temporary folder
+            chunk_dirs = [f"chunk_{i}" for i in range(len(chunks))]
+            instructions = []
+            for chunk_dir, (itst, itnd) in zip(chunk_dirs, chunks):
+                link_chunk_inputs(
+                    Path(self.stage_io_dict.get("unique_dir", "")) / chunk_dir,
+                    [Path(self.stage_io_dict['in']['input_cda_file']).name])
+                instructions.append(self.create_instructions(tmp_cda_path, itst, itnd))
+            fu.log(f'Splitting snapshots {chunks[0][0]} to {chunks[-1][1]} in {len(chunks)} windows',
                    self.out_log, self.global_log)
-            instructions.append(f"  nastr={self.nastr},")
-
-        instructions = instructions + [
-            f"  cormin={self.cormin},",
-            f"  lev1={self.lev1},lev2={self.lev2},",
-            f"  itst={self.itst},itnd={self.itnd},itdel={self.itdel},",
-            f"  histo={self.histo},",
-            f"  series={self.series},",
-            f"  corr={self.corr},",
-            "&end",
-            f"{tmp_cda_path} {self.sequence}",
-            "!"]
-
-        self.cmd = ["\n".join(instructions)]
+            self.cmd = [parallel_instructions(instructions, chunk_dirs)]
+        else:
+            self.cmd = ["\n".join(self.create_instructions(
+                tmp_cda_path, self.itst, self.itnd))]
         fu.log('Creating command line with instructions and required arguments',
                self.out_log, self.global_log)
 
-        # Run Biobb block
-        self.run_biobb()
+        # Run Biobb block, unless the results of an identical run are cached
+        self.start_phase("compute")
+        cache_key = None
+        if self.result_cache:
+            cache_key = result_key(
+                cache_inputs, self.cmd, self.binary_path,
+                self.container_image if self.container_path else None)
+        cached_files = None
+        if cache_key:
+            cached_files = load_results(
+                cache_key, self.stage_io_dict.get("unique_dir", ""), cache_path)
+        if cached_files is not None:
+            fu.log(f'Using cached results {cache_key}', self.out_log, self.global_log)
+            self.return_code = 0
+        else:
+            self.run_biobb()
 
         # change back to original directory
         os.chdir(original_directory)
 
         workdir = self.stage_io_dict.get("unique_dir", "")
+
+        # merge the outputs of all windows
+        if self.num_workers > 1 and self.return_code == 0 and cached_files is None:
+            snapshots = [len(range(itst, itnd + 1, self.itdel)) for itst, itnd in chunks]
+            for name in merge_window_outputs(workdir, chunk_dirs, "canal_output*", snapshots):
+                if name != "canal_output.lis":
+                    raise ValueError(f"{name} can not be merged across snapshot windows, use num_workers=1")
+            # Canal's own .lis file of the first window, its averages are not of the whole run
+            fu.log(f"canal_output.lis only describes snapshots {chunks[0][0]} to {chunks[0][1]}",
+                   self.out_log, self.global_log)
+            shutil.copy(Path(workdir) / chunk_dirs[0] / "canal_output.lis", Path(workdir) / "canal_output.lis")
+
+        # store the results for identical runs
+        if cache_key and cached_files is None and self.return_code == 0:
+            store_results(
+                cache_key, Path(workdir).glob("canal_output*"),
+                cache_path, self.result_cache_max_size)
+
         zip_host_path = Path(workdir) / Path(self.io_dict["out"]["output_zip_path"]).name
 
         # create zipfile and write output inside
+        self.start_phase("archive")
         with zipfile.ZipFile(zip_host_path, "w") as zf:
             for canal_outfile in Path(workdir).glob("canal_output*"):
                 fu.log(f"Adding {canal_outfile} to zip file", self.out_log, self.global_log)
@@ -8,9 +8,12 @@ from pathlib import Path
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
 from biobb_common.tools.file_utils import launchlogger
+from biobb_dna.utils.cache import (
+    load_results, result_cache_root, result_key, store_results)
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class Canion(BiobbObject):
+class Canion(LaunchProfiler, BiobbObject):
     """
     | biobb_dna Canion
     | Wrapper for the Canion executable  that is part of the Curves+ software suite.
@@ -35,7 +38,11 @@ class Canion(BiobbObject):
             * **itdel** (*int*) - (1) Spacing between analyzed snapshots.
             * **rmsf** (*bool*) - (False) If set to True uses the combination of the helical ion parameters and an average helical axis to map the ions into Cartesian space and then calculates their average position (pdb output) and their root mean square fluctuation values (rmsf output). A single pass rmsf algorithm to make this calculation possible with a single read of the trajectory file. This option is generally used for solute atoms and not for solvent molecules or ions.
             * **circ** (*bool*) - (False) If set to True, minicircles are analyzed.
+            * **result_cache** (*bool*) - (False) if True, results are reused from a local cache when the contents of the input files, the instructions passed to the program and the program binary (or container image) are the same as in a previous run.
+            * **result_cache_path** (*str*) - (None) Directory of the result cache. If not specified, $XDG_CACHE_HOME/biobb_dna/results is used.
+            * **result_cache_max_size** (*int*) - (10240) Maximum size (MB) of the result cache, the least recently used results are removed above it.
             * **binary_path** (*str*) - (Canion) Path to Canion executable, otherwise the program wil look for Canion executable in the binaries folder.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -105,6 +112,9 @@ class Canion(BiobbObject):
         self.itdel = properties.get('itdel', 1)
         self.rmsf = ".t." if properties.get('rmsf', False) else ".f."
         self.circ = ".t." if properties.get('circ', False) else ".f."
+        self.result_cache = properties.get('result_cache', False)
+        self.result_cache_path = properties.get('result_cache_path', None)
+        self.result_cache_max_size = int(properties.get('result_cache_max_size', 10240))
         self.properties = properties
 
         # Check the properties
@@ -146,6 +156,10 @@ class Canion(BiobbObject):
         input_afr_file = Path(self.stage_io_dict['in']['input_afr_path']).name
         input_avg_struc = Path(self.stage_io_dict['in']['input_avg_struc_path']).name
 
+        # inputs identifying the results in the result cache
+        cache_path = result_cache_root(self.result_cache_path).resolve()
+        cache_inputs = [Path(f).resolve() for f in self.io_dict['in'].values() if f]
+
         # change directory to temporary folder
         original_directory = os.getcwd()
 
@@ -185,16 +199,38 @@ class Canion(BiobbObject):
 
         fu.log('Creating command line with instructions and required arguments',
                self.out_log, self.global_log)
-        # Run Biobb block
-        self.run_biobb()
+        # Run Biobb block, unless the results of an identical run are cached
+        self.start_phase("compute")
+        cache_key = None
+        if self.result_cache:
+            cache_key = result_key(
+                cache_inputs, self.cmd, self.binary_path,
+                self.container_image if self.container_path else None)
+        cached_files = None
+        if cache_key:
+            cached_files = load_results(
+                cache_key, self.stage_io_dict.get("unique_dir", ""), cache_path)
+        if cached_files is not None:
+            fu.log(f'Using cached results {cache_key}', self.out_log, self.global_log)
+            self.return_code = 0
+        else:
+            self.run_biobb()
 
         # change back to original directory
         os.chdir(original_directory)
 
         workdir = self.stage_io_dict.get("unique_dir", "")
+
+        # store the results for identical runs
+        if cache_key and cached_files is None and self.return_code == 0:
+            store_results(
+                cache_key, Path(workdir).glob("canion_output*"),
+                cache_path, self.result_cache_max_size)
+
         zip_host_path = Path(workdir) / Path(self.io_dict["out"]["output_zip_path"]).name
 
         # create zipfile and write output inside
+        self.start_phase("archive")
         with zipfile.ZipFile(zip_host_path, "w") as zf:
             for curves_outfile in Path(workdir).glob("canion_output*"):
                 fu.log(f"Adding {curves_outfile} to zip file", self.out_log, self.global_log)
@@ -9,9 +9,15 @@ from pathlib import Path
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
 from biobb_common.tools.file_utils import launchlogger
+from biobb_dna.utils.cache import (
+    load_results, result_cache_root, result_key, store_results)
+from biobb_dna.curvesplus.common import (
+    cache_stdlib, concatenate_chunk_files, fix_lis_header, frame_chunks,
+    link_chunk_inputs, link_stdlib, parallel_instructions, read_snapshots)
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class Curves(BiobbObject):
+class Curves(LaunchProfiler, BiobbObject):
     """
     | biobb_dna Curves
     | Wrapper for the Cur+ executable  that is part of the Curves+ software suite.
@@ -35,7 +41,14 @@ class Curves(BiobbObject):
             * **line** (*bool*) - (False) if True, find the best linear helical axis.
             * **fit** (*bool*) - (True) if True, fit a standard bases to the input coordinates (important for MD snapshots to avoid base distortions leading to noisy helical parameters).
             * **axfrm** (*bool*) - (False) if True, generates closely spaced helical axis frames as input for Canal and Canion.
+            * **stdlib_cache** (*bool*) - (True) if True, standard library files are stored once in a shared read-only cache under $XDG_CACHE_HOME/biobb_dna/curvesplus and linked into each run instead of being copied.
+            * **num_workers** (*int*) - (1) Number of Cur+ processes run concurrently, each one over a contiguous chunk of the itst to itnd snapshot range (itnd must be specified). Experimental, it requires experimental_parallel. Their .cda files are concatenated snapshot by snapshot and the .lis file of the first chunk is kept with the header of the whole range, so the rest of the .lis only describes the first chunk. Only supported with ions and axfrm disabled, as their .cdi and .afr outputs can not be merged.
+            * **experimental_parallel** (*bool*) - (False) Allow num_workers > 1. The concatenation of the .cda files of the chunks assumes that Cur+ writes them as a sequence of per-snapshot records without a header, which has not been checked against Canal.
+            * **result_cache** (*bool*) - (False) if True, results are reused from a local cache when the contents of the input files, the instructions passed to the program and the program binary (or container image) are the same as in a previous run.
+            * **result_cache_path** (*str*) - (None) Directory of the result cache. If not specified, $XDG_CACHE_HOME/biobb_dna/results is used.
+            * **result_cache_max_size** (*int*) - (10240) Maximum size (MB) of the result cache, the least recently used results are removed above it.
             * **binary_path** (*str*) - (Cur+) Path to Curves+ executable, otherwise the program wil look for Cur+ executable in the binaries folder.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -105,6 +118,12 @@ class Curves(BiobbObject):
         self.line = ".t." if properties.get('line', False) else ".f."
         self.fit = ".t." if properties.get('fit', True) else ".f."
         self.axfrm = ".t." if properties.get('axfrm', False) else ".f."
+        self.stdlib_cache = properties.get('stdlib_cache', True)
+        self.num_workers = int(properties.get('num_workers', 1))
+        self.experimental_parallel = properties.get('experimental_parallel', False)
+        self.result_cache = properties.get('result_cache', False)
+        self.result_cache_path = properties.get('result_cache_path', None)
+        self.result_cache_max_size = int(properties.get('result_cache_max_size', 10240))
         self.properties = properties
 
         # Check the properties
@@ -113,8 +132,13 @@ class Curves(BiobbObject):
 
     def create_curvesplus_folder(self):
         """Create .curvesplus folder in the current temporal folder and copy the lib files inside."""
-        # Create .curvesplus directory in temporary folder
         dst_dir = self.stage_io_dict.get("unique_dir", "") + '/.curvesplus'
+        if self.stdlib_cache:
+            # link the shared cache, containers only see the sandbox so they get hard links
+            cache_dir = cache_stdlib(os.path.dirname(self.stdlib_path))
+            link_stdlib(cache_dir, dst_dir, hardlink=bool(self.container_path))
+            return
+        # Create .curvesplus directory in temporary folder
         os.makedirs(dst_dir, exist_ok=True)
         # Get lib files from stdlib_path
         lib_files = list(Path(os.path.dirname(self.stdlib_path)).glob("*.lib"))
@@ -122,6 +146,32 @@ class Curves(BiobbObject):
         for file in lib_files:
             shutil.copy(file, dst_dir)
 
+    def create_instructions(self, struc_input, top_input, lib_path, itst, itnd):
+        """Heredoc instructions for a Cur+ run over the itst-itnd snapshot range."""
+        instructions = [
+            f"{self.binary_path} <<! ",
+            "&inp",
+            f"  file={struc_input},"]
+        if top_input is not None:
+            instructions.append(
+                f"  ftop={top_input},")
+        instructions = instructions + [
+            "  lis='curves_output',",
+            f"  lib={lib_path},",
+            f"  ions={self.ions},",
+            f"  test={self.test},",
+            f"  line={self.line},",
+            f"  fit={self.fit},",
+            f"  axfrm={self.axfrm},",
+            f"  itst={itst},itnd={itnd},itdel={self.itdel},",
+            "&end",
+            "2 1 -1 0 0",
+            f"{self.s1range}",
+            f"{self.s2range}",
+            "!"
+        ]
+        return instructions
+
     @launchlogger
     def launch(self) -> int:
         """Execute the :class:`Curves <biobb_dna.curvesplus.biobb_curves.Curves>` object."""
@@ -140,6 +190,14 @@ class Curves(BiobbObject):
             s2end = 2 * range1_end
             self.s2range = f"{s2end}:{s2start}"
 
+        # split snapshots range in chunks for parallel runs
+        if self.num_workers > 1:
+            if not self.experimental_parallel:
+                raise ValueError("num_workers > 1 is experimental, set the property 'experimental_parallel' to use it!")
+            if self.ions == ".t." or self.axfrm == ".t.":
+                raise ValueError("properties 'ions' and 'axfrm' are not supported with num_workers > 1!")
+            chunks = frame_chunks(self.itst, self.itnd, self.itdel, self.num_workers)
+
         # check standard library files location if not provided
         if self.stdlib_path is None:
             if os.getenv("CONDA_PREFIX", False):
@@ -161,7 +219,10 @@ class Curves(BiobbObject):
                         "Please indicate where standard_*.lib files are "
                         "located with the stdlib_path property.")
                 # copy standard library files to temporary folder
-                shutil.copytree(curves_aux_path, self.stage_io_dict.get("unique_dir", "") + '/.curvesplus')
+                if self.stdlib_cache:
+                    self.create_curvesplus_folder()
+                else:
+                    shutil.copytree(curves_aux_path, self.stage_io_dict.get("unique_dir", "") + '/.curvesplus')
                 relative_lib_path = '.curvesplus/standard'
             else:
                 # CONDA_PREFIX undefined
@@ -178,6 +239,11 @@ class Curves(BiobbObject):
             path_parts = str(self.stdlib_path).split(os.sep)
             relative_lib_path = '.curvesplus/' + os.sep.join(path_parts[-1:])
 
+        # inputs identifying the results in the result cache
+        cache_path = result_cache_root(self.result_cache_path).resolve()
+        cache_inputs = [Path(f).resolve() for f in self.io_dict['in'].values() if f]
+        cache_inputs += sorted(Path(self.stdlib_path).resolve().parent.glob("*.lib"))
+
         # change directory to temporary folder
         original_directory = os.getcwd()
 
@@ -188,51 +254,72 @@ class Curves(BiobbObject):
 
         # define temporary file names
         tmp_struc_input = Path(self.stage_io_dict['in']['input_struc_path']).name
-        if self.stage_io_dict['in']['input_top_path'] is not None:
-            tmp_top_input = Path(self.stage_io_dict['in']['input_top_path']).name
-
-        # create intructions
-        instructions = [
-            f"{self.binary_path} <<! ",
-            "&inp",
-            f"  file={tmp_struc_input},"]
-        if self.stage_io_dict['in']['input_top_path'] is not None:
+        tmp_top_input = None
+        if self.stage_io_dict['in'].get('input_top_path') is not None:
             # add topology file if needed
             fu.log('Appending provided topology to command',
                    self.out_log, self.global_log)
-            instructions.append(
-                f"  ftop={tmp_top_input},")
+            tmp_top_input = Path(self.stage_io_dict['in']['input_top_path']).name
 
-        # create intructions
-        instructions = instructions + [
-            "  lis='curves_output',",
-            f"  lib={relative_lib_path},",
-            f"  ions={self.ions},",
-            f"  test={self.test},",
-            f"  line={self.line},",
-            f"  fit={self.fit},",
-            f"  axfrm={self.axfrm},",
-            f"  itst={self.itst},itnd={self.itnd},itdel={self.itdel},",
-            "&end",
-            "2 1 -1 0 0",
-            f"{self.s1range}",
-            f"{self.s2range}",
-            "!"
-        ]
-        self.cmd = ["\n".join(instructions)]
+        if self.num_workers > 1:
+            # one Cur+ process for each chunk of snapshots, each one in its
+            # own subdirectory of the temporary folder with links to the inputs
+            chunk_dirs = [f"chunk_{i}" for i in range(len(chunks))]
+            instructions = []
+            for chunk_dir, (itst, itnd) in zip(chunk_dirs, chunks):
+                link_chunk_inputs(
+                    Path(self.stage_io_dict.get("unique_dir", "")) / chunk_dir,
+                    [tmp_struc_input, tmp_top_input, ".curvesplus"])
+                instructions.append(self.create_instructions(
+                    tmp_struc_input, tmp_top_input, relative_lib_path, itst, itnd))
+            fu.log(f'Splitting snapshots {chunks[0][0]} to {chunks[-1][1]} in {len(chunks)} chunks',
+                   self.out_log, self.global_log)
+            self.cmd = [parallel_instructions(instructions, chunk_dirs)]
+        else:
+            self.cmd = ["\n".join(self.create_instructions(
+                tmp_struc_input, tmp_top_input, relative_lib_path, self.itst, self.itnd))]
         fu.log('Creating command line with instructions and required arguments',
                self.out_log, self.global_log)
 
-        # Run Biobb block
-        self.run_biobb()
+        # Run Biobb block, unless the results of an identical run are cached
+        self.start_phase("compute")
+        cache_key = None
+        if self.result_cache:
+            cache_key = result_key(
+                cache_inputs, self.cmd, self.binary_path,
+                self.container_image if self.container_path else None)
+        cached_files = None
+        if cache_key:
+            cached_files = load_results(
+                cache_key, self.stage_io_dict.get("unique_dir", ""), cache_path)
+        if cached_files is not None:
+            fu.log(f'Using cached results {cache_key}', self.out_log, self.global_log)
+            self.return_code = 0
+        else:
+            self.run_biobb()
 
         # change back to original directory
         os.chdir(original_directory)
 
         workdir = self.stage_io_dict.get("unique_dir", "")
+
+        # merge the outputs of all chunks
+        if self.num_workers > 1 and self.return_code == 0 and cached_files is None:
+            concatenate_chunk_files(workdir, chunk_dirs, ["curves_output.cda"])
+            snapshots = sum(read_snapshots(Path(workdir) / chunk_dir / "curves_output.lis") for chunk_dir in chunk_dirs)
+            shutil.copy(Path(workdir) / chunk_dirs[0] / "curves_output.lis", workdir)
+            fix_lis_header(Path(workdir) / "curves_output.lis", self.itst, self.itnd, snapshots)
+
+        # store the results for identical runs
+        if cache_key and cached_files is None and self.return_code == 0:
+            store_results(
+                cache_key, Path(workdir).glob("curves_output*"),
+                cache_path, self.result_cache_max_size)
+
         zip_host_path = Path(workdir) / Path(self.io_dict["out"]["output_zip_path"]).name
 
         # create zipfile and write output inside
+        self.start_phase("archive")
         with zipfile.ZipFile(zip_host_path, "w") as zf:
             for curves_outfile in Path(workdir).glob("curves_output*"):
                 fu.log(f"Adding {curves_outfile} to zip file", self.out_log, self.global_log)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+
+"""Module containing the CurvesCanal class and the command line interface."""
+import multiprocessing
+import os
+import select
+import sys
+import threading
+from typing import Optional
+from pathlib import Path
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools import file_utils as fu
+from biobb_common.tools.file_utils import launchlogger
+from biobb_dna.curvesplus.biobb_curves import Curves
+from biobb_dna.curvesplus.biobb_canal import Canal
+from biobb_dna.utils.profiling import LaunchProfiler
+
+CURVES_PROPERTIES = [
+    's1range', 's2range', 'stdlib_path', 'stdlib_cache', 'itst', 'itnd',
+    'itdel', 'ions', 'test', 'line', 'fit', 'axfrm', 'num_workers',
+    'experimental_parallel']
+CANAL_PROPERTIES = [
+    'bases', 'lev1', 'lev2', 'nastr', 'cormin', 'series', 'histo', 'corr',
+    'sequence']
+CONTAINER_PROPERTIES = [
+    'container_path', 'container_image', 'container_volume_path',
+    'container_working_dir', 'container_user_id', 'container_shell_path']
+
+
+class CurvesCanal(LaunchProfiler, BiobbObject):
+    """
+    | biobb_dna CurvesCanal
+    | Wrapper for the Cur+ and Canal executables that are part of the Curves+ software suite.
+    | Runs Cur+ and then Canal on its .cda output in a single sandbox, so the intermediate .cda file never leaves it.
+
+    Args:
+        input_struc_path (str): Trajectory or PDB input file. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/structure.stripped.trj>`_. Accepted formats: trj (edam:format_3910), pdb (edam:format_1476), netcdf (edam:format_3650), nc (edam:format_3650).
+        input_top_path (str) (Optional): Topology file, needed along with .trj file (optional). File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/structure.stripped.top>`_. Accepted formats: top (edam:format_3881), pdb (edam:format_1476).
+        output_zip_path (str): zip filename for Canal output files. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        output_lis_path (str) (Optional): Filename for Cur+ .lis output. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/curvesplus/curves_trj_output.lis>`_. Accepted formats: lis (edam:format_2330).
+        output_curves_zip_path (str) (Optional): Filename for .zip file with other Cur+ output files (.afr, .cdi). File type: output. Accepted formats: zip (edam:format_3987).
+        properties (dict):
+            * **s1range** (*str*) - (None) Range of first strand. Must be specified in the form "start:end".
+            * **s2range** (*str*) - (None) Range of second strand. Must be specified in the form "start:end".
+            * **stdlib_path** (*str*) - ('standard') Path to Curves' standard library files for nucleotides. If not specified will look for 'standard' files in current directory.
+            * **stdlib_cache** (*bool*) - (True) if True, standard library files are linked from the shared read-only cache instead of being copied.
+            * **itst** (*int*) - (0) Iteration start index for Cur+.
+            * **itnd** (*int*) - (0) Iteration end index for Cur+.
+            * **itdel** (*int*) - (1) Iteration delimiter for Cur+.
+            * **ions** (*bool*) - (False) If True, helicoidal analysis of ions (or solvent molecules) around solute is carried out.
+            * **test** (*bool*) - (False) If True, provide addition output in .lis file on fitting and axis generation.
+            * **line** (*bool*) - (False) if True, find the best linear helical axis.
+            * **fit** (*bool*) - (True) if True, fit a standard bases to the input coordinates (important for MD snapshots to avoid base distortions leading to noisy helical parameters).
+            * **axfrm** (*bool*) - (False) if True, generates closely spaced helical axis frames as input for Canal and Canion.
+            * **num_workers** (*int*) - (1) Number of Cur+ processes run concurrently over chunks of the itst to itnd snapshot range (itnd must be specified, ions and axfrm must be disabled). Experimental, it requires experimental_parallel and the .lis file only describes the first chunk.
+            * **experimental_parallel** (*bool*) - (False) Allow num_workers > 1, whose concatenated .cda file has not been checked against Canal.
+            * **bases** (*str*) - (None) sequence of bases to be searched for in the I/P data (default is blank, meaning no specified sequence).
+            * **lev1** (*int*) - (0) Lower base level limit (i.e. base pairs) used for analysis.
+            * **lev2** (*int*) - (0) Upper base level limit used for analysis. If lev1 > 0 and lev2 = 0, lev2 is set to lev1 (i.e. analyze lev1 only). If lev1=lev2=0, lev1 is set to 1 and lev2 is set to the length of the oligmer (i.e. analyze all levels).
+            * **nastr** (*str*) - ('NA') character string used to indicate missing data in .ser files.
+            * **cormin** (*float*) - (0.6) minimal absolute value for printing linear correlation coefficients between pairs of analyzed variables.
+            * **series** (*bool*) - (False) if True then output spatial or time series data. Only possible for the analysis of single structures or single trajectories.
+            * **histo** (*bool*) - (False) if True then output histogram data.
+            * **corr** (*bool*) - (False) if True than output linear correlation coefficients between all variables.
+            * **sequence** (*str*) - (None) sequence of the first strand of the DNA fragment. If not given it will be parsed from the Cur+ .lis file.
+            * **cda_pipe** (*bool*) - (False) if True, the .cda file is a named pipe and Canal reads it while Cur+ writes it. Requires the sequence property and binaries that write and read the .cda file sequentially.
+            * **curves_binary_path** (*str*) - (Cur+) Path to Curves+ executable, otherwise the program wil look for Cur+ executable in the binaries folder.
+            * **canal_binary_path** (*str*) - (Canal) Path to Canal executable, otherwise the program wil look for Canal executable in the binaries folder.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+            * **container_path** (*str*) - (None)  Path to the binary executable of your container.
+            * **container_image** (*str*) - ("cmip/cmip:latest") Container Image identifier.
+            * **container_volume_path** (*str*) - ("/data") Path to an internal directory in the container.
+            * **container_working_dir** (*str*) - (None) Path to the internal CWD in the container.
+            * **container_user_id** (*str*) - (None) User number id to be mapped inside the container.
+            * **container_shell_path** (*str*) - ("/bin/bash") Path to the binary executable of the container shell.
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.curvesplus.biobb_curves_canal import biobb_curves_canal
+            prop = {
+                's1range': '1:12',
+                's2range': '24:13',
+                'series': True,
+                'histo': True
+            }
+            biobb_curves_canal(
+                input_struc_path='/path/to/structure/file.trj',
+                input_top_path='/path/to/topology/file.top',
+                output_zip_path='/path/to/output.zip',
+                properties=prop)
+    Info:
+        * wrapped_software:
+            * name: Curves
+            * version: >=2.6
+            * license: BSD 3-Clause
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+    """
+
+    def __init__(
+            self, input_struc_path, output_zip_path,
+            input_top_path=None, output_lis_path=None,
+            output_curves_zip_path=None, properties=None, **kwargs) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            'in': {
+                'input_struc_path': input_struc_path,
+                'input_top_path': input_top_path
+            },
+            'out': {
+                'output_zip_path': output_zip_path,
+                'output_lis_path': output_lis_path,
+                'output_curves_zip_path': output_curves_zip_path
+            }
+        }
+
+        # Properties specific for BB
+        self.sequence = properties.get('sequence', None)
+        self.cda_pipe = properties.get('cda_pipe', False)
+        self.curves_binary_path = properties.get('curves_binary_path', 'Cur+')
+        self.canal_binary_path = properties.get('canal_binary_path', 'Canal')
+        self.properties = properties
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    def step_properties(self, names, binary_path):
+        """Properties of the Cur+ or Canal step, run inside this block's sandbox."""
+        step_properties = {
+            name: self.properties[name]
+            for name in names + CONTAINER_PROPERTIES if name in self.properties}
+        step_properties['binary_path'] = binary_path
+        step_properties['disable_sandbox'] = True
+        # the steps are profiled as the compute phase of this block
+        step_properties['profile'] = False
+        return step_properties
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`CurvesCanal <biobb_dna.curvesplus.biobb_curves_canal.CurvesCanal>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        if self.cda_pipe and self.sequence is None:
+            raise ValueError(
+                "property 'sequence' must be specified when the .cda file is a named pipe!")
+
+        # both steps run in the sandbox without copying their inputs or outputs
+        original_directory = os.getcwd()
+        os.chdir(self.stage_io_dict.get("unique_dir", ""))
+
+        input_top_path = self.stage_io_dict['in'].get('input_top_path')
+        curves = Curves(
+            input_struc_path=Path(self.stage_io_dict['in']['input_struc_path']).name,
+            input_top_path=Path(input_top_path).name if input_top_path else None,
+            output_lis_path="curves_output.lis",
+            output_cda_path="curves_output.cda",
+            output_zip_path="curves_output.zip",
+            properties=self.step_properties(CURVES_PROPERTIES, self.curves_binary_path))
+
+        self.start_phase("compute")
+        try:
+            if self.cda_pipe:
+                self.return_code = self.run_piped(curves)
+            else:
+                fu.log('Running Cur+', self.out_log, self.global_log)
+                self.return_code = curves.launch()
+                if self.return_code == 0:
+                    fu.log('Running Canal on the Cur+ .cda file', self.out_log, self.global_log)
+                    self.return_code = self.create_canal().launch()
+        finally:
+            os.chdir(original_directory)
+
+        # outputs of Cur+ asked by the user
+        unique_dir = Path(self.stage_io_dict.get("unique_dir", ""))
+        for file_ref, name in (("output_lis_path", "curves_output.lis"),
+                               ("output_curves_zip_path", "curves_output.zip")):
+            if self.stage_io_dict['out'].get(file_ref) and (unique_dir / name).exists():
+                (unique_dir / name).rename(
+                    unique_dir / Path(self.stage_io_dict['out'][file_ref]).name)
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return self.return_code
+
+    def create_canal(self):
+        """Canal step reading the .cda file written by Cur+ in the sandbox."""
+        return Canal(
+            input_cda_file="curves_output.cda",
+            input_lis_file=None if self.sequence else "curves_output.lis",
+            output_zip_path=Path(self.stage_io_dict['out']['output_zip_path']).name,
+            properties=self.step_properties(CANAL_PROPERTIES, self.canal_binary_path))
+
+    def run_piped(self, curves):
+        """Run Cur+ and Canal concurrently, with the .cda file as a named pipe.
+
+        Canal runs in a child process, so that each launch changes the
+        working directory of its own process only, and Cur+ in this one.
+        When one of them ends without opening the pipe, the other one is
+        released: Canal gets an empty .cda file and the output of Cur+ is
+        read and discarded."""
+        fu.log('Running Cur+ and Canal through a named pipe', self.out_log, self.global_log)
+        fifo_path = str(Path(self.stage_io_dict.get("unique_dir", "")).resolve() / "curves_output.cda")
+        os.mkfifo(fifo_path)
+        canal_process = multiprocessing.get_context("fork").Process(
+            target=launch_step, args=(self.create_canal(),))
+        canal_process.start()
+        curves_done = threading.Event()
+        reader_thread = threading.Thread(
+            target=discard_pipe, args=(fifo_path, canal_process, curves_done))
+        reader_thread.start()
+        try:
+            curves_code = curves.launch()
+        finally:
+            curves_done.set()
+            release_pipe_reader(fifo_path, canal_process)
+            canal_process.join()
+            reader_thread.join()
+        return curves_code or canal_process.exitcode
+
+
+def launch_step(step):
+    """Launch a step in a child process, its return code is the exit code."""
+    sys.exit(step.launch())
+
+
+def discard_pipe(fifo_path, reader_process, writer_done):
+    """Once the reader process has ended, read and discard what is written
+    to the named pipe until writer_done is set, so that the writer is not
+    blocked forever opening it or writing to it."""
+    reader_process.join()
+    if writer_done.is_set():
+        return
+    fifo = os.open(fifo_path, os.O_RDONLY | os.O_NONBLOCK)
+    try:
+        while not writer_done.is_set():
+            if select.select([fifo], [], [], 0.1)[0]:
+                try:
+                    if not os.read(fifo, 1 << 16):
+                        # no writer yet or anymore
+                        writer_done.wait(0.1)
+                except BlockingIOError:
+                    pass
+    finally:
+        os.close(fifo)
+
+
+def release_pipe_reader(fifo_path, reader_process):
+    """Open and close the write end of the named pipe, so that a reader
+    process still waiting for a writer reads an empty file."""
+    while reader_process.is_alive():
+        try:
+            os.close(os.open(fifo_path, os.O_WRONLY | os.O_NONBLOCK))
+            return
+        except OSError:
+            # the reader has not opened the pipe yet
+            reader_process.join(0.1)
+
+
+def biobb_curves_canal(
+        input_struc_path: str, output_zip_path: str,
+        input_top_path: Optional[str] = None, output_lis_path: Optional[str] = None,
+        output_curves_zip_path: Optional[str] = None,
+        properties: Optional[dict] = None, **kwargs) -> int:
+    """Create :class:`CurvesCanal <biobb_dna.curvesplus.biobb_curves_canal.CurvesCanal>` class and
+    execute the :meth:`launch() <biobb_dna.curvesplus.biobb_curves_canal.CurvesCanal.launch>` method."""
+    return CurvesCanal(**dict(locals())).launch()
+
+
+biobb_curves_canal.__doc__ = CurvesCanal.__doc__
+main = CurvesCanal.get_main(biobb_curves_canal, "Execute Cur+ and Canal from the Curves+ software suite in a single sandbox.")
+
+if __name__ == '__main__':
+    main()
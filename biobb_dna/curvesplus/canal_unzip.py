@@ -1,30 +1,35 @@
 #!/usr/bin/env python3
 
 """Module containing the CanalUnzip class and the command line interface."""
+import os
 import re
-import zipfile
-import shutil
 from typing import Optional
 
+from biobb_dna.utils.archive import archive_index, extract_member
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.profiling import LaunchProfiler
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
 from biobb_common.tools.file_utils import launchlogger
 
 
-class CanalUnzip(BiobbObject):
+class CanalUnzip(LaunchProfiler, BiobbObject):
     """
     | biobb_dna CanalUnzip
     | Tool for extracting biobb_canal output files.
-    | Unzips a Canal output file contained within a zip file.
+    | Unzips one or more Canal output files contained within a zip file.
 
     Args:
         input_zip_file (str): Zip file with Canal output files. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
-        output_path (str): Canal output file contained within input_zip_file. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/curvesplus/canal_unzip_output.ser>`_. Accepted formats: ser (edam:format_2330), his (edam:format_3905), cor (edam:format_3465).
+        output_path (str) (Optional): Canal output file contained within input_zip_file, when a single file is selected. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/curvesplus/canal_unzip_output.ser>`_. Accepted formats: ser (edam:format_2330), his (edam:format_3905), cor (edam:format_3465).
         output_list_path (str) (Optional): Text file with a list of all Canal output files contained within input_zip_file. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/curvesplus/canal_unzip_output.txt>`_. Accepted formats: txt (edam:format_2330).
+        output_dir_path (dir) (Optional): Directory where all the selected Canal output files are extracted with their original names. File type: output. Accepted formats: directory (edam:format_1915).
         properties (dic):
-            * **type** (*str*) - (None) Type of file. Values: series, histo, corr.
-            * **helpar_name** (*str*) - (None) Helical parameter name, only for 'series' and 'histo' types. Values: alphaC, alphaW, ampC, ampW, ax-bend, betaC, betaW, buckle, chiC, chiW, curv, deltaC, deltaW, epsilC, epsilW, gammaC, gammaW, h-ris, h-twi, inclin, majd, majw, mind, minw, opening, phaseC, phaseW, propel, reg, rise, roll, shear, shift, slide, stagger, stretch, tbend, tilt, tip, twist, xdisp, ydisp, zetaC, zetaW.
-            * **correlation** (*str*) - (None) Correlation indexes separated by underscore (ie '98_165'), only for 'corr' type.
+            * **type** (*str*) - (None) Type of file, or list of types. Values: series, histo, corr.
+            * **helpar_name** (*str*) - (None) Helical parameter name, or list of names, only for 'series' and 'histo' types. Values: alphaC, alphaW, ampC, ampW, ax-bend, betaC, betaW, buckle, chiC, chiW, curv, deltaC, deltaW, epsilC, epsilW, gammaC, gammaW, h-ris, h-twi, inclin, majd, majw, mind, minw, opening, phaseC, phaseW, propel, reg, rise, roll, shear, shift, slide, stagger, stretch, tbend, tilt, tip, twist, xdisp, ydisp, zetaC, zetaW.
+            * **correlation** (*str*) - (None) Correlation indexes separated by underscore (ie '98_165'), or list of them, only for 'corr' type.
+            * **archive_index** (*bool*) - (False) if True, the index of the members of input_zip_file is stored in a cache under $XDG_CACHE_HOME/biobb_dna/archive_index and reused by later extractions from the same archive.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -39,8 +44,14 @@ class CanalUnzip(BiobbObject):
             canal_unzip(
                 input_zip_file='/path/to/canal/output.zip',
                 output_path='/path/to/output.ser',
-                output_list_path='/path/to/output.txt'
+                output_list_path='/path/to/output.txt',
                 properties=prop)
+
+            # several files in a single pass
+            canal_unzip(
+                input_zip_file='/path/to/canal/output.zip',
+                output_dir_path='/path/to/output_dir',
+                properties={'type': 'series', 'helpar_name': ['shift', 'slide', 'rise']})
     Info:
         * wrapped_software:
             * name: In house
@@ -50,8 +61,8 @@ class CanalUnzip(BiobbObject):
             * schema: http://edamontology.org/EDAM.owl
     """
 
-    def __init__(self, input_zip_file,
-                 output_path, output_list_path=None, properties=None, **kwargs) -> None:
+    def __init__(self, input_zip_file, output_path=None, output_list_path=None,
+                 output_dir_path=None, properties=None, **kwargs) -> None:
         properties = properties or {}
 
         # Call parent class constructor
@@ -65,7 +76,8 @@ class CanalUnzip(BiobbObject):
             },
             'out': {
                 'output_path': output_path,
-                'output_list_path': output_list_path
+                'output_list_path': output_list_path,
+                'output_dir_path': output_dir_path
             }
         }
 
@@ -73,6 +85,7 @@ class CanalUnzip(BiobbObject):
         self.type = properties.get('type', None)
         self.helpar_name = properties.get('helpar_name', None)
         self.correlation = properties.get('correlation', None)
+        self.archive_index = properties.get('archive_index', False)
         self.properties = properties
 
         # Check the properties
@@ -88,20 +101,24 @@ class CanalUnzip(BiobbObject):
             return 0
         self.stage_files()
 
+        types = _from_string_to_list(self.type)
+        helpar_names = _from_string_to_list(self.helpar_name)
+        correlations = _from_string_to_list(self.correlation)
+
         # Check that both properties are set
-        if self.type is None:
+        if not types:
             fu.log("Property 'type' is mandatory to run CanalUnzip. Please set it.",
                    self.out_log, self.global_log)
             exit(1)
 
         # Check that helpar_name is set if type is series or histo
-        if self.type in ["series", "histo"] and self.helpar_name is None:
+        if any(t in ["series", "histo"] for t in types) and not helpar_names:
             fu.log("Property 'helpar_name' is mandatory to run CanalUnzip with type 'series' or 'histo'. Please set it.",
                    self.out_log, self.global_log)
             exit(1)
 
         # Check that correlation is set if type is corr
-        if self.type == "corr" and self.correlation is None:
+        if "corr" in types and not correlations:
             fu.log("Property 'correlation' is mandatory to run CanalUnzip with type 'corr'. Please set it.",
                    self.out_log, self.global_log)
             exit(1)
@@ -111,56 +128,81 @@ class CanalUnzip(BiobbObject):
             "histo": "his",
             "corr": "cor"
         }
-        # Check that the type is valid
-        if self.type not in extensions:
-            fu.log(f"Type {self.type} not valid. Valid types are: {', '.join(extensions.keys())}.",
-                   self.out_log, self.global_log)
-            exit(1)
-
-        # generate sufix
-        sufix = ""
-        if self.type == "corr":
-            # Check that the correlation is valid
-            pattern = r'\d+_\d+'
-            if not re.match(pattern, self.correlation):
-                fu.log(f"Correlation {self.correlation} not valid. It should match the pattern <number_number>.",
+        # Generate the filenames
+        filenames = []
+        for file_type in types:
+            # Check that the type is valid
+            if file_type not in extensions:
+                fu.log(f"Type {file_type} not valid. Valid types are: {', '.join(extensions.keys())}.",
                        self.out_log, self.global_log)
                 exit(1)
-            sufix = self.correlation
-        else:
-            # Check that the helpar_name is valid
-            if self.helpar_name not in ["alphaC", "alphaW", "ampC", "ampW", "ax-bend", "betaC", "betaW", "buckle",
-                                        "chiC", "chiW", "curv", "deltaC", "deltaW", "epsilC", "epsilW", "gammaC",
-                                        "gammaW", "h-ris", "h-twi", "inclin", "majd", "majw", "mind", "minw",
-                                        "opening", "phaseC", "phaseW", "propel", "reg", "rise", "roll", "shear",
-                                        "shift", "slide", "stagger", "stretch", "tbend", "tilt", "tip", "twist",
-                                        "xdisp", "ydisp", "zetaC", "zetaW"]:
-                fu.log(f"Parameter {self.helpar_name} not valid. Valid parameters are: alphaC, alphaW, ampC, ampW, ax-bend, betaC, betaW, buckle, chiC, chiW, curv, deltaC, deltaW, epsilC, epsilW, gammaC, gammaW, h-ris, h-twi, inclin, majd, majw, mind, minw, opening, phaseC, phaseW, propel, reg, rise, roll, shear, shift, slide, stagger, stretch, tbend, tilt, tip, twist, xdisp, ydisp, zetaC, zetaW.",
-                       self.out_log, self.global_log)
-                exit(1)
-            sufix = self.helpar_name
-
-        # Generate the filename
-        filename = f"canal_output_{sufix}.{extensions[self.type]}"
 
-        # Unzip the file
-        with zipfile.ZipFile(self.stage_io_dict["in"]["input_zip_file"], 'r') as zip_ref:
-            # Check if the file exists in the zip file
-            if filename in zip_ref.namelist():
-                # Extract the file
-                fu.log(f'{filename} exists, copying into {self.stage_io_dict["out"]["output_path"]}.',
-                       self.out_log, self.global_log)
-                with zip_ref.open(filename) as source, open(self.stage_io_dict["out"]["output_path"], "wb") as target:
-                    shutil.copyfileobj(source, target)
+            # generate sufixes
+            if file_type == "corr":
+                sufixes = correlations
+                for correlation in correlations:
+                    # Check that the correlation is valid
+                    pattern = r'\d+_\d+'
+                    if not re.match(pattern, correlation):
+                        fu.log(f"Correlation {correlation} not valid. It should match the pattern <number_number>.",
+                               self.out_log, self.global_log)
+                        exit(1)
             else:
+                sufixes = helpar_names
+                for helpar_name in helpar_names:
+                    # Check that the helpar_name is valid
+                    if helpar_name not in ["alphaC", "alphaW", "ampC", "ampW", "ax-bend", "betaC", "betaW", "buckle",
+                                           "chiC", "chiW", "curv", "deltaC", "deltaW", "epsilC", "epsilW", "gammaC",
+                                           "gammaW", "h-ris", "h-twi", "inclin", "majd", "majw", "mind", "minw",
+                                           "opening", "phaseC", "phaseW", "propel", "reg", "rise", "roll", "shear",
+                                           "shift", "slide", "stagger", "stretch", "tbend", "tilt", "tip", "twist",
+                                           "xdisp", "ydisp", "zetaC", "zetaW"]:
+                        fu.log(f"Parameter {helpar_name} not valid. Valid parameters are: alphaC, alphaW, ampC, ampW, ax-bend, betaC, betaW, buckle, chiC, chiW, curv, deltaC, deltaW, epsilC, epsilW, gammaC, gammaW, h-ris, h-twi, inclin, majd, majw, mind, minw, opening, phaseC, phaseW, propel, reg, rise, roll, shear, shift, slide, stagger, stretch, tbend, tilt, tip, twist, xdisp, ydisp, zetaC, zetaW.",
+                               self.out_log, self.global_log)
+                        exit(1)
+            filenames += [f"canal_output_{sufix}.{extensions[file_type]}" for sufix in sufixes]
+
+        # Check the outputs
+        output_path = self.stage_io_dict["out"].get("output_path")
+        output_dir_path = self.stage_io_dict["out"].get("output_dir_path")
+        if not output_path and not output_dir_path:
+            fu.log("Either 'output_path' or 'output_dir_path' must be set to run CanalUnzip.",
+                   self.out_log, self.global_log)
+            exit(1)
+        if output_path and len(filenames) > 1:
+            fu.log(f"{len(filenames)} files selected, 'output_path' can only be used with a single file. Use 'output_dir_path' instead.",
+                   self.out_log, self.global_log)
+            exit(1)
+
+        # Unzip the files, all of them read from the same archive index
+        self.start_phase("parse")
+        members = archive_index(self.stage_io_dict["in"]["input_zip_file"], cached=self.archive_index)
+        # Check if the files exist in the zip file
+        for filename in filenames:
+            if filename not in members:
                 fu.log(f"File {filename} not found in the zip file.", self.out_log, self.global_log)
                 exit(1)
 
-            # Write the list of files
-            if self.stage_io_dict["out"]["output_list_path"]:
-                with open(self.stage_io_dict["out"]["output_list_path"], "w") as f:
-                    for name in zip_ref.namelist():
-                        f.write(f"{name}\n")
+        self.start_phase("archive")
+        if output_path:
+            # Extract the file
+            fu.log(f'{filenames[0]} exists, copying into {output_path}.',
+                   self.out_log, self.global_log)
+            extract_member(self.stage_io_dict["in"]["input_zip_file"], filenames[0], output_path, members)
+        if output_dir_path:
+            os.makedirs(output_dir_path, exist_ok=True)
+            fu.log(f'Extracting {len(filenames)} files into {output_dir_path}.',
+                   self.out_log, self.global_log)
+            for filename in filenames:
+                extract_member(
+                    self.stage_io_dict["in"]["input_zip_file"], filename,
+                    os.path.join(output_dir_path, filename), members)
+
+        # Write the list of files
+        if self.stage_io_dict["out"].get("output_list_path"):
+            with open(self.stage_io_dict["out"]["output_list_path"], "w") as f:
+                for name in members:
+                    f.write(f"{name}\n")
 
         # Run Biobb block
         # self.run_biobb()
@@ -178,8 +220,9 @@ class CanalUnzip(BiobbObject):
 
 def canal_unzip(
         input_zip_file: str,
-        output_path: str,
+        output_path: Optional[str] = None,
         output_list_path: Optional[str] = None,
+        output_dir_path: Optional[str] = None,
         properties: Optional[dict] = None,
         **kwargs) -> int:
     """Create :class:`CanalUnzip <biobb_dna.curvesplus.canal_unzip.CanalUnzip>` class and
@@ -0,0 +1,243 @@
+"""Common functions for the curvesplus package."""
+
+import hashlib
+import os
+import re
+import shutil
+import socket
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+# cache directories of standard library files already resolved in this
+# process, keyed by their source directory and file stats
+_STDLIB_CACHE = {}
+
+
+def stdlib_cache_root():
+    """Parent directory of the cached copies of Curves+ standard library files."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "biobb_dna" / "curvesplus"
+
+
+def files_digest(files):
+    """sha256 digest of the names and contents of a list of files."""
+    sha = hashlib.sha256()
+    for file in sorted(files, key=lambda f: Path(f).name):
+        sha.update(Path(file).name.encode())
+        sha.update(b"\0")
+        with open(file, "rb") as lib_file:
+            for block in iter(lambda: lib_file.read(1 << 20), b""):
+                sha.update(block)
+        sha.update(b"\0")
+    return sha.hexdigest()
+
+
+def cache_stdlib(lib_dir):
+    """Shared read-only copy of the *.lib files of lib_dir.
+
+    Files are stored in a directory named after the sha256 digest of their
+    contents, populated atomically the first time and validated once per
+    host. Within a process, lib_dir is only hashed again if its files change."""
+    lib_files = sorted(Path(lib_dir).glob("*.lib"))
+    key = (str(stdlib_cache_root()), str(Path(lib_dir).resolve()),
+           tuple((f.name, f.stat().st_mtime_ns, f.stat().st_size) for f in lib_files))
+    if key in _STDLIB_CACHE and _STDLIB_CACHE[key].is_dir():
+        return _STDLIB_CACHE[key]
+
+    digest = files_digest(lib_files)
+    cache_dir = stdlib_cache_root() / digest
+    marker = cache_dir / f".validated-{socket.gethostname()}"
+    if not marker.exists():
+        cached_files = list(cache_dir.glob("*.lib")) if cache_dir.exists() else []
+        if cached_files and files_digest(cached_files) != digest:
+            # corrupted cache entry, replace it
+            shutil.rmtree(cache_dir, ignore_errors=True)
+        if not cache_dir.exists():
+            cache_dir.parent.mkdir(parents=True, exist_ok=True)
+            tmp_dir = Path(tempfile.mkdtemp(prefix=f".{digest}.", dir=cache_dir.parent))
+            for lib_file in lib_files:
+                shutil.copy(lib_file, tmp_dir)
+                os.chmod(tmp_dir / lib_file.name, 0o444)
+            try:
+                os.rename(tmp_dir, cache_dir)
+            except OSError:
+                # another process populated the cache first
+                shutil.rmtree(tmp_dir, ignore_errors=True)
+        marker.touch()
+    _STDLIB_CACHE[key] = cache_dir
+    return cache_dir
+
+
+def link_stdlib(cache_dir, dst_dir, hardlink=False):
+    """Make the cached standard library files available in dst_dir.
+
+    dst_dir is created as a symbolic link to cache_dir or, with hardlink=True
+    (e.g. when dst_dir is mounted in a container), as a directory with hard
+    links to the cached files, which are copied if linking is not possible."""
+    if not hardlink:
+        os.symlink(cache_dir, dst_dir)
+        return
+    os.makedirs(dst_dir, exist_ok=True)
+    for lib_file in Path(cache_dir).glob("*.lib"):
+        try:
+            os.link(lib_file, Path(dst_dir) / lib_file.name)
+        except OSError:
+            shutil.copy(lib_file, dst_dir)
+
+
+def frame_chunks(itst, itnd, itdel, num_workers):
+    """Split the itst-itnd snapshot range in contiguous chunks.
+
+    Returns a list of (itst, itnd) tuples, one for each chunk, keeping the
+    itdel stride across chunk boundaries."""
+    if itnd <= 0:
+        raise ValueError("property 'itnd' must be specified to run in parallel!")
+    frames = list(range(max(itst, 1), itnd + 1, itdel))
+    if not frames:
+        raise ValueError(f"no snapshots selected between itst={itst} and itnd={itnd}")
+    num_workers = min(num_workers, len(frames))
+    size, extra = divmod(len(frames), num_workers)
+    chunks = []
+    start = 0
+    for i in range(num_workers):
+        end = start + size + (1 if i < extra else 0)
+        chunks.append((frames[start], frames[end - 1]))
+        start = end
+    return chunks
+
+
+def link_chunk_inputs(chunk_dir, names):
+    """Create chunk_dir with relative symbolic links to the given files of its
+    parent directory, so each chunk runs with the same relative paths."""
+    os.makedirs(chunk_dir, exist_ok=True)
+    for name in names:
+        if name:
+            os.symlink(Path("..") / name, Path(chunk_dir) / name)
+
+
+def parallel_instructions(instructions, chunk_dirs):
+    """Shell script running each set of heredoc instructions in the background
+    inside its own directory and returning a non-zero code if any of them fails."""
+    script = []
+    for i, (chunk_instructions, chunk_dir) in enumerate(zip(instructions, chunk_dirs)):
+        script.append(f"( cd {chunk_dir} && " + "\n".join(chunk_instructions))
+        script.append(") &")
+        script.append(f"pid{i}=$!")
+    script.append("rc=0")
+    for i in range(len(chunk_dirs)):
+        script.append(f"wait $pid{i} || rc=$?")
+    script.append("exit $rc")
+    return "\n".join(script)
+
+
+def read_snapshots(lis_path):
+    """Number of snapshots read by Cur+ according to its .lis file."""
+    with open(lis_path) as lis_file:
+        for line in lis_file:
+            match = re.search(r"loop read\s+(\d+)\s+snapshots", line)
+            if match:
+                return int(match.group(1))
+    return 0
+
+
+def fix_lis_header(lis_path, itst, itnd, snapshots):
+    """Rewrite ITST, ITND and the number of snapshots of a Cur+ .lis file
+    keeping the original column widths."""
+
+    def replace(value):
+        return lambda m: m.group(1) + str(value).rjust(len(m.group(2)))
+
+    with open(lis_path) as lis_file:
+        lis = lis_file.read()
+    lis = re.sub(r"(ITST\s+:)(\s*\d+)", replace(itst), lis)
+    lis = re.sub(r"(ITND\s+:)(\s*\d+)", replace(itnd), lis)
+    lis = re.sub(r"(loop read)(\s+\d+)", replace(snapshots), lis)
+    with open(lis_path, "w") as lis_file:
+        lis_file.write(lis)
+
+
+def concatenate_chunk_files(workdir, chunk_dirs, names):
+    """Concatenate, in chunk order, the named files of each chunk directory
+    into a file with the same name in workdir.
+
+    This is only valid for files written as a sequence of per-snapshot records
+    without a file header or trailer, as the Cur+ .cda file. Files with a
+    header, as the .afr axis frames, must not be merged this way."""
+    workdir = Path(workdir)
+    for name in names:
+        parts = [workdir / chunk_dir / name for chunk_dir in chunk_dirs]
+        missing = [str(part) for part in parts if not part.exists()]
+        if missing:
+            raise ValueError(f"{name} not found in chunk directories: {', '.join(missing)}")
+        with open(workdir / name, "wb") as merged_file:
+            for part in parts:
+                with open(part, "rb") as part_file:
+                    shutil.copyfileobj(part_file, merged_file)
+
+
+def merge_series(ser_paths, merged_path):
+    """Join, in window order, the Canal .ser files of consecutive snapshot windows.
+
+    The first column of each window is shifted so that snapshot indices keep
+    increasing with the same step across windows, the rest of every line is
+    copied verbatim."""
+    last_index, step = None, 1
+    with open(merged_path, "w") as merged_file:
+        for ser_path in ser_paths:
+            with open(ser_path) as ser_file:
+                lines = ser_file.read().splitlines()
+            if not lines:
+                continue
+            first_index = int(lines[0].split()[0])
+            if last_index is None:
+                offset = 0
+                if len(lines) > 1:
+                    step = int(lines[1].split()[0]) - first_index
+            else:
+                offset = last_index + step - first_index
+            for line in lines:
+                index = line.split()[0]
+                width = line.index(index) + len(index)
+                last_index = int(index) + offset
+                merged_file.write(f"{last_index:>{width}d}{line[width:]}\n")
+
+
+def merge_histograms(his_paths, snapshots, merged_path):
+    """Recombine the Canal .his files of consecutive snapshot windows.
+
+    Each window is weighted by its number of snapshots. All windows must share
+    the same bins, a ValueError is raised otherwise as the counts of a bin can
+    not be split between the bins of another grid."""
+    histograms = [np.loadtxt(his_path, ndmin=2) for his_path in his_paths]
+    weights = np.asarray(snapshots, dtype=float) / np.sum(snapshots)
+    centers = histograms[0][:, 0]
+    if not all(np.array_equal(his[:, 0], centers) for his in histograms):
+        raise ValueError(
+            f"bins of {Path(merged_path).name} differ between snapshot windows, "
+            "use num_workers=1")
+    values = sum(w * his[:, 1:] for w, his in zip(weights, histograms))
+    merged = np.column_stack([centers, values])
+    np.savetxt(merged_path, merged, fmt=["%10.2f"] + ["%8.2f"] * values.shape[1], delimiter="")
+
+
+def merge_window_outputs(workdir, chunk_dirs, pattern, snapshots):
+    """Merge, in workdir, the files matching pattern written in each window
+    directory: .ser files are joined with merge_series and .his files are
+    recombined with merge_histograms.
+
+    Returns the list of the other file names, which are left unmerged."""
+    workdir = Path(workdir)
+    chunk_paths = [workdir / chunk_dir for chunk_dir in chunk_dirs]
+    unmerged = []
+    for outfile in sorted(chunk_paths[0].glob(pattern)):
+        parts = [chunk_path / outfile.name for chunk_path in chunk_paths]
+        if outfile.suffix == ".ser":
+            merge_series(parts, workdir / outfile.name)
+        elif outfile.suffix == ".his":
+            merge_histograms(parts, snapshots, workdir / outfile.name)
+        else:
+            unmerged.append(outfile.name)
+    return unmerged
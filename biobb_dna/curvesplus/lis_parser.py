@@ -0,0 +1,200 @@
+"""Parser for the .lis output files of Curves+."""
+import re
+from collections import namedtuple
+
+import numpy as np
+
+# column names of the lettered sections written by Cur+ for single structures
+SECTION_COLUMNS = {
+    "A": ["Xdisp", "Ydisp", "Inclin", "Tip", "Ax-bend"],
+    "B": ["Shear", "Stretch", "Stagger", "Buckle", "Propel", "Opening"],
+    "C": ["Shift", "Slide", "Rise", "Tilt", "Roll", "Twist", "H-Ris", "H-Twi"],
+    "D": ["Alpha", "Beta", "Gamma", "Delta", "Epsil", "Zeta", "Chi", "Phase", "Ampli", "Puckr"],
+    "E": ["W12", "D12", "W21", "D21"],
+}
+SECTION_NAMES = {
+    "bp_axis": "A",
+    "intra_bp": "B",
+    "inter_bp": "C",
+    "backbone": "D",
+    "groove": "E",
+}
+
+SECTION_RE = re.compile(rb"^\s*\(([A-Z])\)\s*(.*?)\s*$")
+ROW_RE = re.compile(r"^\s*(\d+)\)\s+(.*)$")
+STRAND_RE = re.compile(r"Strand\s+(\d+)\s+has\s+(\d+)\s+bases\s+\((\S+)\):\s*(\S*)")
+SNAPSHOTS_RE = re.compile(r"loop read\s+(\d+)\s+snapshots")
+LEVELS_RE = re.compile(r"Combined strands have\s+(\d+)\s+levels")
+FIELD_RE = re.compile(r"([A-Za-z][\w-]*)\s+:\s+(\S*)")
+
+LisSection = namedtuple("LisSection", ["title", "columns", "labels", "values"])
+LisStrand = namedtuple("LisStrand", ["bases", "direction", "sequence"])
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except ValueError:
+        return np.nan
+
+
+class LisFile:
+    """Lazy, indexed reader of a Cur+ .lis file.
+
+    The byte offset of each lettered section is recorded the first time the
+    file is scanned, and the scan stops as soon as the requested section has
+    been delimited, so reading the header or one section does not need to go
+    through the rest of the file.
+
+    Args:
+        lis_path (str): Path to the .lis file.
+    """
+
+    def __init__(self, lis_path):
+        self.lis_path = lis_path
+        # section letter -> (title, start offset, end offset)
+        self._sections = {}
+        self._header_end = None
+        self._scan_offset = 0
+        self._scan_done = False
+        self._last_section = None
+
+    def _scan(self, until=None):
+        """Index section offsets until section `until` is delimited (or EOF)."""
+        if self._scan_done or (until is not None and self._delimited(until)):
+            return
+        with open(self.lis_path, "rb") as lis_file:
+            lis_file.seek(self._scan_offset)
+            while True:
+                offset = lis_file.tell()
+                line = lis_file.readline()
+                if not line:
+                    self._close_section(offset)
+                    if self._header_end is None:
+                        self._header_end = offset
+                    self._scan_done = True
+                    break
+                match = SECTION_RE.match(line)
+                if match is None:
+                    continue
+                self._close_section(offset)
+                if self._header_end is None:
+                    self._header_end = offset
+                letter = match.group(1).decode()
+                self._sections[letter] = (match.group(2).decode(), offset, None)
+                self._last_section = letter
+                self._scan_offset = lis_file.tell()
+                if until is not None and self._delimited(until):
+                    break
+            self._scan_offset = lis_file.tell()
+
+    def _close_section(self, offset):
+        if self._last_section is not None:
+            title, start, _ = self._sections[self._last_section]
+            self._sections[self._last_section] = (title, start, offset)
+            self._last_section = None
+
+    def _delimited(self, key):
+        if key == "header":
+            return self._header_end is not None
+        return key in self._sections and self._sections[key][2] is not None
+
+    def _read(self, start, end):
+        with open(self.lis_path, "rb") as lis_file:
+            lis_file.seek(start)
+            text = lis_file.read(end - start)
+        return text.decode(errors="replace").splitlines()
+
+    def header_lines(self):
+        """Lines before the first lettered section."""
+        self._scan("header")
+        return self._read(0, self._header_end)
+
+    def header(self):
+        """Dictionary of the `KEY : value` fields of the header (values as strings)."""
+        fields = {}
+        for line in self.header_lines():
+            for key, value in FIELD_RE.findall(line):
+                fields.setdefault(key, value)
+        return fields
+
+    def strands(self):
+        """Dictionary of LisStrand(bases, direction, sequence) by strand number."""
+        strands = {}
+        for line in self.header_lines():
+            match = STRAND_RE.search(line)
+            if match:
+                number, bases, direction, sequence = match.groups()
+                strands[int(number)] = LisStrand(int(bases), direction, sequence)
+        return strands
+
+    def sequence(self, strand=1):
+        """Sequence of bases of a strand, as written in the header."""
+        strands = self.strands()
+        if strand not in strands:
+            raise ValueError(f"strand {strand} not found in {self.lis_path}")
+        return strands[strand].sequence
+
+    def levels(self):
+        """Number of levels of the combined strands, or None if not found."""
+        for line in self.header_lines():
+            match = LEVELS_RE.search(line)
+            if match:
+                return int(match.group(1))
+        return None
+
+    def snapshots(self):
+        """Number of trajectory snapshots read, or None for single structures."""
+        for line in self.header_lines():
+            match = SNAPSHOTS_RE.search(line)
+            if match:
+                return int(match.group(1))
+        return None
+
+    def sections(self):
+        """Letters of all the sections in the file."""
+        self._scan()
+        return list(self._sections)
+
+    def section(self, key):
+        """Read one section as a LisSection(title, columns, labels, values).
+
+        key is a section letter ('A' to 'E') or one of the names in
+        SECTION_NAMES. values is a (rows, columns) float array, with NaN for
+        missing or non numeric entries."""
+        letter = SECTION_NAMES.get(key, key)
+        self._scan(letter)
+        if letter not in self._sections:
+            raise ValueError(f"section ({letter}) not found in {self.lis_path}")
+        title, start, end = self._sections[letter]
+        lines = self._read(start, end)
+
+        columns = None
+        known = SECTION_COLUMNS.get(letter, [])
+        labels, rows = [], []
+        for line in lines[1:] if len(lines) > 1 else []:
+            match = ROW_RE.match(line)
+            if match is None:
+                tokens = line.split()
+                if columns is None and known and any(name in tokens for name in known):
+                    columns = tokens[min(tokens.index(n) for n in known if n in tokens):]
+                elif columns is None and tokens and not known:
+                    columns = tokens[1:]
+                continue
+            if columns is None:
+                # column names on the section line itself
+                tokens = title.split()
+                names = [n for n in known if n in tokens]
+                columns = tokens[tokens.index(names[0]):] if names else tokens[1:]
+                title = " ".join(tokens[:len(tokens) - len(columns)])
+            tokens = match.group(2).split()
+            labels.append(" ".join(tokens[:len(tokens) - len(columns)]))
+            rows.append([_to_float(value) for value in tokens[len(tokens) - len(columns):]])
+        columns = columns or []
+        values = np.array(rows, dtype=float).reshape(len(rows), len(columns))
+        return LisSection(title, columns, labels, values)
+
+
+def read_sequence(lis_path, strand=1):
+    """Sequence of a strand read from the header of a Cur+ .lis file."""
+    return LisFile(lis_path).sequence(strand)
@@ -1,6 +1,9 @@
 from . import dna_averages
+from . import dna_averages_batch
 from . import dna_bimodality
+from . import dna_rolling
+from . import dna_suite
 from . import dna_timeseries
 from . import dna_timeseries_unzip
 name = "dna"
-__all__ = ["dna_averages", "dna_bimodality", "dna_timeseries", "dna_timeseries_unzip"]
+__all__ = ["dna_averages", "dna_averages_batch", "dna_bimodality", "dna_rolling", "dna_suite", "dna_timeseries", "dna_timeseries_unzip"]
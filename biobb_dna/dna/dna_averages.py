@@ -12,10 +12,12 @@ from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class HelParAverages(BiobbObject):
+class HelParAverages(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna HelParAverages
     | Load .ser file for a given helical parameter and read each column corresponding to a base calculating average over each one.
@@ -30,6 +32,7 @@ class HelParAverages(BiobbObject):
             * **helpar_name** (*str*) - (Optional) helical parameter name.
             * **stride** (*int*) - (1000) granularity of the number of snapshots for plotting time series.
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -150,62 +153,25 @@ class HelParAverages(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input .ser file
-        ser_data = read_series(
-            self.stage_io_dict["in"]["input_ser_path"], usecols=self.seqpos
+        self.start_phase("parse")
+        ser_data = read_series(self.stage_io_dict["in"]["input_ser_path"])
+        self.start_phase("compute")
+        dataset = averages_table(
+            ser_data, self.sequence, self.helpar_name, self.seqpos
         )
-        if not self.seqpos:
-            ser_data = ser_data[ser_data.columns[1:-1]]
-            # discard first and last base(pairs) from sequence
-            sequence = self.sequence[1:]
-            xlabels = [
-                f"{sequence[i:i+1+self.baselen]}"
-                for i in range(len(ser_data.columns) - self.baselen)
-            ]
-        else:
-            sequence = self.sequence
-            xlabels = [f"{sequence[i:i+1+self.baselen]}" for i in self.seqpos]
-
-        # rename duplicated subunits
-        while any(pd.Index(ser_data.columns).duplicated()):
-            ser_data.columns = [
-                name if not duplicated else name + "_dup"
-                for duplicated, name in zip(
-                    pd.Index(ser_data.columns).duplicated(), ser_data.columns
-                )
-            ]
-
-        # write output files for all selected bases
-        means = ser_data.mean(axis=0).iloc[: len(xlabels)]
-        stds = ser_data.std(axis=0).iloc[: len(xlabels)]
 
         # save plot
-        fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
-        axs.errorbar(
-            means.index, means.to_numpy(), yerr=stds.to_numpy(), marker="o", capsize=5
-        )
-        axs.set_xticks(means.index)
-        axs.set_xticklabels(xlabels, rotation=90)
-        axs.set_xlabel("Sequence Base Pair " f"{'Step' if self.baselen == 1 else ''}")
-        axs.set_ylabel(f"{self.helpar_name.capitalize()} ({self.hp_unit})")
-        axs.set_title(
-            "Base Pair "
-            f"{'Step' if self.baselen == 1 else ''} "
-            f"Helical Parameter: {self.helpar_name.capitalize()}"
+        self.start_phase("render")
+        plot_helpar_averages(
+            dataset["mean"], dataset["std"], dataset.iloc[:, 0].tolist(),
+            self.helpar_name, self.baselen, self.hp_unit,
+            self.stage_io_dict["out"]["output_jpg_path"],
         )
-        fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
 
         # save table
-        dataset = pd.DataFrame(
-            {
-                f"Base Pair {'Step' if self.baselen == 1 else ''}": xlabels,
-                "mean": means.to_numpy(),
-                "std": stds.to_numpy(),
-            }
-        )
+        self.start_phase("archive")
         dataset.to_csv(self.stage_io_dict["out"]["output_csv_path"], index=False)
 
-        plt.close()
-
         # Copy files to host
         self.copy_to_host()
 
@@ -217,6 +183,76 @@ class HelParAverages(BiobbObject):
         return 0
 
 
+def helpar_averages(ser_data, sequence, baselen, seqpos=None):
+    """Mean and standard deviation of each base (pair) of a helical parameter series.
+
+    If seqpos is not given, the first and last base (pairs) are discarded.
+    Returns the list of sequence labels and the means and standard deviations
+    as pandas Series."""
+    if not seqpos:
+        ser_data = ser_data[ser_data.columns[1:-1]]
+        # discard first and last base(pairs) from sequence
+        sequence = sequence[1:]
+        xlabels = [
+            f"{sequence[i:i+1+baselen]}"
+            for i in range(len(ser_data.columns) - baselen)
+        ]
+    else:
+        xlabels = [f"{sequence[i:i+1+baselen]}" for i in seqpos]
+
+    # rename duplicated subunits
+    while any(pd.Index(ser_data.columns).duplicated()):
+        ser_data.columns = [
+            name if not duplicated else name + "_dup"
+            for duplicated, name in zip(
+                pd.Index(ser_data.columns).duplicated(), ser_data.columns
+            )
+        ]
+
+    means = ser_data.mean(axis=0).iloc[: len(xlabels)]
+    stds = ser_data.std(axis=0).iloc[: len(xlabels)]
+    return xlabels, means, stds
+
+
+def averages_table(ser_data, sequence, helpar_name, seqpos=None):
+    """Table of the mean and standard deviation of each base (pair) of a
+    helical parameter, as saved by dna_averages.
+
+    ser_data is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. The rows of the table are indexed by the
+    columns of ser_data."""
+    baselen = 1 if helpar_name in constants.hp_basepairs else 0
+    ser_data = select_series(series_frame(ser_data), list(seqpos) if seqpos else None)
+    xlabels, means, stds = helpar_averages(ser_data, sequence, baselen, seqpos or None)
+    return pd.DataFrame(
+        {
+            f"Base Pair {'Step' if baselen == 1 else ''}": xlabels,
+            "mean": means,
+            "std": stds,
+        },
+        index=means.index,
+    )
+
+
+def plot_helpar_averages(means, stds, xlabels, helpar_name, baselen, hp_unit, output_jpg_path):
+    """Save the mean and standard deviation of each base (pair) as an errorbar plot."""
+    fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
+    axs.errorbar(
+        means.index, means.to_numpy(), yerr=stds.to_numpy(), marker="o", capsize=5
+    )
+    axs.set_xticks(means.index)
+    axs.set_xticklabels(xlabels, rotation=90)
+    axs.set_xlabel("Sequence Base Pair " f"{'Step' if baselen == 1 else ''}")
+    axs.set_ylabel(f"{helpar_name.capitalize()} ({hp_unit})")
+    axs.set_title(
+        "Base Pair "
+        f"{'Step' if baselen == 1 else ''} "
+        f"Helical Parameter: {helpar_name.capitalize()}"
+    )
+    fig.savefig(output_jpg_path, format="jpg")
+    plt.close(fig)
+
+
 def dna_averages(
     input_ser_path: str,
     output_csv_path: str,
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+
+"""Module containing the HelParAveragesBatch class and the command line interface."""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools import file_utils as fu
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.dna.dna_averages import helpar_averages, plot_helpar_averages
+from biobb_dna.utils import constants
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import ARCHIVE_SEPARATOR, open_archive, read_series
+from biobb_dna.utils.profiling import LaunchProfiler
+
+
+class HelParAveragesBatch(LaunchProfiler, BiobbObject):
+    """
+    | biobb_dna HelParAveragesBatch
+    | Calculate average values for each base pair of all the helical parameters of a Canal output.
+    | Load every .ser file of a Canal output .zip file or directory, calculate the mean and standard deviation of each base pair for all of them in a single process and save them in a long-format .csv file.
+
+    Args:
+        input_zip_file (str) (Optional): .zip file with the canal_output_<helpar>.ser files of a Canal run. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        input_ser_dir (dir) (Optional): Directory with the canal_output_<helpar>.ser files of a Canal run, used if input_zip_file is not given. File type: input. Accepted formats: directory (edam:format_1915).
+        output_csv_path (str): Path to .csv file where the helical parameter, position, base (pair step), mean and standard deviation of each base pair of every helical parameter are saved. File type: output. Accepted formats: csv (edam:format_3752).
+        output_jpg_dir (dir) (Optional): Directory where the plot of the averages of each helical parameter is saved as <helpar>_avg.jpg. File type: output. Accepted formats: directory (edam:format_1915).
+        properties (dict):
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser files. Length of sequence is expected to be the same as the total number of columns in the .ser files, minus the index column.
+            * **helpar_name** (*list*) - (None) list of helical parameter names to analyze. If not specified all the base pair and base pair step helical parameters found in the input are analyzed.
+            * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **num_workers** (*int*) - (1) Number of threads reading the .ser files concurrently.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.dna.dna_averages_batch import dna_averages_batch
+
+            prop = {
+                'sequence': 'GCAT',
+                'num_workers': 4
+            }
+            dna_averages_batch(
+                input_zip_file='/path/to/canal_output.zip',
+                output_csv_path='/path/to/table/output.csv',
+                output_jpg_dir='/path/to/plots',
+                properties=prop)
+
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        output_csv_path,
+        input_zip_file=None,
+        input_ser_dir=None,
+        output_jpg_dir=None,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_zip_file": input_zip_file,
+                "input_ser_dir": input_ser_dir,
+            },
+            "out": {
+                "output_csv_path": output_csv_path,
+                "output_jpg_dir": output_jpg_dir,
+            },
+        }
+
+        # Properties specific for BB
+        self.properties = properties
+        self.sequence = properties.get("sequence", None)
+        self.helpar_name = _from_string_to_list(properties.get("helpar_name", None))
+        self.seqpos = [
+            int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
+        ]
+        self.num_workers = int(properties.get("num_workers", 1))
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    def ser_files(self):
+        """Dictionary of the path of the .ser file of each helical parameter
+        found in the input, keyed by helical parameter name."""
+        zip_path = self.stage_io_dict["in"].get("input_zip_file")
+        if zip_path:
+            names = open_archive(zip_path).namelist()
+            paths = [f"{zip_path}{ARCHIVE_SEPARATOR}{name}" for name in names]
+        else:
+            names = sorted(os.listdir(self.stage_io_dict["in"]["input_ser_dir"]))
+            paths = [
+                os.path.join(self.stage_io_dict["in"]["input_ser_dir"], name)
+                for name in names]
+        ser_files = {}
+        for name, path in zip(names, paths):
+            if not name.endswith(".ser"):
+                continue
+            helpar = Path(name).stem.split("_")[-1]
+            if helpar in constants.hp_basepairs + constants.hp_singlebases:
+                ser_files[helpar] = path
+        return ser_files
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`HelParAveragesBatch <dna.dna_averages_batch.HelParAveragesBatch>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check inputs
+        if not (self.stage_io_dict["in"].get("input_zip_file") or self.stage_io_dict["in"].get("input_ser_dir")):
+            raise ValueError("input_zip_file or input_ser_dir must be provided!")
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check seqpos
+        if self.seqpos:
+            if (max(self.seqpos) > len(self.sequence) - 2) or (min(self.seqpos) < 1):
+                raise ValueError(
+                    f"seqpos values must be between 1 and {len(self.sequence) - 2}"
+                )
+            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
+                raise ValueError("seqpos must be a list of at least two integers")
+        else:
+            self.seqpos = None  # type: ignore
+
+        # select helical parameters
+        ser_files = self.ser_files()
+        if self.helpar_name:
+            for helpar in self.helpar_name:
+                if helpar not in ser_files:
+                    raise ValueError(
+                        f"No .ser file found for helical parameter {helpar}! "
+                        f"Found: {list(ser_files)}"
+                    )
+            ser_files = {helpar: ser_files[helpar] for helpar in self.helpar_name}
+        if not ser_files:
+            raise ValueError("No helical parameter .ser files found in the input!")
+        fu.log(
+            f"Calculating averages of {len(ser_files)} helical parameters: "
+            f"{', '.join(ser_files)}",
+            self.out_log,
+        )
+
+        # read all .ser files, several of them at the same time
+        self.start_phase("parse")
+        with ThreadPoolExecutor(max_workers=max(1, self.num_workers)) as pool:
+            series = pool.map(
+                lambda path: read_series(path, usecols=self.seqpos),
+                ser_files.values(),
+            )
+            series = dict(zip(ser_files, series))
+
+        output_jpg_dir = self.stage_io_dict["out"].get("output_jpg_dir")
+        if output_jpg_dir:
+            os.makedirs(output_jpg_dir, exist_ok=True)
+
+        tables = []
+        for helpar, ser_data in series.items():
+            baselen = 1 if helpar in constants.hp_basepairs else 0
+            hp_unit = "Degrees" if helpar in constants.hp_angular else "Angstroms"
+            self.start_phase("compute")
+            xlabels, means, stds = helpar_averages(
+                ser_data, self.sequence, baselen, self.seqpos
+            )
+            tables.append(
+                pd.DataFrame(
+                    {
+                        "helpar": helpar,
+                        "position": means.index,
+                        "base": xlabels,
+                        "mean": means.to_numpy(),
+                        "std": stds.to_numpy(),
+                    }
+                )
+            )
+            if output_jpg_dir:
+                self.start_phase("render")
+                plot_helpar_averages(
+                    means, stds, xlabels, helpar, baselen, hp_unit,
+                    os.path.join(output_jpg_dir, f"{helpar}_avg.jpg"),
+                )
+
+        # save long-format table
+        self.start_phase("archive")
+        dataset = pd.concat(tables, ignore_index=True)
+        dataset.to_csv(self.stage_io_dict["out"]["output_csv_path"], index=False)
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+
+def dna_averages_batch(
+    output_csv_path: str,
+    input_zip_file: Optional[str] = None,
+    input_ser_dir: Optional[str] = None,
+    output_jpg_dir: Optional[str] = None,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`HelParAveragesBatch <dna.dna_averages_batch.HelParAveragesBatch>` class and
+    execute the :meth:`launch() <dna.dna_averages_batch.HelParAveragesBatch.launch>` method."""
+    return HelParAveragesBatch(**dict(locals())).launch()
+
+
+dna_averages_batch.__doc__ = HelParAveragesBatch.__doc__
+main = HelParAveragesBatch.get_main(dna_averages_batch, "Load all the helical parameter files of a Canal output and calculate average values for each base pair.")
+
+if __name__ == '__main__':
+    main()
@@ -2,7 +2,6 @@
 
 """Module containing the HelParBimodality class and the command line interface."""
 import os
-import zipfile
 from typing import Optional
 from pathlib import Path
 
@@ -13,10 +12,11 @@ from sklearn.mixture import GaussianMixture  # type: ignore
 from biobb_dna.utils import constants
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
-from biobb_dna.utils.loader import load_data
+from biobb_dna.utils.loader import ArchiveMemberInputs, load_data, timeseries_frame
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class HelParBimodality(BiobbObject):
+class HelParBimodality(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna HelParBimodality
     | Determine binormality/bimodality from a helical parameter series dataset.
@@ -24,7 +24,7 @@ class HelParBimodality(BiobbObject):
 
     Args:
         input_csv_file (str): Path to .csv file with helical parameter series. If `input_zip_file` is passed, this should be just the filename of the .csv file inside .zip.  File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/dna/series_shift_AT.csv>`_. Accepted formats: csv (edam:format_3752).
-        input_zip_file (str) (Optional): .zip file containing the `input_csv_file` .csv file. File type: input. Accepted formats: zip (edam:format_3987).
+        input_zip_file (str) (Optional): .zip file containing the `input_csv_file` .csv file, or .npz file of dna_timeseries containing its table. File type: input. Accepted formats: zip (edam:format_3987), npz (edam:format_4003).
         output_csv_path (str): Path to .csv file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/AT_shift_bimod.csv>`_. Accepted formats: csv (edam:format_3752).
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/AT_shift_bimod.jpg>`_. Accepted formats: jpg (edam:format_3579).
         properties (dict):
@@ -32,6 +32,7 @@ class HelParBimodality(BiobbObject):
             * **confidence_level** (*float*) - (5.0) Confidence level for Byes Factor test (in percentage).
             * **max_iter** (*int*) - (400) Number of maximum iterations for EM algorithm.
             * **tol** (*float*) - (1e-5) Tolerance value for EM algorithm.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.1
@@ -143,51 +144,25 @@ class HelParBimodality(BiobbObject):
         os.chdir(self.stage_io_dict.get("unique_dir", ""))
 
         # read input
+        self.start_phase("parse")
+        data_filename = Path(self.stage_io_dict['in']['input_csv_file']).name
         if self.stage_io_dict.get("in", {}).get("input_zip_file") is not None:
-            # if zipfile is specified, extract to temporary folder
-            with zipfile.ZipFile(
-                    self.stage_io_dict['in']['input_zip_file'],
-                    'r') as zip_ref:
-                zip_ref.extractall(self.stage_io_dict.get("unique_dir", ""))
+            # if zipfile is specified, read the .csv file without extracting it
+            data_filename = f"{self.stage_io_dict['in']['input_zip_file']}::{data_filename}"
+        data = load_data(data_filename)
 
-        data = load_data(Path(self.stage_io_dict['in']['input_csv_file']).name)
-
-        means, variances, bics, weights = self.fit_to_model(data)
-        uninormal, binormal, insuf_ev = self.bayes_factor_criteria(
-            bics[0], bics[1])
-
-        if binormal:
-            maxm = np.argmax(means[1])
-            minm = np.argmin(means[1])
-            mean1 = means[1][minm]
-            var1 = variances[1][minm]
-            w1 = weights[1][minm]
-            mean2 = means[1][maxm]
-            var2 = variances[1][maxm]
-            w2 = weights[1][maxm]
-            bimodal = self.helguero_theorem(mean1, mean2, var1, var2)
-        else:
-            mean1 = means[0][0]
-            var1 = variances[0][0]
-            w1 = weights[0][0]
-            mean2, var2, w2 = np.nan, np.nan, 0
-            bimodal = False
-        info = dict(
-            binormal=binormal,
-            uninormal=uninormal,
-            insuf_ev=insuf_ev,
-            bimodal=bimodal,
-            mean1=mean1,
-            mean2=mean2,
-            var1=var1,
-            var2=var2,
-            w1=w1,
-            w2=w2)
+        self.start_phase("compute")
+        info = helpar_bimodality(
+            data, self.confidence_level, self.max_iter, self.tol)
+        binormal = info['binormal'].iloc[0]
 
         # save tables
-        pd.DataFrame(info, index=data.columns).to_csv(output_csv_path)
+        self.start_phase("archive")
+        info.to_csv(output_csv_path)
+        info = info.iloc[0]
 
         # make and save plot
+        self.start_phase("render")
         data_size = len(data)
         synth1 = np.random.normal(
             loc=info['mean1'],
@@ -239,51 +214,109 @@ class HelParBimodality(BiobbObject):
         Fit data to Gaussian Mixture models.
         Return dictionary with distribution data.
         """
-        means = []
-        variances = []
-        bics = []
-        weights = []
-        for n_components in (1, 2):
-            gmm = GaussianMixture(
-                n_components=n_components,
-                max_iter=self.max_iter,
-                tol=self.tol)
-            gmm = gmm.fit(data)
-            m = gmm.means_.flatten()  # type: ignore
-            v = gmm.covariances_.flatten()  # type: ignore
-            b = gmm.bic(data)
-            w = gmm.weights_.flatten()  # type: ignore
-            means.append(m)
-            variances.append(v)
-            bics.append(b)
-            weights.append(w)
-        return means, variances, bics, weights
+        return fit_to_model(data, self.max_iter, self.tol)
 
     def bayes_factor_criteria(self, bic1, bic2):
-        diff_bic = bic2 - bic1
-        # probability of a two-component model
-        p = 1 / (1 + np.exp(0.5*diff_bic))
-        if p == np.nan:
-            if bic1 == np.nan:
-                p = 1
-            elif bic2 == np.nan:
-                p = 0
-
-        uninormal = p < (self.confidence_level / 100)
-        binormal = p > (1 - (self.confidence_level / 100))
-        insuf_ev = True if (not uninormal and not binormal) else False
-        return uninormal, binormal, insuf_ev
+        return bayes_factor_criteria(bic1, bic2, self.confidence_level)
 
     def helguero_theorem(self, mean1, mean2, var1, var2):
-        r = var1 / var2
-        separation_factor = np.sqrt(
-            -2 + 3*r + 3*r**2 - 2*r**3 + 2*(1 - r + r**2)**1.5
-        ) / (
-            np.sqrt(r)*(1+np.sqrt(r))
-        )
-        bimodal = abs(mean2-mean1) > separation_factor * \
-            (np.sqrt(var1) + np.sqrt(var2))
-        return bimodal
+        return helguero_theorem(mean1, mean2, var1, var2)
+
+
+def fit_to_model(data, max_iter=400, tol=1e-5):
+    """
+    Fit data to Gaussian Mixture models of one and two components.
+    Return lists with the means, variances, BIC and weights of each model.
+    """
+    means = []
+    variances = []
+    bics = []
+    weights = []
+    for n_components in (1, 2):
+        gmm = GaussianMixture(
+            n_components=n_components,
+            max_iter=max_iter,
+            tol=tol)
+        gmm = gmm.fit(data)
+        m = gmm.means_.flatten()  # type: ignore
+        v = gmm.covariances_.flatten()  # type: ignore
+        b = gmm.bic(data)
+        w = gmm.weights_.flatten()  # type: ignore
+        means.append(m)
+        variances.append(v)
+        bics.append(b)
+        weights.append(w)
+    return means, variances, bics, weights
+
+
+def bayes_factor_criteria(bic1, bic2, confidence_level=5.0):
+    diff_bic = bic2 - bic1
+    # probability of a two-component model
+    p = 1 / (1 + np.exp(0.5*diff_bic))
+    if p == np.nan:
+        if bic1 == np.nan:
+            p = 1
+        elif bic2 == np.nan:
+            p = 0
+
+    uninormal = p < (confidence_level / 100)
+    binormal = p > (1 - (confidence_level / 100))
+    insuf_ev = True if (not uninormal and not binormal) else False
+    return uninormal, binormal, insuf_ev
+
+
+def helguero_theorem(mean1, mean2, var1, var2):
+    r = var1 / var2
+    separation_factor = np.sqrt(
+        -2 + 3*r + 3*r**2 - 2*r**3 + 2*(1 - r + r**2)**1.5
+    ) / (
+        np.sqrt(r)*(1+np.sqrt(r))
+    )
+    bimodal = abs(mean2-mean1) > separation_factor * \
+        (np.sqrt(var1) + np.sqrt(var2))
+    return bimodal
+
+
+def helpar_bimodality(data, confidence_level=5.0, max_iter=400, tol=1e-5):
+    """Binormality and bimodality of a helical parameter time series, as
+    saved by dna_bimodality.
+
+    data is a one-dimensional array or a single column DataFrame, as read by
+    load_data from a time series .csv file of dna_timeseries. Returns a
+    DataFrame with one row, indexed by the column of data."""
+    data = timeseries_frame(data)
+    means, variances, bics, weights = fit_to_model(data, max_iter, tol)
+    uninormal, binormal, insuf_ev = bayes_factor_criteria(
+        bics[0], bics[1], confidence_level)
+
+    if binormal:
+        maxm = np.argmax(means[1])
+        minm = np.argmin(means[1])
+        mean1 = means[1][minm]
+        var1 = variances[1][minm]
+        w1 = weights[1][minm]
+        mean2 = means[1][maxm]
+        var2 = variances[1][maxm]
+        w2 = weights[1][maxm]
+        bimodal = helguero_theorem(mean1, mean2, var1, var2)
+    else:
+        mean1 = means[0][0]
+        var1 = variances[0][0]
+        w1 = weights[0][0]
+        mean2, var2, w2 = np.nan, np.nan, 0
+        bimodal = False
+    info = dict(
+        binormal=binormal,
+        uninormal=uninormal,
+        insuf_ev=insuf_ev,
+        bimodal=bimodal,
+        mean1=mean1,
+        mean2=mean2,
+        var1=var1,
+        var2=var2,
+        w1=w1,
+        w2=w2)
+    return pd.DataFrame(info, index=data.columns)
 
 
 def dna_bimodality(
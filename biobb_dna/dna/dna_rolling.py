@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+
+"""Module containing the HelParRolling class and the command line interface."""
+
+from pathlib import Path
+from typing import Optional
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools import file_utils as fu
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.utils import constants
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import ArchiveMemberInputs, iter_series
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import rolling_window_stats
+
+
+class HelParRolling(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
+    """
+    | biobb_dna HelParRolling
+    | Calculate rolling window statistics over time for each base pair from a helical parameter series file.
+    | Read the .ser file in chunks of snapshots and calculate the mean, standard deviation and, for angular helical parameters, circular mean of each window of consecutive snapshots for each base pair, saving one out of every stride windows in a .csv file.
+
+    Args:
+        input_ser_path (str): Path to .ser file for helical parameter. File is expected to be a table, with the first column being an index and the rest the helical parameter values for each base/basepair. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/dna/canal_output_shift.ser>`_. Accepted formats: ser (edam:format_2330).
+        output_csv_path (str): Path to .csv file where the snapshot at the end of each saved window, position, base (pair step), mean, standard deviation and, for angular helical parameters, circular mean of each base pair are saved. File type: output. Accepted formats: csv (edam:format_3752).
+        output_jpg_path (str) (Optional): Path to .jpg file where the heatmap of the rolling mean of each base pair over time is saved. File type: output. Accepted formats: jpg (edam:format_3579).
+        properties (dict):
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
+            * **helpar_name** (*str*) - (Optional) helical parameter name.
+            * **window** (*int*) - (1000) Number of consecutive snapshots of each window.
+            * **stride** (*int*) - (100) Save the statistics of one out of every stride windows.
+            * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **chunksize** (*int*) - (100000) Number of snapshots of the .ser file read at once.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.dna.dna_rolling import dna_rolling
+
+            prop = {
+                'helpar_name': 'twist',
+                'sequence': 'GCAT',
+                'window': 500,
+                'stride': 50
+            }
+            dna_rolling(
+                input_ser_path='/path/to/twist.ser',
+                output_csv_path='/path/to/table/output.csv',
+                output_jpg_path='/path/to/table/output.jpg',
+                properties=prop)
+
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        input_ser_path,
+        output_csv_path,
+        output_jpg_path=None,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_ser_path": input_ser_path,
+            },
+            "out": {
+                "output_csv_path": output_csv_path,
+                "output_jpg_path": output_jpg_path,
+            },
+        }
+
+        # Properties specific for BB
+        self.properties = properties
+        self.sequence = properties.get("sequence", None)
+        self.window = int(properties.get("window", 1000))
+        self.stride = int(properties.get("stride", 100))
+        self.seqpos = [
+            int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
+        ]
+        self.chunksize = int(properties.get("chunksize", 100000))
+        self.helpar_name = properties.get("helpar_name", None)
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`HelParRolling <dna.dna_rolling.HelParRolling>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check window and stride
+        if self.window < 1 or self.stride < 1:
+            raise ValueError("window and stride must be positive integers!")
+
+        # get helical parameter from filename if not specified
+        if self.helpar_name is None:
+            for hp in constants.helical_parameters:
+                ser_name = Path(self.stage_io_dict["in"]["input_ser_path"]).name.lower()
+                if hp.lower() in ser_name:
+                    self.helpar_name = hp
+            if self.helpar_name is None:
+                raise ValueError(
+                    "Helical parameter name can't be inferred from file, "
+                    "so it must be specified!"
+                )
+        else:
+            if self.helpar_name not in constants.helical_parameters:
+                raise ValueError(
+                    "Helical parameter name is invalid! "
+                    f"Options: {constants.helical_parameters}"
+                )
+
+        # get base length and unit from helical parameter name
+        if self.helpar_name.lower() in constants.hp_basepairs:
+            self.baselen = 1
+        else:
+            self.baselen = 0
+        angular = self.helpar_name in constants.hp_angular
+        if angular:
+            self.hp_unit = "Degrees"
+        else:
+            self.hp_unit = "Angstroms"
+
+        # check seqpos
+        if self.seqpos:
+            if (max(self.seqpos) > len(self.sequence) - 2) or (min(self.seqpos) < 1):
+                raise ValueError(
+                    f"seqpos values must be between 1 and {len(self.sequence) - 2}"
+                )
+            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
+                raise ValueError("seqpos must be a list of at least two integers")
+            positions = sorted(self.seqpos)
+        else:
+            # discard first and last base(pairs), as dna_averages
+            positions = list(range(1, len(self.sequence) - 1 - self.baselen))
+        bases = [self.sequence[i:i+1+self.baselen] for i in positions]
+
+        # rolling statistics of each chunk, continuing the windows of the
+        # previous one with its last window - 1 snapshots
+        self.start_phase("parse")
+        snapshots, tables = [], {}
+        tail_values = np.empty((0, len(positions)))
+        tail_index = np.empty(0, dtype=int)
+        offset = 0
+        for chunk in iter_series(
+            self.stage_io_dict["in"]["input_ser_path"],
+            usecols=positions,
+            chunksize=self.chunksize,
+        ):
+            self.start_phase("compute")
+            values = np.concatenate([tail_values, chunk.to_numpy(dtype=float)])
+            index = np.concatenate([tail_index, chunk.index.to_numpy()])
+            stats = rolling_window_stats(values, self.window, angular=angular)
+            # number of windows before the first one of this chunk
+            first = offset - len(tail_values)
+            keep = (first + np.arange(len(values) - self.window + 1)) % self.stride == 0
+            snapshots.append(index[self.window - 1:][keep])
+            for name, array in stats.items():
+                tables.setdefault(name, []).append(array[keep])
+            offset += len(chunk)
+            n_tail = min(self.window - 1, len(values))
+            tail_values = values[len(values) - n_tail:]
+            tail_index = index[len(values) - n_tail:]
+            self.start_phase("parse")
+        if not snapshots or not sum(len(s) for s in snapshots):
+            raise ValueError(
+                f"The .ser file has less snapshots than the window size ({self.window})!"
+            )
+        snapshots = np.concatenate(snapshots)
+        tables = {name: np.concatenate(arrays) for name, arrays in tables.items()}
+        fu.log(
+            f"Calculated rolling statistics of {len(positions)} base pairs "
+            f"for {len(snapshots)} windows of {self.window} snapshots",
+            self.out_log,
+        )
+
+        # save long-format table
+        self.start_phase("archive")
+        dataset = pd.DataFrame(
+            {
+                "snapshot": np.repeat(snapshots, len(positions)),
+                "position": np.tile(positions, len(snapshots)),
+                "base": np.tile(bases, len(snapshots)),
+            }
+        )
+        for name, array in tables.items():
+            dataset[name] = array.ravel()
+        dataset.to_csv(self.stage_io_dict["out"]["output_csv_path"], index=False)
+
+        # save heatmap
+        if self.stage_io_dict["out"].get("output_jpg_path"):
+            self.start_phase("render")
+            fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
+            im = axs.imshow(
+                tables["mean"].T,
+                aspect="auto",
+                origin="lower",
+                interpolation="nearest",
+                extent=(snapshots[0], snapshots[-1], -0.5, len(positions) - 0.5),
+            )
+            fig.colorbar(im, ax=axs, label=f"{self.helpar_name.capitalize()} ({self.hp_unit})")
+            axs.set_yticks(range(len(positions)))
+            axs.set_yticklabels(bases)
+            axs.set_xlabel("Time (Snapshots)")
+            axs.set_ylabel(f"Base Pair {'Step' if self.baselen == 1 else ''}")
+            axs.set_title(
+                f"Rolling Mean: {self.helpar_name.capitalize()} "
+                f"(window of {self.window} snapshots)"
+            )
+            fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
+            plt.close()
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+
+def dna_rolling(
+    input_ser_path: str,
+    output_csv_path: str,
+    output_jpg_path: Optional[str] = None,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`HelParRolling <dna.dna_rolling.HelParRolling>` class and
+    execute the :meth:`launch() <dna.dna_rolling.HelParRolling.launch>` method."""
+    return HelParRolling(**dict(locals())).launch()
+
+
+dna_rolling.__doc__ = HelParRolling.__doc__
+main = HelParRolling.get_main(dna_rolling, "Calculate rolling window statistics over time for each base pair from a helical parameter series file.")
+
+if __name__ == '__main__':
+    main()
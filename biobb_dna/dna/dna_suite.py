@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+
+"""Module containing the DnaSuite class and the command line interface."""
+
+import importlib
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Optional
+
+from biobb_common.generic.biobb_object import BiobbObject
+from biobb_common.tools import file_utils as fu
+from biobb_common.tools.file_utils import launchlogger
+
+from biobb_dna.utils import constants
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.loader import (
+    ARCHIVE_SEPARATOR,
+    open_archive,
+    using_parsed_series,
+)
+from biobb_dna.utils.profiling import LaunchProfiler
+
+INTER_HELPARS = ["shift", "slide", "rise", "tilt", "roll", "twist"]
+INTRA_HELPARS = ["shear", "stretch", "stagger", "buckle", "propel", "opening"]
+# helical parameters analyzed one by one: dna_averages, dna_timeseries and dna_bimodality
+SINGLE_HELPARS = constants.hp_basepairs + constants.hp_singlebases
+
+# module of the building block of each analysis, named as its function
+ANALYSES = {
+    "dna_averages": "biobb_dna.dna.dna_averages",
+    "dna_timeseries": "biobb_dna.dna.dna_timeseries",
+    "dna_bimodality": "biobb_dna.dna.dna_bimodality",
+    "interseqcorr": "biobb_dna.interbp_correlations.interseqcorr",
+    "intraseqcorr": "biobb_dna.intrabp_correlations.intraseqcorr",
+    "interbpcorr": "biobb_dna.interbp_correlations.interbpcorr",
+    "intrabpcorr": "biobb_dna.intrabp_correlations.intrabpcorr",
+    "interhpcorr": "biobb_dna.interbp_correlations.interhpcorr",
+    "intrahpcorr": "biobb_dna.intrabp_correlations.intrahpcorr",
+    "average_stiffness": "biobb_dna.stiffness.average_stiffness",
+    "basepair_stiffness": "biobb_dna.stiffness.basepair_stiffness",
+    "bipopulations": "biobb_dna.backbone.bipopulations",
+    "canonicalag": "biobb_dna.backbone.canonicalag",
+    "puckering": "biobb_dna.backbone.puckering",
+}
+# analyses of a single .ser file, run for each selected helical parameter
+SER_ANALYSES = {
+    "dna_averages": SINGLE_HELPARS,
+    "dna_timeseries": SINGLE_HELPARS,
+    "interseqcorr": INTER_HELPARS,
+    "intraseqcorr": INTRA_HELPARS,
+    "average_stiffness": INTER_HELPARS,
+}
+# analyses of several .ser files, with the name of the input of each one
+GROUP_ANALYSES = {
+    "interbpcorr": {hp: f"input_filename_{hp}" for hp in INTER_HELPARS},
+    "intrabpcorr": {hp: f"input_filename_{hp}" for hp in INTRA_HELPARS},
+    "bipopulations": {hp: f"input_{hp}_path" for hp in ["epsilC", "epsilW", "zetaC", "zetaW"]},
+    "canonicalag": {hp: f"input_{hp}_path" for hp in ["alphaC", "alphaW", "gammaC", "gammaW"]},
+    "puckering": {hp: f"input_{hp}_path" for hp in ["phaseC", "phaseW"]},
+}
+# analyses of the series of a base (pair step) saved by dna_timeseries
+SERIES_ANALYSES = {
+    "interhpcorr": INTER_HELPARS,
+    "intrahpcorr": INTRA_HELPARS,
+    "basepair_stiffness": INTER_HELPARS,
+}
+# analyses without the sequence property
+NO_SEQUENCE = ["dna_bimodality", "interhpcorr", "intrahpcorr", "basepair_stiffness"]
+
+
+def run_task(task):
+    """Run a task of the suite in its working directory: parse a .ser file or
+    launch a building block, reading the .ser files already parsed from
+    their .npy files."""
+    original_directory = os.getcwd()
+    os.makedirs(task["cwd"], exist_ok=True)
+    os.chdir(task["cwd"])
+    try:
+        if task.get("extract"):
+            zip_path, member = task["extract"]
+            open_archive(zip_path).extract(member, task["cwd"])
+        with using_parsed_series(task.get("parsed", [])):
+            function = getattr(importlib.import_module(task["module"]), task["function"])
+            return function(**task["kwargs"])
+    finally:
+        os.chdir(original_directory)
+
+
+class DnaSuite(LaunchProfiler, BiobbObject):
+    """
+    | biobb_dna DnaSuite
+    | Run a selection of the helical parameter and backbone analyses of a Canal output in a single step.
+    | Plan the analyses as a graph of tasks that parses each .ser file of the Canal output .zip file only once, and run them concurrently on a pool of processes sharing the parsed values as read-only memory maps. The output files of each analysis are the same as those of its building block, and are saved in a .zip file in a folder named as the analysis.
+
+    Args:
+        input_zip_file (str): .zip file with the canal_output_<helpar>.ser files of a Canal run. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/curvesplus/canal_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        output_zip_path (str): Path to .zip file where the output files of all the analyses are saved, as <analysis>/<file>. File type: output. Accepted formats: zip (edam:format_3987).
+        properties (dict):
+            * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser files. Length of sequence is expected to be the same as the total number of columns in the .ser files, minus the index column.
+            * **analyses** (*list*) - (None) list of analyses to run. If not specified all of them are run. Values: dna_averages, dna_timeseries, dna_bimodality, interseqcorr, intraseqcorr, interbpcorr, intrabpcorr, interhpcorr, intrahpcorr, average_stiffness, basepair_stiffness, bipopulations, canonicalag, puckering.
+            * **helpar_name** (*list*) - (None) list of helical parameter names analyzed by dna_averages, dna_timeseries, dna_bimodality, interseqcorr, intraseqcorr and average_stiffness. If not specified all the helical parameters found in the input that each analysis accepts are analyzed.
+            * **block_properties** (*dict*) - (None) properties of the building block of each analysis, keyed by analysis name. For instance, the *seqpos* property of dna_timeseries selects the base (pair steps) analyzed by dna_bimodality, interhpcorr, intrahpcorr and basepair_stiffness.
+            * **num_workers** (*int*) - (1) Number of processes running the tasks concurrently.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
+            * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
+            * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
+            * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
+
+    Examples:
+        This is a use example of how to use the building block from Python::
+
+            from biobb_dna.dna.dna_suite import dna_suite
+
+            prop = {
+                'sequence': 'GCAT',
+                'analyses': ['dna_averages', 'interbpcorr', 'basepair_stiffness'],
+                'block_properties': {'dna_timeseries': {'seqpos': [1, 2]}},
+                'num_workers': 4
+            }
+            dna_suite(
+                input_zip_file='/path/to/canal_output.zip',
+                output_zip_path='/path/to/suite_output.zip',
+                properties=prop)
+
+    Info:
+        * wrapped_software:
+            * name: In house
+            * license: Apache-2.0
+        * ontology:
+            * name: EDAM
+            * schema: http://edamontology.org/EDAM.owl
+
+    """
+
+    def __init__(
+        self,
+        input_zip_file,
+        output_zip_path,
+        properties=None,
+        **kwargs,
+    ) -> None:
+        properties = properties or {}
+
+        # Call parent class constructor
+        super().__init__(properties)
+        self.locals_var_dict = locals().copy()
+
+        # Input/Output files
+        self.io_dict = {
+            "in": {
+                "input_zip_file": input_zip_file,
+            },
+            "out": {
+                "output_zip_path": output_zip_path,
+            },
+        }
+
+        # Properties specific for BB
+        self.properties = properties
+        self.sequence = properties.get("sequence", None)
+        self.analyses = _from_string_to_list(properties.get("analyses", None))
+        self.helpar_name = _from_string_to_list(properties.get("helpar_name", None))
+        self.block_properties = properties.get("block_properties", None) or {}
+        self.num_workers = int(properties.get("num_workers", 1))
+
+        # Check the properties
+        self.check_properties(properties)
+        self.check_arguments()
+
+    def ser_files(self):
+        """Dictionary of the "archive.zip::member" path of the .ser file of
+        each helical parameter found in the input, keyed by helical parameter name."""
+        zip_path = str(Path(self.stage_io_dict["in"]["input_zip_file"]).resolve())
+        ser_files = {}
+        for name in open_archive(zip_path).namelist():
+            if not name.endswith(".ser"):
+                continue
+            helpar = Path(name).stem.split("_")[-1]
+            if helpar in constants.helical_parameters:
+                ser_files[helpar] = f"{zip_path}{ARCHIVE_SEPARATOR}{name}"
+        return ser_files
+
+    def block_task(self, name, analysis, deps, kwargs, extract=None):
+        """Task launching the building block of analysis, with its output
+        files written to the folder of the analysis."""
+        properties = {"helpar_name": kwargs.pop("helpar_name")} if "helpar_name" in kwargs else {}
+        if analysis not in NO_SEQUENCE:
+            properties["sequence"] = self.sequence
+        properties.update(self.block_properties.get(analysis, {}))
+        # the blocks run in the working directory of the task
+        properties["disable_sandbox"] = True
+        # the blocks are profiled as the compute phase of this block
+        properties["profile"] = False
+        output_dir = self.output_dir / analysis
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for file_ref, file_name in kwargs.items():
+            if file_ref.startswith("output_"):
+                kwargs[file_ref] = str(output_dir / file_name)
+        return {
+            "name": name,
+            "deps": deps,
+            "module": ANALYSES[analysis],
+            "function": analysis,
+            "kwargs": {**kwargs, "properties": properties},
+            "cwd": str(self.work_dir / name),
+            "extract": extract,
+        }
+
+    def select_helpars(self, analysis, ser_files):
+        """Helical parameters analyzed one by one by analysis."""
+        accepted = SER_ANALYSES.get(analysis, SINGLE_HELPARS)
+        if not self.helpar_name:
+            return [helpar for helpar in accepted if helpar in ser_files]
+        for helpar in self.helpar_name:
+            if helpar not in ser_files:
+                raise ValueError(
+                    f"No .ser file found for helical parameter {helpar}! "
+                    f"Found: {list(ser_files)}"
+                )
+        return [helpar for helpar in self.helpar_name if helpar in accepted]
+
+    def plan(self, ser_files):
+        """Tasks of the selected analyses, each one with the names of the
+        tasks it depends on: the .ser files are parsed first, the analyses
+        of the .ser files run once their inputs are parsed, and the analyses
+        of the series of each base (pair step) once dna_timeseries has
+        saved them."""
+        tasks = []
+        parsed = set()
+        timeseries = {}
+
+        def parse(helpar):
+            if helpar not in parsed:
+                parsed.add(helpar)
+                tasks.append({
+                    "name": f"parse_{helpar}",
+                    "deps": [],
+                    "module": "biobb_dna.utils.loader",
+                    "function": "parse_series",
+                    "kwargs": {
+                        "input_serfile": ser_files[helpar],
+                        "npy_prefix": str(self.work_dir / "parsed" / helpar)},
+                    "cwd": str(self.work_dir / "parsed"),
+                })
+            return f"parse_{helpar}"
+
+        def time_series(helpar):
+            if helpar not in timeseries:
+                timeseries[helpar] = self.block_task(
+                    f"dna_timeseries_{helpar}", "dna_timeseries", [parse(helpar)], {
+                        "input_ser_path": ser_files[helpar],
+                        "output_zip_path": f"{helpar}_timeseries.zip",
+                        "helpar_name": helpar})
+                if "dna_timeseries" not in self.analyses or (
+                        helpar not in self.select_helpars("dna_timeseries", ser_files)):
+                    # only needed by the analyses of the series
+                    timeseries[helpar]["kwargs"]["output_zip_path"] = str(
+                        self.work_dir / timeseries[helpar]["name"] / f"{helpar}_timeseries.zip")
+                tasks.append(timeseries[helpar])
+            return timeseries[helpar]
+
+        for analysis in self.analyses:
+            if analysis == "dna_timeseries":
+                for helpar in self.select_helpars(analysis, ser_files):
+                    time_series(helpar)
+            elif analysis in SER_ANALYSES:
+                for helpar in self.select_helpars(analysis, ser_files):
+                    output_name = {
+                        "dna_averages": "avg", "average_stiffness": "stiffness"}.get(analysis, "corr")
+                    tasks.append(self.block_task(
+                        f"{analysis}_{helpar}", analysis, [parse(helpar)], {
+                            "input_ser_path": ser_files[helpar],
+                            "output_csv_path": f"{helpar}_{output_name}.csv",
+                            "output_jpg_path": f"{helpar}_{output_name}.jpg",
+                            "helpar_name": helpar}))
+            elif analysis in GROUP_ANALYSES:
+                inputs = GROUP_ANALYSES[analysis]
+                missing = [helpar for helpar in inputs if helpar not in ser_files]
+                if missing:
+                    raise ValueError(
+                        f"No .ser file found for helical parameters {missing} of {analysis}!")
+                tasks.append(self.block_task(
+                    analysis, analysis, [parse(helpar) for helpar in inputs], {
+                        **{file_ref: ser_files[helpar] for helpar, file_ref in inputs.items()},
+                        "output_csv_path": f"{analysis}.csv",
+                        "output_jpg_path": f"{analysis}.jpg"}))
+            else:
+                if analysis == "dna_bimodality":
+                    helpars = self.select_helpars(analysis, ser_files)
+                else:
+                    helpars = SERIES_ANALYSES[analysis]
+                    missing = [helpar for helpar in helpars if helpar not in ser_files]
+                    if missing:
+                        raise ValueError(
+                            f"No .ser file found for helical parameters {missing} of {analysis}!")
+                # the tasks of each base (pair step) are known once the series are saved
+                tasks.append({
+                    "name": analysis,
+                    "deps": [time_series(helpar)["name"] for helpar in helpars],
+                    "expand": {helpar: time_series(helpar) for helpar in helpars},
+                })
+        return tasks
+
+    def expand(self, task):
+        """Tasks of an analysis of the series saved by dna_timeseries, one for
+        each base (pair step), or for each helical parameter and base (pair
+        step) for dna_bimodality."""
+        analysis = task["name"]
+        series = {}
+        for helpar, timeseries_task in task["expand"].items():
+            zip_path = timeseries_task["kwargs"]["output_zip_path"]
+            prefix = f"series_{helpar}_"
+            series[helpar] = {
+                name[len(prefix):-len(".csv")]: (zip_path, name)
+                for name in open_archive(zip_path).namelist()
+                if name.startswith(prefix) and name.endswith(".csv")}
+        tasks = []
+        if analysis == "dna_bimodality":
+            for helpar, labels in series.items():
+                for label, (zip_path, name) in labels.items():
+                    task_name = f"{analysis}_{helpar}_{label}"
+                    tasks.append(self.block_task(
+                        task_name, analysis, [], {
+                            "input_csv_file": str(self.work_dir / task_name / name),
+                            "output_csv_path": f"{helpar}_{label}_bimodality.csv",
+                            "output_jpg_path": f"{helpar}_{label}_bimodality.jpg",
+                            "helpar_name": helpar},
+                        extract=(zip_path, name)))
+            return tasks
+        helpars = list(series)
+        labels = [label for label in series[helpars[0]] if all(label in series[hp] for hp in helpars)]
+        for label in labels:
+            tasks.append(self.block_task(
+                f"{analysis}_{label}", analysis, [], {
+                    **{f"input_filename_{hp}": ARCHIVE_SEPARATOR.join(series[hp][label]) for hp in helpars},
+                    "output_csv_path": f"{label}.csv",
+                    "output_jpg_path": f"{label}.jpg"}))
+        return tasks
+
+    def run_tasks(self, tasks):
+        """Run the tasks once the tasks they depend on are done, on a pool of
+        num_workers processes, or one after the other in this process if
+        num_workers is 1."""
+        pending = {task["name"]: task for task in tasks}
+        done = set()
+        parsed = []
+        running = {}
+        pool = ProcessPoolExecutor(max_workers=self.num_workers) if self.num_workers > 1 else None
+
+        def finish(task, result):
+            done.add(task["name"])
+            if task["function"] == "parse_series":
+                parsed.append(result)
+            elif result != 0:
+                raise ValueError(f"Task {task['name']} failed with return code {result}")
+
+        try:
+            while pending or running:
+                ready = [task for task in pending.values() if all(dep in done for dep in task["deps"])]
+                for task in ready:
+                    del pending[task["name"]]
+                    if "expand" in task:
+                        pending.update({new_task["name"]: new_task for new_task in self.expand(task)})
+                        done.add(task["name"])
+                        continue
+                    # the .ser files parsed so far include all the inputs of the task
+                    task["parsed"] = list(parsed)
+                    fu.log(f"Running task {task['name']}", self.out_log)
+                    if pool is None:
+                        finish(task, run_task(task))
+                    else:
+                        running[pool.submit(run_task, task)] = task
+                if running:
+                    finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        finish(running.pop(future), future.result())
+                elif pending and not ready:
+                    raise ValueError(f"Tasks with unmet dependencies: {list(pending)}")
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+
+    @launchlogger
+    def launch(self) -> int:
+        """Execute the :class:`DnaSuite <dna.dna_suite.DnaSuite>` object."""
+
+        # Setup Biobb
+        if self.check_restart():
+            return 0
+        self.stage_files()
+
+        # check sequence
+        if self.sequence is None or len(self.sequence) < 2:
+            raise ValueError("sequence is null or too short!")
+
+        # check analyses
+        if not self.analyses:
+            self.analyses = list(ANALYSES)
+        for analysis in self.analyses:
+            if analysis not in ANALYSES:
+                raise ValueError(
+                    f"Analysis {analysis} is invalid! Options: {list(ANALYSES)}")
+        for analysis in self.block_properties:
+            if analysis not in ANALYSES:
+                raise ValueError(
+                    f"block_properties of {analysis} are invalid! Options: {list(ANALYSES)}")
+
+        unique_dir = Path(self.stage_io_dict.get("unique_dir", "")).resolve()
+        self.work_dir = unique_dir / "tasks"
+        self.output_dir = unique_dir / "outputs"
+        (self.work_dir / "parsed").mkdir(parents=True, exist_ok=True)
+
+        self.start_phase("parse")
+        ser_files = self.ser_files()
+        if not ser_files:
+            raise ValueError("No helical parameter .ser files found in the input!")
+        tasks = self.plan(ser_files)
+        fu.log(
+            f"Running {len(self.analyses)} analyses of {len(ser_files)} helical parameters "
+            f"with {self.num_workers} workers",
+            self.out_log,
+        )
+
+        self.start_phase("compute")
+        self.run_tasks(tasks)
+
+        # output files of all the analyses
+        self.start_phase("archive")
+        with zipfile.ZipFile(self.stage_io_dict["out"]["output_zip_path"], "w") as zf:
+            for analysis in self.analyses:
+                analysis_dir = self.output_dir / analysis
+                if not analysis_dir.exists():
+                    continue
+                for file_path in sorted(analysis_dir.iterdir()):
+                    zf.write(file_path, arcname=f"{analysis}/{file_path.name}")
+
+        # Copy files to host
+        self.copy_to_host()
+
+        # Remove temporary file(s)
+        self.remove_tmp_files()
+
+        self.check_arguments(output_files_created=True, raise_exception=False)
+
+        return 0
+
+
+def dna_suite(
+    input_zip_file: str,
+    output_zip_path: str,
+    properties: Optional[dict] = None,
+    **kwargs,
+) -> int:
+    """Create :class:`DnaSuite <dna.dna_suite.DnaSuite>` class and
+    execute the :meth:`launch() <dna.dna_suite.DnaSuite.launch>` method."""
+    return DnaSuite(**dict(locals())).launch()
+
+
+dna_suite.__doc__ = DnaSuite.__doc__
+main = DnaSuite.get_main(dna_suite, "Run a selection of the analyses of a Canal output in a single step, parsing each .ser file only once.")
+
+if __name__ == '__main__':
+    main()
@@ -8,6 +8,7 @@ from pathlib import Path
 from typing import Optional
 
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
@@ -15,10 +16,14 @@ from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.downsample import downsample_indices
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, save_npz_tables, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import column_histograms
 
 
-class HelParTimeSeries(BiobbObject):
+class HelParTimeSeries(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna HelParTimeSeries
     | Created time series and histogram plots for each base pair from a helical parameter series file.
@@ -27,12 +32,18 @@ class HelParTimeSeries(BiobbObject):
     Args:
         input_ser_path (str): Path to .ser file for helical parameter. File is expected to be a table, with the first column being an index and the rest the helical parameter values for each base/basepair. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/dna/canal_output_shift.ser>`_. Accepted formats: ser (edam:format_2330).
         output_zip_path (str): Path to output .zip files where data is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/timeseries_output.zip>`_. Accepted formats: zip (edam:format_3987).
+        output_hist_csv_path (str) (Optional): Path to .csv file where the histograms of all the selected base pairs, computed on a shared grid of bins, are saved as a single table with one density column for each base pair. File type: output. Accepted formats: csv (edam:format_3752).
+        output_hist_jpg_path (str) (Optional): Path to .jpg file where the heatmap of the histograms of all the selected base pairs is saved. File type: output. Accepted formats: jpg (edam:format_3579).
+        output_npz_path (str) (Optional): Path to .npz file where the series and histogram tables of all the selected base pairs are saved together, named as the .csv files of output_zip_path without extension. Each table can be read on its own as "output.npz::series_<helpar>_<base>". File type: output. Accepted formats: npz (edam:format_4003).
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *usecols* option).
-            * **bins** (*int*) - (None) Bins for histogram. Parameter has same options as matplotlib.pyplot.hist.
+            * **bins** (*int*) - (None) Bins for histogram. Parameter has same options as matplotlib.pyplot.hist. The shared grid of bins of output_hist_csv_path is computed from all the selected base pairs with the same option.
             * **helpar_name** (*str*) - (None) Helical parameter name. It must match the name of the helical parameter in the .ser input file. Values: majd, majw, mind, minw, inclin, tip, xdisp, ydisp, shear, stretch, stagger, buckle, propel, opening, rise, roll, twist, shift, slide, tilt, alphaC, alphaW, betaC, betaW, gammaC, gammaW, deltaC, deltaW, epsilC, epsilW, zetaC, zetaW, chiC, chiW, phaseC, phaseW.
-            * **stride** (*int*) - (1000) granularity of the number of snapshots for plotting time series.
+            * **stride** (*int*) - (1000) granularity of the number of snapshots for plotting time series, if downsample is stride.
+            * **downsample** (*str*) - ("lttb") Method used to reduce the number of snapshots plotted in time series. Values: lttb (Largest-Triangle-Three-Buckets, keeps the shape of the series and its rare excursions), minmax (minimum and maximum of each bucket of snapshots), stride (one out of every stride snapshots).
+            * **max_points** (*int*) - (2000) Maximum number of snapshots plotted in each time series, if downsample is lttb or minmax.
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 1) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -49,7 +60,10 @@ class HelParTimeSeries(BiobbObject):
             }
             dna_timeseries(
                 input_ser_path='/path/to/twist.ser',
-                output_zip_path='/path/to/output/file.zip'
+                output_zip_path='/path/to/output/file.zip',
+                output_hist_csv_path='/path/to/output/hist.csv',
+                output_hist_jpg_path='/path/to/output/hist.jpg',
+                output_npz_path='/path/to/output/tables.npz',
                 properties=prop)
     Info:
         * wrapped_software:
@@ -62,7 +76,14 @@ class HelParTimeSeries(BiobbObject):
     """
 
     def __init__(
-        self, input_ser_path, output_zip_path, properties=None, **kwargs
+        self,
+        input_ser_path,
+        output_zip_path,
+        output_hist_csv_path=None,
+        output_hist_jpg_path=None,
+        output_npz_path=None,
+        properties=None,
+        **kwargs,
     ) -> None:
         properties = properties or {}
 
@@ -75,13 +96,20 @@ class HelParTimeSeries(BiobbObject):
             "in": {
                 "input_ser_path": input_ser_path,
             },
-            "out": {"output_zip_path": output_zip_path},
+            "out": {
+                "output_zip_path": output_zip_path,
+                "output_hist_csv_path": output_hist_csv_path,
+                "output_hist_jpg_path": output_hist_jpg_path,
+                "output_npz_path": output_npz_path,
+            },
         }
 
         self.properties = properties
         self.sequence = properties.get("sequence", None)
         self.bins = properties.get("bins", "auto")
         self.stride = properties.get("stride", 10)
+        self.downsample = properties.get("downsample", "lttb")
+        self.max_points = int(properties.get("max_points", 2000))
         self.seqpos = [
             int(elem) for elem in _from_string_to_list(properties.get("seqpos", None))
         ]
@@ -132,70 +160,18 @@ class HelParTimeSeries(BiobbObject):
         if self.sequence is None or len(self.sequence) < 2:
             raise ValueError("sequence is null or too short!")
 
-        # calculate cols with 0 index
-        if self.seqpos:
-            cols = [i - 1 for i in self.seqpos]
-        else:
-            cols = list(range(len(self.sequence)))
-
-        # sort cols in ascending order
-        cols.sort()
+        # check downsample method
+        if self.downsample not in ["lttb", "minmax", "stride"]:
+            raise ValueError(
+                "downsample method is invalid! Options: lttb, minmax, stride"
+            )
 
-        # check seqpos for base pairs
-        if self.seqpos and self.helpar_name in constants.hp_basepairs:
-            if (max(cols) > len(self.sequence) - 2) or (min(cols) < 0):
-                raise ValueError(
-                    f"seqpos values must be between 1 and {len(self.sequence) - 1}"
-                )
-            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
-                raise ValueError("seqpos must be a list of at least two integers")
-        # check seqpos for non base pairs
-        elif self.seqpos and self.helpar_name not in constants.hp_basepairs:
-            if (max(cols) > len(self.sequence) - 1) or (min(cols) < 0):
-                raise ValueError(
-                    f"seqpos values must be between 1 and {len(self.sequence)}"
-                )
-            if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
-                raise ValueError("seqpos must be a list of at least two integers")
-
-        if self.helpar_name in constants.hp_basepairs:
-            # remove first and last base pairs from cols if they match 0 and len(sequence)
-            if min(cols) == 0:
-                cols.pop(0)
-            if max(cols) == len(self.sequence) - 1:
-                cols.pop(-1)
-
-            # discard first and last base(pairs) from sequence
-            sequence = self.sequence[1:-1]
-            # create indices list
-            indices = cols.copy()
-            # create subunits list from cols
-            subunits = [f"{i+1}_{sequence[i-1:i+self.baselen]}" for i in cols]
-            # clean subunits (leave only basepairs)
-            pattern = re.compile(r"\d+_[A-Za-z]{2}")
-            # get removed items
-            removed_items = [s for s in subunits if not pattern.fullmatch(s)]
-            # get indices of removed items (in integer format and starting from 0)
-            removed_numbers = [
-                int(match.group())
-                for item in removed_items
-                if (match := re.match(r"\d+", item))
-            ]
-            removed_numbers = list(map(int, removed_numbers))
-            removed_numbers = [int(i) - 1 for i in removed_numbers]
-            # remove non basepairs from subunits and indices
-            subunits = [s for s in subunits if pattern.fullmatch(s)]
-            indices = [i for i in indices if i not in removed_numbers]
-        else:
-            sequence = self.sequence
-            # create indices list
-            indices = cols.copy()
-            # trick for getting the index column from the .ser file
-            indices.insert(0, 0)
-            # create subunits list from cols
-            subunits = [f"{i+1}_{sequence[i:i+1+self.baselen]}" for i in cols]
+        indices, subunits = timeseries_columns(
+            self.sequence, self.helpar_name, self.seqpos
+        )
 
         # read input .ser file
+        self.start_phase("parse")
         ser_data = read_series(
             self.stage_io_dict["in"]["input_ser_path"], usecols=indices
         )
@@ -205,13 +181,15 @@ class HelParTimeSeries(BiobbObject):
 
         # write output files for all selected bases (one per column)
         zf = zipfile.ZipFile(Path(self.stage_io_dict["out"]["output_zip_path"]), "w")
+        npz_tables = {}
         for col in ser_data.columns:
             # unstack columns to prevent errors from repeated base pairs
-            column_data = ser_data[[col]].unstack().dropna().reset_index(drop=True)
-            column_data.name = col
+            self.start_phase("compute")
+            column_data = column_series(ser_data, col)
             fu.log(f"Computing base number {col}...")
 
             # column series
+            self.start_phase("archive")
             series_colfn = f"series_{self.helpar_name}_{col}"
             column_data.to_csv(
                 Path(self.stage_io_dict.get("unique_dir", "")) / f"{series_colfn}.csv"
@@ -222,8 +200,17 @@ class HelParTimeSeries(BiobbObject):
                 arcname=f"{series_colfn}.csv",
             )
 
+            self.start_phase("render")
             fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
-            reduced_data = column_data.iloc[:: self.stride]
+            reduced_data = column_data.iloc[
+                downsample_indices(
+                    column_data.index,
+                    column_data.to_numpy(),
+                    method=self.downsample,
+                    max_points=self.max_points,
+                    stride=self.stride,
+                )
+            ]
             axs.plot(reduced_data.index, reduced_data.to_numpy())
             axs.set_xlabel("Time (Snapshots)")
             axs.set_ylabel(f"{self.helpar_name.capitalize()} ({self.hp_unit})")
@@ -246,7 +233,8 @@ class HelParTimeSeries(BiobbObject):
             # columns histogram
             hist_colfn = f"hist_{self.helpar_name}_{col}"
             fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
-            ybins, x, _ = axs.hist(column_data, bins=self.bins)
+            ybins, x = column_histogram(column_data, bins=self.bins)
+            axs.hist(column_data, bins=x)
             pd.DataFrame({self.helpar_name: x[:-1], "density": ybins}).to_csv(
                 Path(self.stage_io_dict.get("unique_dir", "")) / f"{hist_colfn}.csv",
                 index=False,
@@ -269,8 +257,49 @@ class HelParTimeSeries(BiobbObject):
                 arcname=f"{hist_colfn}.jpg",
             )
             plt.close()
+
+            # same tables as the .csv files, for the .npz file
+            if self.stage_io_dict["out"].get("output_npz_path"):
+                npz_tables[series_colfn] = column_data.to_frame()
+                npz_tables[hist_colfn] = pd.DataFrame(
+                    {"density": ybins}, index=pd.Index(x[:-1], name=self.helpar_name)
+                )
+        self.start_phase("archive")
         zf.close()
 
+        # all the tables in a single file
+        if self.stage_io_dict["out"].get("output_npz_path"):
+            save_npz_tables(self.stage_io_dict["out"]["output_npz_path"], npz_tables)
+
+        # histograms of all the selected base pairs on a shared grid of bins
+        if self.stage_io_dict["out"].get("output_hist_csv_path") or self.stage_io_dict["out"].get("output_hist_jpg_path"):
+            self.start_phase("compute")
+            edges, density = column_histograms(ser_data, bins=self.bins)
+            hist_data = pd.DataFrame(density, columns=ser_data.columns)
+            hist_data.insert(0, self.helpar_name, edges[:-1])
+            if self.stage_io_dict["out"].get("output_hist_csv_path"):
+                hist_data.to_csv(self.stage_io_dict["out"]["output_hist_csv_path"], index=False)
+            if self.stage_io_dict["out"].get("output_hist_jpg_path"):
+                self.start_phase("render")
+                fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
+                im = axs.imshow(
+                    density,
+                    aspect="auto",
+                    origin="lower",
+                    interpolation="nearest",
+                    extent=(-0.5, len(ser_data.columns) - 0.5, edges[0], edges[-1]),
+                )
+                fig.colorbar(im, ax=axs, label="Density")
+                axs.set_xticks(range(len(ser_data.columns)))
+                axs.set_xticklabels(ser_data.columns, rotation=90)
+                axs.set_xlabel(f"Base Pair {'Step' if self.baselen == 1 else ''}")
+                axs.set_ylabel(f"{self.helpar_name.capitalize()} ({self.hp_unit})")
+                axs.set_title(
+                    f"Helical Parameter Histograms: {self.helpar_name.capitalize()}"
+                )
+                fig.savefig(self.stage_io_dict["out"]["output_hist_jpg_path"], format="jpg")
+                plt.close()
+
         # Copy files to host
         self.copy_to_host()
 
@@ -282,9 +311,119 @@ class HelParTimeSeries(BiobbObject):
         return 0
 
 
+def timeseries_columns(sequence, helpar_name, seqpos=None):
+    """Columns of the .ser file of a helical parameter selected by
+    dna_timeseries, as read_series usecols, and their base (pair) labels.
+
+    seqpos are the positions (starting from 1) of the selected bases (pairs),
+    all of them if not given. The first and last base pairs are discarded
+    for base pair step parameters."""
+    baselen = 0 if helpar_name.lower() in constants.hp_singlebases else 1
+
+    # calculate cols with 0 index
+    if seqpos:
+        cols = [i - 1 for i in seqpos]
+    else:
+        cols = list(range(len(sequence)))
+
+    # sort cols in ascending order
+    cols.sort()
+
+    # check seqpos for base pairs
+    if seqpos and helpar_name in constants.hp_basepairs:
+        if (max(cols) > len(sequence) - 2) or (min(cols) < 0):
+            raise ValueError(
+                f"seqpos values must be between 1 and {len(sequence) - 1}"
+            )
+        if not (isinstance(seqpos, list) and len(seqpos) > 1):
+            raise ValueError("seqpos must be a list of at least two integers")
+    # check seqpos for non base pairs
+    elif seqpos and helpar_name not in constants.hp_basepairs:
+        if (max(cols) > len(sequence) - 1) or (min(cols) < 0):
+            raise ValueError(
+                f"seqpos values must be between 1 and {len(sequence)}"
+            )
+        if not (isinstance(seqpos, list) and len(seqpos) > 1):
+            raise ValueError("seqpos must be a list of at least two integers")
+
+    if helpar_name in constants.hp_basepairs:
+        # remove first and last base pairs from cols if they match 0 and len(sequence)
+        if min(cols) == 0:
+            cols.pop(0)
+        if max(cols) == len(sequence) - 1:
+            cols.pop(-1)
+
+        # discard first and last base(pairs) from sequence
+        sequence = sequence[1:-1]
+        # create indices list
+        indices = cols.copy()
+        # create subunits list from cols
+        subunits = [f"{i+1}_{sequence[i-1:i+baselen]}" for i in cols]
+        # clean subunits (leave only basepairs)
+        pattern = re.compile(r"\d+_[A-Za-z]{2}")
+        # get removed items
+        removed_items = [s for s in subunits if not pattern.fullmatch(s)]
+        # get indices of removed items (in integer format and starting from 0)
+        removed_numbers = [
+            int(match.group())
+            for item in removed_items
+            if (match := re.match(r"\d+", item))
+        ]
+        removed_numbers = list(map(int, removed_numbers))
+        removed_numbers = [int(i) - 1 for i in removed_numbers]
+        # remove non basepairs from subunits and indices
+        subunits = [s for s in subunits if pattern.fullmatch(s)]
+        indices = [i for i in indices if i not in removed_numbers]
+    else:
+        # create indices list
+        indices = cols.copy()
+        # trick for getting the index column from the .ser file
+        indices.insert(0, 0)
+        # create subunits list from cols
+        subunits = [f"{i+1}_{sequence[i:i+1+baselen]}" for i in cols]
+    return indices, subunits
+
+
+def column_series(ser_data, col):
+    """Time series of a base (pair) column, unstacking repeated base pairs."""
+    column_data = ser_data[[col]].unstack().dropna().reset_index(drop=True)
+    column_data.name = col
+    return column_data
+
+
+def column_histogram(column_data, bins="auto"):
+    """Histogram counts and bin edges of a time series, as matplotlib.pyplot.hist."""
+    counts, edges = np.histogram(column_data, bins=bins)
+    return counts.astype(float), edges
+
+
+def helpar_timeseries(ser_data, sequence, helpar_name, seqpos=None, bins="auto"):
+    """Time series and histogram tables of each selected base (pair) of a
+    helical parameter, as saved by dna_timeseries in its .npz file.
+
+    ser_data is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. Returns a dictionary of DataFrames named
+    series_<helpar_name>_<base> and hist_<helpar_name>_<base>."""
+    indices, subunits = timeseries_columns(sequence, helpar_name, seqpos)
+    ser_data = select_series(series_frame(ser_data), indices)
+    ser_data.columns = subunits
+    tables = {}
+    for col in ser_data.columns:
+        column_data = column_series(ser_data, col)
+        ybins, x = column_histogram(column_data, bins=bins)
+        tables[f"series_{helpar_name}_{col}"] = column_data.to_frame()
+        tables[f"hist_{helpar_name}_{col}"] = pd.DataFrame(
+            {"density": ybins}, index=pd.Index(x[:-1], name=helpar_name)
+        )
+    return tables
+
+
 def dna_timeseries(
     input_ser_path: str,
     output_zip_path: str,
+    output_hist_csv_path: Optional[str] = None,
+    output_hist_jpg_path: Optional[str] = None,
+    output_npz_path: Optional[str] = None,
     properties: Optional[dict] = None,
     **kwargs,
 ) -> int:
@@ -1,33 +1,38 @@
 #!/usr/bin/env python3
 
 """Module containing the DnaTimeseriesUnzip class and the command line interface."""
+import os
 import re
-import zipfile
-import shutil
 from typing import Optional
 
 from biobb_dna.utils import constants
+from biobb_dna.utils.archive import archive_index, extract_member
+from biobb_dna.utils.common import _from_string_to_list
+from biobb_dna.utils.profiling import LaunchProfiler
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools import file_utils as fu
 from biobb_common.tools.file_utils import launchlogger
 
 
-class DnaTimeseriesUnzip(BiobbObject):
+class DnaTimeseriesUnzip(LaunchProfiler, BiobbObject):
     """
     | biobb_dna DnaTimeseriesUnzip
     | Tool for extracting dna_timeseries output files.
-    | Unzips a zip file containing dna_timeseries output files and extracts the csv and jpg files.
+    | Unzips a zip file containing dna_timeseries output files and extracts the csv and jpg files of one or more base pairs.
 
     Args:
         input_zip_file (str): Zip file with dna_timeseries output files. File type: input. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/data/dna/timeseries_output.zip>`_. Accepted formats: zip (edam:format_3987).
-        output_path_csv (str): dna_timeseries output csv file contained within input_zip_file. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/dna_timeseries_unzip.csv>`_. Accepted formats: csv (edam:format_3752).
-        output_path_jpg (str): dna_timeseries output jpg file contained within input_zip_file. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/dna_timeseries_unzip.jpg>`_. Accepted formats: jpg (edam:format_3579).
+        output_path_csv (str) (Optional): dna_timeseries output csv file contained within input_zip_file, when a single file is selected. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/dna_timeseries_unzip.csv>`_. Accepted formats: csv (edam:format_3752).
+        output_path_jpg (str) (Optional): dna_timeseries output jpg file contained within input_zip_file, when a single file is selected. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/dna_timeseries_unzip.jpg>`_. Accepted formats: jpg (edam:format_3579).
         output_list_path (str) (Optional): Text file with a list of all dna_timeseries output files contained within input_zip_file. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/dna/dna_timeseries_unzip.txt>`_. Accepted formats: txt (edam:format_2330).
+        output_dir_path (dir) (Optional): Directory where the csv and jpg files of all the selected base pairs are extracted with their original names. File type: output. Accepted formats: directory (edam:format_1915).
         properties (dic):
-            * **type** (*str*) - (None) Type of analysis, series or histogram. Values: series, hist.
-            * **parameter** (*str*) - (None) Type of parameter. Values: majd, majw, mind, minw, inclin, tip, xdisp, ydisp, shear, stretch, stagger, buckle, propel, opening, rise, roll, twist, shift, slide, tilt, alphaC, alphaW, betaC, betaW, gammaC, gammaW, deltaC, deltaW, epsilC, epsilW, zetaC, zetaW, chiC, chiW, phaseC, phaseW.
+            * **type** (*str*) - (None) Type of analysis, series or histogram, or list of types. Values: series, hist.
+            * **parameter** (*str*) - (None) Type of parameter, or list of parameters. Values: majd, majw, mind, minw, inclin, tip, xdisp, ydisp, shear, stretch, stagger, buckle, propel, opening, rise, roll, twist, shift, slide, tilt, alphaC, alphaW, betaC, betaW, gammaC, gammaW, deltaC, deltaW, epsilC, epsilW, zetaC, zetaW, chiC, chiW, phaseC, phaseW.
             * **sequence** (*str*) - (None) Nucleic acid sequence used for generating dna_timeseries output file.
-            * **index** (*int*) - (1) Base pair index in the parameter 'sequence', starting from 1.
+            * **index** (*int*) - (1) Base pair index in the parameter 'sequence', starting from 1, or list of indices.
+            * **archive_index** (*bool*) - (False) if True, the index of the members of input_zip_file is stored in a cache under $XDG_CACHE_HOME/biobb_dna/archive_index and reused by later extractions from the same archive.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -43,8 +48,16 @@ class DnaTimeseriesUnzip(BiobbObject):
             }
             dna_timeseries_unzip(
                 input_zip_file='/path/to/dna_timeseries/output.zip',
-                output_path='/path/to/output.csv',
-                output_list_path='/path/to/output.txt'
+                output_path_csv='/path/to/output.csv',
+                output_path_jpg='/path/to/output.jpg',
+                output_list_path='/path/to/output.txt',
+                properties=prop)
+
+            # several base pairs in a single pass
+            prop['index'] = [4, 5, 6]
+            dna_timeseries_unzip(
+                input_zip_file='/path/to/dna_timeseries/output.zip',
+                output_dir_path='/path/to/output_dir',
                 properties=prop)
     Info:
         * wrapped_software:
@@ -55,8 +68,8 @@ class DnaTimeseriesUnzip(BiobbObject):
             * schema: http://edamontology.org/EDAM.owl
     """
 
-    def __init__(self, input_zip_file,
-                 output_path_csv, output_path_jpg, output_list_path=None, properties=None, **kwargs) -> None:
+    def __init__(self, input_zip_file, output_path_csv=None, output_path_jpg=None,
+                 output_list_path=None, output_dir_path=None, properties=None, **kwargs) -> None:
         properties = properties or {}
 
         # Call parent class constructor
@@ -71,7 +84,8 @@ class DnaTimeseriesUnzip(BiobbObject):
             'out': {
                 'output_path_csv': output_path_csv,
                 'output_path_jpg': output_path_jpg,
-                'output_list_path': output_list_path
+                'output_list_path': output_list_path,
+                'output_dir_path': output_dir_path
             }
         }
 
@@ -80,6 +94,7 @@ class DnaTimeseriesUnzip(BiobbObject):
         self.parameter = properties.get('parameter', None)
         self.sequence = properties.get('sequence', None)
         self.index = properties.get('index', 1)
+        self.archive_index = properties.get('archive_index', False)
         self.properties = properties
 
         # Check the properties
@@ -101,17 +116,24 @@ class DnaTimeseriesUnzip(BiobbObject):
                    self.out_log, self.global_log)
             exit(1)
 
-        # Check that the type is valid
-        if self.type not in ["series", "hist"]:
-            fu.log(f"Type {self.type} not valid. Valid types are: series, hist.",
-                   self.out_log, self.global_log)
-            exit(1)
+        types = _from_string_to_list(self.type)
+        parameters = _from_string_to_list(self.parameter)
+        indices = [int(index) for index in _from_string_to_list(
+            self.index if isinstance(self.index, (list, str)) else [self.index])]
 
-        # Check that the parameter is valid
-        if self.parameter not in constants.helical_parameters:
-            fu.log(f"Parameter {self.parameter} not valid. Valid parameters are: {constants.helical_parameters}.",
-                   self.out_log, self.global_log)
-            exit(1)
+        # Check that the types are valid
+        for type_ in types:
+            if type_ not in ["series", "hist"]:
+                fu.log(f"Type {type_} not valid. Valid types are: series, hist.",
+                       self.out_log, self.global_log)
+                exit(1)
+
+        # Check that the parameters are valid
+        for parameter in parameters:
+            if parameter not in constants.helical_parameters:
+                fu.log(f"Parameter {parameter} not valid. Valid parameters are: {constants.helical_parameters}.",
+                       self.out_log, self.global_log)
+                exit(1)
 
         # Check that the sequence is valid
         pattern = r'^[ACGT]+$'
@@ -120,49 +142,65 @@ class DnaTimeseriesUnzip(BiobbObject):
                    self.out_log, self.global_log)
             exit(1)
 
-        # Check that the index is valid
-        if self.index < 1 or self.index >= len(self.sequence) - 1:
-            fu.log(f"Index {self.index} not valid. It should be between 0 and {len(self.sequence) - 2}.",
-                   self.out_log, self.global_log)
-            exit(1)
-
-        # Get index sequence base and next base
-        bp = self.sequence[self.index-1] + self.sequence[self.index]
-
-        # Get the filename
-        filename = f"{self.type}_{self.parameter}_{self.index}_{bp}"
-        csv_file = f"{filename}.csv"
-        jpg_file = f"{filename}.jpg"
-
-        # Unzip the file
-        with zipfile.ZipFile(self.stage_io_dict["in"]["input_zip_file"], 'r') as zip_ref:
-            # Check if the csv file exists in the zip file
-            if csv_file in zip_ref.namelist():
-                # Extract the file
-                fu.log(f'{csv_file} exists, copying into {self.stage_io_dict["out"]["output_path_csv"]}.',
+        # Check that the indices are valid
+        for index in indices:
+            if index < 1 or index >= len(self.sequence) - 1:
+                fu.log(f"Index {index} not valid. It should be between 0 and {len(self.sequence) - 2}.",
                        self.out_log, self.global_log)
-                with zip_ref.open(csv_file) as source, open(self.stage_io_dict["out"]["output_path_csv"], "wb") as target:
-                    shutil.copyfileobj(source, target)
-            else:
-                fu.log(f"File {csv_file} not found in the zip file.", self.out_log, self.global_log)
                 exit(1)
 
-            # Check if the jpg file exists in the zip file
-            if jpg_file in zip_ref.namelist():
+        # Get the filenames, with the index sequence base and next base
+        filenames = [
+            f"{type_}_{parameter}_{index}_{self.sequence[index-1] + self.sequence[index]}"
+            for type_ in types for parameter in parameters for index in indices]
+
+        # Check the outputs
+        output_path_csv = self.stage_io_dict["out"].get("output_path_csv")
+        output_path_jpg = self.stage_io_dict["out"].get("output_path_jpg")
+        output_dir_path = self.stage_io_dict["out"].get("output_dir_path")
+        if not (output_path_csv and output_path_jpg) and not output_dir_path:
+            fu.log("Either 'output_path_csv' and 'output_path_jpg' or 'output_dir_path' must be set to run DnaTimeseriesUnzip.",
+                   self.out_log, self.global_log)
+            exit(1)
+        if (output_path_csv or output_path_jpg) and len(filenames) > 1:
+            fu.log(f"{len(filenames)} files selected, 'output_path_csv' and 'output_path_jpg' can only be used with a single file. Use 'output_dir_path' instead.",
+                   self.out_log, self.global_log)
+            exit(1)
+
+        # Unzip the files, all of them read from the same archive index
+        self.start_phase("parse")
+        members = archive_index(self.stage_io_dict["in"]["input_zip_file"], cached=self.archive_index)
+        # Check if the csv and jpg files exist in the zip file
+        for filename in filenames:
+            for extension in ["csv", "jpg"]:
+                if f"{filename}.{extension}" not in members:
+                    fu.log(f"File {filename}.{extension} not found in the zip file.", self.out_log, self.global_log)
+                    exit(1)
+
+        self.start_phase("archive")
+        for extension, output_path in [("csv", output_path_csv), ("jpg", output_path_jpg)]:
+            if output_path:
                 # Extract the file
-                fu.log(f'{jpg_file} exists, copying into {self.stage_io_dict["out"]["output_path_jpg"]}.',
+                fu.log(f'{filenames[0]}.{extension} exists, copying into {output_path}.',
                        self.out_log, self.global_log)
-                with zip_ref.open(jpg_file) as source, open(self.stage_io_dict["out"]["output_path_jpg"], "wb") as target:
-                    shutil.copyfileobj(source, target)
-            else:
-                fu.log(f"File {jpg_file} not found in the zip file.", self.out_log, self.global_log)
-                exit(1)
-
-            # Write the list of files
-            if self.stage_io_dict["out"]["output_list_path"]:
-                with open(self.stage_io_dict["out"]["output_list_path"], "w") as f:
-                    for name in zip_ref.namelist():
-                        f.write(f"{name}\n")
+                extract_member(
+                    self.stage_io_dict["in"]["input_zip_file"], f"{filenames[0]}.{extension}",
+                    output_path, members)
+        if output_dir_path:
+            os.makedirs(output_dir_path, exist_ok=True)
+            fu.log(f'Extracting {2 * len(filenames)} files into {output_dir_path}.',
+                   self.out_log, self.global_log)
+            for filename in filenames:
+                for extension in ["csv", "jpg"]:
+                    extract_member(
+                        self.stage_io_dict["in"]["input_zip_file"], f"{filename}.{extension}",
+                        os.path.join(output_dir_path, f"{filename}.{extension}"), members)
+
+        # Write the list of files
+        if self.stage_io_dict["out"].get("output_list_path"):
+            with open(self.stage_io_dict["out"]["output_list_path"], "w") as f:
+                for name in members:
+                    f.write(f"{name}\n")
 
         # Run Biobb block
         # self.run_biobb()
@@ -180,9 +218,10 @@ class DnaTimeseriesUnzip(BiobbObject):
 
 def dna_timeseries_unzip(
         input_zip_file: str,
-        output_path_csv: str,
-        output_path_jpg: str,
+        output_path_csv: Optional[str] = None,
+        output_path_jpg: Optional[str] = None,
         output_list_path: Optional[str] = None,
+        output_dir_path: Optional[str] = None,
         properties: Optional[dict] = None,
         **kwargs) -> int:
     """Create :class:`DnaTimeseriesUnzip <biobb_dna.dna.dna_timeseries_unzip.DnaTimeseriesUnzip>` class and
@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 """Module containing the InterBasePairCorrelation class and the command line interface."""
-from itertools import product
 from typing import Optional
 
 import matplotlib as mpl
@@ -13,10 +12,13 @@ from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import neighbor_correlation
 
 
-class InterBasePairCorrelation(BiobbObject):
+class InterBasePairCorrelation(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna InterBasePairCorrelation
     | Calculate correlation between all base pairs of a single sequence and for a single helical parameter.
@@ -34,6 +36,7 @@ class InterBasePairCorrelation(BiobbObject):
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence for the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -129,86 +132,26 @@ class InterBasePairCorrelation(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input
-        shift = read_series(
-            self.stage_io_dict["in"]["input_filename_shift"], usecols=self.seqpos
-        )
-        slide = read_series(
-            self.stage_io_dict["in"]["input_filename_slide"], usecols=self.seqpos
-        )
-        rise = read_series(
-            self.stage_io_dict["in"]["input_filename_rise"], usecols=self.seqpos
-        )
-        tilt = read_series(
-            self.stage_io_dict["in"]["input_filename_tilt"], usecols=self.seqpos
-        )
-        roll = read_series(
-            self.stage_io_dict["in"]["input_filename_roll"], usecols=self.seqpos
-        )
-        twist = read_series(
-            self.stage_io_dict["in"]["input_filename_twist"], usecols=self.seqpos
-        )
-
-        if not self.seqpos:
-            # drop first and last columns
-            shift = shift[shift.columns[1:-2]]
-            slide = slide[slide.columns[1:-2]]
-            rise = rise[rise.columns[1:-2]]
-            tilt = tilt[tilt.columns[1:-2]]
-            roll = roll[roll.columns[1:-2]]
-            twist = twist[twist.columns[1:-2]]
-            labels = [
-                f"{i+1}_{self.sequence[i:i+2]}"
-                for i in range(1, len(shift.columns) + 1)
-            ]
-            corr_index = [
-                f"{self.sequence[i:i+3]}" for i in range(1, len(shift.columns) + 1)
-            ]
-        else:
-            labels = [f"{i+1}_{self.sequence[i:i+2]}" for i in self.seqpos]
-            corr_index = [f"{self.sequence[i:i+3]}" for i in self.seqpos]
-
-        # rename duplicated subunits
-        shift.columns = labels
-        slide.columns = labels
-        rise.columns = labels
-        tilt.columns = labels
-        roll.columns = labels
-        twist.columns = labels
-
-        # set names to each dataset
-        shift.name = "shift"
-        slide.name = "slide"
-        rise.name = "rise"
-        tilt.name = "tilt"
-        roll.name = "roll"
-        twist.name = "twist"
+        self.start_phase("parse")
+        shift = read_series(self.stage_io_dict["in"]["input_filename_shift"])
+        slide = read_series(self.stage_io_dict["in"]["input_filename_slide"])
+        rise = read_series(self.stage_io_dict["in"]["input_filename_rise"])
+        tilt = read_series(self.stage_io_dict["in"]["input_filename_tilt"])
+        roll = read_series(self.stage_io_dict["in"]["input_filename_roll"])
+        twist = read_series(self.stage_io_dict["in"]["input_filename_twist"])
 
         # get correlation between neighboring basepairs among all helical parameters
-        results = {}
-        datasets = [shift, slide, rise, tilt, roll, twist]
-        for ser1, ser2 in product(datasets, datasets):
-            ser2_shifted = ser2.shift(axis=1)
-            ser2_shifted[labels[0]] = ser2[labels[-1]]
-            if ser1.name in constants.hp_angular and ser2.name in constants.hp_angular:
-                method = self.circular
-            elif (
-                ser1.name in constants.hp_angular and ser2.name not in constants.hp_angular
-            ) or (
-                ser2.name in constants.hp_angular and ser1.name not in constants.hp_angular
-            ):
-                method = self.circlineal
-            else:
-                method = "pearson"  # type: ignore
-            corr_data = ser1.corrwith(ser2_shifted, method=method)
-            corr_data.index = corr_index
-            results[f"{ser1.name}/{ser2.name}"] = corr_data
-        result_df = pd.DataFrame.from_dict(results)
-        result_df.index = corr_index  # type: ignore
+        self.start_phase("compute")
+        result_df = interbp_correlation(
+            shift, slide, rise, tilt, roll, twist, self.sequence, self.seqpos
+        )
 
         # save csv data
+        self.start_phase("archive")
         result_df.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         # create heatmap
+        self.start_phase("render")
         cmap = plt.get_cmap("bwr").copy()
         bounds = [-1, -0.8, -0.6, -0.4, -0.2, 0.2, 0.4, 0.6, 0.8, 1]
         num = cmap.N
@@ -245,28 +188,42 @@ class InterBasePairCorrelation(BiobbObject):
 
         return 0
 
-    @staticmethod
-    def circular(x1, x2):
-        x1 = x1 * np.pi / 180
-        x2 = x2 * np.pi / 180
-        diff_1 = np.sin(x1 - x1.mean())
-        diff_2 = np.sin(x2 - x2.mean())
-        num = (diff_1 * diff_2).sum()
-        den = np.sqrt((diff_1**2).sum() * (diff_2**2).sum())
-        return num / den
-
-    @staticmethod
-    def circlineal(x1, x2):
-        x2 = x2 * np.pi / 180
-        rc = np.corrcoef(x1, np.cos(x2))[1, 0]
-        rs = np.corrcoef(x1, np.sin(x2))[1, 0]
-        rcs = np.corrcoef(np.sin(x2), np.cos(x2))[1, 0]
-        num = (rc**2) + (rs**2) - 2 * rc * rs * rcs
-        den = 1 - (rcs**2)
-        correlation = np.sqrt(num / den)
-        if np.corrcoef(x1, x2)[1, 0] < 0:
-            correlation *= -1
-        return correlation
+
+def interbp_correlation(shift, slide, rise, tilt, roll, twist, sequence, seqpos=None):
+    """Correlation between neighboring base pair steps among all pairs of helical
+    parameters, as saved by interbpcorr.
+
+    Each helical parameter is a (frames, columns) array or the DataFrame of a
+    whole .ser file, as read by read_series. If seqpos is not given, the first
+    and last base pair steps are discarded."""
+    usecols = list(seqpos) if seqpos else None
+    shift = select_series(series_frame(shift), usecols)
+    slide = select_series(series_frame(slide), usecols)
+    rise = select_series(series_frame(rise), usecols)
+    tilt = select_series(series_frame(tilt), usecols)
+    roll = select_series(series_frame(roll), usecols)
+    twist = select_series(series_frame(twist), usecols)
+
+    if not seqpos:
+        # drop first and last columns
+        shift = shift[shift.columns[1:-2]]
+        slide = slide[slide.columns[1:-2]]
+        rise = rise[rise.columns[1:-2]]
+        tilt = tilt[tilt.columns[1:-2]]
+        roll = roll[roll.columns[1:-2]]
+        twist = twist[twist.columns[1:-2]]
+        corr_index = [
+            f"{sequence[i:i+3]}" for i in range(1, len(shift.columns) + 1)
+        ]
+    else:
+        corr_index = [f"{sequence[i:i+3]}" for i in seqpos]
+
+    datasets = {"shift": shift, "slide": slide, "rise": rise, "tilt": tilt, "roll": roll, "twist": twist}
+    results = neighbor_correlation(datasets, constants.hp_angular)
+    result_df = pd.DataFrame.from_dict(
+        {name: pd.Series(corr_data, index=corr_index) for name, corr_data in results.items()})
+    result_df.index = corr_index  # type: ignore
+    return result_df
 
 
 def interbpcorr(
@@ -4,15 +4,17 @@
 from typing import Optional
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
-from biobb_dna.utils.loader import load_data
+from biobb_dna.utils import constants
+from biobb_dna.utils.loader import ArchiveMemberInputs, load_data, timeseries_frame
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import helpar_correlation_matrix
 
 
-class InterHelParCorrelation(BiobbObject):
+class InterHelParCorrelation(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna InterHelParCorrelation
     | Calculate correlation between helical parameters for a single inter-base pair.
@@ -29,6 +31,7 @@ class InterHelParCorrelation(BiobbObject):
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/correlation/inter_hpcorr_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
         properties (dict):
             * **basepair** (*str*) - (None) Name of basepair analyzed.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -106,6 +109,7 @@ class InterHelParCorrelation(BiobbObject):
         self.stage_files()
 
         # read input
+        self.start_phase("parse")
         shift = load_data(self.stage_io_dict["in"]["input_filename_shift"])
         slide = load_data(self.stage_io_dict["in"]["input_filename_slide"])
         rise = load_data(self.stage_io_dict["in"]["input_filename_rise"])
@@ -118,89 +122,16 @@ class InterHelParCorrelation(BiobbObject):
             self.basepair = shift.columns[0]
 
         # make matrix
-        coordinates = ["shift", "slide", "rise", "tilt", "roll", "twist"]
-        corr_matrix = pd.DataFrame(
-            np.eye(6, 6), index=coordinates, columns=coordinates)
-
-        # shift
-        # corr_matrix["shift"]["slide"] = shift.corrwith(slide, method="pearson")
-        corr_matrix.loc["slide", "shift"] = shift.corrwith(slide, method="pearson").values[0]
-        # corr_matrix["shift"]["rise"] = shift.corrwith(rise, method="pearson")
-        corr_matrix.loc["rise", "shift"] = shift.corrwith(rise, method="pearson").values[0]
-        # corr_matrix["shift"]["tilt"] = shift.corrwith(tilt, method=self.circlineal)
-        corr_matrix.loc["tilt", "shift"] = shift.corrwith(tilt, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["shift"]["roll"] = shift.corrwith(roll, method=self.circlineal)
-        corr_matrix.loc["roll", "shift"] = shift.corrwith(roll, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["shift"]["twist"] = shift.corrwith(twist, method=self.circlineal)
-        corr_matrix.loc["twist", "shift"] = shift.corrwith(twist, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["slide"]["shift"] = corr_matrix["shift"]["slide"]
-        corr_matrix.loc["shift", "slide"] = corr_matrix.loc["slide", "shift"]
-        # corr_matrix["rise"]["shift"] = corr_matrix["shift"]["rise"]
-        corr_matrix.loc["shift", "rise"] = corr_matrix.loc["rise", "shift"]
-        # corr_matrix["tilt"]["shift"] = corr_matrix["shift"]["tilt"]
-        corr_matrix.loc["shift", "tilt"] = corr_matrix.loc["tilt", "shift"]
-        # corr_matrix["roll"]["shift"] = corr_matrix["shift"]["roll"]
-        corr_matrix.loc["shift", "roll"] = corr_matrix.loc["roll", "shift"]
-        # corr_matrix["twist"]["shift"] = corr_matrix["shift"]["twist"]
-        corr_matrix.loc["shift", "twist"] = corr_matrix.loc["twist", "shift"]
-
-        # slide
-        # corr_matrix["slide"]["rise"] = slide.corrwith(rise, method="pearson")
-        corr_matrix.loc["rise", "slide"] = slide.corrwith(rise, method="pearson").values[0]
-        # corr_matrix["slide"]["tilt"] = slide.corrwith(tilt, method=self.circlineal)
-        corr_matrix.loc["tilt", "slide"] = slide.corrwith(tilt, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["slide"]["roll"] = slide.corrwith(roll, method=self.circlineal)
-        corr_matrix.loc["roll", "slide"] = slide.corrwith(roll, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["slide"]["twist"] = slide.corrwith(twist, method=self.circlineal)
-        corr_matrix.loc["twist", "slide"] = slide.corrwith(twist, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["rise"]["slide"] = corr_matrix["slide"]["rise"]
-        corr_matrix.loc["slide", "rise"] = corr_matrix.loc["rise", "slide"]
-        # corr_matrix["tilt"]["slide"] = corr_matrix["slide"]["tilt"]
-        corr_matrix.loc["slide", "tilt"] = corr_matrix.loc["tilt", "slide"]
-        # corr_matrix["roll"]["slide"] = corr_matrix["slide"]["roll"]
-        corr_matrix.loc["slide", "roll"] = corr_matrix.loc["roll", "slide"]
-        # corr_matrix["twist"]["slide"] = corr_matrix["slide"]["twist"]
-        corr_matrix.loc["slide", "twist"] = corr_matrix.loc["twist", "slide"]
-
-        # rise
-        # corr_matrix["rise"]["tilt"] = rise.corrwith(tilt, method=self.circlineal)
-        corr_matrix.loc["tilt", "rise"] = rise.corrwith(tilt, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["rise"]["roll"] = rise.corrwith(roll, method=self.circlineal)
-        corr_matrix.loc["roll", "rise"] = rise.corrwith(roll, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["rise"]["twist"] = rise.corrwith(twist, method=self.circlineal)
-        corr_matrix.loc["twist", "rise"] = rise.corrwith(twist, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["tilt"]["rise"] = corr_matrix["rise"]["tilt"]
-        corr_matrix.loc["rise", "tilt"] = corr_matrix.loc["tilt", "rise"]
-        # corr_matrix["roll"]["rise"] = corr_matrix["rise"]["roll"]
-        corr_matrix.loc["rise", "roll"] = corr_matrix.loc["roll", "rise"]
-        # corr_matrix["twist"]["rise"] = corr_matrix["rise"]["twist"]
-        corr_matrix.loc["rise", "twist"] = corr_matrix.loc["twist", "rise"]
-
-        # tilt
-        # corr_matrix["tilt"]["roll"] = tilt.corrwith(roll, method=self.circular)
-        corr_matrix.loc["roll", "tilt"] = tilt.corrwith(roll, method=self.circular).values[0]  # type: ignore
-        # corr_matrix["tilt"]["twist"] = tilt.corrwith(twist, method=self.circular)
-        corr_matrix.loc["twist", "tilt"] = tilt.corrwith(twist, method=self.circular).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["roll"]["tilt"] = corr_matrix["tilt"]["roll"]
-        corr_matrix.loc["tilt", "roll"] = corr_matrix.loc["roll", "tilt"]
-        # corr_matrix["twist"]["tilt"] = corr_matrix["tilt"]["twist"]
-        corr_matrix.loc["tilt", "twist"] = corr_matrix.loc["twist", "tilt"]
-
-        # roll
-        # corr_matrix["roll"]["twist"] = roll.corrwith(twist, method=self.circular)
-        corr_matrix.loc["twist", "roll"] = roll.corrwith(twist, method=self.circular).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["twist"]["roll"] = corr_matrix["roll"]["twist"]
-        corr_matrix.loc["roll", "twist"] = corr_matrix.loc["twist", "roll"]
+        self.start_phase("compute")
+        corr_matrix = interhp_correlation(shift, slide, rise, tilt, roll, twist)
+        coordinates = corr_matrix.columns.tolist()
 
         # save csv data
+        self.start_phase("archive")
         corr_matrix.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         # create heatmap
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.pcolor(corr_matrix)
         # Loop over data dimensions and create text annotations.
@@ -236,39 +167,22 @@ class InterHelParCorrelation(BiobbObject):
 
         return 0
 
-    def get_corr_method(self, corrtype1, corrtype2):
-        if corrtype1 == "circular" and corrtype2 == "linear":
-            method = self.circlineal
-        if corrtype1 == "linear" and corrtype2 == "circular":
-            method = self.circlineal
-        elif corrtype1 == "circular" and corrtype2 == "circular":
-            method = self.circular
-        else:
-            method = "pearson"
-        return method
-
-    @staticmethod
-    def circular(x1, x2):
-        x1 = x1 * np.pi / 180
-        x2 = x2 * np.pi / 180
-        diff_1 = np.sin(x1 - x1.mean())
-        diff_2 = np.sin(x2 - x2.mean())
-        num = (diff_1 * diff_2).sum()
-        den = np.sqrt((diff_1 ** 2).sum() * (diff_2 ** 2).sum())
-        return num / den
-
-    @staticmethod
-    def circlineal(x1, x2):
-        x2 = x2 * np.pi / 180
-        rc = np.corrcoef(x1, np.cos(x2))[1, 0]
-        rs = np.corrcoef(x1, np.sin(x2))[1, 0]
-        rcs = np.corrcoef(np.sin(x2), np.cos(x2))[1, 0]
-        num = (rc ** 2) + (rs ** 2) - 2 * rc * rs * rcs
-        den = 1 - (rcs ** 2)
-        correlation = np.sqrt(num / den)
-        if np.corrcoef(x1, x2)[1, 0] < 0:
-            correlation *= -1
-        return correlation
+
+def interhp_correlation(shift, slide, rise, tilt, roll, twist):
+    """Correlation matrix between the helical parameters of a single
+    base pair step, as saved by interhpcorr.
+
+    Each helical parameter is a one-dimensional array or a single column
+    DataFrame, as read by load_data from the time series .csv files of
+    dna_timeseries."""
+    coordinates = ["shift", "slide", "rise", "tilt", "roll", "twist"]
+    datasets = {
+        name: timeseries_frame(data).iloc[:, 0]
+        for name, data in zip(coordinates, [shift, slide, rise, tilt, roll, twist])
+    }
+    return pd.DataFrame(
+        helpar_correlation_matrix(datasets, constants.hp_angular),
+        index=coordinates, columns=coordinates)
 
 
 def interhpcorr(
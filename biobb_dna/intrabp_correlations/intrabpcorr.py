@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 
 """Module containing the IntraBasePairCorrelation class and the command line interface."""
-from itertools import product
 from typing import Optional
 
 import matplotlib as mpl
@@ -13,10 +12,13 @@ from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import neighbor_correlation
 
 
-class IntraBasePairCorrelation(BiobbObject):
+class IntraBasePairCorrelation(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna IntraBasePairCorrelation
     | Calculate correlation between all intra-base pairs of a single sequence and for a single helical parameter.
@@ -34,6 +36,7 @@ class IntraBasePairCorrelation(BiobbObject):
         properties (dict):
             * **sequence** (*str*) - (None) Nucleic acid sequence for the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -129,86 +132,26 @@ class IntraBasePairCorrelation(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input
-        shear = read_series(
-            self.stage_io_dict["in"]["input_filename_shear"], usecols=self.seqpos
-        )
-        stretch = read_series(
-            self.stage_io_dict["in"]["input_filename_stretch"], usecols=self.seqpos
-        )
-        stagger = read_series(
-            self.stage_io_dict["in"]["input_filename_stagger"], usecols=self.seqpos
-        )
-        buckle = read_series(
-            self.stage_io_dict["in"]["input_filename_buckle"], usecols=self.seqpos
-        )
-        propel = read_series(
-            self.stage_io_dict["in"]["input_filename_propel"], usecols=self.seqpos
-        )
-        opening = read_series(
-            self.stage_io_dict["in"]["input_filename_opening"], usecols=self.seqpos
-        )
-
-        if not self.seqpos:
-            # drop first and last columns
-            shear = shear[shear.columns[1:-1]]
-            stretch = stretch[stretch.columns[1:-1]]
-            stagger = stagger[stagger.columns[1:-1]]
-            buckle = buckle[buckle.columns[1:-1]]
-            propel = propel[propel.columns[1:-1]]
-            opening = opening[opening.columns[1:-1]]
-            labels = [
-                f"{i+1}_{self.sequence[i:i+1]}"
-                for i in range(1, len(shear.columns) + 1)
-            ]
-            corr_index = [
-                f"{self.sequence[i:i+2]}" for i in range(1, len(shear.columns) + 1)
-            ]
-        else:
-            labels = [f"{i+1}_{self.sequence[i:i+1]}" for i in self.seqpos]
-            corr_index = [f"{self.sequence[i:i+2]}" for i in self.seqpos]
-
-        # rename duplicated subunits
-        shear.columns = labels
-        stretch.columns = labels
-        stagger.columns = labels
-        buckle.columns = labels
-        propel.columns = labels
-        opening.columns = labels
-
-        # set names to each dataset
-        shear.name = "shear"
-        stretch.name = "stretch"
-        stagger.name = "stagger"
-        buckle.name = "buckle"
-        propel.name = "propel"
-        opening.name = "opening"
+        self.start_phase("parse")
+        shear = read_series(self.stage_io_dict["in"]["input_filename_shear"])
+        stretch = read_series(self.stage_io_dict["in"]["input_filename_stretch"])
+        stagger = read_series(self.stage_io_dict["in"]["input_filename_stagger"])
+        buckle = read_series(self.stage_io_dict["in"]["input_filename_buckle"])
+        propel = read_series(self.stage_io_dict["in"]["input_filename_propel"])
+        opening = read_series(self.stage_io_dict["in"]["input_filename_opening"])
 
         # get correlation between neighboring basepairs among all helical parameters
-        results = {}
-        datasets = [shear, stretch, stagger, buckle, propel, opening]
-        for ser1, ser2 in product(datasets, datasets):
-            ser2_shifted = ser2.shift(axis=1)
-            ser2_shifted[labels[0]] = ser2[labels[-1]]
-            if ser1.name in constants.hp_angular and ser2.name in constants.hp_angular:
-                method = self.circular
-            elif (
-                ser1.name in constants.hp_angular and ser2.name not in constants.hp_angular
-            ) or (
-                ser2.name in constants.hp_angular and ser1.name not in constants.hp_angular
-            ):
-                method = self.circlineal
-            else:
-                method = "pearson"  # type: ignore
-            corr_data = ser1.corrwith(ser2_shifted, method=method)
-            corr_data.index = corr_index
-            results[f"{ser1.name}/{ser2.name}"] = corr_data
-        result_df = pd.DataFrame.from_dict(results)
-        result_df.index = corr_index  # type: ignore
+        self.start_phase("compute")
+        result_df = intrabp_correlation(
+            shear, stretch, stagger, buckle, propel, opening, self.sequence, self.seqpos
+        )
 
         # save csv data
+        self.start_phase("archive")
         result_df.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         # create heatmap
+        self.start_phase("render")
         cmap = plt.get_cmap("bwr").copy()
         bounds = [-1, -0.8, -0.6, -0.4, -0.2, 0.2, 0.4, 0.6, 0.8, 1]
         num = cmap.N
@@ -245,28 +188,42 @@ class IntraBasePairCorrelation(BiobbObject):
 
         return 0
 
-    @staticmethod
-    def circular(x1, x2):
-        x1 = x1 * np.pi / 180
-        x2 = x2 * np.pi / 180
-        diff_1 = np.sin(x1 - x1.mean())
-        diff_2 = np.sin(x2 - x2.mean())
-        num = (diff_1 * diff_2).sum()
-        den = np.sqrt((diff_1**2).sum() * (diff_2**2).sum())
-        return num / den
-
-    @staticmethod
-    def circlineal(x1, x2):
-        x2 = x2 * np.pi / 180
-        rc = np.corrcoef(x1, np.cos(x2))[1, 0]
-        rs = np.corrcoef(x1, np.sin(x2))[1, 0]
-        rcs = np.corrcoef(np.sin(x2), np.cos(x2))[1, 0]
-        num = (rc**2) + (rs**2) - 2 * rc * rs * rcs
-        den = 1 - (rcs**2)
-        correlation = np.sqrt(num / den)
-        if np.corrcoef(x1, x2)[1, 0] < 0:
-            correlation *= -1
-        return correlation
+
+def intrabp_correlation(shear, stretch, stagger, buckle, propel, opening, sequence, seqpos=None):
+    """Correlation between neighboring base pairs among all pairs of helical
+    parameters, as saved by intrabpcorr.
+
+    Each helical parameter is a (frames, columns) array or the DataFrame of a
+    whole .ser file, as read by read_series. If seqpos is not given, the first
+    and last base pairs are discarded."""
+    usecols = list(seqpos) if seqpos else None
+    shear = select_series(series_frame(shear), usecols)
+    stretch = select_series(series_frame(stretch), usecols)
+    stagger = select_series(series_frame(stagger), usecols)
+    buckle = select_series(series_frame(buckle), usecols)
+    propel = select_series(series_frame(propel), usecols)
+    opening = select_series(series_frame(opening), usecols)
+
+    if not seqpos:
+        # drop first and last columns
+        shear = shear[shear.columns[1:-1]]
+        stretch = stretch[stretch.columns[1:-1]]
+        stagger = stagger[stagger.columns[1:-1]]
+        buckle = buckle[buckle.columns[1:-1]]
+        propel = propel[propel.columns[1:-1]]
+        opening = opening[opening.columns[1:-1]]
+        corr_index = [
+            f"{sequence[i:i+2]}" for i in range(1, len(shear.columns) + 1)
+        ]
+    else:
+        corr_index = [f"{sequence[i:i+2]}" for i in seqpos]
+
+    datasets = {"shear": shear, "stretch": stretch, "stagger": stagger, "buckle": buckle, "propel": propel, "opening": opening}
+    results = neighbor_correlation(datasets, constants.hp_angular)
+    result_df = pd.DataFrame.from_dict(
+        {name: pd.Series(corr_data, index=corr_index) for name, corr_data in results.items()})
+    result_df.index = corr_index  # type: ignore
+    return result_df
 
 
 def intrabpcorr(
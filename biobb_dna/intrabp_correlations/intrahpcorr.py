@@ -4,15 +4,17 @@
 from typing import Optional
 
 import pandas as pd
-import numpy as np
 import matplotlib.pyplot as plt
 
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
-from biobb_dna.utils.loader import load_data
+from biobb_dna.utils import constants
+from biobb_dna.utils.loader import ArchiveMemberInputs, load_data, timeseries_frame
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import helpar_correlation_matrix
 
 
-class IntraHelParCorrelation(BiobbObject):
+class IntraHelParCorrelation(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna IntraHelParCorrelation
     | Calculate correlation between helical parameters for a single intra-base pair.
@@ -29,6 +31,7 @@ class IntraHelParCorrelation(BiobbObject):
         output_jpg_path (str): Path to .jpg file where output is saved. File type: output. `Sample file <https://raw.githubusercontent.com/bioexcel/biobb_dna/master/biobb_dna/test/reference/correlation/intra_hpcorr_ref.jpg>`_. Accepted formats: jpg (edam:format_3579).
         properties (dict):
             * **base** (*str*) - (None) Name of base analyzed.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -106,6 +109,7 @@ class IntraHelParCorrelation(BiobbObject):
         self.stage_files()
 
         # read input
+        self.start_phase("parse")
         shear = load_data(self.stage_io_dict["in"]["input_filename_shear"])
         stretch = load_data(self.stage_io_dict["in"]["input_filename_stretch"])
         stagger = load_data(self.stage_io_dict["in"]["input_filename_stagger"])
@@ -118,91 +122,16 @@ class IntraHelParCorrelation(BiobbObject):
             self.base = shear.columns[0]
 
         # make matrix
-        # coordinates = ["shear", "stretch", "stagger", "buckle", "propel", "opening"]
-        coordinates = [
-            "shear", "stretch", "stagger", "buckle", "propel", "opening"]
-        corr_matrix = pd.DataFrame(
-            np.eye(6, 6), index=coordinates, columns=coordinates)
-
-        # shear
-        # corr_matrix["shear"]["stretch"] = shear.corrwith(stretch, method="pearson")
-        corr_matrix.loc["stretch", "shear"] = shear.corrwith(stretch, method="pearson").values[0]
-        # corr_matrix["shear"]["stagger"] = shear.corrwith(stagger, method="pearson")
-        corr_matrix.loc["stagger", "shear"] = shear.corrwith(stagger, method="pearson").values[0]
-        # corr_matrix["shear"]["buckle"] = shear.corrwith(buckle, method=self.circlineal)
-        corr_matrix.loc["buckle", "shear"] = shear.corrwith(buckle, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["shear"]["propel"] = shear.corrwith(propel, method=self.circlineal)
-        corr_matrix.loc["propel", "shear"] = shear.corrwith(propel, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["shear"]["opening"] = shear.corrwith(opening, method=self.circlineal)
-        corr_matrix.loc["opening", "shear"] = shear.corrwith(opening, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["stretch"]["shear"] = corr_matrix["shear"]["stretch"]
-        corr_matrix.loc["shear", "stretch"] = corr_matrix.loc["stretch", "shear"]
-        # corr_matrix["stagger"]["shear"] = corr_matrix["shear"]["stagger"]
-        corr_matrix.loc["shear", "stagger"] = corr_matrix.loc["stagger", "shear"]
-        # corr_matrix["buckle"]["shear"] = corr_matrix["shear"]["buckle"]
-        corr_matrix.loc["shear", "buckle"] = corr_matrix.loc["buckle", "shear"]
-        # corr_matrix["propel"]["shear"] = corr_matrix["shear"]["propel"]
-        corr_matrix.loc["shear", "propel"] = corr_matrix.loc["propel", "shear"]
-        # corr_matrix["opening"]["shear"] = corr_matrix["shear"]["opening"]
-        corr_matrix.loc["shear", "opening"] = corr_matrix.loc["opening", "shear"]
-
-        # stretch
-        # corr_matrix["stretch"]["stagger"] = stretch.corrwith(stagger, method="pearson")
-        corr_matrix.loc["stagger", "stretch"] = stretch.corrwith(stagger, method="pearson").values[0]
-        # corr_matrix["stretch"]["buckle"] = stretch.corrwith(buckle, method=self.circlineal)
-        corr_matrix.loc["buckle", "stretch"] = stretch.corrwith(buckle, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["stretch"]["propel"] = stretch.corrwith(propel, method=self.circlineal)
-        corr_matrix.loc["propel", "stretch"] = stretch.corrwith(propel, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["stretch"]["opening"] = stretch.corrwith(opening, method=self.circlineal)
-        corr_matrix.loc["opening", "stretch"] = stretch.corrwith(opening, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["stagger"]["stretch"] = corr_matrix["stretch"]["stagger"]
-        corr_matrix.loc["stretch", "stagger"] = corr_matrix.loc["stagger", "stretch"]
-        # corr_matrix["buckle"]["stretch"] = corr_matrix["stretch"]["buckle"]
-        corr_matrix.loc["stretch", "buckle"] = corr_matrix.loc["buckle", "stretch"]
-        # corr_matrix["propel"]["stretch"] = corr_matrix["stretch"]["propel"]
-        corr_matrix.loc["stretch", "propel"] = corr_matrix.loc["propel", "stretch"]
-        # corr_matrix["opening"]["stretch"] = corr_matrix["stretch"]["opening"]
-        corr_matrix.loc["stretch", "opening"] = corr_matrix.loc["opening", "stretch"]
-
-        # stagger
-        # corr_matrix["stagger"]["buckle"] = stagger.corrwith(buckle, method=self.circlineal)
-        corr_matrix.loc["buckle", "stagger"] = stagger.corrwith(buckle, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["stagger"]["propel"] = stagger.corrwith(propel, method=self.circlineal)
-        corr_matrix.loc["propel", "stagger"] = stagger.corrwith(propel, method=self.circlineal).values[0]  # type: ignore
-        # corr_matrix["stagger"]["opening"] = stagger.corrwith(opening, method=self.circlineal)
-        corr_matrix.loc["opening", "stagger"] = stagger.corrwith(opening, method=self.circlineal).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["buckle"]["stagger"] = corr_matrix["stagger"]["buckle"]
-        corr_matrix.loc["stagger", "buckle"] = corr_matrix.loc["buckle", "stagger"]
-        # corr_matrix["propel"]["stagger"] = corr_matrix["stagger"]["propel"]
-        corr_matrix.loc["stagger", "propel"] = corr_matrix.loc["propel", "stagger"]
-        # corr_matrix["opening"]["stagger"] = corr_matrix["stagger"]["opening"]
-        corr_matrix.loc["stagger", "opening"] = corr_matrix.loc["opening", "stagger"]
-
-        # buckle
-        # corr_matrix["buckle"]["propel"] = buckle.corrwith(propel, method=self.circular)
-        corr_matrix.loc["propel", "buckle"] = buckle.corrwith(propel, method=self.circular).values[0]  # type: ignore
-        # corr_matrix["buckle"]["opening"] = buckle.corrwith(opening, method=self.circular)
-        corr_matrix.loc["opening", "buckle"] = buckle.corrwith(opening, method=self.circular).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["propel"]["buckle"] = corr_matrix["buckle"]["propel"]
-        corr_matrix.loc["buckle", "propel"] = corr_matrix.loc["propel", "buckle"]
-        # corr_matrix["opening"]["buckle"] = corr_matrix["buckle"]["opening"]
-        corr_matrix.loc["buckle", "opening"] = corr_matrix.loc["opening", "buckle"]
-
-        # propel
-        # corr_matrix["propel"]["opening"] = propel.corrwith(opening, method=self.circular)
-        corr_matrix.loc["opening", "propel"] = propel.corrwith(opening, method=self.circular).values[0]  # type: ignore
-        # symmetric values
-        # corr_matrix["opening"]["propel"] = corr_matrix["propel"]["opening"]
-        corr_matrix.loc["propel", "opening"] = corr_matrix.loc["opening", "propel"]
+        self.start_phase("compute")
+        corr_matrix = intrahp_correlation(shear, stretch, stagger, buckle, propel, opening)
+        coordinates = corr_matrix.columns.tolist()
 
         # save csv data
+        self.start_phase("archive")
         corr_matrix.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         # create heatmap
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.pcolor(corr_matrix)
         # Loop over data dimensions and create text annotations.
@@ -238,39 +167,22 @@ class IntraHelParCorrelation(BiobbObject):
 
         return 0
 
-    def get_corr_method(self, corrtype1, corrtype2):
-        if corrtype1 == "circular" and corrtype2 == "linear":
-            method = self.circlineal
-        if corrtype1 == "linear" and corrtype2 == "circular":
-            method = self.circlineal
-        elif corrtype1 == "circular" and corrtype2 == "circular":
-            method = self.circular
-        else:
-            method = "pearson"
-        return method
-
-    @staticmethod
-    def circular(x1, x2):
-        x1 = x1 * np.pi / 180
-        x2 = x2 * np.pi / 180
-        diff_1 = np.sin(x1 - x1.mean())
-        diff_2 = np.sin(x2 - x2.mean())
-        num = (diff_1 * diff_2).sum()
-        den = np.sqrt((diff_1 ** 2).sum() * (diff_2 ** 2).sum())
-        return num / den
-
-    @staticmethod
-    def circlineal(x1, x2):
-        x2 = x2 * np.pi / 180
-        rc = np.corrcoef(x1, np.cos(x2))[1, 0]
-        rs = np.corrcoef(x1, np.sin(x2))[1, 0]
-        rcs = np.corrcoef(np.sin(x2), np.cos(x2))[1, 0]
-        num = (rc ** 2) + (rs ** 2) - 2 * rc * rs * rcs
-        den = 1 - (rcs ** 2)
-        correlation = np.sqrt(num / den)
-        if np.corrcoef(x1, x2)[1, 0] < 0:
-            correlation *= -1
-        return correlation
+
+def intrahp_correlation(shear, stretch, stagger, buckle, propel, opening):
+    """Correlation matrix between the helical parameters of a single
+    base pair, as saved by intrahpcorr.
+
+    Each helical parameter is a one-dimensional array or a single column
+    DataFrame, as read by load_data from the time series .csv files of
+    dna_timeseries."""
+    coordinates = ["shear", "stretch", "stagger", "buckle", "propel", "opening"]
+    datasets = {
+        name: timeseries_frame(data).iloc[:, 0]
+        for name, data in zip(coordinates, [shear, stretch, stagger, buckle, propel, opening])
+    }
+    return pd.DataFrame(
+        helpar_correlation_matrix(datasets, constants.hp_angular),
+        index=coordinates, columns=coordinates)
 
 
 def intrahpcorr(
@@ -6,16 +6,19 @@ from pathlib import Path
 from typing import Optional
 
 import matplotlib.pyplot as plt
-import numpy as np
+import pandas as pd
 from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
+from biobb_dna.utils.stats import circular_correlation, linear_correlation
 
 
-class IntraSequenceCorrelation(BiobbObject):
+class IntraSequenceCorrelation(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna IntraSequenceCorrelation
     | Calculate correlation between all intra-base pairs of a single sequence and for a single helical parameter.
@@ -29,6 +32,7 @@ class IntraSequenceCorrelation(BiobbObject):
             * **sequence** (*str*) - (None) Nucleic acid sequence for the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *seqpos* option).
             * **helpar_name** (*str*) - (None) helical parameter name to add to plot title.
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -120,12 +124,6 @@ class IntraSequenceCorrelation(BiobbObject):
                     f"Options: {constants.helical_parameters}"
                 )
 
-        # get base length and unit from helical parameter name
-        if self.helpar_name in constants.hp_angular:
-            self.method = "pearson"
-        else:
-            self.method = self.circular  # type: ignore
-
         # check seqpos
         if self.seqpos:
             if not (isinstance(self.seqpos, list) and len(self.seqpos) > 1):
@@ -134,25 +132,22 @@ class IntraSequenceCorrelation(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input .ser file
-        ser_data = read_series(
-            self.stage_io_dict["in"]["input_ser_path"], usecols=self.seqpos
-        )
-        if not self.seqpos:
-            ser_data = ser_data[ser_data.columns[1:-1]]
-            # discard first and last base(pairs) from strands
-            sequence = self.sequence[1:]
-            labels = [f"{i+1}_{sequence[i:i+1]}" for i in range(len(ser_data.columns))]
-        else:
-            labels = [f"{i+1}_{self.sequence[i:i+1]}" for i in self.seqpos]
-        ser_data.columns = labels
+        self.start_phase("parse")
+        ser_data = read_series(self.stage_io_dict["in"]["input_ser_path"])
 
         # make matrix
-        corr_data = ser_data.corr(method=self.method)
+        self.start_phase("compute")
+        corr_data = intraseq_correlation(
+            ser_data, self.sequence, self.helpar_name, self.seqpos
+        )
+        labels = corr_data.columns.tolist()
 
         # save csv data
+        self.start_phase("archive")
         corr_data.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         # create heatmap
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.pcolor(corr_data)
         # Loop over data dimensions and create text annotations.
@@ -187,15 +182,29 @@ class IntraSequenceCorrelation(BiobbObject):
 
         return 0
 
-    @staticmethod
-    def circular(x1, x2):
-        x1 = x1 * np.pi / 180
-        x2 = x2 * np.pi / 180
-        diff_1 = np.sin(x1 - x1.mean())
-        diff_2 = np.sin(x2 - x2.mean())
-        num = (diff_1 * diff_2).sum()
-        den = np.sqrt((diff_1**2).sum() * (diff_2**2).sum())
-        return num / den
+
+def intraseq_correlation(ser_data, sequence, helpar_name, seqpos=None):
+    """Correlation matrix between all the base pairs of a helical parameter,
+    as saved by intraseqcorr.
+
+    ser_data is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. If seqpos is not given, the first and last
+    base pairs are discarded."""
+    if helpar_name in constants.hp_angular:
+        method = linear_correlation
+    else:
+        method = circular_correlation
+
+    ser_data = select_series(series_frame(ser_data), list(seqpos) if seqpos else None)
+    if not seqpos:
+        ser_data = ser_data[ser_data.columns[1:-1]]
+        # discard first and last base(pairs) from strands
+        sequence = sequence[1:]
+        labels = [f"{i+1}_{sequence[i:i+1]}" for i in range(len(ser_data.columns))]
+    else:
+        labels = [f"{i+1}_{sequence[i:i+1]}" for i in seqpos]
+    ser_data.columns = labels
+    return pd.DataFrame(method(ser_data), index=labels, columns=labels)
 
 
 def intraseqcorr(
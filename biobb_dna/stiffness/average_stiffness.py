@@ -12,10 +12,12 @@ from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils import constants
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.loader import (
+    ArchiveMemberInputs, read_series, select_series, series_frame)
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class AverageStiffness(BiobbObject):
+class AverageStiffness(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna AverageStiffness
     | Calculate average stiffness constants for each base pair of a trajectory's series.
@@ -30,6 +32,7 @@ class AverageStiffness(BiobbObject):
             * **sequence** (*str*) - (None) Nucleic acid sequence corresponding to the input .ser file. Length of sequence is expected to be the same as the total number of columns in the .ser file, minus the index column (even if later on a subset of columns is selected with the *usecols* option).
             * **helpar_name** (*str*) - (None) helical parameter name.
             * **seqpos** (*list*) - (None) list of sequence positions (columns indices starting by 0) to analyze.  If not specified it will analyse the complete sequence.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -128,13 +131,11 @@ class AverageStiffness(BiobbObject):
                     f"Options: {constants.helical_parameters}"
                 )
 
-        # get base length and unit from helical parameter name
+        # get unit from helical parameter name
         if self.helpar_name.lower() in ["roll", "tilt", "twist"]:
             self.hp_unit = "kcal/(mol*degree²)"
-            scale = 1.0
         else:
             self.hp_unit = "kcal/(mol*Å²)"
-            scale = 10.6
 
         # check seqpos
         if self.seqpos:
@@ -148,24 +149,19 @@ class AverageStiffness(BiobbObject):
             self.seqpos = None  # type: ignore
 
         # read input .ser file
-        ser_data = read_series(
-            self.stage_io_dict["in"]["input_ser_path"], usecols=self.seqpos
-        )
-        if not self.seqpos:
-            ser_data = ser_data[ser_data.columns[1:-1]]
-            # discard first and last base(pairs) from sequence
-            sequence = self.sequence[1:]
-            xlabels = [f"{sequence[i:i+2]}" for i in range(len(ser_data.columns))]
-        else:
-            sequence = self.sequence
-            xlabels = [f"{sequence[i:i+2]}" for i in self.seqpos]
+        self.start_phase("parse")
+        ser_data = read_series(self.stage_io_dict["in"]["input_ser_path"])
 
         # calculate average stiffness
-        cov = ser_data.cov()
-        stiff = np.linalg.inv(cov) * self.KT
-        avg_stiffness = np.diag(stiff) * scale
+        self.start_phase("compute")
+        dataset = average_stiffness_table(
+            ser_data, self.sequence, self.helpar_name, self.seqpos, self.KT
+        )
+        xlabels = dataset.index.tolist()
+        avg_stiffness = dataset[f"{self.helpar_name}_stiffness"].to_numpy()
 
         # save plot
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.plot(range(len(xlabels)), avg_stiffness, "-o")
         axs.set_xticks(range(len(xlabels)))
@@ -178,9 +174,7 @@ class AverageStiffness(BiobbObject):
         fig.savefig(self.stage_io_dict["out"]["output_jpg_path"], format="jpg")
 
         # save table
-        dataset = pd.DataFrame(
-            data=avg_stiffness, index=xlabels, columns=[f"{self.helpar_name}_stiffness"]
-        )
+        self.start_phase("archive")
         dataset.to_csv(self.stage_io_dict["out"]["output_csv_path"])
 
         plt.close()
@@ -196,6 +190,36 @@ class AverageStiffness(BiobbObject):
         return 0
 
 
+def average_stiffness_table(ser_data, sequence, helpar_name, seqpos=None, KT=0.592186827):
+    """Table of the average stiffness constant of each base pair step of a
+    helical parameter, as saved by average_stiffness.
+
+    ser_data is a (frames, columns) array or the DataFrame of a whole .ser
+    file, as read by read_series. If seqpos is not given, the first and last
+    base pair steps are discarded."""
+    # get scale from helical parameter name
+    if helpar_name.lower() in ["roll", "tilt", "twist"]:
+        scale = 1.0
+    else:
+        scale = 10.6
+
+    ser_data = select_series(series_frame(ser_data), list(seqpos) if seqpos else None)
+    if not seqpos:
+        ser_data = ser_data[ser_data.columns[1:-1]]
+        # discard first and last base(pairs) from sequence
+        sequence = sequence[1:]
+        xlabels = [f"{sequence[i:i+2]}" for i in range(len(ser_data.columns))]
+    else:
+        xlabels = [f"{sequence[i:i+2]}" for i in seqpos]
+
+    cov = ser_data.cov()
+    stiff = np.linalg.inv(cov) * KT
+    avg_stiffness = np.diag(stiff) * scale
+    return pd.DataFrame(
+        data=avg_stiffness, index=xlabels, columns=[f"{helpar_name}_stiffness"]
+    )
+
+
 def average_stiffness(
     input_ser_path: str,
     output_csv_path: str,
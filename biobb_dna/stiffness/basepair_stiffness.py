@@ -12,10 +12,11 @@ from biobb_common.generic.biobb_object import BiobbObject
 from biobb_common.tools.file_utils import launchlogger
 
 from biobb_dna.utils.common import _from_string_to_list
-from biobb_dna.utils.loader import load_data
+from biobb_dna.utils.loader import ArchiveMemberInputs, load_data, timeseries_frame
+from biobb_dna.utils.profiling import LaunchProfiler
 
 
-class BPStiffness(BiobbObject):
+class BPStiffness(LaunchProfiler, ArchiveMemberInputs, BiobbObject):
     """
     | biobb_dna BPStiffness
     | Calculate stiffness constants matrix between all six helical parameters for a single base pair step.
@@ -33,6 +34,7 @@ class BPStiffness(BiobbObject):
         properties (dict):
             * **KT** (*float*) - (0.592186827) Value of Boltzmann temperature factor.
             * **scaling** (*list*) - ([1, 1, 1, 10.6, 10.6, 10.6]) Values by which to scale stiffness. Positions correspond to helical parameters in the order: shift, slide, rise, tilt, roll, twist.
+            * **profile** (*bool*) - (False) [WF property] Save the wall time and the resident memory at the start and end of each phase of the launch in a .json file next to the first output file (with its name and the _profile.json suffix). Also enabled by the BIOBB_DNA_PROFILE environment variable.
             * **remove_tmp** (*bool*) - (True) [WF property] Remove temporal files.
             * **restart** (*bool*) - (False) [WF property] Do not execute if output files exist.
             * **sandbox_path** (*str*) - ("./") [WF property] Parent path to the sandbox directory.
@@ -124,6 +126,7 @@ class BPStiffness(BiobbObject):
         self.stage_files()
 
         # read input
+        self.start_phase("parse")
         shift = load_data(self.stage_io_dict["in"]["input_filename_shift"])
         slide = load_data(self.stage_io_dict["in"]["input_filename_slide"])
         rise = load_data(self.stage_io_dict["in"]["input_filename_rise"])
@@ -132,22 +135,19 @@ class BPStiffness(BiobbObject):
         twist = load_data(self.stage_io_dict["in"]["input_filename_twist"])
 
         # build matrix cols_arr from helpar input data files
-        coordinates = ["shift", "slide", "rise", "tilt", "roll", "twist"]
-        basepairname = shift.columns[0]
-        helpar_matrix = pd.concat([shift, slide, rise, tilt, roll, twist], axis=1)
-        helpar_matrix.columns = coordinates
-        # covariance
-        cov_df = helpar_matrix.cov()
-        # stiffness
-        stiff = np.linalg.inv(cov_df) * self.KT
-        stiff_diag = stiff * np.array(self.scaling)
-        stiff_df = pd.DataFrame(stiff_diag, columns=cov_df.columns, index=cov_df.index)
-        stiff_df.index.name = basepairname
+        self.start_phase("compute")
+        stiff_df = basepair_stiffness_table(
+            shift, slide, rise, tilt, roll, twist, self.KT, self.scaling
+        )
+        coordinates = stiff_df.columns.tolist()
+        basepairname = stiff_df.index.name
 
         # save csv data
+        self.start_phase("archive")
         stiff_df.to_csv(Path(self.stage_io_dict["out"]["output_csv_path"]))
 
         # create heatmap
+        self.start_phase("render")
         fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
         axs.pcolor(stiff_df)
         # Loop over data dimensions and create text annotations.
@@ -189,6 +189,32 @@ class BPStiffness(BiobbObject):
         return 0
 
 
+def basepair_stiffness_table(
+        shift, slide, rise, tilt, roll, twist, KT=0.592186827, scaling=(1, 1, 1, 10, 10, 10)):
+    """Stiffness constants matrix between the six helical parameters of a base
+    pair step, as saved by basepair_stiffness.
+
+    Each helical parameter is a one-dimensional array or a single column
+    DataFrame, as read by load_data from the time series .csv files of
+    dna_timeseries. The base pair step name is the column of shift. The
+    default scaling is the one of basepair_stiffness, which reads the scaling
+    property as integers."""
+    data = [timeseries_frame(hp) for hp in (shift, slide, rise, tilt, roll, twist)]
+    # build matrix cols_arr from helpar input data files
+    coordinates = ["shift", "slide", "rise", "tilt", "roll", "twist"]
+    basepairname = data[0].columns[0]
+    helpar_matrix = pd.concat(data, axis=1)
+    helpar_matrix.columns = coordinates
+    # covariance
+    cov_df = helpar_matrix.cov()
+    # stiffness
+    stiff = np.linalg.inv(cov_df) * KT
+    stiff_diag = stiff * np.array(scaling)
+    stiff_df = pd.DataFrame(stiff_diag, columns=cov_df.columns, index=cov_df.index)
+    stiff_df.index.name = basepairname
+    return stiff_df
+
+
 def basepair_stiffness(
     input_filename_shift: str,
     input_filename_slide: str,
@@ -0,0 +1,25 @@
+# type: ignore
+from types import SimpleNamespace
+
+import pytest
+
+from biobb_dna.test.benchmarks.harness import BenchmarkRecorder, scale_id, scales, write_inputs
+
+
+@pytest.fixture(scope="session")
+def recorder():
+    benchmark_recorder = BenchmarkRecorder()
+    yield benchmark_recorder
+    if benchmark_recorder.results:
+        benchmark_recorder.save()
+
+
+@pytest.fixture(scope="session", params=scales(), ids=scale_id)
+def inputs(request, tmp_path_factory):
+    """Synthetic inputs of one (frames, bases) scale, written once per session."""
+    frames, bases = request.param
+    directory = tmp_path_factory.mktemp(scale_id(request.param))
+    sequence = write_inputs(directory, frames, bases)
+    return SimpleNamespace(
+        dir=directory, sequence=sequence, scale=request.param,
+        position=bases // 2, base=sequence[bases // 2:bases // 2 + 2])
@@ -0,0 +1,146 @@
+# type: ignore
+"""Helpers of the benchmark suite: scaled synthetic inputs, timing and peak memory.
+
+The benchmarks only run if the BIOBB_DNA_BENCHMARK environment variable is
+set. The scales are lists of comma separated values in
+BIOBB_DNA_BENCHMARK_FRAMES and BIOBB_DNA_BENCHMARK_BASES, and the results
+are saved as JSON in BIOBB_DNA_BENCHMARK_OUTPUT."""
+import gc
+import json
+import os
+import time
+import tracemalloc
+import zipfile
+from itertools import product
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from biobb_dna.utils import constants
+from biobb_dna.utils.loader import read_series_array
+from biobb_dna.utils.synthetic import write_canal_output
+
+BENCHMARK_ENV = "BIOBB_DNA_BENCHMARK"
+DEFAULT_FRAMES = "1000,100000"
+DEFAULT_BASES = "12,100"
+DEFAULT_OUTPUT = "benchmark_results.json"
+
+requires_benchmark = pytest.mark.skipif(
+    not os.getenv(BENCHMARK_ENV),
+    reason=f"set {BENCHMARK_ENV}=1 to run the benchmarks")
+
+# helical parameters of the synthetic inputs
+HELPARS = [
+    "shift", "slide", "rise", "tilt", "roll", "twist",
+    "shear", "stretch", "stagger", "buckle", "propel", "opening",
+    "alphaC", "alphaW", "gammaC", "gammaW", "epsilC", "epsilW", "zetaC", "zetaW",
+    "phaseC", "phaseW",
+]
+
+
+def _int_list(env, default):
+    return [int(float(value)) for value in os.getenv(env, default).split(",") if value]
+
+
+def scales():
+    """(frames, bases) pairs of the benchmarks."""
+    return list(product(
+        _int_list("BIOBB_DNA_BENCHMARK_FRAMES", DEFAULT_FRAMES),
+        _int_list("BIOBB_DNA_BENCHMARK_BASES", DEFAULT_BASES)))
+
+
+def scale_id(scale):
+    return f"{scale[0]}frames-{scale[1]}bp"
+
+
+def random_sequence(bases, seed=0):
+    return "".join(np.random.default_rng(seed).choice(list("ACGT"), bases))
+
+
+def write_inputs(directory, frames, bases, seed=0):
+    """Write the synthetic inputs of all the benchmarks to directory: a
+    canal_output_<helpar>.ser file for every helical parameter of HELPARS,
+    the canal_output.zip file with all of them and a
+    series_<helpar>_<base>.csv file of the middle base pair (step).
+    Returns the sequence."""
+    directory = Path(directory)
+    sequence = random_sequence(bases, seed)
+    position = bases // 2
+    base = sequence[position:position + 2]
+    write_canal_output(directory, sequence, frames, helpars=HELPARS, histo=False, seed=seed)
+    with zipfile.ZipFile(directory / "canal_output.zip", "w") as zf:
+        for helpar in HELPARS:
+            ser_path = directory / f"canal_output_{helpar}.ser"
+            zf.write(ser_path, arcname=ser_path.name)
+            series = read_series_array(ser_path, usecols=[position])[:, 0]
+            if helpar in constants.hp_basepairs:
+                name = f"series_{helpar}_{base}"
+            else:
+                name = f"series_{helpar}_{base[0]}"
+            np.savetxt(
+                directory / f"{name}.csv",
+                np.column_stack([np.arange(frames), series]),
+                fmt=["%d", "%.2f"], delimiter=",", header=f",{name.split('_')[-1]}",
+                comments="")
+    return sequence
+
+
+def measure(function, *args, repeat=1, **kwargs):
+    """Call function repeat times and return its fastest wall time in seconds
+    and the peak of memory allocated in MB (traced with tracemalloc, which
+    follows numpy arrays), with the result of the last call."""
+    seconds = []
+    peak = 0
+    for _ in range(repeat):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        finally:
+            seconds.append(time.perf_counter() - start)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+            tracemalloc.stop()
+    return min(seconds), peak / 1024 ** 2, result
+
+
+class BenchmarkRecorder:
+    """Collects the results of the benchmarks and saves them as JSON."""
+
+    def __init__(self, output_path=None):
+        self.output_path = output_path or os.getenv(
+            "BIOBB_DNA_BENCHMARK_OUTPUT", DEFAULT_OUTPUT)
+        self.results = []
+
+    def __call__(self, name, scale, function, *args, phase="total", **kwargs):
+        seconds, peak_mb, result = measure(
+            function, *args, repeat=int(os.getenv("BIOBB_DNA_BENCHMARK_REPEAT", 1)), **kwargs)
+        self.results.append({
+            "name": name,
+            "phase": phase,
+            "frames": scale[0],
+            "bases": scale[1],
+            "seconds": seconds,
+            "peak_mb": peak_mb,
+        })
+        return result
+
+    def add_profile(self, name, scale, metrics_path):
+        """Add the phases of the profile of a building block launch."""
+        with open(metrics_path) as metrics_file:
+            metrics = json.load(metrics_file)
+        for phase in metrics["phases"]:
+            self.results.append({
+                "name": name,
+                "phase": phase["name"],
+                "frames": scale[0],
+                "bases": scale[1],
+                "seconds": phase["seconds"],
+                "start_rss_mb": phase["start_rss_mb"],
+                "end_rss_mb": phase["end_rss_mb"],
+            })
+
+    def save(self):
+        with open(self.output_path, "w") as results_file:
+            json.dump(self.results, results_file, indent=2)
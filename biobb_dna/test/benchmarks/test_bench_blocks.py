@@ -0,0 +1,169 @@
+# type: ignore
+"""Wall time and peak memory of the launch of every building block."""
+import logging
+import os
+
+import pytest
+
+from biobb_dna.backbone.backbone_analysis import backbone_analysis
+from biobb_dna.backbone.backbone_joint import backbone_joint
+from biobb_dna.backbone.backbone_kinetics import backbone_kinetics
+from biobb_dna.backbone.bipopulations import bipopulations
+from biobb_dna.backbone.canonicalag import canonicalag
+from biobb_dna.backbone.puckering import puckering
+from biobb_dna.dna.dna_averages import dna_averages
+from biobb_dna.dna.dna_averages_batch import dna_averages_batch
+from biobb_dna.dna.dna_bimodality import dna_bimodality
+from biobb_dna.dna.dna_rolling import dna_rolling
+from biobb_dna.dna.dna_suite import dna_suite
+from biobb_dna.dna.dna_timeseries import dna_timeseries
+from biobb_dna.interbp_correlations.interbpcorr import interbpcorr
+from biobb_dna.interbp_correlations.interhpcorr import interhpcorr
+from biobb_dna.interbp_correlations.interseqcorr import interseqcorr
+from biobb_dna.intrabp_correlations.intrabpcorr import intrabpcorr
+from biobb_dna.intrabp_correlations.intrahpcorr import intrahpcorr
+from biobb_dna.intrabp_correlations.intraseqcorr import intraseqcorr
+from biobb_dna.stiffness.average_stiffness import average_stiffness
+from biobb_dna.stiffness.basepair_stiffness import basepair_stiffness
+from biobb_dna.test.benchmarks.harness import requires_benchmark
+from biobb_dna.utils.profiling import PROFILE_ENV, PROFILE_SUFFIX
+
+mpl_logger = logging.getLogger("matplotlib")
+mpl_logger.setLevel(logging.ERROR)
+
+pytestmark = requires_benchmark
+
+INTER_HELPARS = ["shift", "slide", "rise", "tilt", "roll", "twist"]
+INTRA_HELPARS = ["shear", "stretch", "stagger", "buckle", "propel", "opening"]
+BACKBONE_HELPARS = [
+    "alphaC", "alphaW", "gammaC", "gammaW", "epsilC", "epsilW",
+    "zetaC", "zetaW", "phaseC", "phaseW"]
+
+
+def ser(inputs, helpar):
+    return str(inputs.dir / f"canal_output_{helpar}.ser")
+
+
+def series_csv(inputs, helpar):
+    base = inputs.base if helpar in INTER_HELPARS else inputs.base[0]
+    return str(inputs.dir / f"series_{helpar}_{base}.csv")
+
+
+def run_block(name, inputs, out):
+    """Launch block name with the synthetic inputs, writing its outputs to out."""
+    sequence = inputs.sequence
+    properties = {"sequence": sequence, "sandbox_path": str(out), "path": str(out)}
+    zip_file = str(inputs.dir / "canal_output.zip")
+    if name == "dna_averages":
+        return dna_averages(
+            ser(inputs, "shift"), str(out / "avg.csv"), str(out / "avg.jpg"),
+            properties=properties)
+    if name == "dna_averages_batch":
+        return dna_averages_batch(
+            str(out / "avg_batch.csv"), input_zip_file=zip_file, properties=properties)
+    if name == "dna_timeseries":
+        seqpos = [inputs.position, inputs.position + 1]
+        return dna_timeseries(
+            ser(inputs, "shift"), str(out / "timeseries.zip"),
+            properties={**properties, "seqpos": seqpos})
+    if name == "dna_bimodality":
+        return dna_bimodality(
+            series_csv(inputs, "shift"), str(out / "bimod.csv"), str(out / "bimod.jpg"),
+            properties={"helpar_name": "shift", "sandbox_path": str(out), "path": str(out)})
+    if name == "dna_rolling":
+        window = max(1, min(1000, inputs.scale[0] // 10))
+        return dna_rolling(
+            ser(inputs, "shift"), str(out / "rolling.csv"), str(out / "rolling.jpg"),
+            properties={**properties, "window": window, "stride": window})
+    if name == "average_stiffness":
+        return average_stiffness(
+            ser(inputs, "roll"), str(out / "avgstiff.csv"), str(out / "avgstiff.jpg"),
+            properties=properties)
+    if name == "basepair_stiffness":
+        return basepair_stiffness(
+            **{f"input_filename_{hp}": series_csv(inputs, hp) for hp in INTER_HELPARS},
+            output_csv_path=str(out / "bpstiff.csv"), output_jpg_path=str(out / "bpstiff.jpg"),
+            properties={"sandbox_path": str(out), "path": str(out)})
+    if name == "interseqcorr":
+        return interseqcorr(
+            ser(inputs, "roll"), str(out / "interseq.csv"), str(out / "interseq.jpg"),
+            properties=properties)
+    if name == "intraseqcorr":
+        return intraseqcorr(
+            ser(inputs, "buckle"), str(out / "intraseq.csv"), str(out / "intraseq.jpg"),
+            properties=properties)
+    if name == "interbpcorr":
+        return interbpcorr(
+            **{f"input_filename_{hp}": ser(inputs, hp) for hp in INTER_HELPARS},
+            output_csv_path=str(out / "interbp.csv"), output_jpg_path=str(out / "interbp.jpg"),
+            properties=properties)
+    if name == "intrabpcorr":
+        return intrabpcorr(
+            **{f"input_filename_{hp}": ser(inputs, hp) for hp in INTRA_HELPARS},
+            output_csv_path=str(out / "intrabp.csv"), output_jpg_path=str(out / "intrabp.jpg"),
+            properties=properties)
+    if name == "interhpcorr":
+        return interhpcorr(
+            **{f"input_filename_{hp}": series_csv(inputs, hp) for hp in INTER_HELPARS},
+            output_csv_path=str(out / "interhp.csv"), output_jpg_path=str(out / "interhp.jpg"),
+            properties={"sandbox_path": str(out), "path": str(out)})
+    if name == "intrahpcorr":
+        return intrahpcorr(
+            **{f"input_filename_{hp}": series_csv(inputs, hp) for hp in INTRA_HELPARS},
+            output_csv_path=str(out / "intrahp.csv"), output_jpg_path=str(out / "intrahp.jpg"),
+            properties={"sandbox_path": str(out), "path": str(out)})
+    if name == "bipopulations":
+        return bipopulations(
+            **{f"input_{hp}_path": ser(inputs, hp) for hp in ["epsilC", "epsilW", "zetaC", "zetaW"]},
+            output_csv_path=str(out / "bipop.csv"), output_jpg_path=str(out / "bipop.jpg"),
+            properties=properties)
+    if name == "canonicalag":
+        return canonicalag(
+            **{f"input_{hp}_path": ser(inputs, hp) for hp in ["alphaC", "alphaW", "gammaC", "gammaW"]},
+            output_csv_path=str(out / "canonag.csv"), output_jpg_path=str(out / "canonag.jpg"),
+            properties=properties)
+    if name == "puckering":
+        return puckering(
+            **{f"input_{hp}_path": ser(inputs, hp) for hp in ["phaseC", "phaseW"]},
+            output_csv_path=str(out / "puckering.csv"), output_jpg_path=str(out / "puckering.jpg"),
+            properties=properties)
+    if name == "backbone_analysis":
+        return backbone_analysis(
+            output_bipop_csv_path=str(out / "bipop.csv"),
+            output_canonag_csv_path=str(out / "canonag.csv"),
+            output_puckering_csv_path=str(out / "puckering.csv"),
+            input_zip_file=zip_file, properties=properties)
+    if name == "backbone_kinetics":
+        return backbone_kinetics(
+            str(out / "kinetics.csv"), input_zip_file=zip_file,
+            properties={**properties, "type": "puckering"})
+    if name == "backbone_joint":
+        return backbone_joint(
+            str(out / "joint.csv"), input_zip_file=zip_file, properties=properties)
+    if name == "dna_suite":
+        seqpos = [inputs.position, inputs.position + 1]
+        return dna_suite(
+            zip_file, str(out / "suite.zip"),
+            properties={
+                **properties, "block_properties": {"dna_timeseries": {"seqpos": seqpos}},
+                "num_workers": os.cpu_count()})
+    raise ValueError(f"Unknown block {name}")
+
+
+BLOCKS = [
+    "dna_averages", "dna_averages_batch", "dna_timeseries", "dna_bimodality", "dna_rolling",
+    "average_stiffness", "basepair_stiffness",
+    "interseqcorr", "intraseqcorr", "interbpcorr", "intrabpcorr", "interhpcorr", "intrahpcorr",
+    "bipopulations", "canonicalag", "puckering",
+    "backbone_analysis", "backbone_kinetics", "backbone_joint", "dna_suite",
+]
+
+
+@pytest.mark.parametrize("name", BLOCKS)
+def test_bench_block(name, inputs, recorder, tmp_path, monkeypatch):
+    # the phases of the launch are saved next to the outputs
+    monkeypatch.setenv(PROFILE_ENV, "1")
+    returncode = recorder(name, inputs.scale, run_block, name, inputs, tmp_path)
+    assert returncode == 0
+    for metrics_path in tmp_path.glob(f"*{PROFILE_SUFFIX}"):
+        recorder.add_profile(name, inputs.scale, metrics_path)
@@ -0,0 +1,92 @@
+# type: ignore
+"""Wall time and peak memory of the phases shared by the building blocks:
+parse, compute, plot, zip and staging."""
+import logging
+import zipfile
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+from biobb_dna.dna.dna_averages import HelParAverages
+from biobb_dna.test.benchmarks.harness import requires_benchmark
+from biobb_dna.utils.downsample import lttb_indices
+from biobb_dna.utils.loader import load_data, read_series, read_series_array
+from biobb_dna.utils.stats import (
+    circular_correlation,
+    column_histograms,
+    linear_correlation,
+    rolling_window_stats,
+)
+
+mpl_logger = logging.getLogger("matplotlib")
+mpl_logger.setLevel(logging.ERROR)
+
+pytestmark = requires_benchmark
+
+
+def test_bench_parse(inputs, recorder, tmp_path):
+    ser_path = inputs.dir / "canal_output_shift.ser"
+    ser_data = recorder("read_series", inputs.scale, read_series, ser_path, phase="parse")
+    assert ser_data.shape == inputs.scale
+    values = recorder(
+        "read_series_array", inputs.scale, read_series_array, ser_path,
+        npy_path=tmp_path / "shift.npy", phase="parse")
+    assert values.shape == inputs.scale
+    series = recorder(
+        "load_data", inputs.scale, load_data,
+        str(inputs.dir / f"series_shift_{inputs.base}.csv"), phase="parse")
+    assert len(series) == inputs.scale[0]
+
+
+def test_bench_compute(inputs, recorder):
+    linear = read_series(inputs.dir / "canal_output_shift.ser").to_numpy()
+    angular = read_series(inputs.dir / "canal_output_twist.ser").to_numpy()
+    recorder("linear_correlation", inputs.scale, linear_correlation, linear, phase="compute")
+    recorder("circular_correlation", inputs.scale, circular_correlation, angular, phase="compute")
+    recorder("column_histograms", inputs.scale, column_histograms, linear, phase="compute")
+    window = max(1, min(1000, inputs.scale[0] // 10))
+    recorder(
+        "rolling_window_stats", inputs.scale, rolling_window_stats, angular, window,
+        angular=True, phase="compute")
+    column = linear[:, inputs.position]
+    recorder(
+        "lttb_indices", inputs.scale, lttb_indices, np.arange(len(column)), column, 2000,
+        phase="compute")
+
+
+def test_bench_plot(inputs, recorder, tmp_path):
+    correlations = linear_correlation(read_series(inputs.dir / "canal_output_shift.ser"))
+
+    def heatmap():
+        fig, axs = plt.subplots(1, 1, dpi=300, tight_layout=True)
+        axs.imshow(correlations, cmap="bwr", vmin=-1, vmax=1)
+        axs.set_xticks(range(len(correlations)))
+        axs.set_yticks(range(len(correlations)))
+        fig.savefig(tmp_path / "heatmap.jpg", format="jpg")
+        plt.close()
+
+    recorder("heatmap", inputs.scale, heatmap, phase="plot")
+
+
+def test_bench_zip(inputs, recorder, tmp_path):
+    ser_path = inputs.dir / "canal_output_shift.ser"
+    zip_path = tmp_path / "canal_output.zip"
+
+    def write_zip():
+        with zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+            zf.write(ser_path, arcname=ser_path.name)
+
+    recorder("zip_write", inputs.scale, write_zip, phase="zip")
+    ser_data = recorder(
+        "zip_read_series", inputs.scale, read_series, f"{zip_path}::{ser_path.name}",
+        phase="zip")
+    assert ser_data.shape == inputs.scale
+
+
+def test_bench_staging(inputs, recorder, tmp_path):
+    block = HelParAverages(
+        str(inputs.dir / "canal_output_shift.ser"),
+        str(tmp_path / "avg.csv"), str(tmp_path / "avg.jpg"),
+        properties={"sequence": inputs.sequence, "sandbox_path": str(tmp_path)})
+    recorder("stage_files", inputs.scale, block.stage_files, phase="staging")
+    recorder("remove_tmp_files", inputs.scale, block.remove_tmp_files, phase="staging")
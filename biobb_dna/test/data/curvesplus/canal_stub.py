@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""Minimal Canal replacement for tests: reads the &inp namelist from stdin and
+writes .ser and .his outputs computed from the snapshot number of each
+selected line of the input .cda file."""
+import re
+import sys
+
+import numpy as np
+
+namelist = sys.stdin.read()
+values = dict(re.findall(r"(\w+)=([^,\n]+)", namelist))
+lis = values["lis"].strip("'")
+itst, itnd, itdel = int(values["itst"]), int(values["itnd"]), int(values["itdel"])
+cda_path, sequence = namelist.split("&end")[1].split()[:2]
+
+with open(cda_path) as cda_file:
+    snapshots = [int(line.split()[-1]) for line in cda_file if line.strip()]
+if itnd <= 0:
+    itnd = len(snapshots)
+snapshots = [snapshots[i - 1] for i in range(max(itst, 1), itnd + 1, itdel)]
+
+with open(f"{lis}.lis", "w") as lis_file:
+    lis_file.write(f"  Strand  1 has {len(sequence)} bases (5'-3'): {sequence}\n")
+    lis_file.write(f"  Snapshots analyzed: {len(snapshots)}\n")
+
+levels = np.arange(1, len(sequence) + 1)
+centers = np.arange(-175, 180, 10)
+for name, factor in (("shift", 7), ("alphaW", 37)):
+    series = (np.outer(snapshots, levels) * factor) % 360 - 180.0
+    if values["series"] == ".t.":
+        with open(f"{lis}_{name}.ser", "w") as ser_file:
+            for i, row in enumerate(series, start=1):
+                ser_file.write(f"{i:12d}" + "".join(f"{v:8.2f}" for v in row) + "\n")
+    if values["histo"] == ".t.":
+        counts = np.stack([np.histogram(column, bins=np.arange(-180, 181, 10))[0] for column in series.T], axis=1)
+        percent = counts / len(snapshots) * 100
+        with open(f"{lis}_{name}.his", "w") as his_file:
+            for center, row in zip(centers, percent):
+                his_file.write(f"{center:10.2f}" + "".join(f"{v:8.2f}" for v in row) + "\n")
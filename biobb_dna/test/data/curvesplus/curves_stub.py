@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""Minimal Cur+ replacement for tests: reads the &inp namelist from stdin,
+checks the standard library files exist and writes one line per processed
+snapshot to the .cda output and, if requested, the .afr and .cdi outputs."""
+import os
+import re
+import sys
+
+namelist = sys.stdin.read()
+values = dict(re.findall(r"(\w+)=([^,\n]+)", namelist))
+lis = values["lis"].strip("'")
+itst, itnd, itdel = int(values["itst"]), int(values["itnd"]), int(values["itdel"])
+frames = list(range(max(itst, 1), itnd + 1, itdel))
+for kind in "bsi":
+    if not os.path.exists(f"{values['lib']}_{kind}.lib"):
+        sys.exit(f"standard library file {values['lib']}_{kind}.lib not found")
+
+# first strand sequence from the residue names of a PDB input
+sequence = ""
+if values["file"].endswith(".pdb"):
+    start, end = (int(i) for i in namelist.split("&end")[1].split()[5].split(":"))
+    residues = {}
+    with open(values["file"]) as pdb_file:
+        for line in pdb_file:
+            if line.startswith("ATOM"):
+                residues[int(line[22:26])] = line[17:20].strip().strip("D0123456789")
+    sequence = "".join(residues[i] for i in range(start, end + 1))
+
+with open(f"{lis}.lis", "w") as lis_file:
+    lis_file.write(f"  FILE : {values['file']:<30}\n")
+    lis_file.write(f"  isym  :     1  ITST  :{itst:6d}  ITND  :{itnd:6d}  ITDEL :{itdel:6d}\n")
+    if sequence:
+        lis_file.write(f"  Strand  1 has {len(sequence):3d} bases (5'-3'): {sequence}\n")
+    lis_file.write(f"  ... trj loop read {len(frames):8d} snapshots\n")
+extensions = ["cda"]
+extensions += ["afr"] if values["axfrm"] == ".t." else []
+extensions += ["cdi"] if values["ions"] == ".t." else []
+for ext in extensions:
+    with open(f"{lis}.{ext}", "w") as out_file:
+        for frame in frames:
+            out_file.write(f"{ext} snapshot {frame:8d}\n")
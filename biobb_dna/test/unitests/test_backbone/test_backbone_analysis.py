@@ -0,0 +1,22 @@
+# type: ignore
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.backbone.backbone_analysis import backbone_analysis
+
+
+class TestBackboneAnalysis():
+    def setup_class(self):
+        fx.test_setup(self, 'backbone_analysis')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_backbone_analysis(self):
+        returncode = backbone_analysis(properties=self.properties, **self.paths)
+        assert fx.exe_success(returncode)
+        for table in ['bipop', 'canonag', 'puckering']:
+            assert fx.not_empty(self.paths[f'output_{table}_csv_path'])
+            assert fx.not_empty(self.paths[f'output_{table}_jpg_path'])
+            assert fx.not_empty(self.paths[f'output_{table}_states_path'])
+            assert fx.equal(self.paths[f'output_{table}_csv_path'], self.paths[f'ref_{table}_csv_output'])
+            assert fx.equal(self.paths[f'output_{table}_jpg_path'], self.paths[f'ref_{table}_jpg_output'], percent_tolerance=20)
+            assert fx.equal(self.paths[f'output_{table}_states_path'], self.paths[f'ref_{table}_states_output'])
@@ -0,0 +1,42 @@
+# type: ignore
+from pathlib import Path
+import pandas as pd
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.backbone.backbone_joint import backbone_joint
+
+
+class TestBackboneJoint():
+    def setup_class(self):
+        fx.test_setup(self, 'backbone_joint')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_backbone_joint(self):
+        returncode = backbone_joint(properties=self.properties, **self.paths)
+        assert fx.not_empty(self.paths['output_csv_path'])
+        assert fx.not_empty(self.paths['output_neighbours_csv_path'])
+        assert fx.not_empty(self.paths['output_mi_csv_path'])
+        assert fx.exe_success(returncode)
+        assert fx.equal(self.paths['output_csv_path'], self.paths['ref_csv_output'])
+        assert fx.equal(self.paths['output_neighbours_csv_path'], self.paths['ref_neighbours_csv_output'])
+        assert fx.equal(self.paths['output_mi_csv_path'], self.paths['ref_mi_csv_output'])
+
+    def test_backbone_joint_non_contiguous_seqpos(self):
+        # only columns of consecutive sequence positions are neighbours
+        paths = {
+            key: value for key, value in self.paths.items()
+            if not key.startswith('ref_') and key != 'output_mi_csv_path'}
+        for key in ['output_csv_path', 'output_neighbours_csv_path']:
+            paths[key] = str(Path(paths[key]).with_name('seqpos_' + Path(paths[key]).name))
+        returncode = backbone_joint(
+            properties={**self.properties, 'seqpos': [2, 3, 5, 9]}, **paths)
+        assert fx.exe_success(returncode)
+        neighbours = pd.read_csv(paths['output_neighbours_csv_path'])
+        reference = pd.read_csv(self.paths['ref_neighbours_csv_output'])
+        # Watson columns 2-3 and Crick columns 3-2, the only consecutive positions
+        assert neighbours.groupby(['Nucleotide', 'Neighbour'], sort=False).ngroups == 2
+        values = ['State', 'Neighbour state', 'Count', 'Conditional probability']
+        for selected, pair in zip(neighbours.groupby(['Nucleotide', 'Neighbour'], sort=False), [('C-3', 'G-4'), ('G-4', 'C-3')]):
+            expected = reference[(reference['Nucleotide'] == pair[0]) & (reference['Neighbour'] == pair[1])]
+            assert selected[1][values].reset_index(drop=True).equals(expected[values].reset_index(drop=True))
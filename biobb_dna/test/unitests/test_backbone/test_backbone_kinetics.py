@@ -0,0 +1,35 @@
+# type: ignore
+from pathlib import Path
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.backbone.backbone_kinetics import backbone_kinetics
+
+
+class TestBackboneKinetics():
+    def setup_class(self):
+        fx.test_setup(self, 'backbone_kinetics')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_backbone_kinetics(self):
+        returncode = backbone_kinetics(properties=self.properties, **self.paths)
+        assert fx.not_empty(self.paths['output_csv_path'])
+        assert fx.not_empty(self.paths['output_transitions_csv_path'])
+        assert fx.not_empty(self.paths['output_lifetimes_csv_path'])
+        assert fx.exe_success(returncode)
+        assert fx.equal(self.paths['output_csv_path'], self.paths['ref_csv_output'])
+        assert fx.equal(self.paths['output_transitions_csv_path'], self.paths['ref_transitions_csv_output'])
+        assert fx.equal(self.paths['output_lifetimes_csv_path'], self.paths['ref_lifetimes_csv_output'])
+
+    def test_backbone_kinetics_no_sandbox(self):
+        # optional outputs not given are not copied back without a sandbox
+        paths = {
+            key: value for key, value in self.paths.items()
+            if not key.startswith('ref_') and key != 'output_lifetimes_csv_path'}
+        for key in ['output_csv_path', 'output_transitions_csv_path']:
+            paths[key] = str(Path(paths[key]).with_name('no_sandbox_' + Path(paths[key]).name))
+        returncode = backbone_kinetics(
+            properties={**self.properties, 'disable_sandbox': True}, **paths)
+        assert fx.exe_success(returncode)
+        assert fx.equal(paths['output_csv_path'], self.paths['ref_csv_output'])
+        assert fx.equal(paths['output_transitions_csv_path'], self.paths['ref_transitions_csv_output'])
@@ -1,9 +1,11 @@
 # type: ignore
 import platform
 
+import pandas as pd
 from biobb_common.tools import test_fixtures as fx
 
-from biobb_dna.backbone.bipopulations import bipopulations
+from biobb_dna.backbone.bipopulations import bi_populations_table, bipopulations
+from biobb_dna.utils.loader import read_series
 
 
 class TestBIPopulations:
@@ -19,7 +21,36 @@ class TestBIPopulations:
         returncode = bipopulations(properties=self.properties, **self.paths)
         assert fx.not_empty(self.paths["output_csv_path"])
         assert fx.not_empty(self.paths["output_jpg_path"])
+        assert fx.not_empty(self.paths["output_states_path"])
         assert fx.exe_success(returncode)
         if platform.system() == "Darwin":
             assert fx.equal(self.paths["output_csv_path"], self.paths["ref_csv_output"])
         assert fx.equal(self.paths["output_jpg_path"], self.paths["ref_jpg_output"])
+        assert fx.equal(self.paths["output_states_path"], self.paths["ref_states_output"])
+
+    def test_bi_populations_table(self):
+        # same table from the .ser files read in memory, without files
+        series = {
+            hp: read_series(self.paths[f"input_{hp}_path"])
+            for hp in ["epsilC", "epsilW", "zetaC", "zetaW"]
+        }
+        snapshots = len(series["epsilC"]) + 1
+        populations = bi_populations_table(
+            **series, sequence=self.properties["sequence"], snapshots=snapshots)
+        bipopulations(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            populations, pd.read_csv(self.paths["output_csv_path"]))
+
+    def test_bi_populations_table_arrays(self):
+        # arrays and DataFrames of the same series give the same table
+        series = {
+            hp: read_series(self.paths[f"input_{hp}_path"])
+            for hp in ["epsilC", "epsilW", "zetaC", "zetaW"]
+        }
+        for seqpos in (None, [2, 3, 5]):
+            populations = bi_populations_table(
+                **series, sequence=self.properties["sequence"], seqpos=seqpos)
+            array_populations = bi_populations_table(
+                **{hp: ser.to_numpy() for hp, ser in series.items()},
+                sequence=self.properties["sequence"], seqpos=seqpos)
+            pd.testing.assert_frame_equal(populations, array_populations)
@@ -14,5 +14,7 @@ class TestCanonicalAlphaGamma():
         returncode = canonicalag(properties=self.properties, **self.paths)
         assert fx.not_empty(self.paths['output_csv_path'])
         assert fx.not_empty(self.paths['output_jpg_path'])
+        assert fx.not_empty(self.paths['output_states_path'])
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
+        assert fx.equal(self.paths['output_states_path'], self.paths['ref_states_output'])
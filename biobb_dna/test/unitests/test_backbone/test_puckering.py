@@ -14,5 +14,7 @@ class TestPuckering():
         returncode = puckering(properties=self.properties, **self.paths)
         assert fx.not_empty(self.paths['output_csv_path'])
         assert fx.not_empty(self.paths['output_jpg_path'])
+        assert fx.not_empty(self.paths['output_states_path'])
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'], percent_tolerance=20)
+        assert fx.equal(self.paths['output_states_path'], self.paths['ref_states_output'])
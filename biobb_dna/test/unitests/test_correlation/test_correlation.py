@@ -1,11 +1,13 @@
 # type: ignore
+import pandas as pd
 from biobb_common.tools import test_fixtures as fx
 from biobb_dna.interbp_correlations.interhpcorr import interhpcorr
-from biobb_dna.interbp_correlations.interseqcorr import interseqcorr
-from biobb_dna.interbp_correlations.interbpcorr import interbpcorr
+from biobb_dna.interbp_correlations.interseqcorr import interseq_correlation, interseqcorr
+from biobb_dna.interbp_correlations.interbpcorr import interbp_correlation, interbpcorr
 from biobb_dna.intrabp_correlations.intrahpcorr import intrahpcorr
 from biobb_dna.intrabp_correlations.intraseqcorr import intraseqcorr
 from biobb_dna.intrabp_correlations.intrabpcorr import intrabpcorr
+from biobb_dna.utils.loader import read_series
 
 
 class TestInterHelparCorrelation():
@@ -39,6 +41,14 @@ class TestInterSequenceCorrelation():
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
 
+    def test_interseq_correlation(self):
+        # same matrix from the values of the .ser file, without files
+        values = read_series(self.paths['input_ser_path']).to_numpy()
+        corr_data = interseq_correlation(values, self.properties['sequence'], 'roll')
+        interseqcorr(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            corr_data, pd.read_csv(self.paths['output_csv_path'], index_col=0))
+
 
 class TestInterBasepairCorrelation():
     def setup_class(self):
@@ -57,6 +67,15 @@ class TestInterBasepairCorrelation():
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
 
+    def test_interbp_correlation(self):
+        helpars = ['shift', 'slide', 'rise', 'tilt', 'roll', 'twist']
+        result_df = interbp_correlation(
+            *(read_series(self.paths[f'input_filename_{hp}']).to_numpy() for hp in helpars),
+            self.properties['sequence'])
+        interbpcorr(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            result_df, pd.read_csv(self.paths['output_csv_path'], index_col=0))
+
 
 class TestIntraHelparCorrelation():
     def setup_class(self):
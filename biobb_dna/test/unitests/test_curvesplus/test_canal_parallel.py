@@ -0,0 +1,99 @@
+# type: ignore
+import sys
+import zipfile
+from pathlib import Path
+import numpy as np
+import pytest
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.curvesplus.biobb_canal import biobb_canal
+from biobb_dna.curvesplus.common import frame_chunks, merge_histograms
+
+
+class TestCanalParallel():
+    def setup_class(self):
+        fx.test_setup(self, 'biobb_canal_parallel')
+        # Canal stub writing series and histograms of the snapshot numbers
+        data_dir = Path(self.paths['input_cda_file']).parent
+        self.properties['binary_path'] = f"{sys.executable} {data_dir / 'canal_stub.py'}"
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_canal_parallel(self):
+        returncode = biobb_canal(
+            properties=self.properties, **self.paths)
+        assert fx.not_empty(self.paths['output_zip_path'])
+        assert fx.exe_success(returncode)
+
+        # a single Canal run over the whole range gives the same series and histograms
+        serial_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.serial.zip'))
+        returncode = biobb_canal(
+            input_cda_file=self.paths['input_cda_file'],
+            output_zip_path=serial_zip_path,
+            properties={**self.properties, 'num_workers': 1})
+        assert fx.exe_success(returncode)
+
+        # and a single Canal run over the first window gives the same .lis file
+        itst, itnd = frame_chunks(
+            self.properties['itst'], self.properties['itnd'],
+            self.properties['itdel'], self.properties['num_workers'])[0]
+        window_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.window.zip'))
+        returncode = biobb_canal(
+            input_cda_file=self.paths['input_cda_file'],
+            output_zip_path=window_zip_path,
+            properties={**self.properties, 'num_workers': 1, 'itst': itst, 'itnd': itnd})
+        assert fx.exe_success(returncode)
+
+        with zipfile.ZipFile(self.paths['output_zip_path']) as parallel_zip, \
+                zipfile.ZipFile(serial_zip_path) as serial_zip, \
+                zipfile.ZipFile(window_zip_path) as window_zip:
+            assert sorted(parallel_zip.namelist()) == sorted(serial_zip.namelist())
+            for member in serial_zip.namelist():
+                if member.endswith(".ser"):
+                    assert parallel_zip.read(member) == serial_zip.read(member)
+                elif member.endswith(".his"):
+                    parallel_his = np.loadtxt(parallel_zip.open(member))
+                    serial_his = np.loadtxt(serial_zip.open(member))
+                    assert np.allclose(parallel_his, serial_his, atol=0.02)
+            assert parallel_zip.read("canal_output.lis") == window_zip.read("canal_output.lis")
+
+    def test_canal_parallel_histogram_bins(self, tmp_path):
+        # windows with different bins can not be recombined
+        his_paths = [tmp_path / "window_0.his", tmp_path / "window_1.his"]
+        np.savetxt(his_paths[0], [[0.5, 50.0], [1.5, 50.0]])
+        np.savetxt(his_paths[1], [[1.0, 50.0], [2.0, 50.0]])
+        with pytest.raises(ValueError, match="bins"):
+            merge_histograms(his_paths, [1, 1], tmp_path / "merged.his")
+
+    def test_canal_parallel_no_series(self):
+        # histograms are merged without series
+        zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.histo.zip'))
+        returncode = biobb_canal(
+            input_cda_file=self.paths['input_cda_file'],
+            output_zip_path=zip_path,
+            properties={**self.properties, 'series': False})
+        assert fx.exe_success(returncode)
+        with zipfile.ZipFile(zip_path) as zf:
+            assert sorted(zf.namelist()) == [
+                'canal_output.lis', 'canal_output_alphaW.his', 'canal_output_shift.his']
+
+    def test_canal_parallel_corr(self):
+        properties = {**self.properties, 'corr': True}
+        try:
+            biobb_canal(properties=properties, **self.paths)
+        except ValueError:
+            return
+        assert False, "corr should not be allowed with num_workers > 1"
+
+    def test_canal_parallel_lis_sequence(self):
+        # sequence parsed from the Cur+ .lis file
+        properties = {k: v for k, v in self.properties.items() if k != 'sequence'}
+        lis_path = str(Path(self.paths['input_cda_file']).parent / 'curves_output.lis')
+        returncode = biobb_canal(
+            input_cda_file=self.paths['input_cda_file'],
+            input_lis_file=lis_path,
+            output_zip_path=self.paths['output_zip_path'],
+            properties=properties)
+        assert fx.exe_success(returncode)
+        with zipfile.ZipFile(self.paths['output_zip_path']) as zf:
+            assert "CGCGAATTCGCG" in zf.read("canal_output.lis").decode()
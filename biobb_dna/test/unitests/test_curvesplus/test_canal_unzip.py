@@ -1,4 +1,5 @@
 # type: ignore
+import os
 from biobb_common.tools import test_fixtures as fx
 from biobb_dna.curvesplus.canal_unzip import canal_unzip
 
@@ -22,3 +23,15 @@ class TestCanalUnzip():
         assert fx.equal(
             self.paths['output_list_path'],
             self.paths['ref_output_list_path'])
+
+    def test_canal_unzip_dir(self):
+        properties = {**self.properties, 'type': ['series', 'histo'], 'helpar_name': ['alphaC', 'alphaW']}
+        returncode = canal_unzip(
+            input_zip_file=self.paths['input_zip_file'],
+            output_dir_path=self.paths['output_dir_path'],
+            properties=properties)
+        assert fx.exe_success(returncode)
+        assert len(os.listdir(self.paths['output_dir_path'])) == 4
+        assert fx.equal(
+            os.path.join(self.paths['output_dir_path'], 'canal_output_alphaC.his'),
+            self.paths['ref_output_path'])
@@ -0,0 +1,79 @@
+# type: ignore
+import os
+import sys
+import zipfile
+from pathlib import Path
+import pytest
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.curvesplus.biobb_curves_canal import biobb_curves_canal
+
+
+class TestCurvesCanal():
+    def setup_class(self):
+        fx.test_setup(self, 'biobb_curves_canal')
+        # Cur+ and Canal stubs, Canal computes its series from the .cda lines
+        data_dir = Path(self.paths['input_struc_path']).parent
+        self.properties['curves_binary_path'] = f"{sys.executable} {data_dir / 'curves_stub.py'}"
+        self.properties['canal_binary_path'] = f"{sys.executable} {data_dir / 'canal_stub.py'}"
+        self.properties['stdlib_path'] = str(data_dir / 'stdlib' / 'standard')
+        self.xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = str(Path('cache').resolve())
+
+    def teardown_class(self):
+        if self.xdg_cache_home is None:
+            os.environ.pop('XDG_CACHE_HOME')
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.xdg_cache_home
+        fx.test_teardown(self)
+
+    def test_curves_canal(self):
+        returncode = biobb_curves_canal(
+            properties=self.properties, **self.paths)
+        assert fx.not_empty(self.paths['output_zip_path'])
+        assert fx.not_empty(self.paths['output_lis_path'])
+        assert fx.not_empty(self.paths['output_curves_zip_path'])
+        assert fx.exe_success(returncode)
+        with zipfile.ZipFile(self.paths['output_zip_path']) as zf:
+            assert "canal_output_shift.ser" in zf.namelist()
+            # snapshots 1, 3, 5, 7, 9 and 11 read by Cur+
+            assert len(zf.read("canal_output_shift.ser").splitlines()) == 6
+
+    def test_curves_canal_pipe(self):
+        pipe_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.pipe.zip'))
+        returncode = biobb_curves_canal(
+            input_struc_path=self.paths['input_struc_path'],
+            output_zip_path=pipe_zip_path,
+            properties={**self.properties, 'cda_pipe': True})
+        assert fx.exe_success(returncode)
+        assert fx.equal(pipe_zip_path, self.paths['output_zip_path'])
+
+    def test_curves_canal_pipe_canal_error(self):
+        # Cur+ is not blocked on the named pipe when Canal fails without opening it
+        error_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.error.zip'))
+        returncode = biobb_curves_canal(
+            input_struc_path=self.paths['input_struc_path'],
+            output_zip_path=error_zip_path,
+            properties={**self.properties, 'cda_pipe': True, 'canal_binary_path': 'false'})
+        assert returncode != 0
+
+    def test_curves_canal_pipe_curves_error(self):
+        # Canal is not blocked on the named pipe when Cur+ fails without opening it,
+        # the launch ends with the error of the missing Cur+ outputs
+        error_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.curves_error.zip'))
+        with pytest.raises(FileNotFoundError):
+            biobb_curves_canal(
+                input_struc_path=self.paths['input_struc_path'],
+                output_zip_path=error_zip_path,
+                properties={**self.properties, 'cda_pipe': True, 'curves_binary_path': 'false'})
+
+    def test_curves_canal_lis_sequence(self):
+        # sequence parsed from the Cur+ .lis file kept in the sandbox
+        properties = {k: v for k, v in self.properties.items() if k != 'sequence'}
+        lis_zip_path = str(Path(self.paths['output_zip_path']).with_suffix('.lis.zip'))
+        returncode = biobb_curves_canal(
+            input_struc_path=self.paths['input_struc_path'],
+            output_zip_path=lis_zip_path,
+            properties=properties)
+        assert fx.exe_success(returncode)
+        with zipfile.ZipFile(lis_zip_path) as zf:
+            assert "CGCGTHGACGCG" in zf.read("canal_output.lis").decode()
@@ -0,0 +1,85 @@
+# type: ignore
+import os
+import sys
+from pathlib import Path
+import pytest
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.curvesplus.biobb_curves import biobb_curves
+
+
+class TestCurvesParallel():
+    def setup_class(self):
+        fx.test_setup(self, 'biobb_curves_parallel')
+        # Cur+ stub writing one line per snapshot to its outputs
+        data_dir = Path(self.paths['input_struc_path']).parent
+        self.properties['binary_path'] = f"{sys.executable} {data_dir / 'curves_stub.py'}"
+        self.properties['stdlib_path'] = str(data_dir / 'stdlib' / 'standard')
+        # shared standard library cache inside the test directory
+        self.xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = str(Path('cache').resolve())
+
+    def teardown_class(self):
+        if self.xdg_cache_home is None:
+            os.environ.pop('XDG_CACHE_HOME')
+        else:
+            os.environ['XDG_CACHE_HOME'] = self.xdg_cache_home
+        fx.test_teardown(self)
+
+    def test_curves_parallel(self):
+        returncode = biobb_curves(
+            properties=self.properties, **self.paths)
+        assert fx.not_empty(self.paths['output_cda_path'])
+        assert fx.not_empty(self.paths['output_lis_path'])
+        # without ions and axfrm the zip file has no members
+        assert Path(self.paths['output_zip_path']).exists()
+        assert fx.exe_success(returncode)
+
+        # a single Cur+ run over the whole range gives the same outputs
+        serial_paths = {
+            'input_struc_path': self.paths['input_struc_path'],
+            'output_cda_path': str(Path(self.paths['output_cda_path']).with_suffix('.serial.cda')),
+            'output_lis_path': str(Path(self.paths['output_lis_path']).with_suffix('.serial.lis')),
+            'output_zip_path': str(Path(self.paths['output_zip_path']).with_suffix('.serial.zip'))}
+        returncode = biobb_curves(
+            properties={**self.properties, 'num_workers': 1}, **serial_paths)
+        assert fx.exe_success(returncode)
+        assert fx.equal(self.paths['output_cda_path'], serial_paths['output_cda_path'])
+        assert fx.equal(self.paths['output_lis_path'], serial_paths['output_lis_path'])
+        assert fx.equal(self.paths['output_zip_path'], serial_paths['output_zip_path'])
+
+        # both runs linked the same cached copy of the standard library
+        cached = list(Path('cache', 'biobb_dna', 'curvesplus').glob('*/standard_*.lib'))
+        assert len(cached) == 3
+
+    def test_curves_parallel_ions(self):
+        # .cdi and .afr outputs can not be merged across chunks
+        with pytest.raises(ValueError, match="num_workers"):
+            biobb_curves(properties={**self.properties, 'ions': True}, **self.paths)
+
+    def test_curves_parallel_not_experimental(self):
+        # parallel runs must be enabled explicitly
+        with pytest.raises(ValueError, match="experimental_parallel"):
+            biobb_curves(properties={**self.properties, 'experimental_parallel': False}, **self.paths)
+
+    def test_curves_result_cache(self):
+        properties = {**self.properties, 'result_cache': True, 'result_cache_path': 'results'}
+        cached_paths = {
+            'input_struc_path': self.paths['input_struc_path'],
+            'output_cda_path': str(Path(self.paths['output_cda_path']).with_suffix('.cached.cda')),
+            'output_lis_path': str(Path(self.paths['output_lis_path']).with_suffix('.cached.lis')),
+            'output_zip_path': str(Path(self.paths['output_zip_path']).with_suffix('.cached.zip'))}
+        returncode = biobb_curves(properties=properties, **cached_paths)
+        assert fx.exe_success(returncode)
+        entries = list(Path('results').iterdir())
+        assert len(entries) == 1
+        assert fx.equal(str(entries[0] / 'curves_output.cda'), cached_paths['output_cda_path'])
+
+        # same input contents with another name, results come from the cache
+        renamed_struc_path = Path('renamed_structure.pdb').resolve()
+        renamed_struc_path.write_bytes(Path(self.paths['input_struc_path']).read_bytes())
+        with open(entries[0] / 'curves_output.cda', 'a') as cda_file:
+            cda_file.write('cached\n')
+        returncode = biobb_curves(
+            properties=properties, **{**cached_paths, 'input_struc_path': str(renamed_struc_path)})
+        assert fx.exe_success(returncode)
+        assert Path(cached_paths['output_cda_path']).read_text().endswith('cached\n')
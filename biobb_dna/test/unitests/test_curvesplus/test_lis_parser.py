@@ -0,0 +1,52 @@
+# type: ignore
+import numpy as np
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.curvesplus.lis_parser import LisFile, read_sequence
+
+
+class TestLisParser():
+    def setup_class(self):
+        fx.test_setup(self, 'lis_parser')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_trajectory_header(self):
+        lis = LisFile(self.paths['input_trj_lis_path'])
+        assert read_sequence(self.paths['input_trj_lis_path']) == self.properties['sequence']
+        assert lis.strands()[2].sequence == "GCGCTTAAGCGC"
+        assert lis.strands()[2].direction == "3'-5'"
+        assert lis.levels() == 12
+        assert lis.snapshots() == 5000
+        assert lis.header()['FILE'] == "structure.stripped.trj"
+        assert lis.header()['ITDEL'] == "1"
+        assert lis.sections() == []
+
+    def test_sections(self):
+        lis = LisFile(self.paths['input_lis_path'])
+        assert lis.sequence() == self.properties['sequence']
+        assert lis.snapshots() is None
+
+        # reading the first section does not index the rest of the file
+        bp_axis = lis.section("bp_axis")
+        assert list(lis._sections) == ["A", "B"]
+        assert bp_axis.title == "BP-Axis"
+        assert bp_axis.columns == ["Xdisp", "Ydisp", "Inclin", "Tip", "Ax-bend"]
+        assert bp_axis.labels[0] == "C 1-G 24"
+        assert bp_axis.values.shape == (12, 5)
+        assert np.isnan(bp_axis.values[0, 4])
+
+        inter_bp = lis.section("C")
+        assert inter_bp.columns[-2:] == ["H-Ris", "H-Twi"]
+        assert inter_bp.values.shape == (11, 8)
+        assert np.allclose(inter_bp.values[:, 4], np.arange(2, 24, 2))
+
+        backbone = lis.section("backbone")
+        assert backbone.values.shape == (12, 10)
+        assert np.isnan(backbone.values[:, 9]).all()
+        assert np.isnan(backbone.values[11, 4])
+
+        groove = lis.section("groove")
+        assert groove.columns == ["W12", "D12", "W21", "D21"]
+        assert np.isnan(groove.values[:2, :2]).all()
+        assert lis.sections() == ["A", "B", "C", "D", "E"]
@@ -1,6 +1,8 @@
 # type: ignore
+import pandas as pd
 from biobb_common.tools import test_fixtures as fx
-from biobb_dna.dna.dna_averages import dna_averages
+from biobb_dna.dna.dna_averages import averages_table, dna_averages
+from biobb_dna.utils.loader import read_series
 
 import logging
 mpl_logger = logging.getLogger("matplotlib")
@@ -20,3 +22,12 @@ class TestAverages():
         assert fx.not_empty(self.paths['output_jpg_path'])
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
+
+    def test_averages_table(self):
+        # same table from the values of the .ser file, without files
+        values = read_series(self.paths['input_ser_path']).to_numpy()
+        dataset = averages_table(
+            values, self.properties['sequence'], 'shift', self.properties['seqpos'])
+        dna_averages(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            dataset.reset_index(drop=True), pd.read_csv(self.paths['output_csv_path']))
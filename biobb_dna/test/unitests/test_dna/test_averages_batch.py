@@ -0,0 +1,44 @@
+# type: ignore
+import zipfile
+import pandas as pd
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.dna.dna_averages_batch import dna_averages_batch
+
+import logging
+mpl_logger = logging.getLogger("matplotlib")
+mpl_logger.setLevel(logging.ERROR)
+
+
+class TestAveragesBatch():
+    def setup_class(self):
+        fx.test_setup(self, 'dna_averages_batch')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_helparaverages_batch(self):
+        returncode = dna_averages_batch(
+            input_ser_dir=self.paths['input_ser_dir'],
+            output_csv_path=self.paths['output_csv_path'],
+            output_jpg_dir=self.paths['output_jpg_dir'],
+            properties=self.properties)
+        assert fx.exe_success(returncode)
+        assert fx.not_empty(self.paths['output_csv_path'])
+        assert fx.not_empty(f"{self.paths['output_jpg_dir']}/shift_avg.jpg")
+        dataset = pd.read_csv(self.paths['output_csv_path'])
+        reference = pd.read_csv(self.paths['ref_csv_output'])
+        assert list(dataset['helpar'].unique()) == ['shift']
+        assert dataset[['mean', 'std']].equals(reference[['mean', 'std']])
+
+    def test_helparaverages_batch_zip(self):
+        with zipfile.ZipFile(self.paths['output_zip_path'], 'w') as zf:
+            zf.write(f"{self.paths['input_ser_dir']}/canal_output_shift.ser",
+                     arcname='canal_output_shift.ser')
+        returncode = dna_averages_batch(
+            input_zip_file=self.paths['output_zip_path'],
+            output_csv_path=self.paths['output_csv_path'],
+            properties=self.properties)
+        assert fx.exe_success(returncode)
+        dataset = pd.read_csv(self.paths['output_csv_path'])
+        reference = pd.read_csv(self.paths['ref_csv_output'])
+        assert dataset[['mean', 'std']].equals(reference[['mean', 'std']])
@@ -0,0 +1,33 @@
+# type: ignore
+import numpy as np
+import pandas as pd
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.dna.dna_rolling import dna_rolling
+from biobb_dna.utils.loader import read_series
+
+import logging
+mpl_logger = logging.getLogger("matplotlib")
+mpl_logger.setLevel(logging.ERROR)
+
+
+class TestRolling():
+    def setup_class(self):
+        fx.test_setup(self, 'dna_rolling')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_helparrolling(self):
+        returncode = dna_rolling(properties=self.properties, **self.paths)
+        assert fx.exe_success(returncode)
+        assert fx.not_empty(self.paths['output_csv_path'])
+        assert fx.not_empty(self.paths['output_jpg_path'])
+        dataset = pd.read_csv(self.paths['output_csv_path'])
+        # windows crossing chunks give the same values as pandas rolling
+        ser_data = read_series(self.paths['input_ser_path'], usecols=list(range(1, 10)))
+        rolling = ser_data.rolling(self.properties['window'])
+        first, stride = self.properties['window'] - 1, self.properties['stride']
+        for stat, reference in [('mean', rolling.mean()), ('std', rolling.std())]:
+            table = dataset.pivot(index='snapshot', columns='position', values=stat)
+            assert np.array_equal(table.index, reference.index[first::stride])
+            assert np.allclose(table.to_numpy(), reference.iloc[first::stride].to_numpy())
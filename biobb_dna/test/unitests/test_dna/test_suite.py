@@ -0,0 +1,74 @@
+# type: ignore
+import zipfile
+from pathlib import Path
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.backbone.bipopulations import bipopulations
+from biobb_dna.dna.dna_averages import dna_averages
+from biobb_dna.dna.dna_suite import dna_suite
+from biobb_dna.dna.dna_timeseries import dna_timeseries
+from biobb_dna.interbp_correlations.interbpcorr import interbpcorr
+from biobb_dna.stiffness.basepair_stiffness import basepair_stiffness
+from biobb_dna.utils.synthetic import write_canal_output
+
+import logging
+mpl_logger = logging.getLogger("matplotlib")
+mpl_logger.setLevel(logging.ERROR)
+
+FRAMES = 500
+INTER_HELPARS = ["shift", "slide", "rise", "tilt", "roll", "twist"]
+BACKBONE_HELPARS = ["epsilC", "epsilW", "zetaC", "zetaW"]
+
+
+class TestDnaSuite():
+    def setup_class(self):
+        fx.test_setup(self, 'dna_suite')
+        write_canal_output(
+            self.paths['output_canal_zip_path'], self.properties['sequence'], FRAMES,
+            helpars=INTER_HELPARS + BACKBONE_HELPARS, histo=False)
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def ser(self, helpar):
+        return f"{self.paths['output_canal_zip_path']}::canal_output_{helpar}.ser"
+
+    def test_dna_suite(self):
+        returncode = dna_suite(
+            input_zip_file=self.paths['output_canal_zip_path'],
+            output_zip_path=self.paths['output_zip_path'],
+            properties=self.properties)
+        assert fx.exe_success(returncode)
+        with zipfile.ZipFile(self.paths['output_zip_path']) as zf:
+            outputs = {name: zf.read(name) for name in zf.namelist()}
+        assert sorted(outputs) == sorted(
+            f"{name}.{ext}" for ext in ['csv', 'jpg'] for name in [
+                'dna_averages/shift_avg', 'interbpcorr/interbpcorr',
+                'basepair_stiffness/4_GA', 'basepair_stiffness/5_AA',
+                'bipopulations/bipopulations'])
+
+        # same output files as the building blocks
+        sequence = self.properties['sequence']
+        dna_averages(
+            self.ser('shift'), 'avg.csv', 'avg.jpg',
+            properties={'sequence': sequence, 'helpar_name': 'shift'})
+        interbpcorr(
+            **{f"input_filename_{hp}": self.ser(hp) for hp in INTER_HELPARS},
+            output_csv_path='interbp.csv', output_jpg_path='interbp.jpg',
+            properties={'sequence': sequence})
+        for hp in INTER_HELPARS:
+            dna_timeseries(
+                self.ser(hp), f"{hp}_timeseries.zip",
+                properties={'sequence': sequence, 'helpar_name': hp, 'seqpos': [4, 5]})
+        basepair_stiffness(
+            **{f"input_filename_{hp}": f"{hp}_timeseries.zip::series_{hp}_5_AA.csv"
+               for hp in INTER_HELPARS},
+            output_csv_path='stiffness.csv', output_jpg_path='stiffness.jpg')
+        bipopulations(
+            **{f"input_{hp}_path": self.ser(hp) for hp in BACKBONE_HELPARS},
+            output_csv_path='bipop.csv', output_jpg_path='bipop.jpg',
+            properties={'sequence': sequence})
+        for name, path in [
+                ('dna_averages/shift_avg', 'avg'), ('interbpcorr/interbpcorr', 'interbp'),
+                ('basepair_stiffness/5_AA', 'stiffness'), ('bipopulations/bipopulations', 'bipop')]:
+            for ext in ['csv', 'jpg']:
+                assert outputs[f"{name}.{ext}"] == Path(f"{path}.{ext}").read_bytes()
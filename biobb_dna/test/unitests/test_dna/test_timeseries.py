@@ -1,6 +1,9 @@
 # type: ignore
+import numpy as np
+import pandas as pd
 from biobb_common.tools import test_fixtures as fx
 from biobb_dna.dna.dna_timeseries import dna_timeseries
+from biobb_dna.utils.loader import load_data
 
 import logging
 mpl_logger = logging.getLogger("matplotlib")
@@ -18,3 +21,12 @@ class TestTimeSeries():
         returncode = dna_timeseries(properties=self.properties, **self.paths)
         assert fx.not_empty(self.paths['output_zip_path'])
         assert fx.exe_success(returncode)
+        assert fx.not_empty(self.paths['output_hist_jpg_path'])
+        hist_data = pd.read_csv(self.paths['output_hist_csv_path'], index_col=0)
+        bin_width = np.diff(hist_data.index.to_numpy())[0]
+        assert np.allclose(hist_data.sum() * bin_width, 1)
+
+        for table in ["series_shift_5_AA", "hist_shift_5_AA"]:
+            npz_data = load_data(f"{self.paths['output_npz_path']}::{table}")
+            csv_data = load_data(self.paths['output_zip_path'], inner_file=f"{table}.csv")
+            pd.testing.assert_frame_equal(npz_data, csv_data)
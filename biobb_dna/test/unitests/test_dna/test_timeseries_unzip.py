@@ -1,4 +1,6 @@
 # type: ignore
+import os
+from pathlib import Path
 from biobb_common.tools import test_fixtures as fx
 from biobb_dna.dna.dna_timeseries_unzip import dna_timeseries_unzip
 
@@ -24,3 +26,26 @@ class TestCanalUnzip():
             self.paths['output_list_path'],
             self.paths['ref_output_list_path'])
         assert fx.equal(self.paths['output_path_jpg'], self.paths['ref_output_path_jpg'])
+
+    def test_dna_timeseries_unzip_dir(self):
+        xdg_cache_home = os.environ.get('XDG_CACHE_HOME')
+        os.environ['XDG_CACHE_HOME'] = str(Path('cache').resolve())
+        try:
+            properties = {**self.properties, 'type': ['series', 'hist'], 'index': [4, 5], 'archive_index': True}
+            for _ in range(2):
+                # the second extraction reuses the persisted archive index
+                returncode = dna_timeseries_unzip(
+                    input_zip_file=self.paths['input_zip_file'],
+                    output_dir_path=self.paths['output_dir_path'],
+                    properties=properties)
+                assert fx.exe_success(returncode)
+        finally:
+            if xdg_cache_home is None:
+                os.environ.pop('XDG_CACHE_HOME')
+            else:
+                os.environ['XDG_CACHE_HOME'] = xdg_cache_home
+        assert len(list(Path('cache', 'biobb_dna', 'archive_index').glob('*.json'))) == 1
+        assert len(os.listdir(self.paths['output_dir_path'])) == 8
+        assert fx.equal(
+            str(Path(self.paths['output_dir_path'], 'hist_shift_5_AA.csv')),
+            self.paths['ref_output_path_csv'])
@@ -1,7 +1,9 @@
 # type: ignore
+import pandas as pd
 from biobb_common.tools import test_fixtures as fx
-from biobb_dna.stiffness.average_stiffness import average_stiffness
-from biobb_dna.stiffness.basepair_stiffness import basepair_stiffness
+from biobb_dna.stiffness.average_stiffness import average_stiffness, average_stiffness_table
+from biobb_dna.stiffness.basepair_stiffness import basepair_stiffness, basepair_stiffness_table
+from biobb_dna.utils.loader import load_data, read_series
 
 
 class TestAvgStiffness():
@@ -19,6 +21,14 @@ class TestAvgStiffness():
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
 
+    def test_average_stiffness_table(self):
+        # same table from the values of the .ser file, without files
+        values = read_series(self.paths['input_ser_path']).to_numpy()
+        dataset = average_stiffness_table(values, self.properties['sequence'], 'roll')
+        average_stiffness(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            dataset, pd.read_csv(self.paths['output_csv_path'], index_col=0))
+
 
 class TestBasePairStiffness():
     def setup_class(self):
@@ -34,3 +44,15 @@ class TestBasePairStiffness():
         assert fx.not_empty(self.paths['output_jpg_path'])
         assert fx.exe_success(returncode)
         assert fx.equal(self.paths['output_jpg_path'], self.paths['ref_jpg_output'])
+
+    def test_basepair_stiffness_table(self):
+        helpars = ['shift', 'slide', 'rise', 'tilt', 'roll', 'twist']
+        data = {hp: load_data(self.paths[f'input_filename_{hp}']) for hp in helpars}
+        stiff_df = basepair_stiffness_table(**data)
+        basepair_stiffness(properties=self.properties, **self.paths)
+        pd.testing.assert_frame_equal(
+            stiff_df, pd.read_csv(self.paths['output_csv_path'], index_col=0))
+        # one-dimensional arrays give the same matrix
+        stiff_arrays = basepair_stiffness_table(
+            **{hp: series.to_numpy().ravel() for hp, series in data.items()})
+        pd.testing.assert_frame_equal(stiff_arrays, stiff_df, check_names=False)
@@ -0,0 +1,39 @@
+# type: ignore
+import zipfile
+from pathlib import Path
+import pytest
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.utils.archive import archive_index, extract_member
+
+
+class TestArchive():
+    def setup_class(self):
+        fx.test_setup(self, 'archive')
+        with zipfile.ZipFile(self.paths['output_zip_path'], 'w') as zf:
+            zf.write(self.paths['input_ser_path'], 'stored.ser', compress_type=zipfile.ZIP_STORED)
+            zf.write(self.paths['input_ser_path'], 'deflated.ser', compress_type=zipfile.ZIP_DEFLATED)
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_extract_member_index(self):
+        index = archive_index(self.paths['output_zip_path'])
+        # without its end of central directory record the archive can only
+        # be read from the offsets of the index
+        broken_path = Path(self.paths['output_zip_path']).with_suffix('.broken.zip')
+        broken_path.write_bytes(Path(self.paths['output_zip_path']).read_bytes()[:-22])
+        with pytest.raises(zipfile.BadZipFile):
+            zipfile.ZipFile(broken_path)
+        for name in ['stored.ser', 'deflated.ser']:
+            extract_member(broken_path, name, self.paths['output_ser_path'], index)
+            assert fx.equal(self.paths['output_ser_path'], self.paths['input_ser_path'])
+
+    def test_extract_member_outdated_index(self):
+        index = archive_index(self.paths['output_zip_path'])
+        # the members are at other offsets, they are looked up by name
+        other_path = Path(self.paths['output_zip_path']).with_suffix('.other.zip')
+        with zipfile.ZipFile(other_path, 'w') as zf:
+            zf.write(self.paths['input_ser_path'], 'deflated.ser', compress_type=zipfile.ZIP_DEFLATED)
+            zf.write(self.paths['input_ser_path'], 'stored.ser', compress_type=zipfile.ZIP_STORED)
+        extract_member(other_path, 'stored.ser', self.paths['output_ser_path'], index)
+        assert fx.equal(self.paths['output_ser_path'], self.paths['input_ser_path'])
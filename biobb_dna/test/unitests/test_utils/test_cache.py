@@ -0,0 +1,44 @@
+# type: ignore
+import os
+import sys
+from pathlib import Path
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.utils.cache import load_results, result_key, store_results
+
+
+class TestCache():
+    def setup_class(self):
+        fx.test_setup(self, 'cache')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_result_key(self):
+        renamed_path = Path('renamed.ser')
+        renamed_path.write_bytes(Path(self.paths['input_ser_path']).read_bytes())
+        key = result_key([self.paths['input_ser_path']], ["file=canal_output_alphaW.ser"], "Canal")
+        assert key == result_key([renamed_path], ["file=renamed.ser"], "Canal")
+        assert key != result_key([renamed_path], ["file=renamed.ser itnd=10"], "Canal")
+        # only whole values are input names, not other values containing them
+        key = result_key([renamed_path], ["file=renamed.ser,lis=not_renamed.ser"], "Canal")
+        assert key == result_key(
+            [self.paths['input_ser_path']], ["file=canal_output_alphaW.ser,lis=not_renamed.ser"], "Canal")
+        # another binary or container image gives another key
+        assert key != result_key([renamed_path], ["file=renamed.ser,lis=not_renamed.ser"], sys.executable)
+        assert key != result_key(
+            [renamed_path], ["file=renamed.ser,lis=not_renamed.ser"], "Canal", "biobb_dna:latest")
+
+    def test_lru_eviction(self):
+        cache_path = self.paths['output_cache_path']
+        max_size = self.properties['max_size']
+        # each entry uses a bit more than half of the cache size
+        result_path = Path('result.dat')
+        result_path.write_bytes(b"0" * (max_size * 1024 ** 2 // 2 + 1))
+        store_results("first", [result_path], cache_path, max_size)
+        store_results("second", [result_path], cache_path, max_size)
+        assert sorted(os.listdir(cache_path)) == ["second"]
+
+        os.makedirs("loaded", exist_ok=True)
+        assert load_results("second", "loaded", cache_path) == ["result.dat"]
+        assert load_results("first", "loaded", cache_path) is None
+        assert fx.equal("loaded/result.dat", str(result_path))
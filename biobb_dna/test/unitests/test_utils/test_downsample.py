@@ -0,0 +1,37 @@
+# type: ignore
+import numpy as np
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.utils.downsample import lttb_indices, minmax_indices
+
+
+class TestDownsample():
+    def setup_class(self):
+        fx.test_setup(self, 'downsample')
+        # noisy series with two single-snapshot excursions
+        rng = np.random.default_rng(0)
+        self.y = rng.normal(size=100000)
+        self.y[12345] = 50
+        self.y[76543] = -40
+        self.x = np.arange(len(self.y))
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_lttb(self):
+        max_points = self.properties['max_points']
+        indices = lttb_indices(self.x, self.y, max_points)
+        assert len(indices) == max_points
+        assert indices[0] == 0 and indices[-1] == len(self.y) - 1
+        assert np.all(np.diff(indices) > 0)
+        assert {12345, 76543} <= set(indices)
+        # MinMaxLTTB preselection keeps the same excursions
+        exact = lttb_indices(self.x, self.y, max_points, minmax_ratio=0)
+        assert {12345, 76543} <= set(exact)
+
+    def test_minmax(self):
+        max_points = self.properties['max_points']
+        indices = minmax_indices(self.y, max_points)
+        assert len(indices) <= max_points
+        assert np.all(np.diff(indices) > 0)
+        assert {12345, 76543} <= set(indices)
+        assert np.array_equal(minmax_indices(self.y[:10], max_points), np.arange(10))
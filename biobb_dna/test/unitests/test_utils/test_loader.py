@@ -0,0 +1,117 @@
+# type: ignore
+import zipfile
+from pathlib import Path
+import numpy as np
+import pandas as pd
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.interbp_correlations.interbpcorr import InterBasePairCorrelation
+from biobb_dna.utils.loader import (
+    iter_series, load_data, npz_tables, parse_series, read_series, read_series_array,
+    save_npz_tables, series_frame, using_parsed_series)
+
+
+class TestLoader():
+    def setup_class(self):
+        fx.test_setup(self, 'loader')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_iter_series(self):
+        ser_data = read_series(self.paths['input_ser_path'])
+        chunks = list(iter_series(
+            self.paths['input_ser_path'], chunksize=self.properties['chunksize']))
+        assert len(chunks) == int(np.ceil(len(ser_data) / self.properties['chunksize']))
+        assert ser_data.equals(pd.concat(chunks))
+
+    def test_read_series_array(self):
+        usecols = self.properties['usecols']
+        ser_data = read_series(self.paths['input_ser_path'], usecols=list(usecols))
+        values = read_series_array(
+            self.paths['input_ser_path'], usecols=usecols,
+            chunksize=self.properties['chunksize'])
+        assert np.array_equal(values, ser_data.to_numpy(dtype=float), equal_nan=True)
+
+    def test_read_series_npy(self):
+        ser_data = read_series(self.paths['input_ser_path'])
+        values = read_series_array(
+            self.paths['input_ser_path'], npy_path=self.paths['output_npy_path'],
+            chunksize=self.properties['chunksize'])
+        assert isinstance(values, np.memmap)
+        assert np.array_equal(values, ser_data.to_numpy(dtype=float), equal_nan=True)
+        assert np.array_equal(
+            np.load(self.paths['output_npy_path']), values, equal_nan=True)
+
+    def test_read_series_zip(self):
+        with zipfile.ZipFile(self.paths['output_zip_path'], 'w') as zf:
+            zf.write(self.paths['input_ser_path'], arcname='canal_output_alphaW.ser')
+        ser_data = read_series(self.paths['input_ser_path'])
+        values = read_series_array(
+            self.paths['output_zip_path'], inner_file='canal_output_alphaW.ser',
+            npy_path=self.paths['output_npy_path'],
+            chunksize=self.properties['chunksize'])
+        assert np.array_equal(values, ser_data.to_numpy(dtype=float), equal_nan=True)
+
+    def test_read_series_archive_path(self):
+        with zipfile.ZipFile(self.paths['output_zip_path'], 'w') as zf:
+            zf.write(self.paths['input_ser_path'], arcname='canal_output_alphaW.ser')
+        ser_data = read_series(self.paths['input_ser_path'])
+        archive_path = f"{self.paths['output_zip_path']}::canal_output_alphaW.ser"
+        assert ser_data.equals(read_series(archive_path))
+        values = read_series_array(archive_path, chunksize=self.properties['chunksize'])
+        assert np.array_equal(values, ser_data.to_numpy(dtype=float), equal_nan=True)
+
+    def test_stage_archive_members(self):
+        helpars = ['shift', 'slide', 'rise', 'tilt', 'roll', 'twist']
+        zip_path = Path(self.paths['output_zip_path']).with_suffix('.members.zip')
+        with zipfile.ZipFile(zip_path, 'w') as zf:
+            for helpar in helpars:
+                zf.write(self.paths['input_ser_path'], arcname=f'canal_output_{helpar}.ser')
+        block = InterBasePairCorrelation(
+            **{f"input_filename_{helpar}": f"{zip_path}::canal_output_{helpar}.ser" for helpar in helpars},
+            output_csv_path='interbpcorr.csv', output_jpg_path='interbpcorr.jpg',
+            properties={'sequence': 'CGCGAATTCGCG'})
+        block.stage_files()
+        try:
+            # the members are read from the archive at its host path, which is not copied
+            assert list(block.stage_io_dict['in']) == [f"input_filename_{helpar}" for helpar in helpars]
+            for helpar in helpars:
+                assert block.stage_io_dict['in'][f"input_filename_{helpar}"] == (
+                    f"{zip_path.resolve()}::canal_output_{helpar}.ser")
+            assert not list(Path(block.stage_io_dict['unique_dir']).glob('*.zip'))
+        finally:
+            block.remove_tmp_files()
+
+    def test_npz_tables(self):
+        ser_data = read_series(self.paths['input_ser_path'])
+        ser_data.index.name = 'snapshot'
+        tables = {'series_1': ser_data[[1]], 'series_2_4': ser_data[[2, 4]]}
+        save_npz_tables(self.paths['output_npz_path'], tables)
+        assert npz_tables(self.paths['output_npz_path']) == list(tables)
+        table = load_data(f"{self.paths['output_npz_path']}::series_2_4.csv")
+        assert table.index.name == 'snapshot'
+        assert list(table.columns) == ['2', '4']
+        assert np.array_equal(table.to_numpy(), ser_data[[2, 4]].to_numpy(), equal_nan=True)
+
+    def test_series_frame(self):
+        ser_data = read_series(self.paths['input_ser_path'])
+        frame = series_frame(ser_data.to_numpy())
+        pd.testing.assert_index_equal(frame.columns, ser_data.columns)
+        assert np.array_equal(frame.to_numpy(), ser_data.to_numpy(), equal_nan=True)
+        assert series_frame(ser_data) is ser_data
+
+    def test_parsed_series(self):
+        usecols = self.properties['usecols']
+        ser_data = read_series(self.paths['input_ser_path'])
+        parsed = parse_series(self.paths['input_ser_path'], self.paths['output_npy_path'][:-4])
+        with using_parsed_series([parsed]):
+            parsed_data = read_series(self.paths['input_ser_path'])
+            pd.testing.assert_frame_equal(parsed_data, ser_data, check_exact=True)
+            pd.testing.assert_frame_equal(
+                read_series(self.paths['input_ser_path'], usecols=list(usecols)),
+                ser_data[[i + 1 for i in usecols if i != 0]], check_exact=True)
+            # copy on write, the .npy file is not modified
+            parsed_data.iloc[0, 0] = 0.
+        pd.testing.assert_frame_equal(
+            read_series(self.paths['input_ser_path']), ser_data, check_exact=True)
+        assert np.array_equal(np.load(parsed['values']), ser_data.to_numpy(), equal_nan=True)
@@ -0,0 +1,45 @@
+# type: ignore
+import json
+from pathlib import Path
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.dna.dna_averages import HelParAverages, dna_averages
+from biobb_dna.utils.profiling import PROFILE_ENV, profile_enabled, profile_path
+
+
+class TestProfiling():
+    def setup_class(self):
+        fx.test_setup(self, 'profiling')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_profile_enabled(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        assert not profile_enabled({})
+        assert profile_enabled({'profile': True})
+        monkeypatch.setenv(PROFILE_ENV, '1')
+        assert profile_enabled({})
+        assert not profile_enabled({'profile': False})
+        monkeypatch.setenv(PROFILE_ENV, 'false')
+        assert not profile_enabled({})
+
+    def test_launch_profile(self):
+        returncode = dna_averages(properties=self.properties, **self.paths)
+        assert returncode == 0
+        metrics_path = Path(self.paths['output_csv_path']).with_name('profile_avg_profile.json')
+        assert profile_path({'output_csv_path': self.paths['output_csv_path']}) == metrics_path
+        with open(metrics_path) as metrics_file:
+            metrics = json.load(metrics_file)
+        assert metrics['block'] == 'HelParAverages'
+        phases = [phase['name'] for phase in metrics['phases']]
+        assert phases == ['stage', 'parse', 'compute', 'render', 'archive', 'copy_back']
+        assert all(phase['calls'] == 1 and phase['seconds'] >= 0 for phase in metrics['phases'])
+        assert sum(phase['seconds'] for phase in metrics['phases']) <= metrics['seconds']
+        assert all(phase['start_rss_mb'] > 0 and phase['end_rss_mb'] > 0 for phase in metrics['phases'])
+        assert metrics['process_peak_rss_mb'] >= max(phase['end_rss_mb'] for phase in metrics['phases'])
+
+    def test_profile_disabled(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        block = HelParAverages(properties={**self.properties, 'profile': False}, **self.paths)
+        block.start_phase('parse')
+        assert block._phases == {} and block._phase is None
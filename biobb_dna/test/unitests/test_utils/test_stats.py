@@ -0,0 +1,77 @@
+# type: ignore
+import numpy as np
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.stats import (
+    circular_correlation,
+    circular_linear_correlation,
+    circular_mean,
+    circular_std,
+    linear_correlation,
+    rolling_window_stats,
+    trig_transform,
+)
+
+
+def circular(x1, x2):
+    x1 = x1 * np.pi / 180
+    x2 = x2 * np.pi / 180
+    diff_1 = np.sin(x1 - x1.mean())
+    diff_2 = np.sin(x2 - x2.mean())
+    return (diff_1 * diff_2).sum() / np.sqrt((diff_1**2).sum() * (diff_2**2).sum())
+
+
+def circlineal(x1, x2):
+    x2 = x2 * np.pi / 180
+    rc = np.corrcoef(x1, np.cos(x2))[1, 0]
+    rs = np.corrcoef(x1, np.sin(x2))[1, 0]
+    rcs = np.corrcoef(np.sin(x2), np.cos(x2))[1, 0]
+    correlation = np.sqrt((rc**2 + rs**2 - 2 * rc * rs * rcs) / (1 - rcs**2))
+    return -correlation if np.corrcoef(x1, x2)[1, 0] < 0 else correlation
+
+
+class TestStats():
+    def setup_class(self):
+        fx.test_setup(self, 'stats')
+        # columns of the angular series with missing values
+        self.angular = read_series(self.paths['input_angular_path'])
+        self.angular.iloc[:10, 2] = np.nan
+        self.linear = read_series(self.paths['input_linear_path']).iloc[:, :-1]
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_circular_correlation(self):
+        reference = self.angular.corr(method=circular).to_numpy()
+        assert np.allclose(circular_correlation(self.angular), reference, equal_nan=True)
+        transform = trig_transform(self.angular)
+        values = circular_correlation(transform, transform, paired=True)
+        assert np.allclose(values, np.diag(reference), equal_nan=True)
+
+    def test_circular_linear_correlation(self):
+        angular = self.angular.iloc[:, :-1]
+        angular.columns = self.linear.columns
+        reference = self.linear.corrwith(angular, method=circlineal).to_numpy()
+        values = circular_linear_correlation(self.linear, angular, paired=True)
+        assert np.allclose(values, reference, equal_nan=True)
+
+    def test_linear_correlation(self):
+        reference = self.linear.corr().to_numpy()
+        assert np.allclose(linear_correlation(self.linear), reference, equal_nan=True)
+
+    def test_circular_mean(self):
+        angles = np.array([[350, 10], [10, 30]])
+        assert np.allclose(circular_mean(angles), [0, 20])
+        assert np.allclose(circular_std(angles), circular_std(angles + 180))
+
+    def test_rolling_window_stats(self):
+        linear = self.linear.copy()
+        linear.iloc[10, 0] = np.nan
+        stats = rolling_window_stats(linear, 50)
+        rolling = linear.rolling(50)
+        assert np.allclose(stats['mean'], rolling.mean().iloc[49:], equal_nan=True)
+        assert np.allclose(stats['std'], rolling.std().iloc[49:], equal_nan=True)
+        angles = np.array([[350], [10], [30], [350]])
+        assert np.allclose(
+            rolling_window_stats(angles, 2, angular=True)['circular_mean'].ravel(),
+            [0, 20, 10])
@@ -0,0 +1,54 @@
+# type: ignore
+import numpy as np
+from biobb_common.tools import test_fixtures as fx
+from biobb_dna.curvesplus.lis_parser import LisFile
+from biobb_dna.utils.loader import read_series
+from biobb_dna.utils.synthetic import (
+    format_fixed, missing_columns, synthetic_series, write_canal_output, write_lis)
+
+
+class TestSynthetic():
+    def setup_class(self):
+        fx.test_setup(self, 'synthetic')
+
+    def teardown_class(self):
+        fx.test_teardown(self)
+
+    def test_format_fixed(self):
+        rng = np.random.default_rng(0)
+        values = np.concatenate([
+            rng.normal(0, 100, 5000), np.round(rng.normal(0, 10, 5000), 3),
+            [0.0, -0.0, -0.001, 0.005, -0.005, 1.005, 2.675, 99999.99, -9999.99, np.nan]])
+        expected = "".join(
+            "  NaN   " if np.isnan(value) else f"{value:8.2f}" for value in values)
+        assert format_fixed(values, 8, 2).tobytes().decode() == expected
+        assert format_fixed(np.arange(1, 1001), 12, 0).tobytes().decode() == "".join(
+            f"{i:12d}" for i in range(1, 1001))
+
+    def test_write_canal_output(self):
+        sequence = self.properties['sequence']
+        frames = self.properties['frames']
+        names = write_canal_output(
+            self.paths['output_zip_path'], sequence, frames, helpars=['shift', 'alphaW'],
+            chunksize=self.properties['chunksize'], bimodal_columns=[3])
+        assert names == [
+            'canal_output_shift.ser', 'canal_output_shift.his',
+            'canal_output_alphaW.ser', 'canal_output_alphaW.his']
+        for i, helpar in enumerate(['shift', 'alphaW']):
+            ser_data = read_series(f"{self.paths['output_zip_path']}::canal_output_{helpar}.ser")
+            assert ser_data.shape == (frames, len(sequence))
+            assert list(ser_data.index) == list(range(1, frames + 1))
+            values = synthetic_series(
+                helpar, frames, len(sequence), chunksize=self.properties['chunksize'],
+                bimodal_columns=[3], seed=i)
+            assert np.allclose(ser_data.to_numpy(), values, atol=0.005, equal_nan=True)
+            missing = ser_data.columns[ser_data.isna().all()] - 1
+            assert list(missing) == missing_columns(helpar, len(sequence))
+
+    def test_write_lis(self):
+        sequence = self.properties['sequence']
+        write_lis(self.paths['output_lis_path'], sequence, self.properties['frames'])
+        lis = LisFile(self.paths['output_lis_path'])
+        assert lis.sequence() == sequence
+        assert lis.levels() == len(sequence)
+        assert lis.snapshots() == self.properties['frames']
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+
+"""Utility functions to read members of zip archives."""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from collections import namedtuple
+from pathlib import Path
+
+from biobb_dna.utils.loader import open_archive
+
+ArchiveMember = namedtuple(
+    "ArchiveMember",
+    ["offset", "compress_type", "compress_size", "file_size", "crc", "flag_bits"])
+
+# the end of central directory record, and the end of the central directory
+# itself, lie within the last bytes of the archive
+TAIL_SIZE = 1 << 16
+# local file header: signature, versions, flags, method, time, date, crc,
+# sizes and the lengths of the file name and extra field that follow it
+LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+CHUNK_SIZE = 1 << 20
+# archive keys already computed in this process, keyed by the path, size and
+# modification time of the archive
+_ARCHIVE_KEYS = {}
+
+
+def archive_index_root():
+    """Directory of the persisted archive indexes, $XDG_CACHE_HOME/biobb_dna/archive_index."""
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "biobb_dna" / "archive_index"
+
+
+def archive_key(zip_path):
+    """sha256 digest of the size, modification time and last bytes of an archive.
+
+    Within a process, the archive is only read again if its path, size or
+    modification time change."""
+    stat = os.stat(zip_path)
+    key = (str(Path(zip_path).resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _ARCHIVE_KEYS:
+        sha = hashlib.sha256(f"{stat.st_size} {stat.st_mtime_ns}".encode())
+        with open(zip_path, "rb") as zip_file:
+            zip_file.seek(max(0, stat.st_size - TAIL_SIZE))
+            sha.update(zip_file.read())
+        _ARCHIVE_KEYS[key] = sha.hexdigest()
+    return _ARCHIVE_KEYS[key]
+
+
+def archive_index(zip_path, cached=False):
+    """Dictionary of ArchiveMember by member name, in archive order.
+
+    With cached=True the index is read from, or stored in, a persistent
+    index shared by all the copies of the same archive, so its members are
+    listed, and read with extract_member, without scanning the central
+    directory again."""
+    index_path = archive_index_root() / f"{archive_key(zip_path)}.json" if cached else None
+    if index_path is not None and index_path.exists():
+        with open(index_path) as index_file:
+            return {name: ArchiveMember(*values) for name, values in json.load(index_file)}
+
+    index = {
+        info.filename: ArchiveMember(
+            info.header_offset, info.compress_type, info.compress_size,
+            info.file_size, info.CRC, info.flag_bits)
+        for info in open_archive(zip_path).infolist()}
+
+    if index_path is not None:
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=f".{index_path.name}.", dir=index_path.parent)
+        with os.fdopen(fd, "w") as index_file:
+            json.dump([[name, list(member)] for name, member in index.items()], index_file)
+        os.replace(tmp_path, index_path)
+    return index
+
+
+def member_chunks(zip_path, name, member):
+    """Iterator over the uncompressed data of a member of an archive, read
+    from the raw archive at the offset of its local header.
+
+    Only stored and deflated members are read this way. A zipfile.BadZipFile
+    is raised if the local header at the offset is not the one of the member
+    (outdated index) or if the CRC-32 of the data is wrong."""
+    member = ArchiveMember(*member)
+    if member.compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED) or member.flag_bits & 0x1:
+        raise zipfile.BadZipFile(f"{name} is encrypted or compressed with an unsupported method")
+    encoding = "utf-8" if member.flag_bits & 0x800 else "cp437"
+    with open(zip_path, "rb") as zip_file:
+        zip_file.seek(member.offset)
+        header = zip_file.read(LOCAL_HEADER.size)
+        if len(header) < LOCAL_HEADER.size:
+            raise zipfile.BadZipFile(f"No local header for {name} in {zip_path}")
+        fields = LOCAL_HEADER.unpack(header)
+        name_length, extra_length = fields[-2:]
+        if fields[0] != LOCAL_HEADER_SIGNATURE or zip_file.read(name_length) != name.encode(encoding):
+            raise zipfile.BadZipFile(f"No local header for {name} in {zip_path}")
+        zip_file.seek(extra_length, os.SEEK_CUR)
+
+        decompressor = zlib.decompressobj(-zlib.MAX_WBITS) if member.compress_type == zipfile.ZIP_DEFLATED else None
+        remaining, crc = member.compress_size, 0
+        try:
+            while remaining:
+                data = zip_file.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    raise zipfile.BadZipFile(f"Truncated data of {name} in {zip_path}")
+                remaining -= len(data)
+                if decompressor is not None:
+                    data = decompressor.decompress(data)
+                crc = zlib.crc32(data, crc)
+                yield data
+            if decompressor is not None:
+                data = decompressor.flush()
+                crc = zlib.crc32(data, crc)
+                yield data
+        except zlib.error as error:
+            raise zipfile.BadZipFile(f"Bad compressed data of {name}: {error}")
+        if crc != member.crc:
+            raise zipfile.BadZipFile(f"Bad CRC-32 for file {name}")
+
+
+def open_member(zip_path, name):
+    """Open a member of an archive for reading in binary mode, the archive
+    is opened once per process with utils.loader.open_archive."""
+    return open_archive(zip_path).open(name)
+
+
+def extract_member(zip_path, name, output_path, index=None):
+    """Extract a member of an archive to output_path.
+
+    If index is given, the member is read from the raw archive at the offset
+    stored in the index, without parsing the central directory, and it is
+    only looked up by name with zipfile if the index is outdated."""
+    if index is not None:
+        if name not in index:
+            raise KeyError(f"There is no item named {name!r} in the archive {zip_path}")
+        try:
+            with open(output_path, "wb") as target:
+                for data in member_chunks(zip_path, name, index[name]):
+                    target.write(data)
+            return
+        except zipfile.BadZipFile:
+            # outdated index
+            pass
+    with open_member(zip_path, name) as source, open(output_path, "wb") as target:
+        shutil.copyfileobj(source, target)
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+
+"""Content-addressed cache of the results of Curves+ programs."""
+import hashlib
+import os
+import re
+import shlex
+import shutil
+import tempfile
+from collections import Counter
+from pathlib import Path
+
+
+# sha256 digests of the binaries already hashed in this process, keyed by
+# their path and file stats
+_BINARY_DIGESTS = {}
+
+
+def result_cache_root(cache_path=None):
+    """Directory of the cached results, $XDG_CACHE_HOME/biobb_dna/results by default."""
+    if cache_path:
+        return Path(cache_path)
+    cache_home = os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(cache_home) / "biobb_dna" / "results"
+
+
+def file_digest(path):
+    """sha256 digest of the contents of a file."""
+    sha = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            sha.update(block)
+    return sha.hexdigest()
+
+
+def binary_version(binary_path, container_image=None):
+    """Identity of the program run by binary_path.
+
+    Each word of binary_path that is an executable in the PATH or an existing
+    file is replaced by its resolved path and the sha256 digest of its
+    contents, so an updated binary gives another identity. Digests are only
+    computed again if the file changes. In a container, the binary is
+    identified by the container image."""
+    if container_image:
+        return f"{binary_path}@{container_image}"
+    words = []
+    for word in shlex.split(str(binary_path)):
+        found = shutil.which(word) or (word if Path(word).is_file() else None)
+        if found is None:
+            words.append(word)
+            continue
+        path = Path(found).resolve()
+        stat = path.stat()
+        key = (str(path), stat.st_size, stat.st_mtime_ns)
+        if key not in _BINARY_DIGESTS:
+            _BINARY_DIGESTS[key] = file_digest(path)
+        words.append(f"{path}:{_BINARY_DIGESTS[key]}")
+    return " ".join(words)
+
+
+def replace_input_names(instructions, input_files):
+    """Replace the words of the instructions that name an input file by its
+    position in input_files.
+
+    Words are delimited by blanks, quotes, commas and equal signs, and must be
+    the whole file name, its name without extension or a path ending with
+    it. Other values containing a file name are left unchanged."""
+    placeholders = {}
+    for i, input_file in reversed(list(enumerate(input_files))):
+        placeholders[input_file.name] = f"<input_{i}>"
+    stems = Counter(input_file.stem for input_file in input_files)
+    for i, input_file in enumerate(input_files):
+        if stems[input_file.stem] == 1:
+            placeholders.setdefault(input_file.stem, f"<input_{i}>")
+
+    def replace(match):
+        word = match.group(0)
+        return placeholders.get(word) or placeholders.get(word.rsplit("/", 1)[-1], word)
+
+    return re.sub(r"[^\s=,'\"]+", replace, instructions)
+
+
+def result_key(input_files, instructions, binary_path, container_image=None):
+    """sha256 key of a run, from the contents of its input files, its
+    instructions and the program run.
+
+    The names of the input files are replaced in the instructions by their
+    position in input_files, so the same inputs staged with other names give
+    the same key. The program is identified with binary_version."""
+    sha = hashlib.sha256()
+    input_files = [Path(f) for f in input_files if f]
+    for input_file in input_files:
+        sha.update(file_digest(input_file).encode())
+        sha.update(b"\0")
+    sha.update(binary_version(binary_path, container_image).encode())
+    sha.update(b"\0")
+    sha.update(replace_input_names("\n".join(instructions), input_files).encode())
+    return sha.hexdigest()
+
+
+def load_results(key, dst_dir, cache_path=None):
+    """Copy the cached result files of key to dst_dir.
+
+    Returns the list of copied file names, or None if key is not cached."""
+    entry = result_cache_root(cache_path) / key
+    if not entry.is_dir():
+        return None
+    names = []
+    for cached_file in sorted(entry.iterdir()):
+        shutil.copy(cached_file, dst_dir)
+        names.append(cached_file.name)
+    # the modification time of the entry is its last use
+    os.utime(entry)
+    return names
+
+
+def store_results(key, files, cache_path=None, max_size=10240):
+    """Store files as the results of key and evict the least recently used
+    entries until the cache is below max_size (MB)."""
+    root = result_cache_root(cache_path)
+    entry = root / key
+    files = [Path(f) for f in files if Path(f).is_file()]
+    if entry.exists() or sum(f.stat().st_size for f in files) > max_size * 1024 ** 2:
+        return
+    root.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=root))
+    for result_file in files:
+        shutil.copy(result_file, tmp_dir)
+    try:
+        os.rename(tmp_dir, entry)
+    except OSError:
+        # another process stored the same results first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    evict_results(cache_path, max_size)
+
+
+def evict_results(cache_path=None, max_size=10240):
+    """Remove the least recently used entries until the cache is below max_size (MB)."""
+    root = result_cache_root(cache_path)
+    if not root.is_dir():
+        return
+    entries = []
+    for entry in root.iterdir():
+        if entry.is_dir() and not entry.name.startswith("."):
+            size = sum(f.stat().st_size for f in entry.iterdir())
+            entries.append((entry.stat().st_mtime, size, entry))
+    total = sum(size for _, size, _ in entries)
+    for _, size, entry in sorted(entries):
+        if total <= max_size * 1024 ** 2:
+            break
+        shutil.rmtree(entry, ignore_errors=True)
+        total -= size
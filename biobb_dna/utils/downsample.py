@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+
+"""Shape-preserving downsampling of time series for plotting.
+
+The functions return the (sorted) indices of the points to keep, so they can
+be used with any index or time axis."""
+import numpy as np
+
+
+def stride_indices(n_points, stride):
+    """Indices of one point out of every stride points."""
+    return np.arange(0, n_points, max(1, int(stride)))
+
+
+def minmax_indices(y, n_out):
+    """Indices of the minimum and the maximum of each one of n_out // 2
+    consecutive buckets of y, so excursions of a single point are kept."""
+    y = np.asarray(y, dtype=float)
+    n_points = len(y)
+    if n_out < 2 or n_out >= n_points:
+        return np.arange(n_points)
+    size = -(-n_points // (n_out // 2))
+    buckets = -(-n_points // size)
+    padded = np.empty(buckets * size)
+    padded[:n_points] = y
+    offsets = np.arange(buckets) * size
+    padded[n_points:] = np.inf
+    argmin = padded.reshape(buckets, size).argmin(axis=1)
+    padded[n_points:] = -np.inf
+    argmax = padded.reshape(buckets, size).argmax(axis=1)
+    return np.unique(np.concatenate([offsets + argmin, offsets + argmax]))
+
+
+def lttb_indices(x, y, n_out, minmax_ratio=4):
+    """Indices of n_out points of (x, y) selected with Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept, and from each one of the
+    n_out - 2 buckets in between the point forming the largest triangle with
+    the point kept from the previous bucket and the average of the next one.
+    Series longer than minmax_ratio * n_out are first reduced to the minima
+    and maxima of minmax_ratio * n_out buckets (MinMaxLTTB), so the cost of
+    the selection does not depend on the length of the series."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    if n_out < 3 or n_out >= len(y):
+        return np.arange(len(y))
+    candidates = np.arange(len(y))
+    if minmax_ratio and len(y) > minmax_ratio * n_out:
+        candidates = minmax_indices(y, minmax_ratio * n_out)
+        # the first and last points are kept by LTTB
+        candidates = np.union1d(candidates, [0, len(y) - 1])
+        if n_out >= len(candidates):
+            return candidates
+    cx, cy = x[candidates], y[candidates]
+    n_points = len(candidates)
+
+    # bucket limits and averages, all computed at once
+    bounds = np.linspace(1, n_points - 1, n_out - 1).astype(int)
+    sizes = np.diff(bounds)
+    next_x = np.append(np.add.reduceat(cx[:-1], bounds[:-1]) / sizes, cx[-1])[1:]
+    next_y = np.append(np.add.reduceat(cy[:-1], bounds[:-1]) / sizes, cy[-1])[1:]
+
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n_points - 1
+    a = 0
+    for i, (start, stop) in enumerate(zip(bounds[:-1], bounds[1:])):
+        area = np.abs((cx[a] - next_x[i]) * (cy[start:stop] - cy[a]) - (cx[a] - cx[start:stop]) * (next_y[i] - cy[a]))
+        a = start + int(np.argmax(area))
+        selected[i + 1] = a
+    return candidates[selected]
+
+
+def downsample_indices(x, y, method="lttb", max_points=2000, stride=1):
+    """Indices of the points of a time series to plot with the given method:
+    lttb, minmax (at most max_points points) or stride."""
+    if method == "stride":
+        return stride_indices(len(y), stride)
+    if method == "minmax":
+        return minmax_indices(y, max_points)
+    if method == "lttb":
+        return lttb_indices(x, y, max_points)
+    raise ValueError(f"Invalid downsample method {method}! Options: lttb, minmax, stride")
@@ -1,19 +1,247 @@
 #!/usr/bin/env python3
 
-"""Utility functions to load files."""
+"""Utility functions to load files.
+
+Input paths of the form "archive.zip::member" are read directly from the
+member of the archive. Tables saved together in a .npz file are read the
+same way, as "tables.npz::name", decoding only the arrays of that table.
+
+.ser files parsed once with parse_series are read by read_series from the
+.npy files of their values, shared as read-only memory maps, inside a
+using_parsed_series block."""
+import errno
+import os
 import zipfile
+from collections import OrderedDict
+from contextlib import contextmanager
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from biobb_common.tools import file_utils as fu
+
+ARCHIVE_SEPARATOR = "::"
+# maximum number of archives kept open by open_archive
+MAX_OPEN_ARCHIVES = 16
+_OPEN_ARCHIVES = OrderedDict()
+if hasattr(os, "register_at_fork"):
+    # the archives opened before a fork share their file offset with the child
+    # process, so the child opens its own ones
+    os.register_at_fork(after_in_child=_OPEN_ARCHIVES.clear)
+# arrays saved with each table of a .npz file, besides its values
+NPZ_INDEX_SUFFIX = ".index"
+NPZ_COLUMNS_SUFFIX = ".columns"
+# .ser files parsed with parse_series that read_series reads from .npy files
+_PARSED_SERIES = {}
+
+
+def is_archive_path(path):
+    """True if path is an "archive.zip::member" path."""
+    return isinstance(path, (str, Path)) and ARCHIVE_SEPARATOR in str(path)
+
+
+def split_archive_path(path):
+    """Split an "archive.zip::member" path in the archive path and the member
+    name. The member name is None for any other path or file object."""
+    if not is_archive_path(path):
+        return path, None
+    archive_path, member = str(path).split(ARCHIVE_SEPARATOR, 1)
+    return archive_path, member
+
+
+def open_archive(zip_path):
+    """Open .zip file for reading, reusing the last archives opened in this process."""
+    stat = os.stat(zip_path)
+    key = (str(Path(zip_path).resolve()), stat.st_mtime_ns, stat.st_size)
+    if key in _OPEN_ARCHIVES:
+        _OPEN_ARCHIVES.move_to_end(key)
+        return _OPEN_ARCHIVES[key]
+    zf = zipfile.ZipFile(zip_path, "r")
+    _OPEN_ARCHIVES[key] = zf
+    if len(_OPEN_ARCHIVES) > MAX_OPEN_ARCHIVES:
+        # members already opened from it remain readable
+        _OPEN_ARCHIVES.popitem(last=False)[1].close()
+    return zf
+
+
+@contextmanager
+def open_input(input_file, inner_file=None):
+    """Context manager giving input_file itself, or an open binary file of the
+    archive member if input_file is an "archive.zip::member" path or if
+    inner_file is given."""
+    if inner_file is None:
+        input_file, inner_file = split_archive_path(input_file)
+    if inner_file is None:
+        yield input_file
+        return
+    with open_archive(input_file).open(inner_file) as member_file:
+        yield member_file
+
+
+def npz_table_name(name):
+    """Name of a table of a .npz file, also accepting the name of the .csv
+    file it stands for."""
+    return name[:-len(".csv")] if name.endswith(".csv") else name
+
+
+def npz_tables(npz_path):
+    """Names of the tables saved in a .npz file with save_npz_tables."""
+    extra_arrays = (f"{NPZ_INDEX_SUFFIX}.npy", f"{NPZ_COLUMNS_SUFFIX}.npy")
+    return [
+        name[:-len(".npy")] for name in open_archive(npz_path).namelist()
+        if name.endswith(".npy") and not name.endswith(extra_arrays)]
+
+
+def archive_has_member(archive_path, member):
+    """True if member is a file of a .zip file or a table of a .npz file."""
+    if Path(archive_path).suffix == ".npz":
+        return npz_table_name(member) in npz_tables(archive_path)
+    return member in open_archive(archive_path).namelist()
+
+
+def save_npz_tables(npz_path, tables):
+    """Save a dictionary of DataFrames with numeric values in a single
+    uncompressed .npz file.
+
+    Each table is stored as three arrays: its values, its index and the
+    names of its index and columns, so any table can be read back with
+    read_npz_table without decoding the others."""
+    arrays = {}
+    for name, table in tables.items():
+        arrays[name] = table.to_numpy(dtype=float)
+        arrays[f"{name}{NPZ_INDEX_SUFFIX}"] = table.index.to_numpy()
+        arrays[f"{name}{NPZ_COLUMNS_SUFFIX}"] = np.array(
+            [table.index.name or ""] + [str(col) for col in table.columns])
+    # saving to a file object keeps the path as given, without adding .npz
+    with open(npz_path, "wb") as npz_file:
+        np.savez(npz_file, **arrays)
+
+
+def read_npz_table(npz_path, name):
+    """Read a table saved with save_npz_tables as a DataFrame."""
+    name = npz_table_name(name)
+    zf = open_archive(npz_path)
+
+    def read_array(array_name):
+        with zf.open(f"{array_name}.npy") as array_file:
+            return np.lib.format.read_array(array_file)
+
+    columns = read_array(f"{name}{NPZ_COLUMNS_SUFFIX}")
+    index = pd.Index(read_array(f"{name}{NPZ_INDEX_SUFFIX}"), name=columns[0] or None)
+    return pd.DataFrame(read_array(name), index=index, columns=list(columns[1:]))
+
+
+def _parsed_series_key(input_serfile):
+    """Key of a .ser file path (or "archive.zip::member" path) in the parsed series."""
+    if not isinstance(input_serfile, (str, Path)):
+        return None
+    archive_path, member = split_archive_path(input_serfile)
+    key = str(Path(archive_path).resolve())
+    return f"{key}{ARCHIVE_SEPARATOR}{member}" if member is not None else key
+
+
+def parse_series(input_serfile, npy_prefix):
+    """Parse .ser file once and save its values, index and columns as
+    <npy_prefix>.values.npy, <npy_prefix>.index.npy and
+    <npy_prefix>.columns.npy files.
+
+    Returns the dictionary describing the parsed file to pass to
+    using_parsed_series, or None if its values are not numeric."""
+    ser_data = read_series(input_serfile)
+    values = ser_data.to_numpy()
+    if values.dtype == object:
+        return None
+    parsed = {
+        "key": _parsed_series_key(input_serfile),
+        "values": f"{npy_prefix}.values.npy",
+        "index": f"{npy_prefix}.index.npy",
+        "columns": f"{npy_prefix}.columns.npy",
+        "dtypes": [str(dtype) for dtype in ser_data.dtypes],
+        # pandas reads consecutive snapshot numbers as a RangeIndex
+        "range": None,
+    }
+    np.save(parsed["values"], values)
+    if isinstance(ser_data.index, pd.RangeIndex):
+        parsed["range"] = [ser_data.index.start, ser_data.index.stop, ser_data.index.step]
+    np.save(parsed["index"], ser_data.index.to_numpy())
+    np.save(parsed["columns"], ser_data.columns.to_numpy())
+    return parsed
+
+
+def _load_parsed_series(parsed):
+    """DataFrame of a .ser file parsed with parse_series, as read_series reads it.
+
+    The values are a copy-on-write memory map of the .npy file, so the
+    processes reading the same file share its pages."""
+    values = np.load(parsed["values"], mmap_mode="c")
+    columns = np.load(parsed["columns"])
+    if parsed["range"] is not None:
+        index = pd.RangeIndex(*parsed["range"], name=0)
+    else:
+        index = pd.Index(np.load(parsed["index"]), name=0)
+    ser_data = pd.DataFrame(
+        values, index=index,
+        columns=pd.Index(columns), copy=False)
+    if any(dtype != str(values.dtype) for dtype in parsed["dtypes"]):
+        ser_data = ser_data.astype(dict(zip(columns, parsed["dtypes"])))
+    return ser_data
+
+
+@contextmanager
+def using_parsed_series(parsed_series):
+    """Context manager making read_series read the .ser files of a list of
+    files parsed with parse_series from their .npy files."""
+    previous = dict(_PARSED_SERIES)
+    _PARSED_SERIES.update({parsed["key"]: parsed for parsed in parsed_series if parsed})
+    try:
+        yield
+    finally:
+        _PARSED_SERIES.clear()
+        _PARSED_SERIES.update(previous)
 
 
 def read_series(input_serfile, usecols=None):
     """Read .ser file"""
-    extra_kwargs = dict(
-        header=None,
-        sep='\\s+',
-        index_col=0)
-    ser_data = pd.read_csv(input_serfile, **extra_kwargs)  # type: ignore
+    parsed = _PARSED_SERIES.get(_parsed_series_key(input_serfile)) if _PARSED_SERIES else None
+    if parsed is not None:
+        ser_data = _load_parsed_series(parsed)
+    else:
+        extra_kwargs = dict(
+            header=None,
+            sep='\\s+',
+            index_col=0)
+        with open_input(input_serfile) as ser_file:
+            ser_data = pd.read_csv(ser_file, **extra_kwargs)  # type: ignore
+    return select_series(ser_data, usecols)
+
+
+def series_frame(values):
+    """DataFrame of helical parameter values, as read_series reads a .ser file.
+
+    values is a (frames, columns) array, with the columns of the .ser file
+    (without its snapshot numbers), or a DataFrame, which is returned as is."""
+    if isinstance(values, pd.DataFrame):
+        return values
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return pd.DataFrame(
+        values, index=pd.RangeIndex(len(values), name=0),
+        columns=pd.Index(np.arange(1, values.shape[1] + 1)))
+
+
+def timeseries_frame(values):
+    """Single column DataFrame of a time series, as load_data reads a time
+    series .csv file of dna_timeseries.
+
+    values is a one-dimensional array or a DataFrame, which is returned as is."""
+    if isinstance(values, pd.DataFrame):
+        return values
+    return pd.DataFrame(np.asarray(values, dtype=float).reshape(-1, 1))
+
+
+def select_series(ser_data, usecols=None):
+    """Columns of a DataFrame of a .ser file selected as in read_series."""
     if usecols is not None:
         if 0 in usecols:
             usecols.pop(usecols.index(0))
@@ -21,10 +249,81 @@ def read_series(input_serfile, usecols=None):
     return ser_data
 
 
+def _series_columns(usecols):
+    """Columns of a .ser file selected as in read_series (the index is column 0)."""
+    if usecols is None:
+        return None
+    return [0] + [i + 1 for i in usecols if i != 0]
+
+
+def iter_series(input_serfile, usecols=None, chunksize=100000, inner_file=None):
+    """Read .ser file in chunks of rows.
+
+    Yields DataFrames with the same index and columns read_series would return
+    for each block of chunksize rows. If inner_file is given, input_serfile is
+    a .zip file and inner_file the name of the .ser file inside it."""
+    with open_input(input_serfile, inner_file) as ser_file:
+        reader = pd.read_csv(
+            ser_file, header=None, sep='\\s+', index_col=0,
+            usecols=_series_columns(usecols), chunksize=chunksize)  # type: ignore
+        with reader:
+            for chunk in reader:
+                yield chunk
+
+
+def count_series_rows(input_serfile, inner_file=None):
+    """Number of non empty lines of a .ser file, from a path or a .zip member."""
+    with open_input(input_serfile, inner_file) as ser_file:
+        with open(ser_file, "rb") if isinstance(ser_file, (str, Path)) else ser_file as lines:
+            return sum(1 for line in lines if line.strip())
+
+
+def read_series_array(
+        input_serfile, usecols=None, npy_path=None, chunksize=100000, inner_file=None):
+    """Read .ser file values into a (frames, columns) float array.
+
+    The file is read in chunks of rows. If npy_path is given the values are
+    written to a .npy file as they are read, so memory stays bounded by
+    chunksize, and the returned array is a read-only memory map of that file.
+    File objects can not be read twice, so they are loaded in memory first."""
+    streamed = isinstance(input_serfile, (str, Path))
+    if npy_path is None or not streamed:
+        chunks = [chunk.to_numpy(dtype=float) for chunk in iter_series(
+            input_serfile, usecols=usecols, chunksize=chunksize, inner_file=inner_file)]
+        values = np.concatenate(chunks) if chunks else np.empty((0, 0))
+        if npy_path is None:
+            return values
+        np.save(npy_path, values)
+        return np.load(npy_path, mmap_mode="r")
+
+    n_rows = count_series_rows(input_serfile, inner_file=inner_file)
+    values = None
+    start = 0
+    for chunk in iter_series(
+            input_serfile, usecols=usecols, chunksize=chunksize, inner_file=inner_file):
+        if values is None:
+            values = np.lib.format.open_memmap(
+                npy_path, mode="w+", dtype=float, shape=(n_rows, chunk.shape[1]))
+        values[start:start + len(chunk)] = chunk.to_numpy(dtype=float)
+        start += len(chunk)
+    if values is None:
+        np.save(npy_path, np.empty((0, 0)))
+    else:
+        values.flush()
+        del values
+    return np.load(npy_path, mmap_mode="r")
+
+
 def load_data(data_filename, inner_file=None):
-    """Read .csv file directly or from inside a .zip file."""
+    """Read .csv file directly or from inside a .zip file, or a table of a .npz file."""
+    if is_archive_path(data_filename):
+        archive_path, member = split_archive_path(data_filename)
+        if Path(archive_path).suffix == ".npz":
+            return read_npz_table(archive_path, member)
+        with open_input(data_filename) as dataset:
+            return pd.read_csv(dataset, index_col=0)
     if Path(data_filename).suffix == ".zip":
-        zf = zipfile.ZipFile(data_filename, "r")
+        zf = open_archive(data_filename)
         # use provided data filename of look for csv file
         if inner_file is not None:
             dataset = zf.open(inner_file)
@@ -36,9 +335,78 @@ def load_data(data_filename, inner_file=None):
                 if fn.filename.endswith(".csv"):
                     dataset = zf.open(fn)
                     break
+    elif Path(data_filename).suffix == ".npz":
+        if inner_file is None:
+            print(
+                "inner file name not provided, "
+                "using first table found inside .npz.")
+            inner_file = npz_tables(data_filename)[0]
+        return read_npz_table(data_filename, inner_file)
     elif Path(data_filename).suffix == ".csv":
         dataset = data_filename
     else:
-        raise IOError("input file extension must be .zip or .csv!")
+        raise IOError("input file extension must be .zip, .npz or .csv!")
     data = pd.read_csv(dataset, index_col=0)
     return data
+
+
+class ArchiveMemberInputs:
+    """Mixin for building blocks accepting "archive.zip::member" (or
+    "tables.npz::name") input paths.
+
+    The member is checked inside the archive instead of on disk, and the
+    archive is not copied to the sandbox: the staged input path points to
+    the member of the archive at its host path, which the loaders of this
+    module read without extracting it."""
+
+    def _archive_inputs(self):
+        return {
+            file_ref: split_archive_path(file_path)
+            for file_ref, file_path in self.io_dict.get("in", {}).items()
+            if is_archive_path(file_path)}
+
+    def check_arguments(self, output_files_created=False, raise_exception=True):
+        archive_inputs = self._archive_inputs()
+        for file_ref, (archive_path, member) in archive_inputs.items():
+            if not Path(archive_path).exists() or not archive_has_member(archive_path, member):
+                not_found_error_string = (
+                    f"Path {archive_path}{ARCHIVE_SEPARATOR}{member} --- "
+                    f"{self.__module__}: Unexisting {file_ref} file.")
+                fu.log(not_found_error_string, self.out_log)
+                if raise_exception:
+                    raise FileNotFoundError(
+                        errno.ENOENT, os.strerror(errno.ENOENT), not_found_error_string)
+        doc_arguments_dict = self.doc_arguments_dict
+        self.doc_arguments_dict = {
+            argument: argument_dict for argument, argument_dict in doc_arguments_dict.items()
+            if argument not in archive_inputs}
+        try:
+            super().check_arguments(output_files_created, raise_exception)  # type: ignore
+        finally:
+            self.doc_arguments_dict = doc_arguments_dict
+
+    def stage_files(self):
+        archive_inputs = self._archive_inputs()
+        io_dict_in = self.io_dict["in"]
+        self.io_dict["in"] = {
+            file_ref: file_path for file_ref, file_path in io_dict_in.items()
+            if file_ref not in archive_inputs}
+        try:
+            super().stage_files()  # type: ignore
+        finally:
+            self.io_dict["in"] = io_dict_in
+        # archive members are read from the archive at its host path
+        staged_in = self.stage_io_dict["in"]
+        self.stage_io_dict["in"] = {}
+        for file_ref in io_dict_in:
+            if file_ref in archive_inputs:
+                archive_path, member = archive_inputs[file_ref]
+                self.stage_io_dict["in"][file_ref] = (
+                    f"{Path(archive_path).resolve()}{ARCHIVE_SEPARATOR}{member}")
+            elif file_ref in staged_in:
+                self.stage_io_dict["in"][file_ref] = staged_in[file_ref]
+        # without sandbox the optional outputs not given are staged too, and
+        # copy_to_host would fail on them
+        self.stage_io_dict["out"] = {
+            file_ref: file_path for file_ref, file_path in self.stage_io_dict["out"].items()
+            if file_path}
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+
+"""Wall time and resident memory of the phases of the launch of the building blocks."""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+
+from biobb_common.tools import file_utils as fu
+
+# environment variable enabling the profiling of all the building blocks
+PROFILE_ENV = "BIOBB_DNA_PROFILE"
+PROFILE_SUFFIX = "_profile.json"
+
+
+def profile_enabled(properties):
+    """Value of the profile property, or of the BIOBB_DNA_PROFILE
+    environment variable if the property is not set."""
+    profile = properties.get("profile")
+    if profile is None:
+        profile = os.getenv(PROFILE_ENV, "")
+    if isinstance(profile, str):
+        return profile.lower() not in ("", "0", "false", "no")
+    return bool(profile)
+
+
+def current_rss_mb():
+    """Current resident set size of the process in MB, or None if it can not
+    be measured (it is read from /proc/self/statm)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            resident_pages = int(statm.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return resident_pages * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+
+
+def process_peak_rss_mb():
+    """Peak resident set size of the whole process since it started in MB,
+    or None if it can not be measured. It is never reset, so it includes
+    the memory used before the launch of the building block."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes elsewhere
+    return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def profile_path(io_dict_out):
+    """Path of the metrics file of a launch: <first output>_profile.json,
+    next to the first output file of the building block."""
+    for output_path in io_dict_out.values():
+        if output_path:
+            output_path = Path(output_path)
+            return output_path.parent / f"{output_path.stem}{PROFILE_SUFFIX}"
+    return None
+
+
+class LaunchProfiler:
+    """Mixin for building blocks timing the phases of their launch.
+
+    If the *profile* property (or the BIOBB_DNA_PROFILE environment
+    variable) is set, the wall time and the current resident memory at the
+    start and at the end of each phase are saved as JSON in a
+    <first output>_profile.json file next to the outputs, with the peak
+    resident memory of the whole process. Staging the inputs ("stage") and copying the outputs back
+    ("copy_back") are timed by the mixin itself, and each building block
+    starts its own phases ("parse", "compute", "render", "archive") with
+    start_phase. A phase lasts until the next one starts, and the times of
+    a phase started several times are added up, its memory is the one at
+    the start of its first call and at the end of its last call."""
+
+    def __init__(self, properties=None, **kwargs):
+        properties = properties or {}
+        super().__init__(properties, **kwargs)  # type: ignore
+        self.profile = profile_enabled(properties)
+        self._phases = {}
+        self._phase = None
+        self._launch_start = None
+
+    def start_phase(self, name=None):
+        """End the running phase and start phase name (None to only end it)."""
+        if not self.profile:
+            return
+        now = time.perf_counter()
+        rss = current_rss_mb()
+        if self._launch_start is None:
+            self._launch_start = now
+        if self._phase is not None:
+            phase_name, start, start_rss = self._phase
+            phase = self._phases.setdefault(
+                phase_name, {"name": phase_name, "seconds": 0.0, "calls": 0, "start_rss_mb": start_rss})
+            phase["seconds"] += now - start
+            phase["calls"] += 1
+            phase["end_rss_mb"] = rss
+        self._phase = (name, now, rss) if name is not None else None
+
+    def stage_files(self):
+        self.start_phase("stage")
+        super().stage_files()  # type: ignore
+        self.start_phase()
+
+    def copy_to_host(self):
+        self.start_phase("copy_back")
+        super().copy_to_host()  # type: ignore
+        self.start_phase()
+
+    def remove_tmp_files(self):
+        super().remove_tmp_files()  # type: ignore
+        if self.profile:
+            self.save_profile()
+
+    def save_profile(self):
+        """Save the phases timed so far in the metrics file of the launch."""
+        self.start_phase()
+        metrics_path = profile_path(self.io_dict["out"])  # type: ignore
+        if metrics_path is None:
+            return
+        seconds = time.perf_counter() - self._launch_start if self._launch_start else 0.0
+        metrics = {
+            "block": self.__class__.__name__,
+            "module": self.__module__,
+            "version": self.version,  # type: ignore
+            "seconds": seconds,
+            "process_peak_rss_mb": process_peak_rss_mb(),
+            "phases": list(self._phases.values()),
+        }
+        with open(metrics_path, "w") as metrics_file:
+            json.dump(metrics, metrics_file, indent=2)
+        fu.log(f"Saved profile of the launch to {metrics_path}", self.out_log)  # type: ignore
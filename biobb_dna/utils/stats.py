@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+
+"""Vectorized statistics of helical parameter series.
+
+All the functions take (snapshots, columns) arrays or DataFrames, angles in
+degrees. Correlations are computed at once for all the pairs of columns of
+two datasets or, with paired=True, for the columns in the same position of
+both. As in pandas, for each pair of columns only the snapshots where both
+values are finite are used."""
+from collections import namedtuple
+from itertools import combinations
+
+import numpy as np
+
+TrigTransform = namedtuple("TrigTransform", ["values", "sin", "cos", "centered_sin"])
+
+
+def as_array(values):
+    """Float (snapshots, columns) array of a DataFrame, Series or array."""
+    if isinstance(values, TrigTransform):
+        return values.values
+    values = np.asarray(values, dtype=float)
+    return values.reshape(-1, 1) if values.ndim == 1 else values
+
+
+def trig_transform(values):
+    """Sine and cosine of a dataset of angles in degrees, computed once so they
+    can be reused by all the correlations of the dataset.
+
+    centered_sin is the sine of the difference between each angle and the
+    arithmetic mean of its column."""
+    if isinstance(values, TrigTransform):
+        return values
+    values = as_array(values)
+    radians = values * np.pi / 180
+    with np.errstate(invalid="ignore"):
+        centered = radians - radians.mean(axis=0)
+    return TrigTransform(values, np.sin(radians), np.cos(radians), np.sin(centered))
+
+
+def _standardize(values):
+    centered = values - values.mean(axis=0)
+    return centered / np.sqrt((centered ** 2).sum(axis=0))
+
+
+def _dot(x, y, paired):
+    return (x * y).sum(axis=0) if paired else x.T @ y
+
+
+def _outer(x, y, paired):
+    return x * y if paired else np.outer(x, y)
+
+
+def _pairs(x, y, paired):
+    if paired:
+        return [(i, i) for i in range(x.shape[1])]
+    return [(i, j) for i in range(x.shape[1]) for j in range(y.shape[1])]
+
+
+def _correlation(kernel, x, y, paired, symmetric):
+    """Apply a correlation kernel to complete data, recomputing the pairs of
+    columns with missing values from their valid snapshots only."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = np.array(kernel(x, y, paired), dtype=float)
+        missing_x = ~np.isfinite(as_array(x)).all(axis=0)
+        missing_y = ~np.isfinite(as_array(y)).all(axis=0)
+        if missing_x.any() or missing_y.any():
+            x_values, y_values = as_array(x), as_array(y)
+            for i, j in _pairs(x_values, y_values, paired):
+                if not (missing_x[i] or missing_y[j]):
+                    continue
+                valid = np.isfinite(x_values[:, i]) & np.isfinite(y_values[:, j])
+                value = np.nan
+                if valid.any():
+                    value = kernel(
+                        x_values[valid, i:i + 1], y_values[valid, j:j + 1], True)[0]
+                result[(i,) if paired else (i, j)] = value
+    if symmetric:
+        valid = np.isfinite(as_array(x)).any(axis=0)
+        result[np.diag_indices_from(result)] = np.where(valid, 1.0, np.nan)
+    return result
+
+
+def _linear_kernel(x, y, paired):
+    return _dot(_standardize(as_array(x)), _standardize(as_array(y)), paired)
+
+
+def _circular_kernel(x, y, paired):
+    x_sin = trig_transform(x).centered_sin
+    y_sin = trig_transform(y).centered_sin
+    num = _dot(x_sin, y_sin, paired)
+    den = np.sqrt(_outer((x_sin ** 2).sum(axis=0), (y_sin ** 2).sum(axis=0), paired))
+    return num / den
+
+
+def _circular_linear_kernel(x, y, paired):
+    x_std = _standardize(as_array(x))
+    y_trig = trig_transform(y)
+    y_cos, y_sin = _standardize(y_trig.cos), _standardize(y_trig.sin)
+    rc = _dot(x_std, y_cos, paired)
+    rs = _dot(x_std, y_sin, paired)
+    rcs = (y_sin * y_cos).sum(axis=0)
+    num = rc ** 2 + rs ** 2 - 2 * rc * rs * rcs
+    den = 1 - rcs ** 2
+    correlation = np.sqrt(num / den)
+    sign = _dot(x_std, _standardize(y_trig.values), paired)
+    return np.where(sign < 0, -correlation, correlation)
+
+
+def linear_correlation(x, y=None, paired=False):
+    """Pearson correlation between the columns of x and y (or of x with itself)."""
+    symmetric = y is None and not paired
+    return _correlation(_linear_kernel, x, x if y is None else y, paired, symmetric)
+
+
+def circular_correlation(x, y=None, paired=False):
+    """Circular correlation between the angles of the columns of x and y (or of
+    x with itself). x and y can be given as TrigTransform to reuse their sines."""
+    symmetric = y is None and not paired
+    x = trig_transform(x)
+    y = x if y is None else trig_transform(y)
+    return _correlation(_circular_kernel, x, y, paired, symmetric)
+
+
+def circular_linear_correlation(x, y, paired=False):
+    """Correlation between the linear values of the columns of x and the angles
+    of the columns of y, with the sign of their Pearson correlation.
+
+    y can be given as a TrigTransform to reuse its sines and cosines."""
+    return _correlation(_circular_linear_kernel, x, trig_transform(y), paired, False)
+
+
+def circular_mean(values, axis=0):
+    """Circular mean of angles in degrees, ignoring missing values."""
+    radians = np.deg2rad(as_array(values))
+    return np.rad2deg(np.arctan2(
+        np.nanmean(np.sin(radians), axis=axis), np.nanmean(np.cos(radians), axis=axis)))
+
+
+def mean_resultant_length(values, axis=0):
+    """Length of the mean resultant vector of angles in degrees, ignoring missing values."""
+    radians = np.deg2rad(as_array(values))
+    return np.hypot(
+        np.nanmean(np.sin(radians), axis=axis), np.nanmean(np.cos(radians), axis=axis))
+
+
+def circular_variance(values, axis=0):
+    """Circular variance (1 - mean resultant length) of angles in degrees."""
+    return 1 - mean_resultant_length(values, axis=axis)
+
+
+def circular_std(values, axis=0):
+    """Circular standard deviation of angles, in degrees."""
+    length = np.minimum(mean_resultant_length(values, axis=axis), 1)
+    with np.errstate(divide="ignore"):
+        return np.rad2deg(np.sqrt(-2 * np.log(length)))
+
+
+def helpar_correlation(x, y, x_angular, y_angular, paired=False):
+    """Correlation between two helical parameter datasets: circular if both of
+    them are angular, circular_linear_correlation(x, y) if only one of them
+    is and Pearson otherwise."""
+    if x_angular and y_angular:
+        return circular_correlation(x, y, paired=paired)
+    if x_angular or y_angular:
+        return circular_linear_correlation(x, y, paired=paired)
+    return linear_correlation(x, y, paired=paired)
+
+
+def neighbor_correlation(datasets, angular):
+    """Correlation of each base (pair) of a helical parameter dataset with the
+    previous one of another, for all the pairs of datasets.
+
+    datasets is a dictionary of the datasets of each helical parameter, with
+    the same columns, and angular the names of the angular ones. The sines
+    and cosines of each dataset are computed once, and shifted along with the
+    values for the neighboring base (pair)s. Returns a dictionary of the
+    paired correlations of each "name1/name2" pair of datasets."""
+    transforms = {name: trig_transform(values) for name, values in datasets.items()}
+    shifted = {
+        name: TrigTransform(*(np.roll(array, 1, axis=1) for array in transform))
+        for name, transform in transforms.items()
+    }
+    return {
+        f"{name1}/{name2}": helpar_correlation(
+            transforms[name1], shifted[name2],
+            name1 in angular, name2 in angular, paired=True)
+        for name1 in datasets for name2 in datasets
+    }
+
+
+def helpar_correlation_matrix(datasets, angular):
+    """Correlation matrix between the helical parameter time series of a
+    single base (pair).
+
+    datasets is a dictionary of the time series of each helical parameter,
+    and angular the names of the angular ones. The sines and cosines of each
+    time series are computed only once. Returns a symmetric (datasets,
+    datasets) array with ones in its diagonal."""
+    names = list(datasets)
+    transforms = {name: trig_transform(values) for name, values in datasets.items()}
+    corr_matrix = np.eye(len(names))
+    for (i, name1), (j, name2) in combinations(enumerate(names), 2):
+        corr_matrix[j, i] = corr_matrix[i, j] = helpar_correlation(
+            transforms[name1], transforms[name2],
+            name1 in angular, name2 in angular, paired=True)[0]
+    return corr_matrix
+
+
+def column_histograms(values, bins="auto"):
+    """Density histograms of all the columns of a dataset on a shared grid of bins.
+
+    bins has the same options as numpy.histogram_bin_edges, computed from
+    all the finite values of the dataset. All the values are binned in a
+    single pass. Returns the bin edges and a (bins, columns) array of
+    densities, each column integrating to 1."""
+    values = as_array(values)
+    finite = np.isfinite(values)
+    edges = np.histogram_bin_edges(values[finite], bins=bins)
+    n_bins = len(edges) - 1
+    # the last bin includes its right edge, as in numpy.histogram
+    bin_index = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, n_bins - 1)
+    column_index = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    counts = np.bincount(
+        (column_index[finite] * n_bins + bin_index[finite]),
+        minlength=values.shape[1] * n_bins,
+    ).reshape(values.shape[1], n_bins).T
+    with np.errstate(invalid="ignore", divide="ignore"):
+        density = counts / (counts.sum(axis=0) * np.diff(edges)[:, None])
+    return edges, density
+
+
+def _window_sums(values, window):
+    """Sums of the windows of window consecutive rows, from cumulative sums."""
+    cumsum = np.zeros((len(values) + 1, values.shape[1]))
+    np.cumsum(values, axis=0, out=cumsum[1:])
+    return cumsum[window:] - cumsum[:-window]
+
+
+def rolling_window_stats(values, window, angular=False):
+    """Mean, standard deviation and, for angles, circular mean of each window of
+    window consecutive snapshots, for all the columns of a dataset.
+
+    The windows end at each snapshot from the window-th on, and their sums are
+    differences of cumulative sums, so the cost does not depend on the window
+    size. Windows with missing values are NaN, and the standard deviation is
+    the sample one, as in pandas rolling. Returns a dictionary of
+    (snapshots - window + 1, columns) arrays."""
+    values = as_array(values)
+    missing = ~np.isfinite(values)
+    values = np.where(missing, 0.0, values)
+    # shifting the values does not change the variance, and reduces the
+    # cancellation in the sums of squares
+    shift = values[0] if len(values) else 0.0
+    sums = _window_sums(values - shift, window)
+    squares = _window_sums((values - shift) ** 2, window)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        variance = (squares - sums ** 2 / window) / (window - 1)
+    stats = {
+        "mean": sums / window + shift,
+        "std": np.sqrt(np.maximum(variance, 0)),
+    }
+    if angular:
+        radians = np.deg2rad(values)
+        stats["circular_mean"] = np.rad2deg(np.arctan2(
+            _window_sums(np.sin(radians), window), _window_sums(np.cos(radians), window)))
+    invalid = _window_sums(missing.astype(float), window) > 0
+    for array in stats.values():
+        array[invalid] = np.nan
+    return stats
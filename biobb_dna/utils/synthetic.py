@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+
+"""Synthetic Canal and Curves+ outputs of arbitrary size, for testing.
+
+Canal .ser and .his files are written with the fixed width columns of
+Canal, with the missing (NaN) columns Canal leaves for each helical
+parameter, and can be bundled in a Canal output .zip file together with
+the header of the matching Curves+ .lis file. The values are formatted
+with vectorized numpy operations on chunks of snapshots, so the size of
+the files is only limited by the disk.
+
+Curves+ .cda files, the input of Canal, are not written: their layout
+is undocumented and only read by the Canal executable, so synthetic
+outputs start after Canal and cannot be used as input of biobb_canal.
+
+Usage::
+
+    python -m biobb_dna.utils.synthetic canal_output.zip --sequence CGCGAATTCGCG --frames 1000000
+"""
+import argparse
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from biobb_dna.utils import constants
+
+# mean and standard deviation of the series of each helical parameter
+SERIES_STATS = {
+    "majw": (12.0, 1.5), "majd": (5.5, 1.2), "minw": (6.0, 1.0), "mind": (5.0, 0.6),
+    "rise": (3.3, 0.3), "shift": (0.0, 0.8), "slide": (-0.4, 0.6),
+    "roll": (3.0, 6.0), "tilt": (0.0, 4.0), "twist": (34.0, 6.0),
+    "shear": (0.0, 0.3), "stagger": (0.0, 0.4), "stretch": (0.0, 0.1),
+    "buckle": (0.0, 10.0), "opening": (1.0, 5.0), "propel": (-12.0, 8.0),
+    "inclin": (0.0, 5.0), "tip": (0.0, 5.0), "xdisp": (0.0, 1.0), "ydisp": (0.0, 0.5),
+    "alphaC": (-70.0, 15.0), "alphaW": (-70.0, 15.0),
+    "betaC": (175.0, 15.0), "betaW": (175.0, 15.0),
+    "gammaC": (55.0, 15.0), "gammaW": (55.0, 15.0),
+    "deltaC": (135.0, 12.0), "deltaW": (135.0, 12.0),
+    "chiC": (-110.0, 15.0), "chiW": (-110.0, 15.0),
+    "phaseC": (150.0, 20.0), "phaseW": (150.0, 20.0),
+    "epsilC": (-170.0, 15.0), "epsilW": (-170.0, 15.0),
+    "zetaC": (-95.0, 20.0), "zetaW": (-95.0, 20.0),
+}
+
+# field written by Canal for missing values
+NAN_FIELD = "  NaN   "
+# maximum size of the block of characters formatted at once
+CHUNK_BYTES = 1 << 25
+
+
+def is_angular(helpar):
+    """True for the helical parameters measured in degrees."""
+    return helpar in constants.hp_angular or helpar in constants.hp_backbone
+
+
+def missing_columns(helpar, bases):
+    """Indices of the columns Canal leaves missing for a sequence of bases:
+    the last one for base pair steps, none or one end for backbone torsions
+    depending on the strand, and the two levels at each end for grooves."""
+    if helpar in ["majw", "majd", "minw", "mind"]:
+        return [0, 1, bases - 2, bases - 1]
+    if helpar in constants.hp_basepairs:
+        return [bases - 1]
+    if helpar in ["alphaW", "betaW", "epsilC", "zetaC"]:
+        return [0]
+    if helpar in ["alphaC", "betaC", "epsilW", "zetaW"]:
+        return [bases - 1]
+    return []
+
+
+def iter_synthetic_series(
+        helpar, frames, bases, mean=None, std=None, bimodal_columns=None,
+        separation=4.0, weight=0.3, neighbour_correlation=0.0,
+        chunksize=100000, seed=0):
+    """Generate the values of a Canal .ser file in chunks of snapshots.
+
+    Each column is a normal series of the given mean and standard deviation
+    (by default those of SERIES_STATS), correlated with the previous column
+    by neighbour_correlation. The columns of bimodal_columns have a second
+    mode, separation standard deviations above the first one, with a weight
+    fraction of the snapshots. Angles wrap around at +-180 degrees and the
+    missing_columns are NaN.
+
+    Yields (snapshots, bases) arrays."""
+    default_mean, default_std = SERIES_STATS.get(helpar, (0.0, 1.0))
+    mean = default_mean if mean is None else mean
+    std = default_std if std is None else std
+    rng = np.random.default_rng(seed)
+    bimodal = np.zeros(bases, dtype=bool)
+    if bimodal_columns:
+        bimodal[list(bimodal_columns)] = True
+    missing = missing_columns(helpar, bases)
+    rho = neighbour_correlation
+    for start in range(0, frames, chunksize):
+        rows = min(chunksize, frames - start)
+        noise = rng.standard_normal((rows, bases))
+        # each column mixes the previous one with independent noise, so
+        # neighbours have a correlation rho and all columns unit variance
+        for column in range(1, bases if rho else 0):
+            noise[:, column] = rho * noise[:, column - 1] + np.sqrt(1 - rho ** 2) * noise[:, column]
+        values = noise
+        values *= std
+        values += mean
+        if bimodal.any():
+            second_mode = rng.random((rows, bases)) < weight
+            values += np.where(second_mode & bimodal, separation * std, 0.0)
+        if is_angular(helpar):
+            values += 180
+            np.remainder(values, 360, out=values)
+            values -= 180
+        values[:, missing] = np.nan
+        yield values
+
+
+def synthetic_series(helpar, frames, bases, **kwargs):
+    """(frames, bases) array of the values of a Canal .ser file, with the
+    options of iter_synthetic_series."""
+    chunks = list(iter_synthetic_series(helpar, frames, bases, **kwargs))
+    return np.concatenate(chunks) if chunks else np.empty((0, bases))
+
+
+def _format_magnitudes(scaled, negative, width, decimals):
+    """(values, width) uint8 array of the characters of the integers scaled,
+    the magnitudes of the values times 10 ** decimals, with a minus sign
+    where negative."""
+    powers = 10 ** np.arange(19, dtype=np.int64)
+    # number of digits of each value, with at least one integer digit
+    digits = np.maximum(np.searchsorted(powers, scaled, side="right"), decimals + 1)
+    point = 1 if decimals else 0
+    if (digits + point + negative > width).any():
+        raise ValueError(f"values do not fit in {width} characters with {decimals} decimals")
+    chars = np.full((len(scaled), width), ord(" "), dtype=np.uint8)
+    remaining = scaled
+    for k in range(int(digits.max()) if digits.size else 0):
+        position = width - 1 - k - (point if k >= decimals else 0)
+        digit = (remaining % 10).astype(np.uint8) + ord("0")
+        chars[:, position] = np.where(digits > k, digit, chars[:, position])
+        remaining = remaining // 10
+    if decimals:
+        chars[:, width - 1 - decimals] = ord(".")
+    chars[negative, width - 1 - digits[negative] - point] = ord("-")
+    return chars
+
+
+# formatted fields of the positive and negative magnitudes up to the largest
+# ones formatted so far and of NaN, with the size of each part, by (width, decimals)
+_FIELD_TABLES = {}
+# largest number of magnitudes of each sign formatted with a table
+MAX_TABLE_SIZE = 1 << 20
+
+
+def _table_size(size, width, decimals, negative):
+    # grow by powers of 2, so the table is rebuilt a few times at most, up
+    # to the largest magnitude that fits in the field
+    fitting = 10 ** (width - (1 if decimals else 0) - int(negative))
+    return min(1 << int(max(size, 1) - 1).bit_length(), max(size, fitting))
+
+
+def _field_table(width, decimals, positive_size, negative_size):
+    """Formatted fields of the positive magnitudes, the negative magnitudes
+    and NaN, as a "V{width}" array, with the number of fields of each sign."""
+    table, sizes = _FIELD_TABLES.get((width, decimals), (None, (0, 0)))
+    if table is None or positive_size > sizes[0] or negative_size > sizes[1]:
+        sizes = (
+            _table_size(max(positive_size, sizes[0]), width, decimals, False),
+            _table_size(max(negative_size, sizes[1]), width, decimals, True))
+        nan_field = np.frombuffer(NAN_FIELD.ljust(width)[:width].encode(), dtype=np.uint8).reshape(1, width)
+        chars = np.concatenate([
+            *(_format_magnitudes(np.arange(size, dtype=np.int64), np.full(size, negative), width, decimals)
+              for size, negative in zip(sizes, (False, True))),
+            nan_field])
+        table = chars.view(f"V{width}").ravel()
+        _FIELD_TABLES[(width, decimals)] = (table, sizes)
+    return table, sizes
+
+
+def format_fixed(values, width, decimals):
+    """Characters of values formatted as "%{width}.{decimals}f" and NaN as
+    Canal does, as a (rows, columns * width) uint8 array.
+
+    The values are rounded as printf does, and each field is taken from a
+    table of formatted magnitudes, so formatting costs about one indexing
+    operation per value."""
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values.reshape(-1, 1)
+    rows, columns = values.shape
+    nan = np.isnan(values)
+    negative = np.signbit(values) & ~nan
+    magnitude = np.abs(np.where(nan, 0, values))
+    scaled_float = magnitude * 10 ** decimals
+    rounded = np.rint(scaled_float)
+    scaled = rounded.astype(np.int64)
+    # the product may round to a half, or away from it, where printf does
+    # not: those few values are rounded by python itself
+    near_half = np.abs(np.abs(scaled_float - rounded) - 0.5) < 1e-6
+    for index in zip(*np.nonzero(near_half)):
+        scaled[index] = int(f"{magnitude[index]:.{decimals}f}".replace(".", ""))
+
+    positive_size = int(scaled[~negative].max()) + 1 if (~negative).any() else 0
+    negative_size = int(scaled[negative].max()) + 1 if negative.any() else 0
+    if max(positive_size, negative_size) > MAX_TABLE_SIZE:
+        fields = _format_magnitudes(scaled.ravel(), negative.ravel(), width, decimals)
+        if nan.any():
+            fields[nan.ravel()] = np.frombuffer(NAN_FIELD.ljust(width)[:width].encode(), dtype=np.uint8)
+        return fields.reshape(rows, columns * width)
+    table, sizes = _field_table(width, decimals, positive_size, negative_size)
+    index = scaled + negative * sizes[0]
+    index[nan] = len(table) - 1
+    return table.take(index).view(np.uint8).reshape(rows, columns * width)
+
+
+def _write_rows(out_file, columns):
+    """Write rows made of the blocks of characters of columns."""
+    rows = len(columns[0])
+    newline = np.full((rows, 1), ord("\n"), dtype=np.uint8)
+    out_file.write(np.hstack(columns + [newline]).data)
+
+
+def _chunks(values):
+    if isinstance(values, np.ndarray):
+        values = values.reshape(len(values), -1)
+        rows = max(1, CHUNK_BYTES // (8 * values.shape[1] + 13))
+        return (values[start:start + rows] for start in range(0, len(values), rows))
+    return values
+
+
+@contextmanager
+def _open_output(output):
+    if isinstance(output, (str, Path)):
+        with open(output, "wb") as out_file:
+            yield out_file
+    else:
+        yield output
+
+
+def write_ser(output, values, first_index=1):
+    """Write a Canal .ser file: the snapshot index in 12 characters followed
+    by the values of each column in 8 characters with 2 decimals.
+
+    values can be an array or an iterable of arrays of consecutive
+    snapshots, and output a path or a binary file. Returns the number of
+    snapshots written."""
+    index = first_index
+    with _open_output(output) as out_file:
+        for chunk in _chunks(values):
+            rows = max(1, CHUNK_BYTES // (8 * chunk.shape[1] + 13))
+            for start in range(0, len(chunk), rows):
+                block = chunk[start:start + rows]
+                snapshots = np.arange(index, index + len(block))
+                _write_rows(out_file, [format_fixed(snapshots, 12, 0), format_fixed(block, 8, 2)])
+                index += len(block)
+    return index - first_index
+
+
+def histogram_edges(helpar, bin_width=None):
+    """Edges of the bins of the Canal .his file of a helical parameter: bins
+    of 5 degrees between -180 and 180 for angles, or of bin_width (0.1 by
+    default) within 5 standard deviations of the mean for distances."""
+    if is_angular(helpar):
+        bin_width = bin_width or 5.0
+        return np.arange(-180, 180 + bin_width / 2, bin_width)
+    bin_width = bin_width or 0.1
+    mean, std = SERIES_STATS.get(helpar, (0.0, 1.0))
+    low = np.floor((mean - 5 * std) / bin_width) * bin_width
+    high = np.ceil((mean + 5 * std) / bin_width) * bin_width
+    return np.arange(low, high + bin_width / 2, bin_width)
+
+
+def histogram_counts(values, edges):
+    """(bins, columns) counts of the values of each column in the bins of
+    evenly spaced edges, ignoring missing values and values out of the bins."""
+    n_bins = len(edges) - 1
+    with np.errstate(invalid="ignore"):
+        bins = np.floor((values - edges[0]) / (edges[1] - edges[0]))
+        # the last bin includes its right edge
+        bins[values == edges[-1]] = n_bins - 1
+        valid = (bins >= 0) & (bins < n_bins)
+    bins = np.where(valid, bins, 0).astype(np.int64)
+    column_index = np.broadcast_to(np.arange(values.shape[1]), values.shape)
+    return np.bincount(
+        column_index[valid] * n_bins + bins[valid], minlength=values.shape[1] * n_bins,
+    ).reshape(values.shape[1], n_bins).T
+
+
+def write_his(output, edges, counts, snapshots):
+    """Write a Canal .his file: the center of each bin in 10 characters
+    followed by the percentage of snapshots of each column in the bin."""
+    centers = (edges[:-1] + edges[1:]) / 2
+    percent = counts / max(snapshots, 1) * 100
+    with _open_output(output) as out_file:
+        _write_rows(out_file, [format_fixed(centers, 10, 2), format_fixed(percent, 8, 2)])
+
+
+def complementary(sequence):
+    """Complementary strand of a sequence, written 3'-5'."""
+    return sequence.translate(str.maketrans("ACGTUacgtu", "TGCAAtgcaa"))
+
+
+def lis_header(sequence, snapshots, lis_name="curves_output"):
+    """Header of the Curves+ .lis file of a trajectory of a double strand
+    with the given sequence, as read by curvesplus.lis_parser."""
+    bases = len(sequence)
+    return "\n".join([
+        "",
+        "     **************************************               **************",
+        "     **** CURVES+ Version 3.0nc 09/2016 ***               *  synthetic *",
+        "     **************************************               **************",
+        "",
+        "",
+        f"  FILE : {'structure.trj':<32s} FTOP : {'structure.top':<32s}",
+        f"  LIS  : {lis_name:<32s} LIB  : {'standard':<32s}",
+        "",
+        f"  Strands =    2 Atoms = {41 * bases - 6:5d} Units = {2 * bases:5d}",
+        "",
+        f"  Combined strands have {bases:4d} levels ...",
+        "",
+        f"  Strand  1 has {bases:3d} bases (5'-3'): {sequence}",
+        f"  Strand  2 has {bases:3d} bases (3'-5'): {complementary(sequence)}",
+        "",
+        f"  ... trj loop read {snapshots:8d} snapshots",
+        "",
+    ])
+
+
+def write_lis(lis_path, sequence, snapshots):
+    """Write the header of a Curves+ .lis file."""
+    with open(lis_path, "w") as lis_file:
+        lis_file.write(lis_header(sequence, snapshots, Path(lis_path).stem))
+
+
+def write_canal_output(
+        output, sequence, frames, helpars=None, prefix="canal_output",
+        histo=True, seed=0, chunksize=100000, compression=zipfile.ZIP_STORED, **kwargs):
+    """Write the <prefix>_<helpar>.ser (and .his) files of a Canal run on a
+    trajectory of frames snapshots of a sequence, in a .zip file or a
+    directory.
+
+    helpars defaults to all the helical parameters of SERIES_STATS, and the
+    rest of the options are those of iter_synthetic_series. The values are
+    generated, written and added to the histograms one chunk of snapshots
+    at a time. Returns the list of file names written."""
+    helpars = helpars or list(SERIES_STATS)
+    output = Path(output)
+    zf = zipfile.ZipFile(output, "w", compression=compression) if output.suffix == ".zip" else None
+    if zf is None:
+        output.mkdir(parents=True, exist_ok=True)
+
+    def open_member(name):
+        if zf is not None:
+            return zf.open(name, "w", force_zip64=True)
+        return open(output / name, "wb")
+
+    names = []
+    try:
+        for i, helpar in enumerate(helpars):
+            edges = histogram_edges(helpar)
+            counts = np.zeros((len(edges) - 1, len(sequence)), dtype=np.int64)
+
+            def chunks():
+                for chunk in iter_synthetic_series(
+                        helpar, frames, len(sequence), chunksize=chunksize,
+                        seed=seed + i, **kwargs):
+                    if histo:
+                        counts[:] += histogram_counts(chunk, edges)
+                    yield chunk
+
+            with open_member(f"{prefix}_{helpar}.ser") as ser_file:
+                write_ser(ser_file, chunks())
+            names.append(f"{prefix}_{helpar}.ser")
+            if histo:
+                with open_member(f"{prefix}_{helpar}.his") as his_file:
+                    write_his(his_file, edges, counts, frames)
+                names.append(f"{prefix}_{helpar}.his")
+    finally:
+        if zf is not None:
+            zf.close()
+    return names
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Write synthetic Canal output files, in a .zip file or a directory, and the header of the matching Curves+ .lis file.")
+    parser.add_argument("output", help="Output .zip file or directory.")
+    parser.add_argument("--sequence", required=True, help="Nucleic acid sequence of the first strand.")
+    parser.add_argument("--frames", type=int, required=True, help="Number of snapshots.")
+    parser.add_argument("--helpar", nargs="+", default=None, help="Helical parameters to write (all by default).")
+    parser.add_argument("--prefix", default="canal_output", help="Prefix of the file names.")
+    parser.add_argument("--no_histo", action="store_true", help="Do not write .his files.")
+    parser.add_argument("--lis", default=None, help="Path of the Curves+ .lis header to write.")
+    parser.add_argument("--bimodal_columns", type=int, nargs="+", default=None, help="Columns (starting by 0) with two modes.")
+    parser.add_argument("--separation", type=float, default=4.0, help="Distance between modes, in standard deviations.")
+    parser.add_argument("--weight", type=float, default=0.3, help="Fraction of snapshots in the second mode.")
+    parser.add_argument("--neighbour_correlation", type=float, default=0.0, help="Correlation between neighbouring columns.")
+    parser.add_argument("--chunksize", type=int, default=100000, help="Snapshots generated at once.")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the random generator.")
+    args = parser.parse_args()
+
+    write_canal_output(
+        args.output, args.sequence, args.frames, helpars=args.helpar, prefix=args.prefix,
+        histo=not args.no_histo, seed=args.seed, chunksize=args.chunksize,
+        bimodal_columns=args.bimodal_columns, separation=args.separation,
+        weight=args.weight, neighbour_correlation=args.neighbour_correlation)
+    if args.lis:
+        write_lis(args.lis, args.sequence, args.frames)
+
+
+if __name__ == '__main__':
+    main()
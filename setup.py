@@ -25,15 +25,22 @@ setuptools.setup(
         "console_scripts": [
             "biobb_curves = biobb_dna.curvesplus.biobb_curves:main",
             "biobb_canal = biobb_dna.curvesplus.biobb_canal:main",
+            "biobb_curves_canal = biobb_dna.curvesplus.biobb_curves_canal:main",
             "canal_unzip = biobb_dna.curvesplus.canal_unzip:main",
             "biobb_canion = biobb_dna.curvesplus.biobb_canion:main",
             "dna_averages = biobb_dna.dna.dna_averages:main",
+            "dna_averages_batch = biobb_dna.dna.dna_averages_batch:main",
+            "dna_suite = biobb_dna.dna.dna_suite:main",
             "dna_timeseries = biobb_dna.dna.dna_timeseries:main",
             "dna_timeseries_unzip = biobb_dna.dna.dna_timeseries_unzip:main",
             "dna_bimodality = biobb_dna.dna.dna_bimodality:main",
+            "dna_rolling = biobb_dna.dna.dna_rolling:main",
             "bipopulations = biobb_dna.backbone.bipopulations:main",
             "canonicalag = biobb_dna.backbone.canonicalag:main",
             "puckering = biobb_dna.backbone.puckering:main",
+            "backbone_analysis = biobb_dna.backbone.backbone_analysis:main",
+            "backbone_kinetics = biobb_dna.backbone.backbone_kinetics:main",
+            "backbone_joint = biobb_dna.backbone.backbone_joint:main",
             "interbpcorr = biobb_dna.interbp_correlations.interbpcorr:main",
             "interhpcorr = biobb_dna.interbp_correlations.interhpcorr:main",
             "interseqcorr = biobb_dna.interbp_correlations.interseqcorr:main",